@@ -0,0 +1,72 @@
+"""
+Benchmark duplicate-invoice lookups in the hashed/LSH index against
+scanning the invoice history.
+
+Run from the project root:
+    python -m benchmarks.duplicate_index_benchmark
+"""
+
+import argparse
+import random
+import time
+import numpy as np
+from src.services.duplicate_index import DuplicateInvoiceIndex, invoice_number_keys, invoice_vendor
+
+WORDS = ["laptop", "stand", "dock", "monitor", "cable", "license", "support", "hours", "consulting", "freight", "toner", "chair"]
+
+def make_invoice(rng: random.Random, i: int) -> dict:
+    items = [
+        {"description": " ".join(rng.sample(WORDS, 3)), "amount": round(rng.uniform(10, 2000), 2)}
+        for _ in range(rng.randint(0, 5))
+    ]
+    return {
+        "vendor_id": f"V-{rng.randint(1, 5000):05d}",
+        "invoice_number": f"INV-{i:08d}",
+        "amount": round(rng.uniform(50, 50000), 2),
+        "date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "line_items": items
+    }
+
+def scan(history: list, invoice: dict) -> bool:
+    """Linear scan for an exact or same-number match, as a query over unindexed history would"""
+    vendor = invoice_vendor(invoice)
+    number = invoice_number_keys(invoice["invoice_number"])[1]
+    return any(invoice_vendor(other) == vendor and invoice_number_keys(other["invoice_number"])[1] == number for other in history)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--history", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'history':>9} {'build (s)':>10} {'p50 (us)':>9} {'p99 (us)':>9} {'scan (ms)':>10} {'recall':>7}")
+    for n in args.history:
+        rng = random.Random(42)
+        history = [make_invoice(rng, i) for i in range(n)]
+        index = DuplicateInvoiceIndex(url=None)
+        started = time.perf_counter()
+        for i, invoice in enumerate(history):
+            index.add(invoice, str(i))
+        build = time.perf_counter() - started
+
+        # Resubmissions of known invoices, half of them with a reformatted invoice number
+        probes = [dict(history[rng.randrange(n)]) for _ in range(args.lookups)]
+        for probe in probes[::2]:
+            probe["invoice_number"] = probe["invoice_number"].replace("INV-", "inv ")
+        latencies = []
+        found = 0
+        for probe in probes:
+            started = time.perf_counter()
+            result = index.check(probe)
+            latencies.append(time.perf_counter() - started)
+            found += result["duplicate_of"] is not None or bool(result["possible_duplicates"])
+
+        sample = probes[:5]
+        started = time.perf_counter()
+        assert all(scan(history, probe) for probe in sample)
+        scan_ms = (time.perf_counter() - started) / len(sample) * 1000
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+        print(f"{n:>9} {build:>10.1f} {p50:>9.1f} {p99:>9.1f} {scan_ms:>10.1f} {found / len(probes):>7.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark bulk ERP validation through the local vendor/PO index against
+one ERP round trip per invoice.
+
+Run from the project root:
+    python -m benchmarks.erp_validation_benchmark
+"""
+
+import argparse
+import random
+import time
+from src.services.erp_validation import BulkERPValidator
+from src.tools.erp_clients import MockERPClient
+from src.tools.mock_erp import MockERPDataset
+
+FLAGS = ("po_match", "vendor_valid", "budget_available")
+
+def make_invoices(n: int, purchase_orders: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    invoices = []
+    for i in range(n):
+        # A few invoices cite POs the ERP has never issued
+        po_number = f"PO-{rng.randint(1, int(purchase_orders * 1.02)):06d}"
+        invoices.append({
+            "invoice_number": f"INV-{i:07d}",
+            "vendor_id": f"V-{rng.randint(1, 500):05d}",
+            "po_number": po_number,
+            "amount": round(rng.uniform(100, 30000), 2),
+            "currency": "USD"
+        })
+    return invoices
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--purchase-orders", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated ERP round trip in seconds")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'invoices':>9} {'per-invoice (s)':>16} {'bulk (s)':>9} {'speedup':>8} {'erp requests':>13} {'hit rate':>9}")
+    for n in args.invoices:
+        dataset = MockERPDataset.generate(purchase_orders=args.purchase_orders)
+        client = MockERPClient(dataset, latency_seconds=args.latency)
+        invoices = make_invoices(n, args.purchase_orders)
+
+        # Per-invoice round trips are timed on a sample and extrapolated
+        sample = invoices[:max(1, min(n, int(2 / max(args.latency, 1e-3))))]
+        started = time.perf_counter()
+        expected = [client.validate_invoices([invoice])[0] for invoice in sample]
+        per_invoice = (time.perf_counter() - started) / len(sample) * n
+
+        validator = BulkERPValidator(client)
+        before = dataset.requests["changes"] + dataset.requests["validate"]
+        started = time.perf_counter()
+        results = []
+        for start in range(0, n, args.batch_size):
+            results.extend(validator.validate(invoices[start:start + args.batch_size]))
+        bulk = time.perf_counter() - started
+        requests = dataset.requests["changes"] + dataset.requests["validate"] - before
+
+        # The index must give the ERP's answers
+        assert all({k: a[k] for k in FLAGS} == {k: b[k] for k in FLAGS} for a, b in zip(results, expected))
+        print(f"{n:>9} {per_invoice:>16.2f} {bulk:>9.2f} {per_invoice / bulk:>7.1f}x {requests:>13} {validator.stats()['hit_rate']:>9.3f}")
+
+if __name__ == "__main__":
+    main()
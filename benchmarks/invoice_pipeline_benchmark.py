@@ -0,0 +1,55 @@
+"""
+Benchmark invoice ingestion throughput as the OCR worker pool grows.
+
+Run from the project root:
+    python -m benchmarks.invoice_pipeline_benchmark
+"""
+
+import argparse
+import asyncio
+import time
+from src.models.finance_models import InvoiceDocument, InvoiceIngestionResult
+from src.services.invoice_pipeline import InvoiceIngestionPipeline
+from src.services.result_store import InMemoryResultStore
+from src.tools.ocr_backends import LocalOCRBackend
+
+def make_documents(n: int) -> list:
+    return [
+        InvoiceDocument(content=f"Invoice Number: INV-{i:06d}\nDate: 2026-03-01\nVendor: Vendor {i % 50}\nTotal: ${(i * 37) % 20000 + 1}.00")
+        for i in range(n)
+    ]
+
+async def run(documents: list, concurrency: int, latency: float, queue_size: int) -> tuple:
+    store = InMemoryResultStore(model_cls=InvoiceIngestionResult, max_entries=len(documents))
+    pipeline = InvoiceIngestionPipeline(LocalOCRBackend(latency_seconds=latency), store, ocr_concurrency=concurrency, queue_size=queue_size)
+    pipeline.start()
+    started = time.perf_counter()
+    await pipeline.ingest_stream(documents)
+    await pipeline.join()
+    elapsed = time.perf_counter() - started
+    stats = pipeline.stats()
+    await pipeline.stop()
+    return elapsed, stats, store
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=2000)
+    parser.add_argument("--ocr-latency", type=float, default=0.05, help="Simulated OCR seconds per invoice")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--queue-size", type=int, default=256)
+    args = parser.parse_args()
+
+    documents = make_documents(args.invoices)
+    print(f"{'workers':>8} {'seconds':>9} {'invoices/hour':>14} {'ocr util':>9} {'ocr wait (ms)':>14}")
+    for concurrency in args.concurrency:
+        # The serial run is slow; scale it down and extrapolate the rate
+        sample = documents if concurrency > 1 else documents[:max(1, min(len(documents), int(5 / max(args.ocr_latency, 1e-3))))]
+        elapsed, stats, store = asyncio.run(run(sample, concurrency, args.ocr_latency, args.queue_size))
+        # Every invoice must be stored and routed before timing counts
+        assert len(store.get_many(d.document_id for d in sample)) == len(sample)
+        assert sum(stats["routes"].values()) == len(sample)
+        ocr = stats["stages"]["ocr"]
+        print(f"{concurrency:>8} {elapsed:>9.2f} {len(sample) / elapsed * 3600:>14.0f} {ocr['utilization']:>9.2f} {ocr['average_wait_ms']:>14.1f}")
+
+if __name__ == "__main__":
+    main()
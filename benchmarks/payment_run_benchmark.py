@@ -0,0 +1,63 @@
+"""
+Benchmark payment throughput for several payment run sizes against a
+simulated gateway round trip per request.
+
+Run size 1 is one gateway request per payment, as when each payment is
+its own call. Run from the project root:
+    python -m benchmarks.payment_run_benchmark
+"""
+
+import argparse
+import random
+import time
+from src.services.payment_executor import PaymentExecutor
+from src.tools.mock_payment_gateway import PaymentGatewaySimulator
+from src.tools.payment_gateways import MockPaymentGateway
+
+def make_payments(n: int, vendors: int, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "invoice_id": f"INV-{i:07d}",
+            "vendor": f"V-{rng.randint(1, vendors):05d}",
+            "amount": round(rng.uniform(50, 5000), 2),
+            "currency": "USD",
+            "payment_date": "2026-01-15"
+        }
+        for i in range(n)
+    ]
+
+def pay_all(payments: list, run_size: int, latency: float) -> tuple:
+    simulator = PaymentGatewaySimulator()
+    executor = PaymentExecutor(MockPaymentGateway(simulator, latency_seconds=latency), url="sqlite://", max_run_size=run_size)
+    started = time.perf_counter()
+    keys = [record["idempotency_key"] for record in executor.request_payments(payments)]
+    while True:
+        executor.run_once()
+        counts = executor.stats()["payments"]
+        if not counts["queued"] and not counts["submitted"]:
+            break
+    elapsed = time.perf_counter() - started
+    paid = {key for key in keys if executor.get_payment(key)["status"] == "paid"}
+    return elapsed, paid, simulator.requests["submit_run"] + simulator.requests["get_run_status"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--payments", type=int, default=1000)
+    parser.add_argument("--vendors", type=int, default=50)
+    parser.add_argument("--run-sizes", type=int, nargs="+", default=[1, 50, 500])
+    parser.add_argument("--latency", type=float, default=0.01, help="Simulated gateway round trip in seconds")
+    args = parser.parse_args()
+
+    payments = make_payments(args.payments, args.vendors)
+    print(f"{'run size':>9} {'seconds':>9} {'payments/s':>11} {'gateway requests':>17}")
+    expected = None
+    for run_size in args.run_sizes:
+        elapsed, paid, requests = pay_all(payments, run_size, args.latency)
+        # Every run size must pay every payment exactly once
+        expected = expected or paid
+        assert paid == expected and len(paid) == len(payments)
+        print(f"{run_size:>9} {elapsed:>9.2f} {len(payments) / elapsed:>11.0f} {requests:>17}")
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,11 @@
 # This ensures all imports work correctly in a modular Python project.
 
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from crewai import Agent
-from langchain_groq import ChatGroq
 from src.common.logger import get_logger
+from src.llm.client_registry import get_llm
 from src.common.custom_exception import CustomException
 
 class FinanceAgents:
@@ -17,12 +18,8 @@ class FinanceAgents:
         if not api_key:
             self.logger.error("GROQ_API_KEY environment variable not set")
             raise CustomException("GROQ_API_KEY environment variable not set")
-        self.llm = ChatGroq(
-            temperature=0,
-            groq_api_key=api_key,
-            model_name="llama-3.1-8b-instant"
-        )
-        self.logger.info("FinanceAgents initialized with Groq LLM.")
+        self.llm = get_llm("llama-3.1-8b-instant", temperature=0, rate_limited=True)
+        self.logger.info("FinanceAgents initialized with shared Groq LLM client.")
 
     def financial_analyst_agent(self):
         self.logger.info("Creating Senior Financial Analyst agent.")
@@ -46,6 +43,11 @@ class FinanceAgents:
             llm=self.llm
         )
 
+@lru_cache()
+def get_finance_agents() -> FinanceAgents:
+    """Get the process-wide finance agent factory"""
+    return FinanceAgents()
+
 def main():
     load_dotenv()
     try:
@@ -1,14 +1,10 @@
+from functools import lru_cache
 from crewai import Agent
-from langchain_groq import ChatGroq
-import os
+from src.llm.client_registry import get_llm
 
 class InvoiceAgents:
     def __init__(self):
-        self.llm = ChatGroq(
-            temperature=0,
-            groq_api_key=os.getenv("GROQ_API_KEY"),
-            model_name="mixtral-8x7b-32768"
-        )
+        self.llm = get_llm("mixtral-8x7b-32768", temperature=0, rate_limited=True)
 
     def invoice_ingestion_agent(self):
         return Agent(
@@ -68,4 +64,9 @@ class InvoiceAgents:
             verbose=True,
             allow_delegation=False,
             llm=self.llm
-        )
\ No newline at end of file
+        )
+
+@lru_cache()
+def get_invoice_agents() -> InvoiceAgents:
+    """Get the process-wide invoice agent factory"""
+    return InvoiceAgents()
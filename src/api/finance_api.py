@@ -1,9 +1,33 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
 from starlette.middleware.cors import CORSMiddleware
-from src.workflows.finance_workflow import FinanceWorkflow
-from src.models.finance_models import FinanceWorkflowInput, FinanceWorkflowOutput, WorkflowType
+from concurrent.futures import Future
+from datetime import datetime
+from src.models.finance_models import (
+    BatchWorkflowInput, BatchWorkflowStatus, BudgetBreakdownRequest, BudgetMetricsRequest, BudgetMetricsResponse,
+    ComplianceMetricsRequest, ComplianceMetricsResponse, FinanceWorkflowInput, FinanceWorkflowOutput, RiskMetricsRequest,
+    RiskMetricsResponse, WorkflowStatus, WorkflowType
+)
+from src.config.workflow_config import WorkflowConfig
+from src.core.factories.store_factory import ResultStoreFactory
+from src.services.workflow_executor import WorkflowExecutor, WorkflowQueueFullError
+from src.services.workflow_runner import get_workflow_store, run_finance_workflow, arun_finance_workflow
+from src.llm.client_registry import close_llm_clients, get_llm_client_registry
+from src.llm.rate_limiter import get_rate_limiter
+from src.common.resilience import circuit_breaker_stats, get_circuit_breaker
+from src.llm.response_cache import get_response_cache
+from src.services.event_bus import get_event_bus
+from src.tools.budget_engine import analyze_budget_rows
+from src.tools.compliance_engine import get_compliance_engine
+from src.tools.metrics_engine import analyze_budget
+from src.tools.risk_engine import align_return_series, compute_risk_metrics, to_risk_metrics
+from src.workflows.finance_workflow import metrics_only
+from typing import AsyncIterator, List, Optional, Union
+import asyncio
+import json
+import math
+import time
 import uuid
-from typing import Dict
 import logging
 
 app = FastAPI(
@@ -22,8 +46,19 @@ app.add_middleware(
 )
 
 # Initialize workflow engine
-finance_workflow = FinanceWorkflow()
-workflow_store: Dict[str, FinanceWorkflowOutput] = {}
+config = WorkflowConfig()
+workflow_store = get_workflow_store()
+workflow_executor = WorkflowExecutor(**config.get_executor_config())
+batch_store = ResultStoreFactory.get_result_store(config, model_cls=BatchWorkflowStatus, table_name="workflow_batches")
+batch_config = config.get_batch_config()
+event_bus = get_event_bus()
+rate_limiter = get_rate_limiter()
+
+# Distributed mode hands workflows to Celery workers that share the result store
+workflow_dispatcher = None
+if config.get_celery_config()["enabled"]:
+    from src.workers.dispatch import CeleryWorkflowDispatcher
+    workflow_dispatcher = CeleryWorkflowDispatcher(workflow_store)
 
 @app.post("/api/v1/workflows/financial-analysis", response_model=FinanceWorkflowOutput)
 async def execute_financial_analysis(
@@ -31,25 +66,7 @@ async def execute_financial_analysis(
     background_tasks: BackgroundTasks
 ):
     """Execute financial analysis workflow"""
-    try:
-        workflow_id = str(uuid.uuid4())
-        input_data.workflow_type = WorkflowType.FINANCIAL_ANALYSIS
-        
-        # Execute workflow in background
-        background_tasks.add_task(
-            run_workflow_background,
-            workflow_id,
-            "financial_analysis",
-            input_data
-        )
-        
-        return FinanceWorkflowOutput(
-            workflow_id=workflow_id,
-            status="RUNNING",
-            workflow_type=WorkflowType.FINANCIAL_ANALYSIS
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return start_workflow("financial_analysis", WorkflowType.FINANCIAL_ANALYSIS, input_data, background_tasks)
 
 @app.post("/api/v1/workflows/budget-management", response_model=FinanceWorkflowOutput)
 async def execute_budget_management(
@@ -57,24 +74,7 @@ async def execute_budget_management(
     background_tasks: BackgroundTasks
 ):
     """Execute budget management workflow"""
-    try:
-        workflow_id = str(uuid.uuid4())
-        input_data.workflow_type = WorkflowType.BUDGET_MANAGEMENT
-        
-        background_tasks.add_task(
-            run_workflow_background,
-            workflow_id,
-            "budget_management",
-            input_data
-        )
-        
-        return FinanceWorkflowOutput(
-            workflow_id=workflow_id,
-            status="RUNNING",
-            workflow_type=WorkflowType.BUDGET_MANAGEMENT
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return start_workflow("budget_management", WorkflowType.BUDGET_MANAGEMENT, input_data, background_tasks)
 
 @app.post("/api/v1/workflows/investment-advisory", response_model=FinanceWorkflowOutput)
 async def execute_investment_advisory(
@@ -82,24 +82,7 @@ async def execute_investment_advisory(
     background_tasks: BackgroundTasks
 ):
     """Execute investment advisory workflow"""
-    try:
-        workflow_id = str(uuid.uuid4())
-        input_data.workflow_type = WorkflowType.INVESTMENT_ADVISORY
-        
-        background_tasks.add_task(
-            run_workflow_background,
-            workflow_id,
-            "investment_advisory",
-            input_data
-        )
-        
-        return FinanceWorkflowOutput(
-            workflow_id=workflow_id,
-            status="RUNNING",
-            workflow_type=WorkflowType.INVESTMENT_ADVISORY
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return start_workflow("investment_advisory", WorkflowType.INVESTMENT_ADVISORY, input_data, background_tasks)
 
 @app.post("/api/v1/workflows/comprehensive", response_model=FinanceWorkflowOutput)
 async def execute_comprehensive_workflow(
@@ -107,71 +90,319 @@ async def execute_comprehensive_workflow(
     background_tasks: BackgroundTasks
 ):
     """Execute comprehensive finance workflow"""
-    try:
-        workflow_id = str(uuid.uuid4())
-        input_data.workflow_type = WorkflowType.COMPREHENSIVE
-        
-        background_tasks.add_task(
-            run_workflow_background,
-            workflow_id,
-            "comprehensive",
-            input_data
-        )
-        
-        return FinanceWorkflowOutput(
-            workflow_id=workflow_id,
-            status="RUNNING",
-            workflow_type=WorkflowType.COMPREHENSIVE
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return start_workflow("comprehensive", WorkflowType.COMPREHENSIVE, input_data, background_tasks)
+
+@app.post("/api/v1/workflows/batch", response_model=BatchWorkflowStatus)
+async def execute_batch_workflow(request: Request, background_tasks: BackgroundTasks):
+    """Submit many workflows at once as a JSON list, {"items": [...]} or an NDJSON stream"""
+    items = await parse_batch_items(request)
+    if not items:
+        raise HTTPException(status_code=422, detail="Batch contains no workflow inputs")
+    if len(items) > batch_config["max_items"]:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {batch_config['max_items']} items")
+
+    batch_id = str(uuid.uuid4())
+    workflow_ids = [f"{batch_id}-{index}" for index in range(len(items))]
+    workflow_store.put_many({
+        workflow_id: FinanceWorkflowOutput(workflow_id=workflow_id, status="PENDING", workflow_type=item.workflow_type)
+        for workflow_id, item in zip(workflow_ids, items)
+    })
+    batch_status = BatchWorkflowStatus(
+        batch_id=batch_id,
+        status="PENDING",
+        total=len(items),
+        pending=len(items),
+        workflow_ids=workflow_ids
+    )
+    batch_store.put(batch_id, batch_status)
+
+    background_tasks.add_task(run_batch_background, batch_status, items)
+    return batch_status
+
+@app.get("/api/v1/workflows/batch/{batch_id}/status", response_model=BatchWorkflowStatus)
+async def get_batch_status(batch_id: str):
+    """Get aggregated batch status"""
+    batch_status = batch_store.get(batch_id)
+    if batch_status is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    return batch_status
+
+@app.get("/api/v1/workflows/batch/{batch_id}/results")
+async def stream_batch_results(batch_id: str):
+    """Stream per-item results as NDJSON in completion order"""
+    batch_status = batch_store.get(batch_id)
+    if batch_status is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    return StreamingResponse(iter_batch_results(batch_status.workflow_ids), media_type="application/x-ndjson")
+
+@app.get("/api/v1/workflows/{workflow_id}/events")
+async def stream_workflow_events(workflow_id: str, request: Request):
+    """Push status transitions, stage completions and LLM tokens as Server-Sent Events"""
+    workflow_output = workflow_store.get(workflow_id)
+    if workflow_output is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+
+    last_event_id = request.headers.get("last-event-id", "0")
+    after_seq = int(last_event_id) if last_event_id.isdigit() else 0
+    return StreamingResponse(
+        iter_workflow_events(workflow_id, after_seq),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/api/v1/workflows/{workflow_id}/status", response_model=FinanceWorkflowOutput)
 async def get_workflow_status(workflow_id: str):
-    """Get workflow execution status"""
-    if workflow_id not in workflow_store:
+    """Get workflow execution status, with queue position and estimated wait while pending"""
+    workflow_output = workflow_store.get(workflow_id)
+    if workflow_output is None:
         raise HTTPException(status_code=404, detail="Workflow not found")
-    
-    return workflow_store[workflow_id]
+
+    return with_queue_info(workflow_output)
 
 @app.get("/api/v1/workflows/{workflow_id}/results")
 async def get_workflow_results(workflow_id: str):
-    """Get workflow execution results"""
-    if workflow_id not in workflow_store:
+    """Get workflow execution results, or the text streamed so far while it runs"""
+    workflow_output = workflow_store.get(workflow_id)
+    if workflow_output is None:
         raise HTTPException(status_code=404, detail="Workflow not found")
-    
-    workflow_output = workflow_store[workflow_id]
+
+    if workflow_output.status in (WorkflowStatus.PENDING, WorkflowStatus.RUNNING):
+        return {
+            "workflow_id": workflow_id,
+            "status": workflow_output.status,
+            "results": None,
+            "partial_results": workflow_output.partial_results or {},
+            "recommendations": None
+        }
+
     if workflow_output.status != "SUCCESS":
         raise HTTPException(status_code=400, detail="Workflow not completed successfully")
-    
+
     return {
         "workflow_id": workflow_id,
+        "status": workflow_output.status,
         "results": workflow_output.results,
         "recommendations": workflow_output.recommendations
     }
 
+# Metrics endpoints are plain functions: FastAPI runs them in its threadpool, so numpy work never blocks the event loop.
+# They bypass the workflow store, executor and LLM and answer synchronously.
+
+@app.post("/api/v1/metrics/risk", response_model=RiskMetricsResponse)
+def compute_risk(request: RiskMetricsRequest):
+    """Compute VaR, CVaR, volatility, Sharpe, drawdown and beta for every series in one pass"""
+    started = time.perf_counter()
+    try:
+        names, matrix = align_return_series(request.returns)
+        if request.weights is not None and set(request.weights) != set(names):
+            raise ValueError("weights must name every return series")
+        result = compute_risk_metrics(
+            matrix,
+            asset_names=names,
+            weights=[request.weights[name] for name in names] if request.weights else None,
+            benchmark_returns=request.benchmark_returns[-matrix.shape[1]:] if request.benchmark_returns else None,
+            confidence_level=request.confidence_level,
+            include_correlation=request.include_correlation
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    metrics = to_risk_metrics(result)
+    portfolio = metrics.pop("portfolio")
+    return RiskMetricsResponse(
+        assets=metrics,
+        portfolio=portfolio,
+        weights=result["weights"],
+        periods=result["periods"],
+        execution_time=time.perf_counter() - started
+    )
+
+@app.post("/api/v1/metrics/budget", response_model=BudgetMetricsResponse)
+def compute_budget(request: BudgetMetricsRequest):
+    """Compute budget vs actual variances, with a per-category breakdown when categories are given"""
+    started = time.perf_counter()
+    if request.categories is not None and len(request.categories) != len(request.actual):
+        raise HTTPException(status_code=422, detail="categories must have one entry per budget line")
+    try:
+        result = analyze_budget(request.actual, request.budgeted, request.categories)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return BudgetMetricsResponse(**result, execution_time=time.perf_counter() - started)
+
+@app.post("/api/v1/metrics/budget/breakdown")
+def compute_budget_breakdown(request: BudgetBreakdownRequest):
+    """Compute variances by department, category and period, with trend and forecast, over many budget rows"""
+    started = time.perf_counter()
+    result = analyze_budget_rows(
+        request.rows,
+        trend_window=request.trend_window,
+        forecast_periods=request.forecast_periods,
+        top_n=request.top_n
+    )
+    return {**result, "execution_time": time.perf_counter() - started}
+
+@app.post("/api/v1/metrics/compliance", response_model=ComplianceMetricsResponse)
+def compute_compliance(request: ComplianceMetricsRequest):
+    """Check a batch of transactions against the compliance rules, with a ComplianceCheck per violation"""
+    started = time.perf_counter()
+    evaluation = get_compliance_engine().evaluate(request.transactions)
+    results = [
+        {**result, "checks": evaluation.checks(index) if result["issues"] else []}
+        for index, result in enumerate(evaluation.results())
+    ]
+    return ComplianceMetricsResponse(
+        **evaluation.summary(),
+        results=results,
+        execution_time=time.perf_counter() - started
+    )
+
 @app.get("/api/v1/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "service": "Enterprise Finance Automation API"}
+    """Health check endpoint; degraded while any upstream's circuit breaker is open"""
+    response_cache = get_response_cache()
+    circuit_breakers = circuit_breaker_stats()
+    return {
+        "status": "degraded" if any(breaker["state"] == "open" for breaker in circuit_breakers.values()) else "healthy",
+        "service": "Enterprise Finance Automation API",
+        "executor": workflow_dispatcher.stats() if workflow_dispatcher else workflow_executor.stats(),
+        "event_bus": event_bus.stats(),
+        "llm_cache": response_cache.stats() if response_cache else None,
+        "llm_rate_limit": rate_limiter.stats() if rate_limiter else None,
+        "llm_clients": get_llm_client_registry().stats(),
+        "circuit_breakers": circuit_breakers
+    }
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    """Stop accepting work, release executor workers and pooled connections"""
+    workflow_executor.shutdown(wait=False)
+    await close_llm_clients()
+
+def submit_workflow(
+    workflow_type: str,
+    input_data: FinanceWorkflowInput,
+    workflow_id: Optional[str] = None
+) -> Union[Future, asyncio.Task]:
+    """Hand a workflow to the executor as a coroutine or a pool job, never blocking the event loop"""
+    workflow_id = workflow_id or str(uuid.uuid4())
+    if workflow_dispatcher is not None:
+        return workflow_dispatcher.submit(workflow_type, input_data, workflow_id)
+
+    def mark_running() -> None:
+        # Called when the scheduler hands the job to a worker
+        record_workflow(FinanceWorkflowOutput(workflow_id=workflow_id, status="RUNNING", workflow_type=input_data.workflow_type))
+
+    scheduling = {
+        "priority": input_data.priority,
+        "tenant": input_data.organization_id,
+        "job_id": workflow_id,
+        "on_start": mark_running
+    }
+    if workflow_executor.executor_type == "async":
+        return workflow_executor.submit_async(arun_finance_workflow, workflow_type, input_data, workflow_id, **scheduling)
+    # Worker processes cannot reach this process's event bus; they still record partial results
+    publish_events = workflow_executor.executor_type != "process"
+    return workflow_executor.submit(run_finance_workflow, workflow_type, input_data, workflow_id, publish_events, **scheduling)
+
+def with_queue_info(workflow_output: FinanceWorkflowOutput) -> FinanceWorkflowOutput:
+    """Attach the scheduler's queue position and wait estimate to a pending workflow"""
+    if workflow_output.status != WorkflowStatus.PENDING or workflow_dispatcher is not None:
+        return workflow_output
+    queue_info = workflow_executor.queue_info(workflow_output.workflow_id)
+    return workflow_output.model_copy(update=queue_info) if queue_info else workflow_output
 
-async def run_workflow_background(workflow_id: str, workflow_type: str, input_data: FinanceWorkflowInput):
-    """Run workflow in background task"""
+def llm_backlog_seconds(input_data: FinanceWorkflowInput) -> float:
+    """Seconds until the organization's LLM calls would be admitted without exceeding the limiter's max wait"""
+    if rate_limiter is None or metrics_only(input_data):
+        return 0.0
+    return max(0.0, rate_limiter.retry_after(input_data.organization_id) - rate_limiter.max_wait_seconds)
+
+def record_workflow(workflow_output: FinanceWorkflowOutput) -> None:
+    """Store a workflow record and announce its status to event subscribers"""
+    workflow_store.put(workflow_output.workflow_id, workflow_output)
+    announce_status(workflow_output)
+
+def announce_status(workflow_output: FinanceWorkflowOutput) -> None:
+    """Publish a workflow's current status to event subscribers"""
+    event_bus.publish(workflow_output.workflow_id, "status", {
+        "status": getattr(workflow_output.status, "value", workflow_output.status),
+        "error_message": workflow_output.error_message,
+        "execution_time": workflow_output.execution_time
+    })
+
+def start_workflow(
+    workflow_type: str,
+    workflow_enum: WorkflowType,
+    input_data: FinanceWorkflowInput,
+    background_tasks: BackgroundTasks
+) -> FinanceWorkflowOutput:
+    """Submit a workflow to the scheduler and record it as pending until a worker picks it up"""
+    backlog = llm_backlog_seconds(input_data)
+    if backlog > 0:
+        raise HTTPException(
+            status_code=429,
+            detail=f"LLM rate limit reached for organization {input_data.organization_id}",
+            headers={"Retry-After": str(math.ceil(backlog))}
+        )
+    llm_breaker = get_circuit_breaker("llm").stats()
+    if llm_breaker["state"] == "open" and not metrics_only(input_data):
+        raise HTTPException(
+            status_code=503,
+            detail="LLM provider is unavailable",
+            headers={"Retry-After": str(math.ceil(llm_breaker["retry_after_seconds"]) or 1)}
+        )
     try:
-        if workflow_type == "financial_analysis":
-            result = finance_workflow.execute_financial_analysis_workflow(input_data)
-        elif workflow_type == "budget_management":
-            result = finance_workflow.execute_budget_management_workflow(input_data)
-        elif workflow_type == "investment_advisory":
-            result = finance_workflow.execute_investment_advisory_workflow(input_data)
-        elif workflow_type == "comprehensive":
-            result = finance_workflow.execute_comprehensive_workflow(input_data)
-        else:
-            raise ValueError(f"Unknown workflow type: {workflow_type}")
-        
+        workflow_id = str(uuid.uuid4())
+        input_data.workflow_type = workflow_enum
+
+        # Record before submitting: a fast worker may finish first
+        pending = FinanceWorkflowOutput(
+            workflow_id=workflow_id,
+            status="PENDING",
+            workflow_type=workflow_enum
+        )
+        workflow_store.put(workflow_id, pending)
+        try:
+            future = submit_workflow(workflow_type, input_data, workflow_id)
+        except Exception:
+            workflow_store.delete(workflow_id)
+            raise
+
+        background_tasks.add_task(
+            run_workflow_background,
+            workflow_id,
+            future,
+            input_data
+        )
+        return with_queue_info(workflow_store.get(workflow_id) or pending)
+    except WorkflowQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def run_workflow_background(
+    workflow_id: str,
+    future: Union[Future, asyncio.Task],
+    input_data: FinanceWorkflowInput
+) -> FinanceWorkflowOutput:
+    """Wait for an executor-run workflow and store its result"""
+    try:
+        result = await workflow_executor.wait(future)
         result.workflow_id = workflow_id
-        workflow_store[workflow_id] = result
-        
+        record_workflow(result)
+        return result
+
+    except asyncio.TimeoutError:
+        error_result = FinanceWorkflowOutput(
+            workflow_id=workflow_id,
+            status="FAILED",
+            workflow_type=input_data.workflow_type,
+            error_message=f"Workflow timed out after {workflow_executor.timeout_seconds} seconds"
+        )
+        record_workflow(error_result)
+        logging.error(f"Workflow {workflow_id} timed out")
+        return error_result
     except Exception as e:
         error_result = FinanceWorkflowOutput(
             workflow_id=workflow_id,
@@ -179,9 +410,138 @@ async def run_workflow_background(workflow_id: str, workflow_type: str, input_da
             workflow_type=input_data.workflow_type,
             error_message=str(e)
         )
-        workflow_store[workflow_id] = error_result
+        record_workflow(error_result)
         logging.error(f"Workflow {workflow_id} failed: {str(e)}")
+        return error_result
+
+async def parse_batch_items(request: Request) -> List[FinanceWorkflowInput]:
+    """Parse a batch body once: NDJSON lines, a JSON list, or a BatchWorkflowInput object"""
+    try:
+        if "ndjson" in request.headers.get("content-type", ""):
+            items = []
+            buffer = b""
+            async for chunk in request.stream():
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                items.extend(FinanceWorkflowInput.model_validate_json(line) for line in lines if line.strip())
+            if buffer.strip():
+                items.append(FinanceWorkflowInput.model_validate_json(buffer))
+            return items
+
+        body = await request.json()
+        if isinstance(body, list):
+            body = {"items": body}
+        return BatchWorkflowInput.model_validate(body).items
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Invalid batch payload: {str(e)}")
+
+async def run_batch_background(batch_status: BatchWorkflowStatus, items: List[FinanceWorkflowInput]):
+    """Run batch items with bounded concurrency and keep the batch record up to date"""
+    semaphore = asyncio.Semaphore(batch_config["max_concurrency"])
+
+    async def run_item(workflow_id: str, item: FinanceWorkflowInput):
+        started = False
+        try:
+            async with semaphore:
+                future = await submit_with_backoff(item.workflow_type.value.lower(), item, workflow_id)
+                batch_status.pending -= 1
+                batch_status.running += 1
+                started = True
+                batch_status.status = WorkflowStatus.RUNNING
+                result = await run_workflow_background(workflow_id, future, item)
+            succeeded = result.status == WorkflowStatus.SUCCESS
+        except Exception as e:
+            # One item failing to submit or record must not abandon the rest of the batch
+            logging.error(f"Batch {batch_status.batch_id} item {workflow_id} failed: {str(e)}")
+            try:
+                record_workflow(FinanceWorkflowOutput(
+                    workflow_id=workflow_id,
+                    status="FAILED",
+                    workflow_type=item.workflow_type,
+                    error_message=str(e)
+                ))
+            except Exception as record_error:
+                logging.error(f"Cannot record failed batch item {workflow_id}: {str(record_error)}")
+            succeeded = False
+
+        if started:
+            batch_status.running -= 1
+        else:
+            batch_status.pending -= 1
+        if succeeded:
+            batch_status.succeeded += 1
+        else:
+            batch_status.failed += 1
+        try:
+            batch_store.put(batch_status.batch_id, batch_status)
+        except Exception as e:
+            logging.error(f"Cannot update batch {batch_status.batch_id}: {str(e)}")
+
+    try:
+        await asyncio.gather(
+            *(run_item(workflow_id, item) for workflow_id, item in zip(batch_status.workflow_ids, items)),
+            return_exceptions=True
+        )
+    finally:
+        # Also reached on cancellation, with items still pending or running
+        unfinished = batch_status.pending + batch_status.running
+        batch_status.status = WorkflowStatus.SUCCESS if batch_status.failed == 0 and not unfinished else WorkflowStatus.FAILED
+        batch_status.completed_at = datetime.now()
+        batch_store.put(batch_status.batch_id, batch_status)
+        logging.info(f"Batch {batch_status.batch_id} finished: {batch_status.succeeded} succeeded, {batch_status.failed} failed")
+
+async def submit_with_backoff(
+    workflow_type: str,
+    input_data: FinanceWorkflowInput,
+    workflow_id: Optional[str] = None
+) -> Union[Future, asyncio.Task]:
+    """Submit a batch item, waiting for executor and LLM rate-limit capacity instead of failing the item"""
+    delay = 0.1
+    while True:
+        backlog = llm_backlog_seconds(input_data)
+        if backlog > 0:
+            await asyncio.sleep(min(backlog, 5.0))
+            continue
+        try:
+            return submit_workflow(workflow_type, input_data, workflow_id)
+        except WorkflowQueueFullError:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 2.0)
+
+async def iter_batch_results(workflow_ids: List[str], poll_interval: float = 0.5) -> AsyncIterator[str]:
+    """Yield each finished batch item once, as soon as it completes"""
+    remaining = list(workflow_ids)
+    while remaining:
+        outputs = workflow_store.get_many(remaining)
+        finished = {
+            workflow_id: output
+            for workflow_id, output in outputs.items()
+            if output.status in (WorkflowStatus.SUCCESS, WorkflowStatus.FAILED)
+        }
+        for workflow_id, output in finished.items():
+            yield output.model_dump_json() + "\n"
+        # Items evicted from the store will never finish, so stop waiting for them
+        remaining = [workflow_id for workflow_id in remaining if workflow_id in outputs and workflow_id not in finished]
+        if remaining:
+            await asyncio.sleep(poll_interval)
+
+async def iter_workflow_events(workflow_id: str, after_seq: int = 0) -> AsyncIterator[str]:
+    """Format a workflow's events as SSE frames, ending after its terminal status"""
+    async for event in event_bus.subscribe(workflow_id, after_seq):
+        if event is not None:
+            yield f"id: {event.seq}\nevent: {event.event}\ndata: {event.model_dump_json()}\n\n"
+            continue
+
+        # Quiet period: keep the connection alive and catch workflows finished by
+        # another process, whose events never reach this process's bus
+        workflow_output = workflow_store.get(workflow_id)
+        if workflow_output is None or workflow_output.status in (WorkflowStatus.SUCCESS, WorkflowStatus.FAILED):
+            status = getattr(workflow_output.status, "value", workflow_output.status) if workflow_output else WorkflowStatus.FAILED.value
+            data = json.dumps({"workflow_id": workflow_id, "event": "status", "data": {"status": status}})
+            yield f"event: status\ndata: {data}\n\n"
+            return
+        yield ": keep-alive\n\n"
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -3,13 +3,29 @@ Enterprise Agentic Finance Automation API
 Main FastAPI application
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, BackgroundTasks
 from starlette.middleware.cors import CORSMiddleware
-from src.models.finance_models import FinanceWorkflowInput, FinanceWorkflowOutput, WorkflowType
+from src.models.finance_models import (
+    FinanceWorkflowInput, FinanceWorkflowOutput, InvoiceIngestionResult, InvoiceIngestRequest,
+    InvoiceValidationRequest, InvoiceValidationResponse, DuplicateCheckResponse, PaymentBatchRequest,
+    PaymentBatchResponse, PaymentRecord, WorkflowType
+)
 from src.core.dependencies import DependencyProvider
-from src.services.finance_service import FinanceService
+from src.common.resilience import CircuitOpenError, circuit_breaker_stats
+from src.services.duplicate_index import get_duplicate_index
+from src.services.erp_validation import get_erp_validator
+from src.services.invoice_pipeline import InvoicePipelineFullError, get_invoice_pipeline
+from src.services.invoice_triage import get_invoice_triage
+from src.services.payment_executor import get_payment_executor
+from src.services.workflow_executor import WorkflowExecutor, WorkflowQueueFullError
+from src.services.workflow_runner import arun_invoice_workflow, get_workflow_store, run_invoice_workflow
+from concurrent.futures import Future
+from typing import Set, Union
+import asyncio
+import math
+import os
+import time
 import uuid
-from typing import Dict
 from src.common.logger import get_logger
 
 logger = get_logger(__name__)
@@ -29,56 +45,222 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Dependency injection
-def get_finance_service() -> FinanceService:
-    """Get finance service instance"""
-    return DependencyProvider().get_finance_service()
-
 # Workflow store for background tasks
-workflow_store: Dict[str, FinanceWorkflowOutput] = {}
+workflow_store = get_workflow_store()
+workflow_executor = WorkflowExecutor(**DependencyProvider().get_config().get_executor_config())
+
+# Distributed mode hands invoices to Celery workers that share the result store
+workflow_dispatcher = None
+if DependencyProvider().get_config().get_celery_config()["enabled"]:
+    from src.workers.dispatch import CeleryWorkflowDispatcher
+    workflow_dispatcher = CeleryWorkflowDispatcher(workflow_store)
+
+# Staged OCR -> validation -> routing pipeline for bulk invoice intake
+invoice_pipeline_config = DependencyProvider().get_config().get_invoice_pipeline_config()
+invoice_pipeline = get_invoice_pipeline() if invoice_pipeline_config["enabled"] else None
 
 @app.post("/api/v1/workflows/invoice", response_model=FinanceWorkflowOutput)
 async def process_invoice(
     input_data: FinanceWorkflowInput,
-    background_tasks: BackgroundTasks,
-    finance_service: FinanceService = Depends(get_finance_service)
+    background_tasks: BackgroundTasks
 ):
     """Process invoice through workflow"""
+    if not input_data.invoice_data:
+        raise HTTPException(status_code=422, detail="invoice_data is required")
     try:
         workflow_id = str(uuid.uuid4())
         
-        # Execute workflow in background
+        # Record before submitting: a fast worker may finish first
+        pending = FinanceWorkflowOutput(
+            workflow_id=workflow_id,
+            status="PENDING",
+            workflow_type=WorkflowType.INVOICE_PROCESSING
+        )
+        workflow_store.put(workflow_id, pending)
+        
+        # Execute workflow on a Celery worker or the executor pool, never on the event loop
+        try:
+            future = submit_invoice_workflow(input_data, workflow_id, pending)
+        except Exception:
+            workflow_store.delete(workflow_id)
+            raise
         background_tasks.add_task(
             run_workflow_background,
             workflow_id,
-            input_data,
-            finance_service
-        )
-        
-        return FinanceWorkflowOutput(
-            workflow_id=workflow_id,
-            status="RUNNING",
-            workflow_type=WorkflowType.INVOICE_PROCESSING
+            future,
+            input_data
         )
+        return workflow_store.get(workflow_id) or pending
+    except WorkflowQueueFullError as e:
+        logger.warning(f"Rejecting invoice workflow: {str(e)}")
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         logger.error(f"Error starting invoice workflow: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def submit_invoice_workflow(
+    input_data: FinanceWorkflowInput,
+    workflow_id: str,
+    pending: FinanceWorkflowOutput
+) -> Union[Future, asyncio.Task]:
+    """Hand invoice processing to Celery or the executor, in the form its executor type accepts"""
+    if workflow_dispatcher is not None:
+        return workflow_dispatcher.submit_invoice(input_data, workflow_id)
+
+    def mark_running() -> None:
+        # Called in this process when the scheduler hands the job to a worker
+        workflow_store.put(workflow_id, pending.model_copy(update={"status": "RUNNING"}))
+
+    scheduling = {
+        "priority": input_data.priority,
+        "tenant": input_data.organization_id,
+        "job_id": workflow_id,
+        "on_start": mark_running
+    }
+    if workflow_executor.executor_type == "async":
+        return workflow_executor.submit_async(arun_invoice_workflow, input_data, **scheduling)
+    return workflow_executor.submit(run_invoice_workflow, input_data, **scheduling)
+
+# Workflows started for ingested invoices, referenced until they finish
+_ingested_invoice_tasks: Set[asyncio.Task] = set()
+
+def dispatch_ingested_invoice(result: InvoiceIngestionResult) -> str:
+    """Start an InvoiceWorkflow for an invoice the ingestion pipeline routed onwards; returns its workflow ID"""
+    workflow_id = str(uuid.uuid4())
+    input_data = FinanceWorkflowInput(
+        workflow_type=WorkflowType.INVOICE_PROCESSING,
+        invoice_data={**(result.extracted_data or {}), "document_id": result.document_id},
+        user_id="invoice_pipeline",
+        organization_id="invoice_pipeline"
+    )
+    pending = FinanceWorkflowOutput(
+        workflow_id=workflow_id,
+        status="PENDING",
+        workflow_type=WorkflowType.INVOICE_PROCESSING
+    )
+    workflow_store.put(workflow_id, pending)
+    try:
+        future = submit_invoice_workflow(input_data, workflow_id, pending)
+    except Exception:
+        workflow_store.delete(workflow_id)
+        raise
+    task = asyncio.create_task(run_workflow_background(workflow_id, future, input_data))
+    _ingested_invoice_tasks.add(task)
+    task.add_done_callback(_ingested_invoice_tasks.discard)
+    return workflow_id
+
+if invoice_pipeline is not None:
+    invoice_pipeline.dispatcher = dispatch_ingested_invoice
+
+@app.post("/api/v1/invoices/ingest")
+async def ingest_invoices(request: InvoiceIngestRequest):
+    """Queue invoices for OCR, validation and routing; all are accepted or none"""
+    if invoice_pipeline is None:
+        raise HTTPException(status_code=503, detail="Invoice ingestion pipeline is disabled")
+    inbox_dir = invoice_pipeline_config["inbox_dir"]
+    for document in request.documents:
+        if document.path is None and document.content is None:
+            raise HTTPException(status_code=422, detail=f"Document {document.document_id} needs a path or content")
+        # Server-side paths are only read from inside the invoice inbox
+        if document.path is not None and document.content is None and not (
+            inbox_dir and os.path.commonpath([os.path.realpath(document.path), os.path.realpath(inbox_dir)]) == os.path.realpath(inbox_dir)
+        ):
+            raise HTTPException(status_code=422, detail=f"Document {document.document_id}: path must be inside INVOICE_INBOX_DIR")
+    try:
+        document_ids = invoice_pipeline.try_submit(request.documents)
+    except InvoicePipelineFullError as e:
+        logger.warning(f"Rejecting invoice ingestion: {str(e)}")
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"accepted": len(document_ids), "document_ids": document_ids}
+
+@app.post("/api/v1/invoices/validate", response_model=InvoiceValidationResponse)
+def validate_invoices(request: InvoiceValidationRequest):
+    """Validate invoices against the ERP; vendors and POs in the local index are checked in memory"""
+    started = time.perf_counter()
+    try:
+        results = get_erp_validator().validate(request.invoices)
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after) or 1)})
+    except Exception as e:
+        logger.error(f"ERP validation failed: {str(e)}")
+        raise HTTPException(status_code=502, detail=str(e))
+    erp_lookups = sum(result["source"] == "erp" for result in results)
+    return InvoiceValidationResponse(
+        results=results,
+        index_hits=len(results) - erp_lookups,
+        erp_lookups=erp_lookups,
+        execution_time=time.perf_counter() - started
+    )
+
+@app.post("/api/v1/invoices/duplicates/check", response_model=DuplicateCheckResponse)
+def check_duplicate_invoices(request: InvoiceValidationRequest):
+    """Look invoices up in the duplicate index without adding them"""
+    started = time.perf_counter()
+    index = get_duplicate_index()
+    results = [index.check(invoice, exclude_id=invoice.get("invoice_id")) for invoice in request.invoices]
+    return DuplicateCheckResponse(results=results, execution_time=time.perf_counter() - started)
+
+@app.post("/api/v1/invoices/history")
+def index_invoice_history(request: InvoiceValidationRequest):
+    """Add accepted or paid invoices, each with an invoice_id, to the duplicate index"""
+    missing = [position for position, invoice in enumerate(request.invoices) if not invoice.get("invoice_id")]
+    if missing:
+        raise HTTPException(status_code=422, detail=f"Invoices at positions {missing[:10]} have no invoice_id")
+    added = get_duplicate_index().add_many({str(invoice["invoice_id"]): invoice for invoice in request.invoices})
+    return {"indexed": added, "already_indexed": len(request.invoices) - added}
+
+@app.get("/api/v1/invoices/pipeline/stats")
+async def get_invoice_pipeline_stats():
+    """Per-stage queue depth, throughput and latency of the ingestion pipeline"""
+    if invoice_pipeline is None:
+        raise HTTPException(status_code=503, detail="Invoice ingestion pipeline is disabled")
+    return invoice_pipeline.stats()
+
+@app.get("/api/v1/invoices/{document_id}", response_model=InvoiceIngestionResult)
+async def get_ingested_invoice(document_id: str):
+    """Get the outcome of an ingested invoice, or PENDING while it is in the pipeline"""
+    if invoice_pipeline is None:
+        raise HTTPException(status_code=503, detail="Invoice ingestion pipeline is disabled")
+    if invoice_pipeline.status(document_id) is not None:
+        return InvoiceIngestionResult(document_id=document_id, status="PENDING")
+    result = await asyncio.to_thread(invoice_pipeline.store.get, document_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    return result
+
+@app.post("/api/v1/payments", response_model=PaymentBatchResponse)
+def request_payments(request: PaymentBatchRequest):
+    """Queue payments for the next payment runs; repeating an idempotency key returns the recorded payment"""
+    try:
+        records = get_payment_executor().request_payments([payment.model_dump() for payment in request.payments])
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return PaymentBatchResponse(payments=records)
+
+@app.get("/api/v1/payments/{idempotency_key}", response_model=PaymentRecord)
+def get_payment(idempotency_key: str):
+    """Get a payment's ledger record: queued, submitted, paid or failed"""
+    record = get_payment_executor().get_payment(idempotency_key)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Payment not found")
+    return record
+
 @app.get("/api/v1/workflows/{workflow_id}/status", response_model=FinanceWorkflowOutput)
 async def get_workflow_status(workflow_id: str):
     """Get workflow execution status"""
-    if workflow_id not in workflow_store:
+    workflow_output = workflow_store.get(workflow_id)
+    if workflow_output is None:
         raise HTTPException(status_code=404, detail="Workflow not found")
     
-    return workflow_store[workflow_id]
+    return workflow_output
 
 @app.get("/api/v1/workflows/{workflow_id}/results")
 async def get_workflow_results(workflow_id: str):
     """Get workflow execution results"""
-    if workflow_id not in workflow_store:
+    workflow_output = workflow_store.get(workflow_id)
+    if workflow_output is None:
         raise HTTPException(status_code=404, detail="Workflow not found")
     
-    workflow_output = workflow_store[workflow_id]
     if workflow_output.status != "SUCCESS":
         raise HTTPException(status_code=400, detail="Workflow not completed successfully")
     
@@ -91,19 +273,57 @@ async def get_workflow_results(workflow_id: str):
 @app.get("/api/v1/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "Enterprise Finance Automation API"}
+    circuit_breakers = circuit_breaker_stats()
+    return {
+        "status": "degraded" if any(breaker["state"] == "open" for breaker in circuit_breakers.values()) else "healthy",
+        "service": "Enterprise Finance Automation API",
+        "executor": workflow_dispatcher.stats() if workflow_dispatcher else workflow_executor.stats(),
+        "invoice_pipeline": invoice_pipeline.stats() if invoice_pipeline else None,
+        "erp_index": get_erp_validator().stats(),
+        "duplicate_index": get_duplicate_index().stats(),
+        "invoice_fast_lane": get_invoice_triage().stats(),
+        "payments": get_payment_executor().stats(),
+        "circuit_breakers": circuit_breakers
+    }
+
+@app.on_event("startup")
+async def start_invoice_pipeline():
+    """Start the invoice ingestion workers, inbox watcher and payment runs"""
+    if invoice_pipeline is not None:
+        invoice_pipeline.start(
+            inbox_dir=invoice_pipeline_config["inbox_dir"],
+            poll_seconds=invoice_pipeline_config["poll_seconds"]
+        )
+    get_payment_executor().start()
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    """Stop accepting work and release executor and pipeline workers"""
+    workflow_executor.shutdown(wait=False)
+    if invoice_pipeline is not None:
+        await invoice_pipeline.stop(drain=True, timeout_seconds=10)
+    await get_payment_executor().stop()
 
 async def run_workflow_background(
     workflow_id: str,
-    input_data: FinanceWorkflowInput,
-    finance_service: FinanceService
+    future: Union[Future, asyncio.Task],
+    input_data: FinanceWorkflowInput
 ):
-    """Run workflow in background task"""
+    """Wait for an executor-run workflow and store its result"""
     try:
-        result = finance_service.process_invoice(input_data)
+        result = await workflow_executor.wait(future)
         result.workflow_id = workflow_id
-        workflow_store[workflow_id] = result
+        workflow_store.put(workflow_id, result)
         
+    except asyncio.TimeoutError:
+        error_result = FinanceWorkflowOutput(
+            workflow_id=workflow_id,
+            status="FAILED",
+            workflow_type=input_data.workflow_type,
+            error_message=f"Workflow timed out after {workflow_executor.timeout_seconds} seconds"
+        )
+        workflow_store.put(workflow_id, error_result)
+        logger.error(f"Workflow {workflow_id} timed out")
     except Exception as e:
         error_result = FinanceWorkflowOutput(
             workflow_id=workflow_id,
@@ -111,7 +331,7 @@ async def run_workflow_background(
             workflow_type=input_data.workflow_type,
             error_message=str(e)
         )
-        workflow_store[workflow_id] = error_result
+        workflow_store.put(workflow_id, error_result)
         logger.error(f"Workflow {workflow_id} failed: {str(e)}")
 
 if __name__ == "__main__":
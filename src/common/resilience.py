@@ -0,0 +1,286 @@
+import asyncio
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from src.common.logger import get_logger
+from src.config.workflow_config import WorkflowConfig
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Upstreams reported by /api/v1/health even before their first call
+UPSTREAMS = ("llm", "market_data", "erp", "payment_gateway", "ocr")
+
+# Transport-level failures worth retrying, matched by class name so no client library must be importable:
+# builtins, httpx (TransportError, TimeoutException), requests (ConnectionError, Timeout), groq/openai SDKs
+RETRYABLE_ERROR_NAMES = {
+    "TimeoutError", "ConnectionError", "TransportError", "TimeoutException",
+    "Timeout", "APIConnectionError", "APITimeoutError"
+}
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    """Raised without calling the upstream while its circuit breaker is open"""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(f"Circuit breaker for {upstream} is open; retry in {retry_after:.0f} seconds")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+def is_retryable(error: BaseException) -> bool:
+    """Check whether an error is a transient upstream failure (timeout, connection error, 429 or 5xx)"""
+    status_code = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in RETRYABLE_STATUS_CODES
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream.
+
+    After failure_threshold transient failures in a row the breaker opens
+    and calls fail fast with CircuitOpenError. Once reset_timeout seconds
+    have passed it lets a single probe through (half-open). A successful
+    probe closes the breaker; a failed one opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._counters = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def acquire(self) -> None:
+        """
+        Ask to call the upstream
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with a probe already in flight
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self._counters["rejected"] += 1
+            retry_after = max(0.0, self._opened_at + self.reset_timeout - now)
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit breaker for {self.name} closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+            self._counters["successes"] += 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._counters["failures"] += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._state == self.CLOSED:
+                    logger.warning(f"Circuit breaker for {self.name} opened after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._counters["opened"] += 1
+            self._probing = False
+
+    def abort(self) -> None:
+        """End a call interrupted before an outcome (e.g. cancelled): a half-open probe counts as failed, so the breaker reopens"""
+        with self._lock:
+            if not self._probing:
+                return
+        self.record_failure()
+
+    def release(self) -> None:
+        """End a call whose error says nothing about upstream health (e.g. a 400 or a local error)"""
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "retry_after_seconds": round(max(0.0, self._opened_at + self.reset_timeout - now), 1) if state == self.OPEN else 0.0,
+                **self._counters
+            }
+
+    def _current_state(self, now: float) -> str:
+        if self._state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+        return self._state
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt n sleeps uniformly in [0, min(max_delay, base_delay * 2**n)]"""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(upstream: str) -> CircuitBreaker:
+    """Get the process-wide circuit breaker for an upstream"""
+    breaker = _breakers.get(upstream)
+    if breaker is None:
+        resilience_config = WorkflowConfig().get_resilience_config()
+        with _breakers_lock:
+            breaker = _breakers.setdefault(upstream, CircuitBreaker(
+                upstream,
+                failure_threshold=resilience_config["failure_threshold"],
+                reset_timeout=resilience_config["reset_timeout_seconds"]
+            ))
+    return breaker
+
+def circuit_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """Get the state of every upstream's circuit breaker"""
+    for upstream in UPSTREAMS:
+        get_circuit_breaker(upstream)
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {upstream: breaker.stats() for upstream, breaker in sorted(breakers.items())}
+
+@lru_cache()
+def get_retry_policy() -> RetryPolicy:
+    """Get the retry policy from MAX_RETRIES and RETRY_* settings"""
+    resilience_config = WorkflowConfig().get_resilience_config()
+    return RetryPolicy(
+        max_retries=resilience_config["max_retries"],
+        base_delay=resilience_config["base_delay_seconds"],
+        max_delay=resilience_config["max_delay_seconds"]
+    )
+
+def call_with_retry(
+    upstream: str,
+    fn: Callable[[], T],
+    deadline_seconds: Optional[float] = None,
+    retry_if: Optional[Callable[[BaseException], bool]] = None,
+    policy: Optional[RetryPolicy] = None
+) -> T:
+    """
+    Call an upstream through its circuit breaker, retrying transient failures
+
+    A blocking call cannot be interrupted, so each attempt relies on the
+    client's own timeout; the deadline stops further retries once it would
+    be exceeded.
+
+    Args:
+        upstream: Breaker name (llm, market_data, erp, payment_gateway, ocr)
+        fn: Zero-argument callable making one attempt
+        deadline_seconds: Budget for all attempts and backoff sleeps
+        retry_if: Extra condition an error must meet to be retried
+        policy: Retry policy, defaults to get_retry_policy()
+
+    Raises:
+        CircuitOpenError: If the upstream's breaker is open
+    """
+    breaker = get_circuit_breaker(upstream)
+    policy = policy or get_retry_policy()
+    deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+    attempt = 0
+    while True:
+        breaker.acquire()
+        try:
+            result = fn()
+        except Exception as e:
+            delay = _next_delay(upstream, breaker, policy, attempt, deadline, e, retry_if)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            attempt += 1
+            continue
+        except BaseException:
+            # KeyboardInterrupt, SystemExit: a probe must not leave the breaker half-open for good
+            breaker.abort()
+            raise
+        breaker.record_success()
+        return result
+
+async def acall_with_retry(
+    upstream: str,
+    fn: Callable[[], Awaitable[T]],
+    deadline_seconds: Optional[float] = None,
+    retry_if: Optional[Callable[[BaseException], bool]] = None,
+    policy: Optional[RetryPolicy] = None
+) -> T:
+    """
+    Async variant of call_with_retry(); attempts are cancelled once the deadline passes
+
+    Raises:
+        CircuitOpenError: If the upstream's breaker is open
+        asyncio.TimeoutError: If the deadline passes mid-attempt and no retry fits
+    """
+    breaker = get_circuit_breaker(upstream)
+    policy = policy or get_retry_policy()
+    deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+    attempt = 0
+    while True:
+        breaker.acquire()
+        try:
+            remaining = deadline - time.monotonic() if deadline else None
+            result = await asyncio.wait_for(fn(), remaining)
+        except Exception as e:
+            delay = _next_delay(upstream, breaker, policy, attempt, deadline, e, retry_if)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        except BaseException:
+            # Cancellation: a probe must not leave the breaker half-open for good
+            breaker.abort()
+            raise
+        breaker.record_success()
+        return result
+
+def _next_delay(
+    upstream: str,
+    breaker: CircuitBreaker,
+    policy: RetryPolicy,
+    attempt: int,
+    deadline: Optional[float],
+    error: BaseException,
+    retry_if: Optional[Callable[[BaseException], bool]]
+) -> Optional[float]:
+    # Record the failure and return the backoff before the next attempt, or None to give up
+    if not is_retryable(error):
+        breaker.release()
+        return None
+    breaker.record_failure()
+    if attempt >= policy.max_retries or (retry_if is not None and not retry_if(error)):
+        return None
+    delay = policy.backoff(attempt)
+    if deadline is not None and time.monotonic() + delay >= deadline:
+        return None
+    logger.warning(f"{upstream} call failed ({type(error).__name__}: {str(error)}); retry {attempt + 1}/{policy.max_retries} in {delay:.2f}s")
+    return delay
@@ -1,5 +1,8 @@
 from typing import Dict, Any
-from pydantic import BaseSettings
+try:
+    from pydantic_settings import BaseSettings
+except ImportError:
+    from pydantic import BaseSettings
 from functools import lru_cache
 
 class FinanceSettings(BaseSettings):
@@ -13,23 +16,127 @@ class FinanceSettings(BaseSettings):
     LLM_MODEL: str = "mixtral-8x7b-32768"
     LLM_TEMPERATURE: float = 0.0
     
+    # LLM Response Cache Configuration
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_BACKEND: str = "memory"
+    LLM_CACHE_URL: str = "sqlite:///llm_cache.db"
+    LLM_CACHE_TTL_SECONDS: int = 3600
+    LLM_CACHE_MAX_ENTRIES: int = 1000
+    LLM_CACHE_SHARED_MAX_ENTRIES: int = 100000
+    REDIS_URL: str = "redis://localhost:6379/0"
+    
+    # LLM Rate Limit Configuration (defaults follow Groq's free tier for llama-3.1-8b-instant)
+    LLM_RATE_LIMIT_ENABLED: bool = True
+    LLM_REQUESTS_PER_MINUTE: int = 30
+    LLM_TOKENS_PER_MINUTE: int = 6000
+    LLM_ORG_REQUESTS_PER_MINUTE: int = 15
+    LLM_ORG_TOKENS_PER_MINUTE: int = 3000
+    LLM_RATE_LIMIT_MAX_WAIT_SECONDS: float = 60.0
+    LLM_COMPLETION_TOKEN_ESTIMATE: int = 512
+    
+    # Prompt Compaction Configuration
+    PROMPT_COMPACTION_ENABLED: bool = True
+    PROMPT_PAYLOAD_TOKEN_BUDGET: int = 2000
+    PROMPT_MODEL_TOKEN_BUDGETS: Dict[str, int] = {}
+    PROMPT_SERIES_THRESHOLD: int = 24
+    
     # Workflow Configuration
     MAX_RETRIES: int = 3
     TIMEOUT_SECONDS: int = 300
     ENABLE_HUMAN_APPROVAL: bool = True
+    PRECOMPUTE_METRICS_ENABLED: bool = True
+    
+    # Resilience Configuration (retries use MAX_RETRIES)
+    RETRY_BASE_DELAY_SECONDS: float = 0.5
+    RETRY_MAX_DELAY_SECONDS: float = 8.0
+    LLM_CALL_TIMEOUT_SECONDS: float = 60.0
+    LLM_CALL_DEADLINE_SECONDS: float = 120.0
+    MARKET_DATA_TIMEOUT_SECONDS: float = 30.0
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RESET_SECONDS: float = 30.0
+    
+    # Executor Configuration
+    WORKFLOW_EXECUTOR_TYPE: str = "thread"
+    WORKFLOW_MAX_CONCURRENCY: int = 4
+    WORKFLOW_QUEUE_DEPTH: int = 100
+    SCHEDULER_AGING_SECONDS: float = 30.0
+    SCHEDULER_ORG_WEIGHTS: Dict[str, float] = {}
+    BATCH_MAX_ITEMS: int = 10000
+    BATCH_MAX_CONCURRENCY: int = 4
+    WORKFLOW_DISPATCH: str = "local"
+    WORKFLOW_STREAMING_ENABLED: bool = True
+    STREAMING_FLUSH_INTERVAL_SECONDS: float = 0.5
+    
+    # Distributed Worker Configuration
+    CELERY_BROKER_URL: str = "redis://localhost:6379/0"
+    CELERY_QUEUE: str = "workflows"
+    CELERY_RESULT_TIMEOUT_SECONDS: float = 3600.0
     
     # Logging Configuration
     LOG_LEVEL: str = "INFO"
     ENABLE_AUDIT_LOG: bool = True
     
+    # Compliance Rule Configuration
+    COMPLIANCE_RULES_PATH: str = ""
+    COMPLIANCE_PASS_SCORE: int = 80
+    
     # Integration Settings
     ERP_API_URL: str = ""
     PAYMENT_GATEWAY_URL: str = ""
     OCR_SERVICE_URL: str = ""
     
+    # ERP Validation Configuration (ERP_API_URL is used by the http backend)
+    ERP_BACKEND: str = "mock"
+    ERP_TIMEOUT_SECONDS: float = 30.0
+    ERP_BATCH_SIZE: int = 500
+    ERP_INDEX_REFRESH_SECONDS: float = 300.0
+    ERP_AMOUNT_TOLERANCE: float = 0.0
+    
+    # Duplicate Invoice Index Configuration
+    DUPLICATE_INDEX_URL: str = "sqlite:///duplicate_index.db"
+    DUPLICATE_NEAR_THRESHOLD: float = 0.8
+    DUPLICATE_MINHASH_PERMUTATIONS: int = 64
+    DUPLICATE_LSH_BANDS: int = 16
+    DUPLICATE_INDEX_REFRESH_SECONDS: float = 30.0
+    
+    # Invoice Ingestion Pipeline Configuration
+    INVOICE_PIPELINE_ENABLED: bool = True
+    INVOICE_OCR_BACKEND: str = "local"
+    INVOICE_OCR_CONCURRENCY: int = 16
+    INVOICE_OCR_TIMEOUT_SECONDS: float = 30.0
+    INVOICE_PIPELINE_QUEUE_SIZE: int = 1000
+    INVOICE_INBOX_DIR: str = ""
+    INVOICE_INBOX_POLL_SECONDS: float = 2.0
+    INVOICE_AUTO_APPROVE_LIMIT: float = 5000.0
+    
+    # Payment Execution Configuration (PAYMENT_GATEWAY_URL is used by the http backend)
+    PAYMENT_GATEWAY_BACKEND: str = "mock"
+    PAYMENT_GATEWAY_TIMEOUT_SECONDS: float = 30.0
+    PAYMENT_LEDGER_URL: str = "sqlite:///payments.db"
+    PAYMENT_RUN_MAX_SIZE: int = 500
+    PAYMENT_RUN_INTERVAL_SECONDS: float = 5.0
+    
+    # Invoice Fast Lane Configuration
+    INVOICE_FAST_LANE_ENABLED: bool = True
+    INVOICE_FAST_LANE_MAX_AMOUNT: float = 5000.0
+    
+    # Market Data Configuration
+    MARKET_DATA_PROVIDER: str = "yfinance"
+    MARKET_DATA_CACHE_ENABLED: bool = True
+    MARKET_DATA_CACHE_DIR: str = ".market_data_cache"
+    MARKET_DATA_FIXTURE_DIR: str = ""
+    MARKET_DATA_INFO_TTL_SECONDS: int = 86400
+    
+    # Result Store Configuration
+    RESULT_STORE_BACKEND: str = "sql"
+    RESULT_STORE_URL: str = "sqlite:///workflow_results.db"
+    RESULT_STORE_TTL_SECONDS: int = 86400
+    RESULT_STORE_MAX_ENTRIES: int = 10000
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
+        extra = "ignore"
 
 @lru_cache()
 def get_settings() -> FinanceSettings:
@@ -55,12 +162,94 @@ class WorkflowConfig:
             "api_key": self.settings.GROQ_API_KEY
         }
     
+    def get_llm_cache_config(self) -> Dict[str, Any]:
+        """Get LLM response cache configuration"""
+        return {
+            "enabled": self.settings.LLM_CACHE_ENABLED,
+            "backend": self.settings.LLM_CACHE_BACKEND,
+            "url": self.settings.LLM_CACHE_URL,
+            "redis_url": self.settings.REDIS_URL,
+            "ttl_seconds": self.settings.LLM_CACHE_TTL_SECONDS,
+            "max_entries": self.settings.LLM_CACHE_MAX_ENTRIES,
+            "shared_max_entries": self.settings.LLM_CACHE_SHARED_MAX_ENTRIES
+        }
+    
+    def get_rate_limit_config(self) -> Dict[str, Any]:
+        """Get LLM rate limit configuration"""
+        return {
+            "enabled": self.settings.LLM_RATE_LIMIT_ENABLED,
+            "requests_per_minute": self.settings.LLM_REQUESTS_PER_MINUTE,
+            "tokens_per_minute": self.settings.LLM_TOKENS_PER_MINUTE,
+            "org_requests_per_minute": self.settings.LLM_ORG_REQUESTS_PER_MINUTE,
+            "org_tokens_per_minute": self.settings.LLM_ORG_TOKENS_PER_MINUTE,
+            "max_wait_seconds": self.settings.LLM_RATE_LIMIT_MAX_WAIT_SECONDS,
+            "completion_token_estimate": self.settings.LLM_COMPLETION_TOKEN_ESTIMATE
+        }
+    
+    def get_prompt_config(self) -> Dict[str, Any]:
+        """Get prompt payload compaction configuration"""
+        return {
+            "enabled": self.settings.PROMPT_COMPACTION_ENABLED,
+            "token_budget": self.settings.PROMPT_PAYLOAD_TOKEN_BUDGET,
+            "model_token_budgets": self.settings.PROMPT_MODEL_TOKEN_BUDGETS,
+            "series_threshold": self.settings.PROMPT_SERIES_THRESHOLD
+        }
+    
     def get_workflow_config(self) -> Dict[str, Any]:
         """Get workflow configuration"""
         return {
             "max_retries": self.settings.MAX_RETRIES,
             "timeout": self.settings.TIMEOUT_SECONDS,
-            "enable_human_approval": self.settings.ENABLE_HUMAN_APPROVAL
+            "enable_human_approval": self.settings.ENABLE_HUMAN_APPROVAL,
+            "precompute_metrics": self.settings.PRECOMPUTE_METRICS_ENABLED
+        }
+    
+    def get_resilience_config(self) -> Dict[str, Any]:
+        """Get retry, deadline and circuit breaker configuration"""
+        return {
+            "max_retries": self.settings.MAX_RETRIES,
+            "base_delay_seconds": self.settings.RETRY_BASE_DELAY_SECONDS,
+            "max_delay_seconds": self.settings.RETRY_MAX_DELAY_SECONDS,
+            "llm_call_timeout_seconds": self.settings.LLM_CALL_TIMEOUT_SECONDS,
+            "llm_call_deadline_seconds": self.settings.LLM_CALL_DEADLINE_SECONDS,
+            "market_data_timeout_seconds": self.settings.MARKET_DATA_TIMEOUT_SECONDS,
+            "failure_threshold": self.settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            "reset_timeout_seconds": self.settings.CIRCUIT_BREAKER_RESET_SECONDS
+        }
+    
+    def get_executor_config(self) -> Dict[str, Any]:
+        """Get workflow executor configuration"""
+        return {
+            "executor_type": self.settings.WORKFLOW_EXECUTOR_TYPE,
+            "max_concurrency": self.settings.WORKFLOW_MAX_CONCURRENCY,
+            "queue_depth": self.settings.WORKFLOW_QUEUE_DEPTH,
+            "timeout_seconds": self.settings.TIMEOUT_SECONDS,
+            "aging_seconds": self.settings.SCHEDULER_AGING_SECONDS,
+            "org_weights": self.settings.SCHEDULER_ORG_WEIGHTS
+        }
+    
+    def get_batch_config(self) -> Dict[str, Any]:
+        """Get batch submission configuration"""
+        return {
+            "max_items": self.settings.BATCH_MAX_ITEMS,
+            "max_concurrency": self.settings.BATCH_MAX_CONCURRENCY
+        }
+    
+    def get_celery_config(self) -> Dict[str, Any]:
+        """Get distributed (Celery) worker configuration"""
+        return {
+            "enabled": self.settings.WORKFLOW_DISPATCH == "celery",
+            "broker_url": self.settings.CELERY_BROKER_URL,
+            "queue": self.settings.CELERY_QUEUE,
+            "result_timeout_seconds": self.settings.CELERY_RESULT_TIMEOUT_SECONDS,
+            "timeout_seconds": self.settings.TIMEOUT_SECONDS
+        }
+    
+    def get_streaming_config(self) -> Dict[str, Any]:
+        """Get token streaming configuration"""
+        return {
+            "enabled": self.settings.WORKFLOW_STREAMING_ENABLED,
+            "flush_interval_seconds": self.settings.STREAMING_FLUSH_INTERVAL_SECONDS
         }
     
     def get_integration_config(self) -> Dict[str, Any]:
@@ -69,4 +258,83 @@ class WorkflowConfig:
             "erp_api_url": self.settings.ERP_API_URL,
             "payment_gateway_url": self.settings.PAYMENT_GATEWAY_URL,
             "ocr_service_url": self.settings.OCR_SERVICE_URL
+        }
+    
+    def get_erp_config(self) -> Dict[str, Any]:
+        """Get ERP client and vendor/PO index configuration"""
+        return {
+            "backend": self.settings.ERP_BACKEND,
+            "url": self.settings.ERP_API_URL,
+            "timeout_seconds": self.settings.ERP_TIMEOUT_SECONDS,
+            "batch_size": self.settings.ERP_BATCH_SIZE,
+            "refresh_seconds": self.settings.ERP_INDEX_REFRESH_SECONDS,
+            "amount_tolerance": self.settings.ERP_AMOUNT_TOLERANCE
+        }
+    
+    def get_duplicate_index_config(self) -> Dict[str, Any]:
+        """Get duplicate invoice index configuration"""
+        return {
+            "url": self.settings.DUPLICATE_INDEX_URL,
+            "near_threshold": self.settings.DUPLICATE_NEAR_THRESHOLD,
+            "num_permutations": self.settings.DUPLICATE_MINHASH_PERMUTATIONS,
+            "bands": self.settings.DUPLICATE_LSH_BANDS,
+            "refresh_seconds": self.settings.DUPLICATE_INDEX_REFRESH_SECONDS
+        }
+    
+    def get_invoice_pipeline_config(self) -> Dict[str, Any]:
+        """Get invoice ingestion pipeline configuration"""
+        return {
+            "enabled": self.settings.INVOICE_PIPELINE_ENABLED,
+            "ocr_backend": self.settings.INVOICE_OCR_BACKEND,
+            "ocr_concurrency": self.settings.INVOICE_OCR_CONCURRENCY,
+            "ocr_timeout_seconds": self.settings.INVOICE_OCR_TIMEOUT_SECONDS,
+            "ocr_service_url": self.settings.OCR_SERVICE_URL,
+            "queue_size": self.settings.INVOICE_PIPELINE_QUEUE_SIZE,
+            "inbox_dir": self.settings.INVOICE_INBOX_DIR,
+            "poll_seconds": self.settings.INVOICE_INBOX_POLL_SECONDS,
+            "auto_approve_limit": self.settings.INVOICE_AUTO_APPROVE_LIMIT
+        }
+    
+    def get_payment_config(self) -> Dict[str, Any]:
+        """Get payment gateway and payment run configuration"""
+        return {
+            "backend": self.settings.PAYMENT_GATEWAY_BACKEND,
+            "url": self.settings.PAYMENT_GATEWAY_URL,
+            "timeout_seconds": self.settings.PAYMENT_GATEWAY_TIMEOUT_SECONDS,
+            "ledger_url": self.settings.PAYMENT_LEDGER_URL,
+            "max_run_size": self.settings.PAYMENT_RUN_MAX_SIZE,
+            "interval_seconds": self.settings.PAYMENT_RUN_INTERVAL_SECONDS
+        }
+    
+    def get_invoice_fast_lane_config(self) -> Dict[str, Any]:
+        """Get invoice fast lane configuration"""
+        return {
+            "enabled": self.settings.INVOICE_FAST_LANE_ENABLED,
+            "max_amount": self.settings.INVOICE_FAST_LANE_MAX_AMOUNT
+        }
+    
+    def get_compliance_config(self) -> Dict[str, Any]:
+        """Get compliance rule engine configuration"""
+        return {
+            "rules_path": self.settings.COMPLIANCE_RULES_PATH,
+            "pass_score": self.settings.COMPLIANCE_PASS_SCORE
+        }
+    
+    def get_market_data_config(self) -> Dict[str, Any]:
+        """Get market data provider configuration"""
+        return {
+            "provider": self.settings.MARKET_DATA_PROVIDER,
+            "cache_enabled": self.settings.MARKET_DATA_CACHE_ENABLED,
+            "cache_dir": self.settings.MARKET_DATA_CACHE_DIR,
+            "fixture_dir": self.settings.MARKET_DATA_FIXTURE_DIR,
+            "info_ttl_seconds": self.settings.MARKET_DATA_INFO_TTL_SECONDS
+        }
+    
+    def get_result_store_config(self) -> Dict[str, Any]:
+        """Get workflow result store configuration"""
+        return {
+            "backend": self.settings.RESULT_STORE_BACKEND,
+            "url": self.settings.RESULT_STORE_URL,
+            "ttl_seconds": self.settings.RESULT_STORE_TTL_SECONDS,
+            "max_entries": self.settings.RESULT_STORE_MAX_ENTRIES
         }
\ No newline at end of file
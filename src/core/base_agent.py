@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from crewai import Agent
 from langchain_groq import ChatGroq
-import os
+from src.llm.client_registry import get_llm
 from typing import Optional
 
 class BaseFinanceAgent(ABC):
@@ -11,14 +11,7 @@ class BaseFinanceAgent(ABC):
         self.llm = llm or self._create_default_llm()
     
     def _create_default_llm(self) -> ChatGroq:
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-            raise ValueError("GROQ_API_KEY environment variable not set")
-        return ChatGroq(
-            temperature=0,
-            groq_api_key=api_key,
-            model_name="mixtral-8x7b-32768"
-        )
+        return get_llm("mixtral-8x7b-32768", temperature=0, rate_limited=True)
     
     @abstractmethod
     def get_role(self) -> str:
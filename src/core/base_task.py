@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from crewai import Task, Agent
-from typing import Any
+from typing import Any, List, Optional
+from src.llm.prompt_compactor import compact_payload
 
 class BaseFinanceTask(ABC):
     """Base class for all finance tasks"""
@@ -13,9 +14,19 @@ class BaseFinanceTask(ABC):
     def get_expected_output(self) -> str:
         pass
     
-    def create_task(self, agent: Agent, data: Any) -> Task:
+    def create_task(
+        self,
+        agent: Agent,
+        data: Any,
+        async_execution: bool = False,
+        context: Optional[List[Task]] = None
+    ) -> Task:
+        # Leave context unset unless given so sequential crews keep passing prior outputs
+        extra = {"context": context} if context is not None else {}
         return Task(
-            description=self.get_description(data),
+            description=self.get_description(compact_payload(data, label=type(self).__name__)),
             agent=agent,
-            expected_output=self.get_expected_output()
+            expected_output=self.get_expected_output(),
+            async_execution=async_execution,
+            **extra
         )
\ No newline at end of file
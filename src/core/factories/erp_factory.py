@@ -0,0 +1,39 @@
+from typing import Dict, Type
+from src.core.interfaces.erp_interface import BaseERPClient
+from src.config.workflow_config import WorkflowConfig
+from src.tools.erp_clients import HttpERPClient, MockERPClient
+
+class ERPClientFactory:
+    """Factory for creating ERP clients"""
+
+    _client_types: Dict[str, Type[BaseERPClient]] = {
+        'http': HttpERPClient,
+        'mock': MockERPClient
+    }
+
+    @classmethod
+    def get_erp_client(cls, config: WorkflowConfig) -> BaseERPClient:
+        """
+        Create the ERP client selected in configuration
+
+        Args:
+            config: Workflow configuration
+
+        Returns:
+            Instance of ERP client
+
+        Raises:
+            ValueError: If client type is not supported
+        """
+        erp_config = config.get_erp_config()
+        client_type = erp_config["backend"]
+        if client_type not in cls._client_types:
+            raise ValueError(f"Unsupported ERP client: {client_type}")
+
+        if client_type == 'http':
+            return HttpERPClient(
+                url=erp_config["url"],
+                timeout_seconds=erp_config["timeout_seconds"],
+                batch_size=erp_config["batch_size"]
+            )
+        return MockERPClient()
@@ -0,0 +1,46 @@
+from typing import Dict, Type
+from src.core.interfaces.market_data_interface import BaseMarketDataProvider
+from src.config.workflow_config import WorkflowConfig
+from src.tools.market_data import CachedMarketDataProvider, FixtureMarketDataProvider, YFinanceMarketDataProvider
+
+class MarketDataFactory:
+    """Factory for creating market data providers"""
+
+    _provider_types: Dict[str, Type[BaseMarketDataProvider]] = {
+        'yfinance': YFinanceMarketDataProvider,
+        'fixture': FixtureMarketDataProvider
+    }
+
+    @classmethod
+    def get_market_data_provider(cls, config: WorkflowConfig) -> BaseMarketDataProvider:
+        """
+        Create the market data provider selected in configuration
+
+        Args:
+            config: Workflow configuration
+
+        Returns:
+            Provider, wrapped in the Parquet cache when caching is enabled
+
+        Raises:
+            ValueError: If provider type is not supported
+        """
+        market_config = config.get_market_data_config()
+        provider_type = market_config["provider"]
+        if provider_type not in cls._provider_types:
+            raise ValueError(f"Unsupported market data provider: {provider_type}")
+
+        if provider_type == 'fixture':
+            provider = FixtureMarketDataProvider(fixture_dir=market_config["fixture_dir"])
+        else:
+            provider = cls._provider_types[provider_type](
+                timeout_seconds=config.get_resilience_config()["market_data_timeout_seconds"]
+            )
+
+        if not market_config["cache_enabled"]:
+            return provider
+        return CachedMarketDataProvider(
+            provider,
+            cache_dir=market_config["cache_dir"],
+            info_ttl_seconds=market_config["info_ttl_seconds"]
+        )
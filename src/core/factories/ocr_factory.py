@@ -0,0 +1,38 @@
+from typing import Dict, Type
+from src.core.interfaces.ocr_interface import BaseOCRBackend
+from src.config.workflow_config import WorkflowConfig
+from src.tools.ocr_backends import HttpOCRBackend, LocalOCRBackend
+
+class OCRFactory:
+    """Factory for creating invoice OCR backends"""
+
+    _backend_types: Dict[str, Type[BaseOCRBackend]] = {
+        'local': LocalOCRBackend,
+        'http': HttpOCRBackend
+    }
+
+    @classmethod
+    def get_ocr_backend(cls, config: WorkflowConfig) -> BaseOCRBackend:
+        """
+        Create the OCR backend selected in configuration
+
+        Args:
+            config: Workflow configuration
+
+        Returns:
+            Instance of OCR backend
+
+        Raises:
+            ValueError: If backend type is not supported
+        """
+        pipeline_config = config.get_invoice_pipeline_config()
+        backend_type = pipeline_config["ocr_backend"]
+        if backend_type not in cls._backend_types:
+            raise ValueError(f"Unsupported OCR backend: {backend_type}")
+
+        if backend_type == 'http':
+            return HttpOCRBackend(
+                url=pipeline_config["ocr_service_url"],
+                timeout_seconds=pipeline_config["ocr_timeout_seconds"]
+            )
+        return LocalOCRBackend()
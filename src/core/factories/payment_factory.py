@@ -0,0 +1,38 @@
+from typing import Dict, Type
+from src.core.interfaces.payment_interface import BasePaymentGateway
+from src.config.workflow_config import WorkflowConfig
+from src.tools.payment_gateways import HttpPaymentGateway, MockPaymentGateway
+
+class PaymentGatewayFactory:
+    """Factory for creating payment gateway clients"""
+
+    _gateway_types: Dict[str, Type[BasePaymentGateway]] = {
+        'http': HttpPaymentGateway,
+        'mock': MockPaymentGateway
+    }
+
+    @classmethod
+    def get_payment_gateway(cls, config: WorkflowConfig) -> BasePaymentGateway:
+        """
+        Create the payment gateway selected in configuration
+
+        Args:
+            config: Workflow configuration
+
+        Returns:
+            Instance of payment gateway
+
+        Raises:
+            ValueError: If gateway type is not supported
+        """
+        payment_config = config.get_payment_config()
+        gateway_type = payment_config["backend"]
+        if gateway_type not in cls._gateway_types:
+            raise ValueError(f"Unsupported payment gateway: {gateway_type}")
+
+        if gateway_type == 'http':
+            return HttpPaymentGateway(
+                url=payment_config["url"],
+                timeout_seconds=payment_config["timeout_seconds"]
+            )
+        return MockPaymentGateway()
@@ -0,0 +1,62 @@
+from typing import Dict, Type
+from pydantic import BaseModel
+from src.core.interfaces.store_interface import BaseResultStore
+from src.config.workflow_config import WorkflowConfig
+from src.models.finance_models import FinanceWorkflowOutput
+from src.services.result_store import InMemoryResultStore, RedisResultStore, SQLResultStore
+
+class ResultStoreFactory:
+    """Factory for creating workflow result stores"""
+
+    _store_types: Dict[str, Type[BaseResultStore]] = {
+        'memory': InMemoryResultStore,
+        'sql': SQLResultStore,
+        'redis': RedisResultStore
+    }
+
+    @classmethod
+    def get_result_store(
+        cls,
+        config: WorkflowConfig,
+        model_cls: Type[BaseModel] = FinanceWorkflowOutput,
+        table_name: str = "workflow_results"
+    ) -> BaseResultStore:
+        """
+        Create the result store selected in configuration
+
+        Args:
+            config: Workflow configuration
+            model_cls: Pydantic model stored in the result store
+            table_name: Table name used by SQL-backed stores
+
+        Returns:
+            Instance of result store
+
+        Raises:
+            ValueError: If store type is not supported
+        """
+        store_config = config.get_result_store_config()
+        store_type = store_config["backend"]
+        if store_type not in cls._store_types:
+            raise ValueError(f"Unsupported result store type: {store_type}")
+
+        if store_type == 'redis':
+            return RedisResultStore(
+                url=store_config["url"],
+                model_cls=model_cls,
+                key_prefix=table_name,
+                ttl_seconds=store_config["ttl_seconds"]
+            )
+        if store_type == 'sql':
+            return SQLResultStore(
+                url=store_config["url"],
+                model_cls=model_cls,
+                table_name=table_name,
+                max_entries=store_config["max_entries"],
+                ttl_seconds=store_config["ttl_seconds"]
+            )
+        return cls._store_types[store_type](
+            model_cls=model_cls,
+            max_entries=store_config["max_entries"],
+            ttl_seconds=store_config["ttl_seconds"]
+        )
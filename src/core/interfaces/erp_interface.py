@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+class BaseERPClient(ABC):
+    """Abstract base class for ERP clients"""
+
+    @abstractmethod
+    def fetch_changes(self, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get vendor-master and purchase order changes since a cursor
+
+        Args:
+            cursor: Cursor returned by the previous call, or None for a full snapshot
+
+        Returns:
+            {"vendors": [...], "purchase_orders": [...], "cursor": str, "has_more": bool}
+        """
+        pass
+
+    @abstractmethod
+    def validate_invoices(self, invoices: List[Dict[str, Any]]) -> List[Dict[str, bool]]:
+        """
+        Validate several invoices in one request
+
+        Returns:
+            po_match, vendor_valid, budget_available and duplicate_check flags per invoice, in order
+        """
+        pass
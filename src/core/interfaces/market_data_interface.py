@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Any, Dict, Sequence
+import pandas as pd
+
+class BaseMarketDataProvider(ABC):
+    """Abstract base class for market data providers"""
+
+    @abstractmethod
+    def get_history(self, symbols: Sequence[str], start: date, end: date) -> Dict[str, pd.DataFrame]:
+        """
+        Get daily OHLCV history for several symbols in one request
+
+        Args:
+            symbols: Ticker symbols
+            start: First date to include
+            end: Last date to include
+
+        Returns:
+            Frame per symbol indexed by date with Open/High/Low/Close/Volume
+            columns. Symbols without data are omitted.
+        """
+        pass
+
+    @abstractmethod
+    def get_info(self, symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Get fundamentals (market cap, P/E, dividend yield) per symbol"""
+        pass
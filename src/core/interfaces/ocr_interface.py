@@ -0,0 +1,25 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+from src.models.finance_models import InvoiceDocument
+
+class BaseOCRBackend(ABC):
+    """Abstract base class for invoice OCR backends"""
+
+    @abstractmethod
+    def extract(self, document: InvoiceDocument) -> Dict[str, Any]:
+        """
+        Extract invoice fields from one document
+
+        Args:
+            document: Invoice file path or inline content
+
+        Returns:
+            Extracted fields (invoice_number, date, vendor, amount, currency,
+            line_items). Fields the backend could not read are None.
+        """
+        pass
+
+    async def aextract(self, document: InvoiceDocument) -> Dict[str, Any]:
+        """Async variant of extract(); runs the blocking call on a worker thread unless overridden"""
+        return await asyncio.to_thread(self.extract, document)
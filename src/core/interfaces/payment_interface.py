@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+class BasePaymentGateway(ABC):
+    """Abstract base class for payment gateways that accept batched payment runs"""
+
+    @abstractmethod
+    def submit_run(self, run: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Submit a payment run for asynchronous execution
+
+        Submitting the same run_id again must not pay anything twice; the
+        gateway answers with the run it already accepted.
+
+        Args:
+            run: {"run_id", "vendor", "currency", "payment_date",
+                "payments": [{"idempotency_key", "invoice_id", "amount"}, ...]}
+
+        Returns:
+            {"gateway_run_id": str, "status": str}
+        """
+        pass
+
+    @abstractmethod
+    def get_run_status(self, gateway_run_id: str) -> Dict[str, Any]:
+        """
+        Get the status of a submitted run
+
+        Returns:
+            {"status": "processing" | "completed", "payments": [{"idempotency_key",
+            "status": "pending" | "paid" | "failed", "transaction_id", "error"}, ...]}
+        """
+        pass
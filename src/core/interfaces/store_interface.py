@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional
+from pydantic import BaseModel
+
+class BaseResultStore(ABC):
+    """Abstract base class for workflow result stores"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[BaseModel]:
+        """Get a stored result, or None if missing or expired"""
+        pass
+
+    @abstractmethod
+    def put(self, key: str, value: BaseModel) -> None:
+        """Insert or replace a stored result"""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete a stored result"""
+        pass
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """Remove expired results and return how many were dropped"""
+        pass
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, BaseModel]:
+        """Get several stored results, skipping missing or expired keys"""
+        results = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                results[key] = value
+        return results
+
+    def put_many(self, values: Dict[str, BaseModel]) -> None:
+        """Insert or replace several stored results"""
+        for key, value in values.items():
+            self.put(key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
@@ -0,0 +1,146 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from src.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+@dataclass
+class GraphStage:
+    """A named unit of work and the stages whose outputs it needs"""
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]
+    depends_on: List[str] = field(default_factory=list)
+
+@dataclass
+class GraphRun:
+    """Outputs and wall-clock timings of a task graph execution"""
+    results: Dict[str, Any]
+    stage_timings: Dict[str, float]
+    total_time: float
+
+class TaskGraph:
+    """
+    DAG executor that runs every stage as soon as its dependencies finish.
+
+    Each stage function receives a dict of its upstream stage outputs, so
+    independent stages run concurrently and join stages see all their
+    inputs. The first stage failure cancels pending stages and is re-raised.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, GraphStage] = {}
+
+    def add_stage(self, name: str, fn: Callable[[Dict[str, Any]], Any], depends_on: Optional[List[str]] = None) -> "TaskGraph":
+        """
+        Register a stage
+
+        Args:
+            name: Unique stage name
+            fn: Callable (or coroutine function for arun) taking upstream outputs
+            depends_on: Names of stages that must finish first
+
+        Returns:
+            The graph, for chaining
+        """
+        if name in self._stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        self._stages[name] = GraphStage(name=name, fn=fn, depends_on=list(depends_on or []))
+        return self
+
+    def validate(self) -> None:
+        """
+        Check that every dependency exists and the graph is acyclic
+
+        Raises:
+            ValueError: If a dependency is unknown or a cycle is found
+        """
+        for stage in self._stages.values():
+            for dep in stage.depends_on:
+                if dep not in self._stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        visiting, done = set(), set()
+
+        def visit(name: str) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected at stage '{name}'")
+            visiting.add(name)
+            for dep in self._stages[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self._stages:
+            visit(name)
+
+    def run(self, max_workers: Optional[int] = None) -> GraphRun:
+        """Execute the graph on a thread pool"""
+        self.validate()
+        results: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+        remaining = dict(self._stages)
+        running: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(self._stages) or 1, thread_name_prefix="stage") as pool:
+            while remaining or running:
+                for name in [n for n, s in remaining.items() if all(d in results for d in s.depends_on)]:
+                    stage = remaining.pop(name)
+                    upstream = {dep: results[dep] for dep in stage.depends_on}
+                    # Carry context variables (e.g. the workflow event scope) into the stage thread
+                    context = contextvars.copy_context()
+                    running[pool.submit(context.run, self._timed, stage.fn, upstream)] = name
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        results[name], timings[name] = future.result()
+                    except Exception:
+                        for pending in running:
+                            pending.cancel()
+                        logger.error(f"Task graph stage '{name}' failed")
+                        raise
+
+        return GraphRun(results=results, stage_timings=timings, total_time=time.perf_counter() - started)
+
+    async def arun(self) -> GraphRun:
+        """Execute the graph on the running event loop; stage functions must be coroutines"""
+        self.validate()
+        timings: Dict[str, float] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+        started = time.perf_counter()
+
+        async def run_stage(stage: GraphStage) -> Any:
+            upstream = {dep: await tasks[dep] for dep in stage.depends_on}
+            stage_started = time.perf_counter()
+            output = await stage.fn(upstream)
+            timings[stage.name] = time.perf_counter() - stage_started
+            return output
+
+        for stage in self._stages.values():
+            tasks[stage.name] = asyncio.ensure_future(run_stage(stage))
+        try:
+            outputs = await asyncio.gather(*tasks.values())
+        except Exception:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        return GraphRun(
+            results=dict(zip(tasks.keys(), outputs)),
+            stage_timings=timings,
+            total_time=time.perf_counter() - started
+        )
+
+    @staticmethod
+    def _timed(fn: Callable[[Dict[str, Any]], Any], upstream: Dict[str, Any]) -> tuple:
+        stage_started = time.perf_counter()
+        output = fn(upstream)
+        return output, time.perf_counter() - stage_started
@@ -1,17 +1,17 @@
 from abc import ABC, abstractmethod
 from crewai import Crew, Process
-from src.agents.finance_agents import FinanceAgents
-from src.tasks.finance_tasks import FinanceTasks
-from src.tools.finance_tools import financial_data_tool, risk_calculator_tool, budget_analyzer_tool, compliance_checker_tool
+from src.agents.finance_agents import get_finance_agents
+from src.tasks.finance_tasks import get_finance_tasks
+from src.tools.finance_tools import financial_data_tool, risk_calculator_tool, portfolio_risk_tool, budget_analyzer_tool, compliance_checker_tool
 from typing import Any
 
 class BaseWorkflow(ABC):
     """Base workflow class"""
     
     def __init__(self):
-        self.agents = FinanceAgents()
-        self.tasks = FinanceTasks()
-        self.tools = [financial_data_tool, risk_calculator_tool, budget_analyzer_tool, compliance_checker_tool]
+        self.agents = get_finance_agents()
+        self.tasks = get_finance_tasks()
+        self.tools = [financial_data_tool, risk_calculator_tool, portfolio_risk_tool, budget_analyzer_tool, compliance_checker_tool]
     
     @abstractmethod
     def create_crew(self, data: Any) -> Crew:
@@ -1,15 +1,16 @@
 from crewai import Crew, Process
-from src.agents.finance_agents import FinanceAgents
-from src.tasks.finance_tasks import FinanceTasks
-from src.tools.finance_tools import financial_data_tool, risk_calculator_tool, budget_analyzer_tool, compliance_checker_tool
+from src.agents.finance_agents import get_finance_agents
+from src.tasks.finance_tasks import get_finance_tasks
+from src.tools.finance_tools import financial_data_tool, risk_calculator_tool, portfolio_risk_tool, budget_analyzer_tool, compliance_checker_tool
 
 class FinanceCrew:
     def __init__(self):
-        self.agents = FinanceAgents()
-        self.tasks = FinanceTasks()
+        self.agents = get_finance_agents()
+        self.tasks = get_finance_tasks()
         self.tools = [
             financial_data_tool,
             risk_calculator_tool,
+            portfolio_risk_tool,
             budget_analyzer_tool,
             compliance_checker_tool
         ]
@@ -98,13 +99,14 @@ class FinanceCrew:
         for agent in [financial_analyst, risk_manager, budget_controller, investment_advisor, compliance_officer]:
             agent.tools = self.tools
         
-        # Create all tasks
-        analysis_task = self.tasks.financial_analysis_task(financial_analyst, financial_data)
-        risk_task = self.tasks.risk_assessment_task(risk_manager, financial_data)
-        budget_task = self.tasks.budget_monitoring_task(budget_controller, budget_data)
-        investment_task = self.tasks.investment_analysis_task(investment_advisor, investment_data)
+        # Independent analyses run concurrently; compliance waits for all of them
+        analysis_task = self.tasks.financial_analysis_task(financial_analyst, financial_data, async_execution=True)
+        risk_task = self.tasks.risk_assessment_task(risk_manager, financial_data, async_execution=True)
+        budget_task = self.tasks.budget_monitoring_task(budget_controller, budget_data, async_execution=True)
+        investment_task = self.tasks.investment_analysis_task(investment_advisor, investment_data, async_execution=True)
         compliance_task = self.tasks.compliance_check_task(compliance_officer, 
-                                                         f"{financial_data}, {budget_data}, {investment_data}")
+                                                         f"{financial_data}, {budget_data}, {investment_data}",
+                                                         context=[analysis_task, risk_task, budget_task, investment_task])
         
         # Create comprehensive crew
         crew = Crew(
@@ -1,5 +1,6 @@
 from crewai import Crew, Process
-from src.agents.invoice_agents import InvoiceAgents
+from functools import lru_cache
+from src.agents.invoice_agents import get_invoice_agents
 from src.tasks.invoice_tasks import InvoiceTasks
 from src.tools.invoice_tools import invoice_processing_tools
 from typing import Dict, Any
@@ -11,7 +12,7 @@ class InvoiceCrew:
     """Crew for Invoice-to-Pay workflow automation"""
     
     def __init__(self):
-        self.agents = InvoiceAgents()
+        self.agents = get_invoice_agents()
         self.tasks = InvoiceTasks()
         self.tools = invoice_processing_tools
 
@@ -62,4 +63,9 @@ class InvoiceCrew:
             verbose=True
         )
         
-        return crew
\ No newline at end of file
+        return crew
+
+@lru_cache()
+def get_invoice_crew() -> InvoiceCrew:
+    """Get the process-wide invoice crew factory"""
+    return InvoiceCrew()
@@ -1,7 +1,7 @@
 import streamlit as st
 import requests
 import pandas as pd
-import time
+import json
 
 # Configure Streamlit page
 st.set_page_config(
@@ -13,6 +13,12 @@ st.set_page_config(
 
 # API Configuration
 API_BASE_URL = "http://localhost:8000/api/v1"
+EVENT_READ_TIMEOUT = 60  # the API sends a keep-alive at least every 15 seconds
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Pooled keep-alive session shared across reruns"""
+    return requests.Session()
 
 def main():
     st.title("🏢 Enterprise Agentic Finance Automation Workflow")
@@ -231,51 +237,79 @@ def show_comprehensive_analysis():
             execute_workflow("comprehensive", payload)
 
 def execute_workflow(endpoint, payload):
-    """Execute workflow and show results"""
+    """Execute workflow and render its progress live from the event stream"""
+    session = get_session()
     try:
-        with st.spinner("Executing workflow..."):
-            response = requests.post(f"{API_BASE_URL}/workflows/{endpoint}", json=payload)
-            
-            if response.status_code == 200:
-                result = response.json()
-                workflow_id = result.get("workflow_id")
-                
-                st.success(f"Workflow started successfully! ID: {workflow_id}")
-                
-                # Poll for results
-                progress_bar = st.progress(0)
-                status_placeholder = st.empty()
-                
-                for i in range(10):  # Poll for 10 iterations
-                    time.sleep(2)  # Wait 2 seconds between polls
-                    
-                    status_response = requests.get(f"{API_BASE_URL}/workflows/{workflow_id}/status")
-                    if status_response.status_code == 200:
-                        status_data = status_response.json()
-                        current_status = status_data.get("status")
-                        
-                        progress_bar.progress((i + 1) * 10)
-                        status_placeholder.info(f"Status: {current_status}")
-                        
-                        if current_status == "SUCCESS":
-                            st.success("Workflow completed successfully!")
-                            
-                            # Get results
-                            results_response = requests.get(f"{API_BASE_URL}/workflows/{workflow_id}/results")
-                            if results_response.status_code == 200:
-                                results_data = results_response.json()
-                                display_results(results_data)
-                            break
-                        elif current_status == "FAILED":
-                            st.error("Workflow failed!")
-                            break
-                
-            else:
-                st.error(f"Failed to start workflow: {response.text}")
-                
+        response = session.post(f"{API_BASE_URL}/workflows/{endpoint}", json=payload)
+        if response.status_code != 200:
+            st.error(f"Failed to start workflow: {response.text}")
+            return
+
+        workflow_id = response.json().get("workflow_id")
+        st.success(f"Workflow started successfully! ID: {workflow_id}")
+
+        status_placeholder = st.empty()
+        progress_bar = st.progress(0)
+        stage_placeholder = st.empty()
+        output_placeholder = st.empty()
+
+        stages = {}
+        tokens = {}
+        final_status = None
+        for event_type, event in iter_workflow_events(session, workflow_id):
+            data = event.get("data", {})
+            if event_type == "status":
+                final_status = data.get("status")
+                status_placeholder.info(f"Status: {final_status}")
+            elif event_type == "stage":
+                stages[data["stage"]] = data["state"]
+                done = sum(state == "completed" for state in stages.values())
+                progress_bar.progress(done / len(stages))
+                stage_placeholder.write(" | ".join(f"{name.replace('_', ' ').title()}: {state}" for name, state in stages.items()))
+            elif event_type == "token":
+                tokens[data["stage"]] = tokens.get(data["stage"], "") + data["text"]
+                output_placeholder.markdown("\n\n".join(
+                    f"**{name.replace('_', ' ').title()}**\n\n{text}" for name, text in tokens.items()
+                ))
+
+        if final_status == "SUCCESS":
+            progress_bar.progress(1.0)
+            st.success("Workflow completed successfully!")
+            results_response = session.get(f"{API_BASE_URL}/workflows/{workflow_id}/results")
+            if results_response.status_code == 200:
+                display_results(results_response.json())
+        elif final_status == "FAILED":
+            status_response = session.get(f"{API_BASE_URL}/workflows/{workflow_id}/status")
+            error = status_response.json().get("error_message") if status_response.status_code == 200 else None
+            st.error(f"Workflow failed! {error or ''}")
+        else:
+            st.warning("Lost the event stream before the workflow finished; check its status later.")
+
     except Exception as e:
         st.error(f"Error executing workflow: {str(e)}")
 
+def iter_workflow_events(session, workflow_id):
+    """Yield (event type, payload) pairs from the workflow's Server-Sent Events stream"""
+    with session.get(
+        f"{API_BASE_URL}/workflows/{workflow_id}/events",
+        stream=True,
+        timeout=(5, EVENT_READ_TIMEOUT),
+        headers={"Accept": "text/event-stream"}
+    ) as response:
+        response.raise_for_status()
+        event_type, data_lines = "message", []
+        for line in response.iter_lines(decode_unicode=True):
+            if line is None:
+                continue
+            if line == "":
+                if data_lines:
+                    yield event_type, json.loads("\n".join(data_lines))
+                event_type, data_lines = "message", []
+            elif line.startswith("event:"):
+                event_type = line[6:].strip()
+            elif line.startswith("data:"):
+                data_lines.append(line[5:].strip())
+
 def display_results(results_data):
     """Display workflow results"""
     st.subheader("📋 Workflow Results")
@@ -0,0 +1,103 @@
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from langchain_groq import ChatGroq
+from src.common.logger import get_logger
+from src.config.workflow_config import WorkflowConfig
+from src.llm.http_clients import close_http_clients, get_async_http_client, get_http_client
+from src.llm.rate_limiter import RateLimitCallbackHandler, get_rate_limiter
+
+logger = get_logger(__name__)
+
+class LLMClientRegistry:
+    """
+    Process-wide ChatGroq clients keyed by (model, temperature).
+
+    Clients are built on first use and share the pooled keep-alive HTTP
+    clients from src.llm.http_clients, so agents, crews and workflows created
+    per request reuse connections instead of opening their own.
+
+    Every client gives up on a request after LLM_CALL_TIMEOUT_SECONDS.
+    FinanceWorkflow wraps calls in its own retry and circuit-breaker layer,
+    so its plain clients do not retry in the SDK. Clients for CrewAI agents
+    (rate_limited=True) carry the rate limiter's callback and let the SDK
+    retry transient failures up to MAX_RETRIES times.
+    """
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key
+        self._clients: Dict[Tuple[str, float, bool], ChatGroq] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str, temperature: float = 0.0, rate_limited: bool = False) -> ChatGroq:
+        """
+        Get the shared client for a model and temperature
+
+        Args:
+            model: Groq model name
+            temperature: Sampling temperature
+            rate_limited: Attach the LLM rate limiter callback (for CrewAI agents)
+
+        Returns:
+            Shared ChatGroq client
+
+        Raises:
+            ValueError: If GROQ_API_KEY is not set
+        """
+        key = (model, float(temperature), rate_limited)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._build(model, float(temperature), rate_limited)
+                self._clients[key] = client
+            return client
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the clients built so far"""
+        with self._lock:
+            keys = list(self._clients)
+        return {
+            "clients": len(keys),
+            "models": sorted({f"{model}@{temperature}" for model, temperature, _ in keys})
+        }
+
+    def clear(self) -> None:
+        """Drop every cached client; the next get() builds fresh ones"""
+        with self._lock:
+            self._clients.clear()
+
+    def _build(self, model: str, temperature: float, rate_limited: bool) -> ChatGroq:
+        api_key = self.api_key or os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ValueError("GROQ_API_KEY environment variable not set")
+        resilience_config = WorkflowConfig().get_resilience_config()
+        rate_limiter = get_rate_limiter() if rate_limited else None
+        logger.info(f"Creating shared LLM client for {model} (temperature={temperature})")
+        return ChatGroq(
+            temperature=temperature,
+            groq_api_key=api_key,
+            model_name=model,
+            timeout=resilience_config["llm_call_timeout_seconds"],
+            max_retries=resilience_config["max_retries"] if rate_limited else 0,
+            callbacks=[RateLimitCallbackHandler(rate_limiter)] if rate_limiter else None,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client()
+        )
+
+@lru_cache()
+def get_llm_client_registry() -> LLMClientRegistry:
+    """Get the process-wide LLM client registry"""
+    return LLMClientRegistry()
+
+def get_llm(model: str, temperature: float = 0.0, rate_limited: bool = False) -> ChatGroq:
+    """Get a shared ChatGroq client from the process-wide registry"""
+    return get_llm_client_registry().get(model, temperature, rate_limited)
+
+async def close_llm_clients() -> None:
+    """Drop the shared LLM clients and close their pooled connections"""
+    get_llm_client_registry().clear()
+    await close_http_clients()
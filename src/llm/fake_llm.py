@@ -0,0 +1,84 @@
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Union
+
+@dataclass
+class FakeMessage:
+    """Minimal stand-in for a LangChain AIMessage"""
+    content: str
+    usage_metadata: Dict[str, int] = field(default_factory=dict)
+
+class FakeChatModel:
+    """
+    Offline chat model with the invoke/ainvoke/stream/astream surface of ChatGroq.
+
+    Responses are deterministic: either the result of `responder(prompt)` or
+    a fixed report that echoes the prompt length. `latency_seconds` simulates
+    a provider round-trip without touching the network.
+    """
+
+    def __init__(
+        self,
+        responder: Optional[Callable[[str], str]] = None,
+        latency_seconds: float = 0.0,
+        model_name: str = "fake-llm",
+        temperature: float = 0
+    ):
+        self.responder = responder or self._default_response
+        self.latency_seconds = latency_seconds
+        self.model_name = model_name
+        self.temperature = temperature
+        self.calls = 0
+
+    def invoke(self, prompt: Union[str, Any], **kwargs: Any) -> FakeMessage:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return self._respond(prompt)
+
+    async def ainvoke(self, prompt: Union[str, Any], **kwargs: Any) -> FakeMessage:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return self._respond(prompt)
+
+    def stream(self, prompt: Union[str, Any], **kwargs: Any) -> Iterator[FakeMessage]:
+        message = self._respond(prompt)
+        chunks = self._chunks(message.content)
+        for chunk in chunks:
+            if self.latency_seconds:
+                time.sleep(self.latency_seconds / len(chunks))
+            yield FakeMessage(content=chunk)
+        # Like ChatGroq, report usage on a final empty chunk
+        yield FakeMessage(content="", usage_metadata=message.usage_metadata)
+
+    async def astream(self, prompt: Union[str, Any], **kwargs: Any) -> AsyncIterator[FakeMessage]:
+        message = self._respond(prompt)
+        chunks = self._chunks(message.content)
+        for chunk in chunks:
+            if self.latency_seconds:
+                await asyncio.sleep(self.latency_seconds / len(chunks))
+            yield FakeMessage(content=chunk)
+        yield FakeMessage(content="", usage_metadata=message.usage_metadata)
+
+    @staticmethod
+    def _chunks(content: str) -> list:
+        # Word-sized chunks, roughly how a provider streams tokens
+        return re.findall(r"\S+\s*|\s+", content) or [content]
+
+    def _respond(self, prompt: Union[str, Any]) -> FakeMessage:
+        self.calls += 1
+        text = str(prompt)
+        content = self.responder(text)
+        return FakeMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": len(text) // 4,
+                "output_tokens": len(content) // 4,
+                "total_tokens": (len(text) + len(content)) // 4
+            }
+        )
+
+    @staticmethod
+    def _default_response(prompt: str) -> str:
+        return f"Fake analysis report for a {len(prompt)} character prompt."
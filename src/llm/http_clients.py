@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import weakref
+from typing import Any, Optional
+import httpx
+from src.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Connection pool shared by every LLM client in the process
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=50, keepalive_expiry=30.0)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+class LoopBoundAsyncClient(httpx.AsyncClient):
+    """Async HTTP client that keeps one connection pool per event loop
+
+    Pooled connections belong to the loop that opened them, so sharing one
+    httpx.AsyncClient between loops (Celery workers, asyncio.run per task,
+    threads running their own loops) fails once a connection is reused on
+    another loop. This client builds requests itself but sends each one
+    through an inner AsyncClient created for the running loop. Holders of
+    the client, such as ChatGroq instances built once by the client
+    registry, keep a single object while every loop gets its own pool.
+    """
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._client_kwargs = kwargs
+        self._loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+        self._loop_lock = threading.Lock()
+
+    def for_running_loop(self) -> httpx.AsyncClient:
+        """Get the inner client owned by the running event loop
+
+        Returns:
+            httpx.AsyncClient: Pooled client for the current loop
+
+        Raises:
+            RuntimeError: If called outside a running event loop
+        """
+        loop = asyncio.get_running_loop()
+        with self._loop_lock:
+            # Open connections reference their loop, so entries for finished
+            # loops are dropped here rather than left to the weak keys
+            for stale in [other for other in self._loop_clients if other.is_closed()]:
+                del self._loop_clients[stale]
+            client = self._loop_clients.get(loop)
+            if client is None or client.is_closed:
+                client = self._loop_clients[loop] = httpx.AsyncClient(**self._client_kwargs)
+            return client
+
+    async def send(self, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        return await self.for_running_loop().send(request, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close the current loop's pool and drop the pools of other loops"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._loop_lock:
+            client = self._loop_clients.pop(loop, None) if loop is not None else None
+            self._loop_clients.clear()
+        if client is not None:
+            await client.aclose()
+        await super().aclose()
+
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[LoopBoundAsyncClient] = None
+_lock = threading.Lock()
+
+def get_http_client() -> httpx.Client:
+    """Get the process-wide pooled keep-alive HTTP client"""
+    global _http_client
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        return _http_client
+
+def get_async_http_client() -> LoopBoundAsyncClient:
+    """Get the process-wide async HTTP client, pooled per event loop"""
+    global _async_http_client
+    with _lock:
+        if _async_http_client is None or _async_http_client.is_closed:
+            _async_http_client = LoopBoundAsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        return _async_http_client
+
+async def close_http_clients() -> None:
+    """Close the shared HTTP clients and drop their pooled connections"""
+    global _http_client, _async_http_client
+    with _lock:
+        client, async_client = _http_client, _async_http_client
+        _http_client = _async_http_client = None
+    if client is not None:
+        client.close()
+    if async_client is not None:
+        await async_client.aclose()
+    logger.info("Closed shared LLM HTTP clients")
@@ -0,0 +1,234 @@
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from src.common.logger import get_logger
+from src.config.workflow_config import WorkflowConfig
+from src.llm.token_usage import estimate_tokens
+
+logger = get_logger(__name__)
+
+_DATE_KEY = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+# Progressively harsher (max list items / dict keys, max string length) passes tried when over budget
+_SHRINK_STEPS = ((50, 1000), (20, 400), (10, 200), (5, 100), (2, 60))
+
+@dataclass
+class CompactedPayload:
+    """A payload rendered for a prompt, with its size before and after compaction"""
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+    truncated: List[str] = field(default_factory=list)
+
+class PromptCompactor:
+    """
+    Render structured inputs as compact canonical JSON for LLM prompts.
+
+    Keys are sorted and whitespace dropped so equal payloads give equal
+    prompts (and response cache hits). Floats keep significant_digits
+    significant figures but never fewer than min_decimals decimals, so
+    currency amounts stay exact. Numeric series longer than series_threshold
+    are collapsed to summary statistics plus the last recent_points values.
+    Series can be lists of numbers, date-keyed dicts (as produced by
+    DataFrame.to_dict()), DataFrames or Series.
+    Payloads still over the token budget are shrunk by trimming lists, dict
+    keys and long strings. As a last resort the text is cut. Every trimmed
+    path is reported and noted in the text so the model knows data is missing.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 2000,
+        series_threshold: int = 24,
+        recent_points: int = 5,
+        significant_digits: int = 6,
+        min_decimals: int = 4
+    ):
+        self.token_budget = token_budget
+        self.series_threshold = series_threshold
+        self.recent_points = recent_points
+        self.significant_digits = significant_digits
+        self.min_decimals = min_decimals
+
+    def compact(self, payload: Any, token_budget: Optional[int] = None) -> CompactedPayload:
+        """
+        Compact a payload to fit a token budget
+
+        Args:
+            payload: Arbitrary input data (dicts, lists, numbers, pandas/numpy objects)
+            token_budget: Tokens allowed for the rendered payload, defaults to self.token_budget
+
+        Returns:
+            Rendered text with before/after token estimates and truncated paths
+        """
+        budget = token_budget or self.token_budget
+        original_tokens = estimate_tokens(str(payload))
+        normalized = self.normalize(payload)
+        text = _dumps(normalized)
+        truncated: List[str] = []
+
+        if estimate_tokens(text) > budget:
+            for max_items, max_chars in _SHRINK_STEPS:
+                truncated = []
+                text = _dumps(self._shrink(normalized, max_items, max_chars, "$", truncated))
+                if estimate_tokens(text) <= budget:
+                    break
+            else:
+                truncated.append("$ (cut at token budget)")
+                text = text[:max(0, budget * 4 - 16)] + "...[cut]"
+            # The same path repeats once per list element; report it once
+            truncated = list(dict.fromkeys(truncated))
+            text += f"\n(Note: truncated to fit the prompt budget at {', '.join(truncated)})"
+
+        return CompactedPayload(text, original_tokens, estimate_tokens(text), truncated)
+
+    def normalize(self, value: Any) -> Any:
+        """Convert a value to JSON-ready data, rounding floats and collapsing long numeric series"""
+        if isinstance(value, pd.DataFrame):
+            return {str(column): self._series(value[column].tolist(), _labels(value.index)) for column in value.columns}
+        if isinstance(value, pd.Series):
+            return self._series(value.tolist(), _labels(value.index))
+        if isinstance(value, np.ndarray):
+            value = value.tolist()
+        if isinstance(value, np.generic):
+            value = value.item()
+
+        if isinstance(value, dict):
+            items = {_label(key): item for key, item in value.items()}
+            if len(items) > self.series_threshold and all(_DATE_KEY.match(key) for key in items) and _numeric(items.values()):
+                ordered = sorted(items)
+                return self._series([items[key] for key in ordered], ordered)
+            return {key: self.normalize(item) for key, item in items.items()}
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            if len(values) > self.series_threshold and _numeric(values):
+                return self._series(values, None)
+            return [self.normalize(item) for item in values]
+        if isinstance(value, bool) or value is None or isinstance(value, (int, str)):
+            return value
+        if isinstance(value, (float, Decimal)):
+            return self._round(float(value))
+        if isinstance(value, (datetime, date, pd.Timestamp)):
+            return value.isoformat()
+        return str(value)
+
+    def _series(self, values: Sequence[Any], labels: Optional[List[str]]) -> Any:
+        points = [(labels[i] if labels else i, float(v)) for i, v in enumerate(values) if _is_number(v) and not math.isnan(float(v))]
+        if len(values) <= self.series_threshold:
+            if labels:
+                return {label: self._round(v) for label, v in points}
+            return [self._round(v) for _, v in points]
+        if not points:
+            return {"series_points": len(values)}
+
+        numbers = np.array([v for _, v in points])
+        first, last = numbers[0], numbers[-1]
+        tail = points[-self.recent_points:]
+        summary = {
+            "series_points": len(values),
+            "first": self._round(first),
+            "last": self._round(last),
+            "min": self._round(numbers.min()),
+            "max": self._round(numbers.max()),
+            "mean": self._round(numbers.mean()),
+            "std": self._round(numbers.std()),
+            "change_pct": self._round(last / first - 1) if first else None,
+            "recent": {label: self._round(v) for label, v in tail} if labels else [self._round(v) for _, v in tail]
+        }
+        if labels:
+            summary["start"], summary["end"] = points[0][0], points[-1][0]
+        return summary
+
+    def _round(self, value: float) -> Any:
+        value = float(value)
+        if math.isnan(value) or math.isinf(value):
+            return None
+        if value == 0:
+            return 0.0
+        magnitude = math.floor(math.log10(abs(value)))
+        return round(value, max(self.min_decimals, self.significant_digits - 1 - magnitude))
+
+    def _shrink(self, value: Any, max_items: int, max_chars: int, path: str, truncated: List[str]) -> Any:
+        if isinstance(value, dict):
+            keys = list(value)
+            if len(keys) > max_items:
+                truncated.append(f"{path} ({len(keys) - max_items} keys)")
+                keys = keys[:max_items]
+            return {key: self._shrink(value[key], max_items, max_chars, f"{path}.{key}", truncated) for key in keys}
+        if isinstance(value, list):
+            items = value
+            if len(items) > max_items:
+                truncated.append(f"{path} ({len(items) - max_items} items)")
+                # Keep the head and the latest entry, which is usually the most relevant
+                items = items[:max_items - 1] + items[-1:]
+            return [self._shrink(item, max_items, max_chars, f"{path}[]", truncated) for item in items]
+        if isinstance(value, str) and len(value) > max_chars:
+            truncated.append(f"{path} (text)")
+            return value[:max_chars] + "..."
+        return value
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, Decimal, np.number)) and not isinstance(value, bool)
+
+def _numeric(values: Any) -> bool:
+    values = [v for v in values if v is not None]
+    return bool(values) and all(_is_number(v) for v in values)
+
+def _label(key: Any) -> str:
+    if isinstance(key, datetime):
+        # Daily bars carry midnight timestamps; the date alone is enough
+        return key.date().isoformat() if key.time() == datetime.min.time() else key.isoformat()
+    if isinstance(key, date):
+        return key.isoformat()
+    return str(key)
+
+def _labels(index: pd.Index) -> List[str]:
+    return [_label(key) for key in index]
+
+@lru_cache()
+def get_prompt_compactor(model: Optional[str] = None) -> Optional[PromptCompactor]:
+    """
+    Get the compactor for a model, using its PROMPT_MODEL_TOKEN_BUDGETS entry if any
+
+    Returns:
+        Configured compactor, or None when compaction is disabled
+    """
+    prompt_config = WorkflowConfig().get_prompt_config()
+    if not prompt_config["enabled"]:
+        return None
+    return PromptCompactor(
+        token_budget=prompt_config["model_token_budgets"].get(model, prompt_config["token_budget"]),
+        series_threshold=prompt_config["series_threshold"]
+    )
+
+def compact_payload(payload: Any, label: str = "payload", model: Optional[str] = None, budget_share: float = 1.0) -> str:
+    """
+    Render a payload for a prompt and log its token count before and after
+
+    Args:
+        payload: Input data to embed in the prompt
+        label: Name used in log lines
+        model: Model the prompt is for, selecting its token budget
+        budget_share: Fraction of the budget for this payload when a prompt embeds several
+
+    Returns:
+        Compact text, or str(payload) when compaction is disabled
+    """
+    compactor = get_prompt_compactor(model)
+    if compactor is None:
+        return str(payload)
+    compacted = compactor.compact(payload, token_budget=max(1, int(compactor.token_budget * budget_share)))
+    logger.info(f"[PROMPT] {label}: ~{compacted.original_tokens} -> ~{compacted.compacted_tokens} tokens")
+    if compacted.truncated:
+        logger.warning(f"[PROMPT] {label} truncated to fit the token budget: {', '.join(compacted.truncated)}")
+    return compacted.text
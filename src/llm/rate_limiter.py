@@ -0,0 +1,287 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from langchain_core.callbacks import BaseCallbackHandler
+from src.common.logger import get_logger
+from src.config.workflow_config import WorkflowConfig
+from src.llm.token_usage import estimate_tokens, record_token_usage, usage_from_message
+
+logger = get_logger(__name__)
+
+DEFAULT_ORGANIZATION = "default"
+
+class LLMRateLimitExceeded(Exception):
+    """Raised when an LLM call would have to wait longer than the limiter allows"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """
+    Bucket refilled continuously at per_minute / 60 units per second.
+
+    take() may drive the level negative: callers reserve capacity up front
+    and wait out the deficit, so later callers queue behind earlier ones.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def delay_for(self, amount: float, now: float) -> float:
+        """Seconds until amount units are available (requests larger than the bucket wait for a full one)"""
+        self._refill(now)
+        return max(0.0, (min(amount, self.capacity) - self.level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def give(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.level >= self.capacity
+
+    def _refill(self, now: float) -> None:
+        if now <= self.updated:
+            return
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+class LLMRateLimiter:
+    """
+    Requests/minute and tokens/minute limits for LLM calls, globally and per organization.
+
+    Every call reserves one request and its estimated tokens (prompt plus
+    completion_token_estimate) from the global buckets and from its
+    organization's buckets, then sleeps until all of them cover the
+    reservation. Once the provider reports actual usage, settle() corrects
+    the token buckets. A call that would wait longer than max_wait_seconds
+    fails with LLMRateLimitExceeded instead, so traffic is held back before
+    the provider starts answering 429 for every tenant sharing the key.
+
+    Limits are per process; a limit of 0 disables that bucket.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 30,
+        tokens_per_minute: int = 6000,
+        org_requests_per_minute: int = 0,
+        org_tokens_per_minute: int = 0,
+        max_wait_seconds: float = 60.0,
+        completion_token_estimate: int = 512,
+        max_organizations: int = 10000
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.org_requests_per_minute = org_requests_per_minute
+        self.org_tokens_per_minute = org_tokens_per_minute
+        self.max_wait_seconds = max_wait_seconds
+        self.completion_token_estimate = completion_token_estimate
+        self.max_organizations = max_organizations
+
+        self._global = self._new_buckets(requests_per_minute, tokens_per_minute)
+        self._orgs: Dict[str, Tuple[Optional[TokenBucket], Optional[TokenBucket]]] = {}
+        self._counters = {"calls": 0, "throttled": 0, "rejected": 0, "wait_seconds": 0.0}
+        self._lock = threading.Lock()
+
+    def reserve(self, organization_id: str, tokens: int) -> float:
+        """
+        Reserve one request and tokens for an organization
+
+        Args:
+            organization_id: Organization the call is billed to
+            tokens: Estimated prompt plus completion tokens
+
+        Returns:
+            Seconds the caller must wait before calling the provider
+
+        Raises:
+            LLMRateLimitExceeded: If the wait would exceed max_wait_seconds
+        """
+        with self._lock:
+            now = time.monotonic()
+            charges = self._charges(organization_id, tokens)
+            delay = max((bucket.delay_for(amount, now) for bucket, amount in charges), default=0.0)
+            if delay > self.max_wait_seconds:
+                self._counters["rejected"] += 1
+                raise LLMRateLimitExceeded(
+                    f"LLM rate limit reached for organization {organization_id}; retry in {delay:.0f} seconds",
+                    retry_after=delay
+                )
+            for bucket, amount in charges:
+                bucket.take(amount)
+            self._counters["calls"] += 1
+            if delay > 0:
+                self._counters["throttled"] += 1
+                self._counters["wait_seconds"] += delay
+            return delay
+
+    def acquire(self, organization_id: str, prompt: str) -> int:
+        """
+        Block until a call with this prompt may go to the provider
+
+        Returns:
+            Tokens reserved, to pass to settle()
+
+        Raises:
+            LLMRateLimitExceeded: If the wait would exceed max_wait_seconds
+        """
+        tokens = estimate_tokens(prompt) + self.completion_token_estimate
+        delay = self.reserve(organization_id, tokens)
+        if delay > 0:
+            logger.info(f"Throttling LLM call for organization {organization_id} by {delay:.2f}s")
+            time.sleep(delay)
+        return tokens
+
+    async def aacquire(self, organization_id: str, prompt: str) -> int:
+        """Async variant of acquire() that waits without blocking the event loop"""
+        tokens = estimate_tokens(prompt) + self.completion_token_estimate
+        delay = self.reserve(organization_id, tokens)
+        if delay > 0:
+            logger.info(f"Throttling LLM call for organization {organization_id} by {delay:.2f}s")
+            await asyncio.sleep(delay)
+        return tokens
+
+    def settle(self, organization_id: str, reserved_tokens: int, used_tokens: int) -> None:
+        """Return over-reserved tokens, or charge the shortfall, once actual usage is known"""
+        difference = reserved_tokens - used_tokens
+        if difference == 0:
+            return
+        with self._lock:
+            for bucket in (self._global[1], self._org_buckets(organization_id)[1]):
+                if bucket is None:
+                    continue
+                if difference > 0:
+                    bucket.give(difference)
+                else:
+                    bucket.take(-difference)
+
+    def retry_after(self, organization_id: str) -> float:
+        """Seconds a new call for this organization would currently wait, without reserving anything"""
+        with self._lock:
+            now = time.monotonic()
+            charges = self._charges(organization_id, self.completion_token_estimate)
+            return max((bucket.delay_for(amount, now) for bucket, amount in charges), default=0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get limiter configuration and throttling counters"""
+        with self._lock:
+            counters = dict(self._counters)
+            organizations = len(self._orgs)
+        counters["wait_seconds"] = round(counters["wait_seconds"], 2)
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "org_requests_per_minute": self.org_requests_per_minute,
+            "org_tokens_per_minute": self.org_tokens_per_minute,
+            "tracked_organizations": organizations,
+            **counters
+        }
+
+    def _charges(self, organization_id: str, tokens: int) -> List[Tuple[TokenBucket, float]]:
+        charges = []
+        for request_bucket, token_bucket in (self._global, self._org_buckets(organization_id)):
+            if request_bucket is not None:
+                charges.append((request_bucket, 1))
+            if token_bucket is not None:
+                charges.append((token_bucket, tokens))
+        return charges
+
+    def _org_buckets(self, organization_id: str) -> Tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+        buckets = self._orgs.get(organization_id)
+        if buckets is None:
+            if len(self._orgs) >= self.max_organizations:
+                self._prune_idle()
+            buckets = self._new_buckets(self.org_requests_per_minute, self.org_tokens_per_minute)
+            self._orgs[organization_id] = buckets
+        return buckets
+
+    def _prune_idle(self) -> None:
+        # A full bucket carries no state worth keeping
+        now = time.monotonic()
+        idle = [
+            organization_id for organization_id, buckets in self._orgs.items()
+            if all(bucket is None or bucket.is_full(now) for bucket in buckets)
+        ]
+        for organization_id in idle:
+            del self._orgs[organization_id]
+
+    @staticmethod
+    def _new_buckets(requests_per_minute: int, tokens_per_minute: int) -> Tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+        return (
+            TokenBucket(requests_per_minute) if requests_per_minute > 0 else None,
+            TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        )
+
+_current_organization: ContextVar[str] = ContextVar("llm_organization", default=DEFAULT_ORGANIZATION)
+
+@contextmanager
+def organization_scope(organization_id: str) -> Iterator[None]:
+    """Bill LLM calls made through RateLimitCallbackHandler in this context to an organization"""
+    token = _current_organization.set(organization_id)
+    try:
+        yield
+    finally:
+        _current_organization.reset(token)
+
+class RateLimitCallbackHandler(BaseCallbackHandler):
+    """
+    LangChain callback applying the limiter to models driven by CrewAI agents.
+
+    The call is throttled in on_chat_model_start and its usage recorded in
+    on_llm_end. Runs are billed to the organization set by organization_scope.
+    """
+
+    # Let LLMRateLimitExceeded abort the call instead of being logged and ignored
+    raise_error = True
+
+    def __init__(self, rate_limiter: LLMRateLimiter):
+        self.rate_limiter = rate_limiter
+        self._reserved: Dict[Any, Tuple[str, int]] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: Any, **kwargs: Any) -> None:
+        prompt = "\n".join(str(message.content) for batch in messages for message in batch)
+        organization_id = _current_organization.get()
+        self._reserved[run_id] = (organization_id, self.rate_limiter.acquire(organization_id, prompt))
+
+    def on_llm_end(self, response: Any, *, run_id: Any, **kwargs: Any) -> None:
+        organization_id, reserved = self._reserved.pop(run_id, (None, 0))
+        if organization_id is None:
+            return
+        usage = next(
+            (usage for generations in response.generations for generation in generations
+             if (usage := usage_from_message(getattr(generation, "message", None))) is not None),
+            None
+        )
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage is None and token_usage.get("total_tokens"):
+            usage = (token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0))
+        prompt_tokens, completion_tokens = usage or (reserved - self.rate_limiter.completion_token_estimate, 0)
+        record_token_usage("agent", prompt_tokens, completion_tokens)
+        self.rate_limiter.settle(organization_id, reserved, prompt_tokens + completion_tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id: Any, **kwargs: Any) -> None:
+        self._reserved.pop(run_id, None)
+
+@lru_cache()
+def get_rate_limiter() -> Optional[LLMRateLimiter]:
+    """
+    Get the process-wide LLM rate limiter
+
+    Returns:
+        Configured limiter, or None when rate limiting is disabled
+    """
+    limiter_config = WorkflowConfig().get_rate_limit_config()
+    if not limiter_config.pop("enabled"):
+        return None
+    return LLMRateLimiter(**limiter_config)
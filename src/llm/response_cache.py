@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from pydantic import BaseModel
+from src.common.logger import get_logger
+from src.common.ttl_cache import TTLLRUCache
+from src.config.workflow_config import WorkflowConfig
+from src.core.interfaces.store_interface import BaseResultStore
+from src.services.result_store import RedisResultStore, SQLResultStore
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+class CachedResponse(BaseModel):
+    """LLM completion persisted in the shared cache tier"""
+    model: str
+    content: str
+
+class LLMResponseCache:
+    """
+    Content-addressed cache for deterministic (temperature=0) completions.
+
+    Keys are sha256(model, whitespace-normalized prompt). Lookups hit the
+    in-process LRU first and fall back to an optional shared tier (a SQL or
+    Redis result store) whose hits are promoted back into memory. aget()
+    and aset() reach the shared tier from a worker thread, as its reads
+    and writes block.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: Optional[float] = 3600,
+        shared_tier: Optional[BaseResultStore] = None
+    ):
+        self._memory = TTLLRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.shared_tier = shared_tier
+        self._counters = {"memory_hits": 0, "shared_hits": 0, "misses": 0, "writes": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        normalized = _WHITESPACE.sub(" ", prompt).strip()
+        return hashlib.sha256(f"{model}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        """Get a cached completion, or None on a miss"""
+        key = self.make_key(model, prompt)
+        content = self._memory.get(key)
+        if content is not None:
+            self._count("memory_hits")
+            return content
+        return self._get_shared(key)
+
+    async def aget(self, model: str, prompt: str) -> Optional[str]:
+        """Async get(); memory hits answer inline, shared tier reads run in a worker thread"""
+        key = self.make_key(model, prompt)
+        content = self._memory.get(key)
+        if content is not None:
+            self._count("memory_hits")
+            return content
+        if self.shared_tier is None:
+            self._count("misses")
+            return None
+        return await asyncio.to_thread(self._get_shared, key)
+
+    def set(self, model: str, prompt: str, content: str) -> None:
+        """Store a completion in every tier"""
+        key = self.make_key(model, prompt)
+        self._memory.set(key, content)
+        self._put_shared(key, model, content)
+        self._count("writes")
+
+    async def aset(self, model: str, prompt: str, content: str) -> None:
+        """Async set(); the shared tier write runs in a worker thread"""
+        key = self.make_key(model, prompt)
+        self._memory.set(key, content)
+        if self.shared_tier is not None:
+            await asyncio.to_thread(self._put_shared, key, model, content)
+        self._count("writes")
+
+    def _get_shared(self, key: str) -> Optional[str]:
+        if self.shared_tier is not None:
+            try:
+                cached = self.shared_tier.get(key)
+            except Exception as e:
+                logger.warning(f"LLM cache shared tier read failed: {str(e)}")
+                cached = None
+            if cached is not None:
+                self._memory.set(key, cached.content)
+                self._count("shared_hits")
+                return cached.content
+
+        self._count("misses")
+        return None
+
+    def _put_shared(self, key: str, model: str, content: str) -> None:
+        if self.shared_tier is not None:
+            try:
+                self.shared_tier.put(key, CachedResponse(model=model, content=content))
+            except Exception as e:
+                logger.warning(f"LLM cache shared tier write failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["memory_hits"] + counters["shared_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["shared_hits"]
+        counters["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        counters["memory_entries"] = len(self._memory)
+        return counters
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+@lru_cache()
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide LLM response cache
+
+    Returns:
+        Configured cache, or None when caching is disabled
+    """
+    cache_config = WorkflowConfig().get_llm_cache_config()
+    if not cache_config["enabled"]:
+        return None
+
+    shared_tier = None
+    if cache_config["backend"] == "sql":
+        shared_tier = SQLResultStore(
+            url=cache_config["url"],
+            model_cls=CachedResponse,
+            table_name="llm_response_cache",
+            max_entries=cache_config["shared_max_entries"],
+            ttl_seconds=cache_config["ttl_seconds"]
+        )
+    elif cache_config["backend"] == "redis":
+        shared_tier = RedisResultStore(
+            url=cache_config["redis_url"],
+            model_cls=CachedResponse,
+            key_prefix="llm_response_cache",
+            ttl_seconds=cache_config["ttl_seconds"]
+        )
+    elif cache_config["backend"] != "memory":
+        raise ValueError(f"Unsupported LLM cache backend: {cache_config['backend']}")
+
+    return LLMResponseCache(
+        max_entries=cache_config["max_entries"],
+        ttl_seconds=cache_config["ttl_seconds"],
+        shared_tier=shared_tier
+    )
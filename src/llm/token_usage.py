@@ -0,0 +1,79 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+from src.models.finance_models import TokenUsage
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting before the provider reports real usage (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+def usage_from_message(message: Any) -> Optional[Tuple[int, int]]:
+    """
+    Read (prompt_tokens, completion_tokens) reported by the provider
+
+    Understands LangChain's usage_metadata and the OpenAI-style token_usage
+    block in response_metadata. Returns None when the message carries neither.
+    """
+    usage = getattr(message, "usage_metadata", None)
+    if usage and usage.get("total_tokens"):
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    usage = (getattr(message, "response_metadata", None) or {}).get("token_usage")
+    if usage and usage.get("total_tokens"):
+        return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+    return None
+
+class TokenUsageTracker:
+    """Thread-safe running total of the tokens one workflow spent, per stage"""
+
+    def __init__(self):
+        self._prompt_tokens = 0
+        self._completion_tokens = 0
+        self._llm_calls = 0
+        self._by_stage: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            self._prompt_tokens += prompt_tokens
+            self._completion_tokens += completion_tokens
+            self._llm_calls += 1
+            self._by_stage[stage] = self._by_stage.get(stage, 0) + prompt_tokens + completion_tokens
+
+    def snapshot(self) -> TokenUsage:
+        with self._lock:
+            return TokenUsage(
+                prompt_tokens=self._prompt_tokens,
+                completion_tokens=self._completion_tokens,
+                total_tokens=self._prompt_tokens + self._completion_tokens,
+                llm_calls=self._llm_calls,
+                by_stage=dict(self._by_stage)
+            )
+
+_current_tracker: ContextVar[Optional[TokenUsageTracker]] = ContextVar("token_usage_tracker", default=None)
+
+@contextmanager
+def token_usage_scope() -> Iterator[TokenUsageTracker]:
+    """
+    Collect token usage for LLM calls made in this context
+
+    Stage threads and tasks started by TaskGraph copy the context, so they
+    add to the same tracker.
+    """
+    tracker = TokenUsageTracker()
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
+
+def record_token_usage(stage: str, prompt_tokens: int, completion_tokens: int) -> None:
+    """Add an LLM call to the tracker of the workflow running in this context, if any"""
+    tracker = _current_tracker.get()
+    if tracker is not None:
+        tracker.add(stage, prompt_tokens, completion_tokens)
+
+def current_token_usage() -> Optional[TokenUsage]:
+    """Get the tokens spent so far by the workflow running in this context"""
+    tracker = _current_tracker.get()
+    return tracker.snapshot() if tracker is not None else None
@@ -2,12 +2,14 @@ from pydantic import BaseModel, Field
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from enum import Enum
+import uuid
 
 class WorkflowType(str, Enum):
     FINANCIAL_ANALYSIS = "FINANCIAL_ANALYSIS"
     BUDGET_MANAGEMENT = "BUDGET_MANAGEMENT"
     INVESTMENT_ADVISORY = "INVESTMENT_ADVISORY"
     COMPREHENSIVE = "COMPREHENSIVE"
+    INVOICE_PROCESSING = "INVOICE_PROCESSING"
 
 class WorkflowStatus(str, Enum):
     PENDING = "PENDING"
@@ -21,23 +23,63 @@ class FinanceWorkflowInput(BaseModel):
     financial_data: Optional[Dict[str, Any]] = None
     budget_data: Optional[Dict[str, Any]] = None
     investment_data: Optional[Dict[str, Any]] = None
+    invoice_data: Optional[Dict[str, Any]] = None
     user_id: str
     organization_id: str
     priority: int = Field(default=1, ge=1, le=5)
     metadata: Optional[Dict[str, Any]] = None
 
+class TokenUsage(BaseModel):
+    """LLM tokens spent by one workflow run"""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    llm_calls: int = 0
+    by_stage: Dict[str, int] = Field(default_factory=dict)
+
 class FinanceWorkflowOutput(BaseModel):
     """Output model for finance workflow results"""
     workflow_id: Optional[str] = None
     status: WorkflowStatus
     workflow_type: WorkflowType
     results: Optional[Any] = None
+    partial_results: Optional[Dict[str, str]] = None
     recommendations: Optional[Dict[str, Any]] = None
+    metrics: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
     execution_time: Optional[float] = None
+    stage_timings: Optional[Dict[str, float]] = None
+    queue_position: Optional[int] = None
+    estimated_wait_seconds: Optional[float] = None
+    token_usage: Optional[TokenUsage] = None
+    created_at: datetime = Field(default_factory=datetime.now)
+    completed_at: Optional[datetime] = None
+
+class BatchWorkflowInput(BaseModel):
+    """Input model for batch workflow submissions"""
+    items: List[FinanceWorkflowInput]
+
+class BatchWorkflowStatus(BaseModel):
+    """Aggregated status of a batch of workflows"""
+    batch_id: str
+    status: WorkflowStatus
+    total: int
+    pending: int = 0
+    running: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    workflow_ids: List[str] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
 
+class WorkflowEvent(BaseModel):
+    """Progress event pushed to workflow event stream subscribers"""
+    workflow_id: str
+    seq: int
+    event: str  # status, stage, token
+    data: Dict[str, Any] = Field(default_factory=dict)
+    timestamp: datetime = Field(default_factory=datetime.now)
+
 class FinancialMetrics(BaseModel):
     """Model for financial metrics and KPIs"""
     revenue: Optional[float] = None
@@ -52,12 +94,49 @@ class FinancialMetrics(BaseModel):
 class RiskMetrics(BaseModel):
     """Model for risk assessment metrics"""
     value_at_risk: Optional[float] = None
+    expected_shortfall: Optional[float] = None
     volatility: Optional[float] = None
     sharpe_ratio: Optional[float] = None
     max_drawdown: Optional[float] = None
     beta: Optional[float] = None
     correlation_matrix: Optional[Dict[str, Dict[str, float]]] = None
 
+class RiskMetricsRequest(BaseModel):
+    """Return series for the synchronous risk metrics endpoint"""
+    returns: Dict[str, List[float]]
+    weights: Optional[Dict[str, float]] = None
+    benchmark_returns: Optional[List[float]] = None
+    confidence_level: float = Field(default=0.95, gt=0, lt=1)
+    include_correlation: bool = True
+
+class RiskMetricsResponse(BaseModel):
+    """Per-asset and portfolio risk metrics computed in one vectorized pass"""
+    assets: Dict[str, RiskMetrics]
+    portfolio: RiskMetrics
+    weights: Dict[str, float]
+    periods: int
+    execution_time: float
+
+class BudgetMetricsRequest(BaseModel):
+    """Budget lines for the synchronous budget metrics endpoint"""
+    actual: List[float]
+    budgeted: List[float]
+    categories: Optional[List[str]] = None
+
+class BudgetMetricsResponse(BaseModel):
+    """Budget vs actual variances"""
+    total_actual: float
+    total_budgeted: float
+    total_variance: float
+    variance_percentage: float
+    monthly_variances: List[float]
+    monthly_variance_percentages: List[float]
+    over_budget_months: int
+    under_budget_months: int
+    by_category: Optional[Dict[str, Dict[str, float]]] = None
+    largest_overruns: Optional[List[str]] = None
+    execution_time: float
+
 class BudgetData(BaseModel):
     """Model for budget information"""
     department: str
@@ -68,6 +147,13 @@ class BudgetData(BaseModel):
     variance: Optional[float] = None
     variance_percentage: Optional[float] = None
 
+class BudgetBreakdownRequest(BaseModel):
+    """Department/category/period budget rows for the grouped budget endpoint"""
+    rows: List[BudgetData] = Field(min_length=1)
+    trend_window: int = Field(default=3, ge=1)
+    forecast_periods: int = Field(default=3, ge=0, le=24)
+    top_n: int = Field(default=5, ge=0)
+
 class InvestmentData(BaseModel):
     """Model for investment information"""
     asset_class: str
@@ -88,6 +174,110 @@ class ComplianceCheck(BaseModel):
     details: Optional[str] = None
     remediation_steps: Optional[List[str]] = None
 
+class ComplianceMetricsRequest(BaseModel):
+    """Transactions for the synchronous compliance metrics endpoint"""
+    transactions: List[Dict[str, Any]] = Field(min_length=1)
+
+class ComplianceResult(BaseModel):
+    """Compliance check of one transaction"""
+    compliance_score: int
+    status: str  # COMPLIANT, NON_COMPLIANT
+    issues: List[str] = Field(default_factory=list)
+    recommendations: List[str] = Field(default_factory=list)
+    checks: List[ComplianceCheck] = Field(default_factory=list)
+
+class ComplianceMetricsResponse(BaseModel):
+    """Per-transaction compliance checks and batch totals"""
+    transactions_checked: int
+    non_compliant: int
+    average_score: float
+    rule_violations: Dict[str, int] = Field(default_factory=dict)
+    results: List[ComplianceResult]
+    execution_time: float
+
+class InvoiceDocument(BaseModel):
+    """Invoice submitted to the ingestion pipeline, as a file path or inline content"""
+    document_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    path: Optional[str] = None
+    content: Optional[str] = None
+    organization_id: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+class InvoiceIngestRequest(BaseModel):
+    """Invoices for the ingestion pipeline"""
+    documents: List[InvoiceDocument] = Field(min_length=1)
+
+class InvoiceIngestionResult(BaseModel):
+    """Outcome of one invoice passing through the ingestion pipeline"""
+    document_id: str
+    source: Optional[str] = None
+    status: str  # PENDING, SUCCESS, FAILED
+    route: Optional[str] = None  # auto_approve, approval_required, rejected
+    extracted_data: Optional[Dict[str, Any]] = None
+    validation_errors: List[str] = Field(default_factory=list)
+    possible_duplicates: List[str] = Field(default_factory=list)
+    workflow_id: Optional[str] = None  # InvoiceWorkflow run started for a routed invoice
+    error_message: Optional[str] = None
+    stage_timings: Dict[str, float] = Field(default_factory=dict)
+    created_at: datetime = Field(default_factory=datetime.now)
+    completed_at: Optional[datetime] = None
+
+class InvoiceValidationRequest(BaseModel):
+    """Invoices for bulk ERP validation"""
+    invoices: List[Dict[str, Any]] = Field(min_length=1)
+
+class InvoiceValidationResponse(BaseModel):
+    """ERP validation flags per invoice and how many were answered from the local index"""
+    results: List[Dict[str, Any]]
+    index_hits: int
+    erp_lookups: int
+    execution_time: float
+
+class DuplicateCheckResult(BaseModel):
+    """Exact and near duplicates of one invoice in the duplicate index"""
+    duplicate_of: Optional[str] = None
+    possible_duplicates: List[Dict[str, Any]] = Field(default_factory=list)
+
+class DuplicateCheckResponse(BaseModel):
+    """Duplicate index lookups per invoice"""
+    results: List[DuplicateCheckResult]
+    execution_time: float
+
+class PaymentRequest(BaseModel):
+    """Payment of one invoice; idempotency_key defaults to one derived from vendor, invoice_number and amount, or from invoice_id"""
+    vendor: str
+    amount: float = Field(gt=0)
+    currency: str = "USD"
+    invoice_id: Optional[str] = None
+    invoice_number: Optional[str] = None
+    payment_date: Optional[str] = None
+    idempotency_key: Optional[str] = None
+
+class PaymentBatchRequest(BaseModel):
+    """Payments to queue for the next payment runs"""
+    payments: List[PaymentRequest] = Field(min_length=1)
+
+class PaymentRecord(BaseModel):
+    """Ledger record of a payment: queued, submitted (in a gateway run), paid or failed"""
+    idempotency_key: str
+    invoice_id: Optional[str] = None
+    invoice_number: Optional[str] = None
+    vendor: str
+    amount: float
+    currency: str
+    payment_date: str
+    status: str
+    run_id: Optional[str] = None
+    transaction_id: Optional[str] = None
+    error_message: Optional[str] = None
+    attempts: int = 0
+    created_at: float
+    updated_at: float
+
+class PaymentBatchResponse(BaseModel):
+    """Ledger records of the requested payments, in order"""
+    payments: List[PaymentRecord]
+
 class WorkflowExecution(BaseModel):
     """Model for tracking workflow execution"""
     workflow_id: str
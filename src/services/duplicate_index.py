@@ -0,0 +1,440 @@
+import hashlib
+import re
+import threading
+import time
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import BigInteger, Column, Float, LargeBinary, MetaData, String, Table, create_engine, event, insert, select
+from sqlalchemy.exc import IntegrityError
+from src.common.logger import get_logger
+from src.config.workflow_config import WorkflowConfig
+from src.services.result_store import _enable_sqlite_wal
+from src.tools.erp_index import vendor_key
+
+logger = get_logger(__name__)
+
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes stays inside uint64
+_MINHASH_PRIME = (1 << 31) - 1
+_MIN_SHINGLES = 3
+# Incremental refreshes re-read rows this much older than the newest seen, covering commit delays and clock skew between workers
+_REFRESH_OVERLAP_SECONDS = 60.0
+
+def invoice_vendor(invoice: Dict[str, Any]) -> str:
+    """Vendor identity used by every key: the vendor_id when given, else the normalized name"""
+    vendor_id = invoice.get("vendor_id")
+    return f"id:{vendor_id}" if vendor_id not in (None, "") else f"name:{vendor_key(invoice.get('vendor'))}"
+
+def invoice_number_keys(number: Any) -> Tuple[str, str]:
+    """
+    Exact and loose forms of an invoice number
+
+    "inv-00123" -> ("INV00123", "123"): the exact form keeps letters and
+    digits; the loose form keeps only the digits without leading zeros.
+    """
+    exact = re.sub(r"[^0-9A-Z]", "", str(number or "").upper())
+    digits = re.sub(r"\D", "", exact).lstrip("0")
+    return exact, digits or exact
+
+def invoice_index_id(invoice: Dict[str, Any]) -> str:
+    """
+    ID an invoice is indexed under: its invoice_id, or one derived from
+    vendor, invoice number, amount and date when it has none, so the same
+    invoice resubmitted without an ID is recognised as itself
+    """
+    if invoice.get("invoice_id"):
+        return str(invoice["invoice_id"])
+    vendor = invoice_vendor(invoice)
+    number_key, _ = invoice_number_keys(invoice.get("invoice_number"))
+    return "fp:" + _exact_key(vendor, number_key, _amount_cents(invoice.get("amount")), _invoice_date(invoice.get("date"))).hex()
+
+def _amount_cents(amount: Any) -> Optional[int]:
+    try:
+        return int(round(float(amount) * 100))
+    except (TypeError, ValueError):
+        return None
+
+def _invoice_date(value: Any) -> str:
+    try:
+        return date.fromisoformat(str(value)[:10]).isoformat()
+    except ValueError:
+        return str(value or "")
+
+def line_item_shingles(line_items: Optional[Iterable[Any]]) -> set:
+    """Description words plus (description, amount) pairs of every line item"""
+    shingles = set()
+    for item in line_items or []:
+        if not isinstance(item, dict):
+            item = {"description": item}
+        description = vendor_key(item.get("description"))
+        amount = _amount_cents(item.get("amount", item.get("total")))
+        shingles.update(word for word in re.findall(r"\w+", description) if len(word) > 2)
+        shingles.add(f"{description}|{amount}")
+    return shingles
+
+class DuplicateInvoiceIndex:
+    """
+    Exact and near-duplicate detection over the history of accepted invoices.
+
+    Three checks answer from in-memory hash maps, without scanning history:
+    - exact: hash of (vendor, invoice number, amount, date)
+    - loose keys: same vendor and invoice number ignoring punctuation,
+      prefixes and leading zeros; or same vendor, amount and date
+    - line items: MinHash signatures bucketed with LSH (bands x rows) per
+      vendor, confirmed by the estimated Jaccard similarity
+
+    Every inserted fingerprint is also written to a SQL table (url), which
+    is replayed into memory on start-up. Inserts are buffered and written
+    in one transaction per flush(), or once max_pending are waiting. Workers
+    sharing the table see each other's invoices once rows written since
+    the last read are loaded, every refresh_seconds; lookups never wait on
+    the database. claim() writes at once, so the unique exact_key column
+    settles races between workers.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = "sqlite:///duplicate_index.db",
+        num_permutations: int = 64,
+        bands: int = 16,
+        near_threshold: float = 0.8,
+        max_pending: int = 1000,
+        refresh_seconds: float = 30.0,
+        seed: int = 1
+    ):
+        if num_permutations % bands:
+            raise ValueError("num_permutations must be a multiple of bands")
+        self.num_permutations = num_permutations
+        self.bands = bands
+        self.rows = num_permutations // bands
+        self.near_threshold = near_threshold
+        self.max_pending = max_pending
+        self.refresh_seconds = refresh_seconds
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MINHASH_PRIME, num_permutations, dtype=np.uint64)
+        self._b = rng.integers(0, _MINHASH_PRIME, num_permutations, dtype=np.uint64)
+
+        self._exact: Dict[bytes, str] = {}
+        self._loose: Dict[tuple, List[str]] = {}
+        self._buckets: List[Dict[int, List[str]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._vendors: Dict[str, str] = {}
+        self._pending: List[Dict[str, Any]] = []
+        # Exact keys of claims being written, so concurrent claims of one invoice in this process see each other
+        self._claiming: Dict[bytes, str] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._loaded_until = 0.0
+        self._refreshed_at: Optional[float] = None
+
+        self.engine = None
+        if url:
+            connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+            self.engine = create_engine(url, connect_args=connect_args, pool_pre_ping=True)
+            if url.startswith("sqlite"):
+                event.listen(self.engine, "connect", _enable_sqlite_wal)
+            metadata = MetaData()
+            self.table = Table(
+                "invoice_fingerprints",
+                metadata,
+                Column("invoice_id", String(128), primary_key=True),
+                # Hex exact key; NULL for an invoice indexed while another one held its key
+                Column("exact_key", String(32), unique=True),
+                Column("vendor", String(256), nullable=False),
+                Column("number_key", String(128), nullable=False),
+                Column("loose_number", String(128), nullable=False),
+                Column("amount_cents", BigInteger),
+                Column("invoice_date", String(32)),
+                Column("signature", LargeBinary),
+                Column("created_at", Float, nullable=False),
+            )
+            metadata.create_all(self.engine)
+            started = time.perf_counter()
+            self.refresh()
+            logger.info(f"Loaded {len(self._vendors)} invoices into the duplicate index in {time.perf_counter() - started:.1f}s")
+
+    def __len__(self) -> int:
+        return len(self._vendors)
+
+    def check(self, invoice: Dict[str, Any], exclude_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Look an invoice up against the index
+
+        Args:
+            invoice: vendor or vendor_id, invoice_number, amount, date and optional line_items
+            exclude_id: ID of the invoice itself, ignored as a match
+
+        Returns:
+            duplicate_of (ID of an exact match, or None) and possible_duplicates
+            ([{"invoice_id", "reason", "similarity"}]) for near matches
+        """
+        self._refresh_if_due()
+        fingerprint = self._fingerprint(invoice)
+        matches: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            exact = self._exact.get(fingerprint["exact_key"])
+            for reason, key in fingerprint["loose_keys"]:
+                for invoice_id in self._loose.get(key, ()):
+                    matches.setdefault(invoice_id, {"invoice_id": invoice_id, "reason": reason, "similarity": None})
+            signature = fingerprint["signature"]
+            if signature is not None:
+                candidates = list({
+                    invoice_id
+                    for band, key in enumerate(self._band_keys(fingerprint["vendor"], signature))
+                    for invoice_id in self._buckets[band].get(key, ())
+                })
+                if candidates:
+                    similarities = (np.stack([self._signatures[invoice_id] for invoice_id in candidates]) == signature).mean(axis=1)
+                    for invoice_id, similarity in zip(candidates, similarities.tolist()):
+                        if similarity >= self.near_threshold:
+                            match = matches.setdefault(invoice_id, {"invoice_id": invoice_id, "reason": "line_items", "similarity": None})
+                            match["similarity"] = round(similarity, 3)
+        if exact == exclude_id:
+            exact = None
+        matches.pop(exclude_id, None)
+        if exact is not None:
+            matches.pop(exact, None)
+        return {"duplicate_of": exact, "possible_duplicates": list(matches.values())}
+
+    def add(self, invoice: Dict[str, Any], invoice_id: str) -> bool:
+        """
+        Insert an invoice; it is searchable immediately and persisted on the next flush
+
+        Returns:
+            False if an invoice with this ID is already indexed
+        """
+        fingerprint = self._fingerprint(invoice)
+        with self._lock:
+            if invoice_id in self._vendors:
+                return False
+            flush = self._add_locked(invoice_id, fingerprint)
+        if flush:
+            self.flush()
+        return True
+
+    def claim(self, invoice: Dict[str, Any], invoice_id: str) -> Optional[str]:
+        """
+        Check an invoice for an exact duplicate and index it, in one step
+
+        Two concurrent claims of the same invoice under different IDs
+        cannot both succeed, in this process or in workers sharing the
+        table, so a caller may pay once its claim succeeds. The row is
+        written at once rather than on the next flush.
+
+        Returns:
+            ID of the exact duplicate already indexed, or None once the invoice
+            is indexed under invoice_id (including by an earlier claim)
+        """
+        fingerprint = self._fingerprint(invoice)
+        exact_key = fingerprint["exact_key"]
+        with self._lock:
+            exact = self._exact.get(exact_key) or self._claiming.get(exact_key)
+            if exact is not None and exact != invoice_id:
+                return exact
+            if invoice_id in self._vendors or exact == invoice_id:
+                return None
+            if self.engine is None:
+                self._insert(invoice_id, fingerprint)
+                return None
+            self._claiming[exact_key] = invoice_id
+        # Written outside the lock, so lookups do not wait on the database
+        try:
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(insert(self.table), [{**self._row(invoice_id, fingerprint, exact_key.hex()), "created_at": time.time()}])
+                owner = invoice_id
+            except IntegrityError:
+                # Another worker indexed the invoice, or this ID, since the last refresh
+                owner = self._stored_owner(exact_key) or invoice_id
+            with self._lock:
+                if owner not in self._vendors:
+                    self._insert(owner, fingerprint)
+        finally:
+            with self._lock:
+                self._claiming.pop(exact_key, None)
+        return owner if owner != invoice_id else None
+
+    def add_many(self, invoices: Dict[str, Dict[str, Any]]) -> int:
+        """Insert several invoices keyed by ID and persist them; returns how many were new"""
+        added = sum(self.add(invoice, invoice_id) for invoice_id, invoice in invoices.items())
+        self.flush()
+        return added
+
+    def flush(self) -> int:
+        """Write buffered inserts in one transaction; returns how many rows were written"""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows or self.engine is None:
+            return 0
+        # Stamped at write time, so incremental refreshes in other workers find rows buffered for a while
+        now = time.time()
+        rows = [{**row, "created_at": now} for row in rows]
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(self.table), rows)
+        except IntegrityError:
+            # Another worker indexed some of these invoices first; write the rest one by one
+            return sum(self._write_row(row) for row in rows)
+        except Exception:
+            with self._lock:
+                self._pending[:0] = rows
+            raise
+        return len(rows)
+
+    def refresh(self) -> int:
+        """
+        Load invoices written to the table since the last refresh, by this or other workers
+
+        Returns:
+            Number of invoices new to this index
+        """
+        if self.engine is None:
+            return 0
+        query = (
+            select(self.table)
+            .where(self.table.c.created_at > self._loaded_until - _REFRESH_OVERLAP_SECONDS)
+            .order_by(self.table.c.created_at)
+        )
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).all()
+        added = 0
+        with self._lock:
+            for row in rows:
+                if row.invoice_id in self._vendors:
+                    continue
+                signature = np.frombuffer(row.signature, dtype=np.uint32) if row.signature else None
+                if signature is not None and len(signature) != self.num_permutations:
+                    signature = None
+                self._insert(row.invoice_id, {
+                    "vendor": row.vendor,
+                    "exact_key": _exact_key(row.vendor, row.number_key, row.amount_cents, row.invoice_date),
+                    "loose_keys": _loose_keys(row.vendor, row.loose_number, row.amount_cents, row.invoice_date),
+                    "signature": signature
+                })
+                added += 1
+            if rows:
+                self._loaded_until = max(self._loaded_until, rows[-1].created_at)
+            self._refreshed_at = time.monotonic()
+        return added
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "invoices": len(self._vendors),
+                "with_line_items": len(self._signatures),
+                "pending_writes": len(self._pending),
+                "persistent": self.engine is not None
+            }
+
+    def _add_locked(self, invoice_id: str, fingerprint: Dict[str, Any]) -> bool:
+        # Callers hold self._lock; returns whether the write buffer is due for a flush
+        self._insert(invoice_id, fingerprint)
+        if self.engine is not None:
+            owns_key = self._exact[fingerprint["exact_key"]] == invoice_id
+            self._pending.append(self._row(invoice_id, fingerprint, fingerprint["exact_key"].hex() if owns_key else None))
+        return len(self._pending) >= self.max_pending
+
+    def _row(self, invoice_id: str, fingerprint: Dict[str, Any], exact_key: Optional[str]) -> Dict[str, Any]:
+        return {
+            "invoice_id": invoice_id,
+            "exact_key": exact_key,
+            "vendor": fingerprint["vendor"],
+            "number_key": fingerprint["number_key"],
+            "loose_number": fingerprint["loose_number"],
+            "amount_cents": fingerprint["amount_cents"],
+            "invoice_date": fingerprint["invoice_date"],
+            "signature": fingerprint["signature"].tobytes() if fingerprint["signature"] is not None else None
+        }
+
+    def _write_row(self, row: Dict[str, Any]) -> bool:
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(self.table), [row])
+            return True
+        except IntegrityError:
+            if row["exact_key"] is None:
+                # The invoice ID is already stored
+                return False
+        # Another worker holds the exact key; keep the row for near-duplicate matching
+        return self._write_row({**row, "exact_key": None})
+
+    def _stored_owner(self, exact_key: bytes) -> Optional[str]:
+        """ID stored under an exact key by any worker, once a claim of the key was refused"""
+        if self.engine is None:
+            return None
+        with self.engine.connect() as conn:
+            return conn.execute(select(self.table.c.invoice_id).where(self.table.c.exact_key == exact_key.hex())).scalar()
+
+    def _refresh_if_due(self) -> None:
+        if self.engine is None or (self._refreshed_at is not None and time.monotonic() - self._refreshed_at < self.refresh_seconds):
+            return
+        # One caller refreshes; the others answer from the current index
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Duplicate index refresh failed, using the current index: {str(e)}")
+        finally:
+            self._refresh_lock.release()
+
+    def _fingerprint(self, invoice: Dict[str, Any]) -> Dict[str, Any]:
+        vendor = invoice_vendor(invoice)
+        number_key, loose_number = invoice_number_keys(invoice.get("invoice_number"))
+        amount_cents = _amount_cents(invoice.get("amount"))
+        invoice_date = _invoice_date(invoice.get("date"))
+        shingles = line_item_shingles(invoice.get("line_items"))
+        return {
+            "vendor": vendor,
+            "number_key": number_key,
+            "loose_number": loose_number,
+            "amount_cents": amount_cents,
+            "invoice_date": invoice_date,
+            "exact_key": _exact_key(vendor, number_key, amount_cents, invoice_date),
+            "loose_keys": _loose_keys(vendor, loose_number, amount_cents, invoice_date),
+            "signature": self._minhash(shingles) if len(shingles) >= _MIN_SHINGLES else None
+        }
+
+    def _minhash(self, shingles: set) -> np.ndarray:
+        hashes = np.array([int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") for s in shingles], dtype=np.uint64)
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _MINHASH_PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, vendor: str, signature: np.ndarray) -> List[int]:
+        # Buckets are per vendor, so common line items never pull in other vendors' invoices
+        return [hash((vendor, signature[band * self.rows:(band + 1) * self.rows].tobytes())) for band in range(self.bands)]
+
+    def _insert(self, invoice_id: str, fingerprint: Dict[str, Any]) -> None:
+        # Callers hold self._lock
+        self._vendors[invoice_id] = fingerprint["vendor"]
+        self._exact.setdefault(fingerprint["exact_key"], invoice_id)
+        for _, key in fingerprint["loose_keys"]:
+            self._loose.setdefault(key, []).append(invoice_id)
+        signature = fingerprint["signature"]
+        if signature is not None:
+            self._signatures[invoice_id] = signature
+            for band, key in enumerate(self._band_keys(fingerprint["vendor"], signature)):
+                self._buckets[band].setdefault(key, []).append(invoice_id)
+
+def _exact_key(vendor: str, number_key: str, amount_cents: Optional[int], invoice_date: str) -> bytes:
+    return hashlib.blake2b(f"{vendor}|{number_key}|{amount_cents}|{invoice_date}".encode(), digest_size=16).digest()
+
+def _loose_keys(vendor: str, loose_number: str, amount_cents: Optional[int], invoice_date: str) -> List[tuple]:
+    keys = []
+    if loose_number:
+        keys.append(("same_number", ("number", vendor, loose_number)))
+    if amount_cents is not None and invoice_date:
+        keys.append(("same_amount_date", ("amount_date", vendor, amount_cents, invoice_date)))
+    return keys
+
+@lru_cache()
+def get_duplicate_index() -> DuplicateInvoiceIndex:
+    """Get the process-wide duplicate index built from DUPLICATE_INDEX_* settings"""
+    index_config = WorkflowConfig().get_duplicate_index_config()
+    return DuplicateInvoiceIndex(
+        url=index_config["url"] or None,
+        num_permutations=index_config["num_permutations"],
+        bands=index_config["bands"],
+        near_threshold=index_config["near_threshold"],
+        refresh_seconds=index_config["refresh_seconds"]
+    )
@@ -0,0 +1,137 @@
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from src.common.logger import get_logger
+from src.config.workflow_config import WorkflowConfig
+from src.core.factories.erp_factory import ERPClientFactory
+from src.core.interfaces.erp_interface import BaseERPClient
+from src.services.duplicate_index import DuplicateInvoiceIndex, get_duplicate_index, invoice_index_id
+from src.tools.erp_index import ERPIndex
+
+logger = get_logger(__name__)
+
+class BulkERPValidator:
+    """
+    Validate invoices against a local vendor/PO index, asking the ERP only on misses.
+
+    The index is loaded from the ERP change feed on first use and then
+    refreshed incrementally once it is older than refresh_seconds; while
+    one thread refreshes, others keep reading the current index. Invoices
+    whose vendor and PO are in the index are validated in memory. The rest
+    go to the ERP together, in as few batched requests as the client
+    allows. duplicate_check comes from the duplicate invoice index, which
+    also lists near matches in possible_duplicates.
+    """
+
+    def __init__(
+        self,
+        client: BaseERPClient,
+        refresh_seconds: float = 300.0,
+        amount_tolerance: float = 0.0,
+        duplicate_index: Optional[DuplicateInvoiceIndex] = None
+    ):
+        self.client = client
+        self.refresh_seconds = refresh_seconds
+        self.amount_tolerance = amount_tolerance
+        self.index = ERPIndex()
+        self.duplicate_index = duplicate_index
+        self._refresh_lock = threading.Lock()
+        self._counters = {"invoices": 0, "index_hits": 0, "erp_lookups": 0, "erp_requests": 0, "refreshes": 0, "refresh_errors": 0}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> int:
+        """
+        Pull every change since the index cursor from the ERP
+
+        Returns:
+            Number of vendor and PO records applied
+        """
+        applied = 0
+        with self._refresh_lock:
+            while True:
+                page = self.client.fetch_changes(self.index.cursor)
+                applied += self.index.apply_changes(page.get("vendors", []), page.get("purchase_orders", []), page.get("cursor"))
+                if not page.get("has_more"):
+                    break
+        with self._lock:
+            self._counters["refreshes"] += 1
+        logger.info(f"ERP index refreshed with {applied} changes")
+        return applied
+
+    def validate(self, invoices: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Validate invoices, answering from the index where possible
+
+        Args:
+            invoices: Invoice dicts with vendor (name) or vendor_id, po_number, amount, currency,
+                invoice_number, date, optional line_items and optional invoice_id
+
+        Returns:
+            po_match, vendor_valid, budget_available, duplicate_check,
+            duplicate_of and possible_duplicates per invoice, in order,
+            with source "index" or "erp"
+
+        Raises:
+            CircuitOpenError: If ERP lookups are needed while the erp breaker is open
+        """
+        self._ensure_fresh()
+        results: List[Optional[Dict[str, Any]]] = []
+        misses = []
+        for position, invoice in enumerate(invoices):
+            flags = self.index.lookup(invoice, self.amount_tolerance)
+            if flags is None:
+                misses.append(position)
+            results.append({**flags, "source": "index"} if flags is not None else None)
+        if misses:
+            for position, flags in zip(misses, self.client.validate_invoices([invoices[position] for position in misses])):
+                results[position] = {**flags, "source": "erp"}
+        for invoice, result in zip(invoices, results):
+            duplicates = self._duplicates(invoice)
+            result["duplicate_check"] = duplicates["duplicate_of"] is not None or bool(result.get("duplicate_check"))
+            result["duplicate_of"] = duplicates["duplicate_of"]
+            result["possible_duplicates"] = [match["invoice_id"] for match in duplicates["possible_duplicates"]]
+        with self._lock:
+            self._counters["invoices"] += len(invoices)
+            self._counters["index_hits"] += len(invoices) - len(misses)
+            self._counters["erp_lookups"] += len(misses)
+            self._counters["erp_requests"] += bool(misses)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index size and age, and how many invoices were answered locally"""
+        with self._lock:
+            counters = dict(self._counters)
+        counters["hit_rate"] = round(counters["index_hits"] / counters["invoices"], 3) if counters["invoices"] else None
+        return {**counters, "index": self.index.stats()}
+
+    def _ensure_fresh(self) -> None:
+        refreshed_at = self.index.refreshed_at
+        if refreshed_at is not None and time.monotonic() - refreshed_at < self.refresh_seconds:
+            return
+        # Only the first load makes callers wait; later refreshes run on whichever caller gets the lock
+        if refreshed_at is not None and self._refresh_lock.locked():
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            with self._lock:
+                self._counters["refresh_errors"] += 1
+            logger.warning(f"ERP index refresh failed, using the current index: {str(e)}")
+
+    def _duplicates(self, invoice: Dict[str, Any]) -> Dict[str, Any]:
+        if self.duplicate_index is None or not invoice.get("invoice_number"):
+            return {"duplicate_of": None, "possible_duplicates": []}
+        return self.duplicate_index.check(invoice, exclude_id=invoice_index_id(invoice))
+
+@lru_cache()
+def get_erp_validator() -> BulkERPValidator:
+    """Get the process-wide ERP validator built from ERP_* settings"""
+    config = WorkflowConfig()
+    erp_config = config.get_erp_config()
+    return BulkERPValidator(
+        ERPClientFactory.get_erp_client(config),
+        refresh_seconds=erp_config["refresh_seconds"],
+        amount_tolerance=erp_config["amount_tolerance"],
+        duplicate_index=get_duplicate_index()
+    )
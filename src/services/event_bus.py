@@ -0,0 +1,193 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+from src.common.logger import get_logger
+from src.models.finance_models import WorkflowEvent, WorkflowStatus
+
+logger = get_logger(__name__)
+
+TERMINAL_STATUSES = (WorkflowStatus.SUCCESS.value, WorkflowStatus.FAILED.value)
+
+class _Channel:
+    """Replay buffer and live subscribers for one workflow"""
+
+    def __init__(self, history_size: int):
+        self.history: Deque[WorkflowEvent] = deque(maxlen=history_size)
+        self.subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self.seq = 0
+        self.closed_at: Optional[float] = None
+
+class WorkflowEventBus:
+    """
+    In-process publish/subscribe hub for workflow progress events.
+
+    Publishing is thread-safe so executor workers can report progress
+    directly; each subscriber gets an asyncio queue fed on its own loop.
+    Late subscribers first receive the buffered history. A terminal status
+    event closes the channel, which is forgotten retention_seconds later.
+    """
+
+    def __init__(self, history_size: int = 1000, retention_seconds: float = 300):
+        self.history_size = history_size
+        self.retention_seconds = retention_seconds
+        self._channels: Dict[str, _Channel] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, workflow_id: str, event: str, data: Optional[Dict[str, Any]] = None) -> WorkflowEvent:
+        """
+        Publish an event to every subscriber of a workflow
+
+        Args:
+            workflow_id: Workflow the event belongs to
+            event: Event type (status, stage, token)
+            data: Event payload
+
+        Returns:
+            The published event with its sequence number
+        """
+        with self._lock:
+            self._sweep()
+            channel = self._channels.get(workflow_id)
+            if channel is None:
+                channel = self._channels[workflow_id] = _Channel(self.history_size)
+            channel.seq += 1
+            workflow_event = WorkflowEvent(workflow_id=workflow_id, seq=channel.seq, event=event, data=data or {})
+            channel.history.append(workflow_event)
+            if is_terminal(workflow_event):
+                channel.closed_at = time.monotonic()
+            subscribers = list(channel.subscribers)
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, workflow_event)
+            except RuntimeError:
+                # Subscriber's loop already closed; it is removed when its generator exits
+                pass
+        return workflow_event
+
+    async def subscribe(self, workflow_id: str, after_seq: int = 0) -> AsyncIterator[Optional[WorkflowEvent]]:
+        """
+        Iterate a workflow's events, replaying history after after_seq
+
+        Yields None when no event arrived for a while so callers can send
+        keep-alives or re-check the result store. Stops after a terminal event.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            channel = self._channels.get(workflow_id)
+            if channel is None:
+                channel = self._channels[workflow_id] = _Channel(self.history_size)
+            replay = [event for event in channel.history if event.seq > after_seq]
+            channel.subscribers.append(subscriber)
+
+        try:
+            for event in replay:
+                after_seq = event.seq
+                yield event
+                if is_terminal(event):
+                    return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event.seq <= after_seq:
+                    continue
+                yield event
+                if is_terminal(event):
+                    return
+        finally:
+            with self._lock:
+                if subscriber in channel.subscribers:
+                    channel.subscribers.remove(subscriber)
+                # Nothing was ever published here (e.g. ran in another process)
+                if not channel.subscribers and not channel.history and self._channels.get(workflow_id) is channel:
+                    del self._channels[workflow_id]
+
+    def stats(self) -> Dict[str, int]:
+        """Get open channel and subscriber counts"""
+        with self._lock:
+            return {
+                "channels": len(self._channels),
+                "subscribers": sum(len(channel.subscribers) for channel in self._channels.values())
+            }
+
+    def _sweep(self) -> None:
+        cutoff = time.monotonic() - self.retention_seconds
+        expired = [
+            workflow_id for workflow_id, channel in self._channels.items()
+            if channel.closed_at is not None and channel.closed_at < cutoff and not channel.subscribers
+        ]
+        for workflow_id in expired:
+            del self._channels[workflow_id]
+
+def is_terminal(event: WorkflowEvent) -> bool:
+    """Check whether an event ends its workflow's stream"""
+    return event.event == "status" and event.data.get("status") in TERMINAL_STATUSES
+
+_event_bus = WorkflowEventBus()
+
+def get_event_bus() -> WorkflowEventBus:
+    """Get the process-wide workflow event bus"""
+    return _event_bus
+
+EventSink = Callable[[str, Dict[str, Any]], None]
+
+# Set while a workflow runs so deep call sites can report progress without
+# threading a workflow id through every signature
+_current_emitter: ContextVar[Optional[EventSink]] = ContextVar("workflow_event_emitter", default=None)
+_stream_tokens: ContextVar[bool] = ContextVar("workflow_stream_tokens", default=False)
+
+@contextmanager
+def workflow_event_scope(
+    workflow_id: Optional[str],
+    publish: bool = True,
+    sinks: Sequence[EventSink] = (),
+    stream_tokens: bool = True
+) -> Iterator[None]:
+    """
+    Route emit_workflow_event calls in this context
+
+    Args:
+        workflow_id: Workflow whose channel receives the events
+        publish: Publish to this process's event bus
+        sinks: Extra callables that receive every (event, data) pair
+        stream_tokens: Ask the LLM layer to stream and emit token events
+    """
+    targets = list(sinks)
+    if workflow_id is not None and publish:
+        targets.append(lambda event, data: _event_bus.publish(workflow_id, event, data))
+    if not targets:
+        yield
+        return
+
+    def emit(event: str, data: Dict[str, Any]) -> None:
+        for target in targets:
+            try:
+                target(event, data)
+            except Exception as e:
+                logger.warning(f"Dropped {event} event: {str(e)}")
+
+    token = _current_emitter.set(emit)
+    stream_token = _stream_tokens.set(stream_tokens)
+    try:
+        yield
+    finally:
+        _stream_tokens.reset(stream_token)
+        _current_emitter.reset(token)
+
+def emit_workflow_event(event: str, **data: Any) -> None:
+    """Publish an event for the workflow running in this context, if any"""
+    emitter = _current_emitter.get()
+    if emitter is not None:
+        emitter(event, data)
+
+def token_streaming_enabled() -> bool:
+    """Check whether the workflow running in this context wants token events"""
+    return _current_emitter.get() is not None and _stream_tokens.get()
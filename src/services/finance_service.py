@@ -1,9 +1,9 @@
 from typing import Dict, Any
-from src.core.factories.agent_factory import AgentFactory
-from src.core.factories.tool_factory import ToolFactory
 from src.config.workflow_config import WorkflowConfig
 from src.common.logger import get_logger
+from src.llm.rate_limiter import organization_scope
 from src.models.finance_models import FinanceWorkflowInput, FinanceWorkflowOutput
+from src.workflows.invoice_workflow import get_invoice_workflow
 
 logger = get_logger(__name__)
 
@@ -19,28 +19,23 @@ class FinanceService:
         Process invoice through workflow
         
         Args:
-            input_data: Finance workflow input data
+            input_data: Finance workflow input data, with the invoice under invoice_data
             
         Returns:
             Workflow execution results
         """
         try:
-            # Get required tools
-            tools = ToolFactory.get_tools_by_types(['invoice', 'finance'])
+            if not input_data.invoice_data:
+                raise ValueError("invoice_data is required for invoice processing")
             
-            # Get invoice agents
-            agent_provider = AgentFactory.get_agent_provider('invoice')
-            
-            # Create and execute workflow
-            workflow_config = self.config.get_workflow_config()
-            
-            # TODO: Implement workflow execution logic
-            result = self._execute_workflow(input_data, tools, agent_provider, workflow_config)
+            with organization_scope(input_data.organization_id):
+                result = self._execute_workflow(input_data)
             
             return FinanceWorkflowOutput(
-                status="SUCCESS",
+                status=result["status"],
                 workflow_type=input_data.workflow_type,
-                results=result
+                results=result,
+                error_message=result.get("error")
             )
             
         except Exception as e:
@@ -51,24 +46,14 @@ class FinanceService:
                 error_message=str(e)
             )
     
-    def _execute_workflow(
-        self, 
-        input_data: FinanceWorkflowInput,
-        tools: list,
-        agent_provider: Any,
-        workflow_config: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    def _execute_workflow(self, input_data: FinanceWorkflowInput) -> Dict[str, Any]:
         """
-        Execute workflow with given configuration
+        Run the invoice through the process-wide InvoiceWorkflow
         
         Args:
             input_data: Workflow input data
-            tools: List of tools to use
-            agent_provider: Provider for creating agents
-            workflow_config: Workflow configuration
             
         Returns:
-            Workflow execution results
+            Workflow execution results: fast lane, duplicate rejection or crew
         """
-        # TODO: Implement workflow execution
-        pass
\ No newline at end of file
+        return get_invoice_workflow().process_invoice(dict(input_data.invoice_data))
@@ -0,0 +1,486 @@
+import asyncio
+import hashlib
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, List, Optional, Union
+from src.common.logger import get_logger
+from src.config.workflow_config import WorkflowConfig
+from src.core.factories.ocr_factory import OCRFactory
+from src.core.factories.store_factory import ResultStoreFactory
+from src.core.interfaces.ocr_interface import BaseOCRBackend
+from src.core.interfaces.store_interface import BaseResultStore
+from src.services.duplicate_index import DuplicateInvoiceIndex, get_duplicate_index, invoice_index_id
+from src.models.finance_models import InvoiceDocument, InvoiceIngestionResult
+
+logger = get_logger(__name__)
+
+STAGES = ("ocr", "validation", "routing")
+# Subdirectories of the inbox that stored invoice files are moved to, so a restart does not ingest them again
+INBOX_PROCESSED_DIR = "processed"
+INBOX_FAILED_DIR = "failed"
+ROUTES = ("auto_approve", "approval_required", "rejected")
+# Routes whose invoices are handed to the dispatcher, when the pipeline has one
+DISPATCHED_ROUTES = ("auto_approve", "approval_required")
+REQUIRED_FIELDS = ("invoice_number", "date", "vendor", "amount", "currency")
+
+# Router: (extracted fields, validation errors, possible duplicate IDs) -> route name
+InvoiceRouter = Callable[[Dict[str, Any], List[str], List[str]], str]
+# Dispatcher: starts processing of a routed invoice and returns the ID of the workflow it runs under
+InvoiceDispatcher = Callable[[InvoiceIngestionResult], str]
+
+class InvoicePipelineFullError(Exception):
+    """Raised when the ingestion pipeline cannot accept more invoices"""
+    pass
+
+def parse_amount(value: Any) -> Optional[float]:
+    """Invoice amount as a float, from a number or a numeric string such as OCR returns ("1,200.50"); None if neither"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        try:
+            value = float(value.strip().replace(",", ""))
+        except ValueError:
+            return None
+    if not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return float(value)
+
+def validate_invoice(fields: Dict[str, Any]) -> List[str]:
+    """
+    Check extracted invoice fields
+
+    Returns:
+        Validation errors, empty when the invoice is valid
+    """
+    errors = [f"Missing required field: {name}" for name in REQUIRED_FIELDS if fields.get(name) in (None, "")]
+    amount = fields.get("amount")
+    if amount not in (None, "") and (parse_amount(amount) or 0) <= 0:
+        errors.append(f"Invalid amount: {amount}")
+    if fields.get("date"):
+        try:
+            date.fromisoformat(str(fields["date"]))
+        except ValueError:
+            errors.append(f"Invalid date: {fields['date']}")
+    currency = fields.get("currency")
+    if currency and not (isinstance(currency, str) and len(currency) == 3 and currency.isalpha()):
+        errors.append(f"Invalid currency: {currency}")
+    return errors
+
+def threshold_router(auto_approve_limit: float) -> InvoiceRouter:
+    """
+    Router sending invalid invoices to rejected, possible duplicates to
+    approval_required, and valid ones to auto_approve up to auto_approve_limit
+    """
+    def route(fields: Dict[str, Any], errors: List[str], possible_duplicates: List[str]) -> str:
+        if errors:
+            return "rejected"
+        if possible_duplicates:
+            return "approval_required"
+        return "auto_approve" if parse_amount(fields["amount"]) <= auto_approve_limit else "approval_required"
+    return route
+
+@dataclass
+class StageStats:
+    """Counters for one pipeline stage"""
+    workers: int
+    capacity: int
+    processed: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    busy_seconds: float = 0.0
+    wait_seconds: float = 0.0
+
+    def snapshot(self, queue: Optional[asyncio.Queue], elapsed: float) -> Dict[str, Any]:
+        done = self.processed + self.failed
+        return {
+            "workers": self.workers,
+            "queued": queue.qsize() if queue is not None else 0,
+            "queue_capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "throughput_per_minute": round(done / elapsed * 60, 1) if elapsed else 0.0,
+            "average_service_ms": round(self.busy_seconds / done * 1000, 2) if done else 0.0,
+            "average_wait_ms": round(self.wait_seconds / done * 1000, 2) if done else 0.0,
+            "utilization": round(min(1.0, self.busy_seconds / (elapsed * self.workers)), 3) if elapsed else 0.0
+        }
+
+@dataclass
+class _Job:
+    document: InvoiceDocument
+    result: InvoiceIngestionResult
+    fields: Dict[str, Any] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+    possible_duplicates: List[str] = field(default_factory=list)
+    failed: bool = False
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+class InvoiceIngestionPipeline:
+    """
+    Staged invoice ingestion: OCR -> validation -> routing.
+
+    Each stage is a set of asyncio workers reading from a bounded queue and
+    writing to the next one, so a slow stage fills its inbox and blocks the
+    stage before it instead of buffering without limit; submit() waits
+    (and try_submit() raises) once the OCR queue is full. OCR runs on
+    ocr_concurrency workers, which is where the wall-clock time goes.
+    Validation and routing are cheap and run on one worker each; routing
+    writes results to the store in batches. Documents that fail OCR skip
+    validation and are stored as FAILED.
+
+    With a duplicate index, validation rejects exact duplicates of indexed
+    invoices, flags near duplicates, and indexes every valid invoice. The
+    single validation worker makes check-then-insert atomic, so two copies
+    in flight at once are still caught. Invoices are indexed under
+    invoice_index_id(), as InvoiceWorkflow and ERP validation look them
+    up, so an ingested invoice processed later is not its own duplicate.
+
+    With a dispatcher, invoices routed to auto_approve or approval_required
+    are handed on for processing (the invoice API starts an InvoiceWorkflow
+    for each) and the workflow ID is stored with the result. Without one,
+    the route is only a label on the stored result.
+    """
+
+    def __init__(
+        self,
+        ocr_backend: BaseOCRBackend,
+        store: BaseResultStore,
+        ocr_concurrency: int = 16,
+        queue_size: int = 1000,
+        router: Optional[InvoiceRouter] = None,
+        auto_approve_limit: float = 5000.0,
+        store_batch_size: int = 100,
+        duplicate_index: Optional[DuplicateInvoiceIndex] = None,
+        dispatcher: Optional[InvoiceDispatcher] = None
+    ):
+        if ocr_concurrency < 1 or queue_size < 1:
+            raise ValueError("ocr_concurrency and queue_size must be at least 1")
+        self.ocr_backend = ocr_backend
+        self.store = store
+        self.ocr_concurrency = ocr_concurrency
+        self.queue_size = queue_size
+        self.router = router or threshold_router(auto_approve_limit)
+        self.store_batch_size = store_batch_size
+        self.duplicate_index = duplicate_index
+        self.dispatcher = dispatcher
+
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._stats = {
+            "ocr": StageStats(workers=ocr_concurrency, capacity=queue_size),
+            "validation": StageStats(workers=1, capacity=queue_size),
+            "routing": StageStats(workers=1, capacity=queue_size)
+        }
+        self._routes = dict.fromkeys(ROUTES, 0)
+        self._dispatch_counts = {"dispatched": 0, "dispatch_failed": 0}
+        self._stage_of: Dict[str, str] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._watcher: Optional[asyncio.Task] = None
+        self._started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self, inbox_dir: Optional[str] = None, poll_seconds: float = 2.0) -> None:
+        """
+        Start the stage workers on the running event loop
+
+        Args:
+            inbox_dir: Directory to watch for new invoice files (no watcher if empty)
+            poll_seconds: Seconds between directory scans
+        """
+        if self.running:
+            return
+        self._queues = {stage: asyncio.Queue(maxsize=self.queue_size) for stage in STAGES}
+        self._tasks = [
+            *(asyncio.create_task(self._run_stage("ocr", self._ocr, "validation")) for _ in range(self.ocr_concurrency)),
+            asyncio.create_task(self._run_stage("validation", self._validate, "routing")),
+            asyncio.create_task(self._route_batches())
+        ]
+        if inbox_dir:
+            self._watcher = asyncio.create_task(self.watch_directory(inbox_dir, poll_seconds))
+        self._started_at = time.perf_counter()
+        logger.info(f"Invoice pipeline started with {self.ocr_concurrency} OCR workers")
+
+    async def stop(self, drain: bool = True, timeout_seconds: Optional[float] = None) -> None:
+        """
+        Stop the watcher and stage workers
+
+        Args:
+            drain: Finish invoices already queued before stopping
+            timeout_seconds: Longest time to wait for the drain
+        """
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+        if drain and self.running:
+            try:
+                await asyncio.wait_for(self.join(), timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.warning(f"Invoice pipeline stopped with {sum(q.qsize() for q in self._queues.values())} invoices queued")
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("Invoice pipeline stopped")
+
+    async def join(self) -> None:
+        """Wait until every submitted invoice has been stored"""
+        for stage in STAGES:
+            await self._queues[stage].join()
+
+    async def submit(self, document: InvoiceDocument) -> str:
+        """
+        Queue an invoice, waiting while the OCR queue is full
+
+        Returns:
+            Document ID
+        """
+        job = self._job(document)
+        await self._queues["ocr"].put(job)
+        self._stage_of[document.document_id] = "ocr"
+        return document.document_id
+
+    def try_submit(self, documents: List[InvoiceDocument]) -> List[str]:
+        """
+        Queue several invoices without waiting, all or none
+
+        Returns:
+            Document IDs
+
+        Raises:
+            InvoicePipelineFullError: If the OCR queue has no room for every document
+        """
+        queue = self._queues.get("ocr")
+        if queue is None or not self.running:
+            raise InvoicePipelineFullError("Invoice pipeline is not running")
+        available = queue.maxsize - queue.qsize()
+        if len(documents) > available:
+            raise InvoicePipelineFullError(f"Invoice pipeline is full ({available} slots free, {len(documents)} requested)")
+        for job in [self._job(document) for document in documents]:
+            queue.put_nowait(job)
+            self._stage_of[job.document.document_id] = "ocr"
+        return [document.document_id for document in documents]
+
+    async def ingest_stream(self, documents: Union[Iterable[InvoiceDocument], AsyncIterable[InvoiceDocument]]) -> int:
+        """Submit every document from a stream, waiting on backpressure; returns how many were queued"""
+        count = 0
+        if hasattr(documents, "__aiter__"):
+            async for document in documents:
+                await self.submit(document)
+                count += 1
+        else:
+            for document in documents:
+                await self.submit(document)
+                count += 1
+        return count
+
+    async def watch_directory(self, inbox_dir: str, poll_seconds: float = 2.0) -> None:
+        """
+        Submit new or modified files in a directory, polling every poll_seconds
+
+        Writers should create files under a temporary name (dotfiles and
+        names ending in .tmp or .part are skipped) and rename them into
+        place once complete. Once its result is stored, a file is moved to
+        the inbox's processed/ subdirectory, or failed/ if it could not be
+        read, so only unfinished files are picked up again after a restart.
+        """
+        seen: Dict[str, int] = {}
+        logger.info(f"Watching {inbox_dir} for invoices")
+        while True:
+            try:
+                entries = await asyncio.to_thread(_scan_inbox, inbox_dir)
+            except OSError as e:
+                logger.error(f"Cannot scan invoice inbox {inbox_dir}: {str(e)}")
+                entries = {}
+            seen = {path: mtime for path, mtime in seen.items() if path in entries}
+            for path, mtime in entries.items():
+                if seen.get(path) == mtime:
+                    continue
+                seen[path] = mtime
+                document_id = hashlib.sha1(f"{path}:{mtime}".encode()).hexdigest()[:16]
+                await self.submit(InvoiceDocument(document_id=f"inbox-{document_id}", path=path, metadata={"source": "inbox"}))
+            await asyncio.sleep(poll_seconds)
+
+    def status(self, document_id: str) -> Optional[str]:
+        """Stage an in-flight invoice is waiting for or in, or None once stored"""
+        return self._stage_of.get(document_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get per-stage queue depth, throughput and latency, and route and dispatch counts"""
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {
+            "running": self.running,
+            "watching_inbox": self._watcher is not None and not self._watcher.done(),
+            "uptime_seconds": round(elapsed, 1),
+            "in_pipeline": len(self._stage_of),
+            "stages": {stage: self._stats[stage].snapshot(self._queues.get(stage), elapsed) for stage in STAGES},
+            "routes": dict(self._routes),
+            **self._dispatch_counts
+        }
+
+    def _job(self, document: InvoiceDocument) -> _Job:
+        if document.path is None and document.content is None:
+            raise ValueError(f"Document {document.document_id} has neither a path nor content")
+        return _Job(document=document, result=InvoiceIngestionResult(
+            document_id=document.document_id,
+            source=document.path,
+            status="PENDING"
+        ))
+
+    async def _run_stage(self, stage: str, handler: Callable[[_Job], Any], next_stage: str) -> None:
+        inbox, stats = self._queues[stage], self._stats[stage]
+        while True:
+            job = await inbox.get()
+            started = time.perf_counter()
+            stats.wait_seconds += started - job.enqueued_at
+            stats.in_flight += 1
+            try:
+                await handler(job)
+                stats.processed += 1
+            except Exception as e:
+                logger.warning(f"Invoice {job.document.document_id} failed in {stage}: {str(e)}")
+                job.failed = True
+                job.result.error_message = f"{stage}: {str(e)}"
+                stats.failed += 1
+            finally:
+                finished = time.perf_counter()
+                stats.busy_seconds += finished - started
+                stats.in_flight -= 1
+                job.result.stage_timings[stage] = round(finished - started, 4)
+            target = "routing" if job.failed else next_stage
+            job.enqueued_at = time.perf_counter()
+            self._stage_of[job.document.document_id] = target
+            await self._queues[target].put(job)
+            inbox.task_done()
+
+    async def _ocr(self, job: _Job) -> None:
+        job.fields = await self.ocr_backend.aextract(job.document)
+
+    async def _validate(self, job: _Job) -> None:
+        job.errors = validate_invoice(job.fields)
+        if job.errors:
+            return
+        job.fields["amount"] = parse_amount(job.fields["amount"])
+        if self.duplicate_index is None:
+            return
+        # Adds may flush to the shared table, so they stay off the event loop
+        duplicates = await asyncio.to_thread(self._check_and_index, job.fields)
+        if duplicates["duplicate_of"] is not None:
+            job.errors.append(f"Duplicate of invoice {duplicates['duplicate_of']}")
+            return
+        job.possible_duplicates = [match["invoice_id"] for match in duplicates["possible_duplicates"]]
+
+    def _check_and_index(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        # Not excluding the invoice's own ID: each document is validated once, so a match is an earlier submission
+        duplicates = self.duplicate_index.check(fields)
+        if duplicates["duplicate_of"] is None:
+            self.duplicate_index.add(fields, invoice_index_id(fields))
+        return duplicates
+
+    async def _route_batches(self) -> None:
+        # Route everything already waiting and write it to the store in one call
+        inbox, stats = self._queues["routing"], self._stats["routing"]
+        while True:
+            batch = [await inbox.get()]
+            while len(batch) < self.store_batch_size and not inbox.empty():
+                batch.append(inbox.get_nowait())
+            started = time.perf_counter()
+            stats.in_flight += len(batch)
+            results = {}
+            for job in batch:
+                stats.wait_seconds += started - job.enqueued_at
+                results[job.document.document_id] = self._finish(job)
+                self._dispatch(results[job.document.document_id])
+            try:
+                await asyncio.to_thread(self._persist, results)
+                stats.processed += len(batch)
+                await asyncio.to_thread(self._archive, batch, results)
+            except Exception as e:
+                logger.error(f"Failed to store {len(batch)} invoice results: {str(e)}")
+                stats.failed += len(batch)
+            finally:
+                stats.busy_seconds += time.perf_counter() - started
+                stats.in_flight -= len(batch)
+                for job in batch:
+                    self._stage_of.pop(job.document.document_id, None)
+                    inbox.task_done()
+
+    def _dispatch(self, result: InvoiceIngestionResult) -> None:
+        if self.dispatcher is None or result.status != "SUCCESS" or result.route not in DISPATCHED_ROUTES:
+            return
+        try:
+            result.workflow_id = self.dispatcher(result)
+            self._dispatch_counts["dispatched"] += 1
+        except Exception as e:
+            logger.warning(f"Cannot dispatch invoice {result.document_id}: {str(e)}")
+            result.error_message = f"dispatch: {str(e)}"
+            self._dispatch_counts["dispatch_failed"] += 1
+
+    def _persist(self, results: Dict[str, InvoiceIngestionResult]) -> None:
+        self.store.put_many(results)
+        if self.duplicate_index is not None:
+            self.duplicate_index.flush()
+
+    def _archive(self, jobs: List[_Job], results: Dict[str, InvoiceIngestionResult]) -> None:
+        for job in jobs:
+            path = job.document.path
+            if (job.document.metadata or {}).get("source") != "inbox" or not path:
+                continue
+            failed = results[job.document.document_id].status == "FAILED"
+            target_dir = os.path.join(os.path.dirname(path), INBOX_FAILED_DIR if failed else INBOX_PROCESSED_DIR)
+            target = os.path.join(target_dir, os.path.basename(path))
+            try:
+                os.makedirs(target_dir, exist_ok=True)
+                if os.path.exists(target):
+                    stem, extension = os.path.splitext(os.path.basename(path))
+                    target = os.path.join(target_dir, f"{stem}-{job.document.document_id}{extension}")
+                os.replace(path, target)
+            except OSError as e:
+                logger.error(f"Cannot move processed invoice {path}: {str(e)}")
+
+    def _finish(self, job: _Job) -> InvoiceIngestionResult:
+        result = job.result
+        result.extracted_data = job.fields or None
+        result.completed_at = datetime.now()
+        if job.failed:
+            result.status = "FAILED"
+            return result
+        result.status = "SUCCESS"
+        result.validation_errors = job.errors
+        try:
+            result.possible_duplicates = job.possible_duplicates
+            result.route = self.router(job.fields, job.errors, job.possible_duplicates)
+        except Exception as e:
+            result.status = "FAILED"
+            result.error_message = f"routing: {str(e)}"
+            return result
+        self._routes[result.route] = self._routes.get(result.route, 0) + 1
+        return result
+
+def _scan_inbox(inbox_dir: str) -> Dict[str, int]:
+    # Complete invoice files in the inbox with their modification times
+    with os.scandir(inbox_dir) as entries:
+        return {
+            entry.path: entry.stat().st_mtime_ns
+            for entry in entries
+            if entry.is_file() and not entry.name.startswith(".") and not entry.name.endswith((".tmp", ".part"))
+        }
+
+@lru_cache()
+def get_invoice_pipeline() -> InvoiceIngestionPipeline:
+    """Get the process-wide invoice ingestion pipeline built from INVOICE_* settings"""
+    config = WorkflowConfig()
+    pipeline_config = config.get_invoice_pipeline_config()
+    return InvoiceIngestionPipeline(
+        OCRFactory.get_ocr_backend(config),
+        ResultStoreFactory.get_result_store(config, model_cls=InvoiceIngestionResult, table_name="invoice_ingestion"),
+        ocr_concurrency=pipeline_config["ocr_concurrency"],
+        queue_size=pipeline_config["queue_size"],
+        auto_approve_limit=pipeline_config["auto_approve_limit"],
+        duplicate_index=get_duplicate_index()
+    )
@@ -0,0 +1,158 @@
+import threading
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from src.common.logger import get_logger
+from src.config.workflow_config import WorkflowConfig
+from src.core.factories.ocr_factory import OCRFactory
+from src.core.interfaces.ocr_interface import BaseOCRBackend
+from src.models.finance_models import InvoiceDocument
+from src.services.erp_validation import BulkERPValidator, get_erp_validator
+from src.services.invoice_pipeline import REQUIRED_FIELDS, parse_amount, validate_invoice
+from src.tools.compliance_engine import ComplianceRuleEngine, get_compliance_engine
+
+logger = get_logger(__name__)
+
+ERP_CHECKS = ("vendor_valid", "po_match", "budget_available")
+
+# Approver recorded on invoices the fast lane approves itself
+FAST_LANE_APPROVER = "invoice_fast_lane"
+
+@dataclass
+class TriageDecision:
+    """Outcome of the rules-first triage of one invoice"""
+    fast_lane: bool
+    reasons: List[str] = field(default_factory=list)
+    fields: Dict[str, Any] = field(default_factory=dict)
+    erp: Optional[Dict[str, Any]] = None
+    compliance: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+class InvoiceTriage:
+    """
+    Deterministic checks that decide whether an invoice needs the agent crew.
+
+    An invoice takes the fast lane when every check passes:
+    - extraction: required fields present and well formed, read from the
+      request or, failing that, from the OCR backend
+    - ERP: vendor valid, PO matched, budget available, not a duplicate
+      and no possible duplicates
+    - compliance: compliant under the rule engine, with the fast lane as
+      approver when the invoice names none
+    - amount: at most max_amount
+    Otherwise the failed checks are returned as reasons, for the crew to
+    work on. Checks stop at the first failing stage, so an unreadable
+    invoice never reaches the ERP.
+    """
+
+    def __init__(
+        self,
+        erp_validator: BulkERPValidator,
+        compliance_engine: ComplianceRuleEngine,
+        ocr_backend: Optional[BaseOCRBackend] = None,
+        max_amount: float = 5000.0
+    ):
+        self.erp_validator = erp_validator
+        self.compliance_engine = compliance_engine
+        self.ocr_backend = ocr_backend
+        self.max_amount = max_amount
+        self._counters = {"fast_lane": 0, "escalated": 0}
+        self._escalation_reasons: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def triage(self, invoice_data: Dict[str, Any]) -> TriageDecision:
+        """
+        Run the deterministic checks on one invoice
+
+        Args:
+            invoice_data: Invoice fields (at the top level or under extracted_data),
+                or a document under file_path, document_path or content
+
+        Returns:
+            Decision with the extracted fields, ERP flags, compliance result
+            and, when escalating, the reasons
+        """
+        decision = TriageDecision(fast_lane=False)
+        decision.fields, decision.reasons = self._extract(invoice_data)
+        if not decision.reasons:
+            decision.reasons = self._check_erp(invoice_data, decision)
+        if not decision.reasons:
+            decision.reasons = self._check_compliance(invoice_data, decision)
+        if not decision.reasons and float(decision.fields["amount"]) > self.max_amount:
+            decision.reasons = [f"amount: {float(decision.fields['amount']):.2f} exceeds the fast-lane limit of {self.max_amount:.2f}"]
+        decision.fast_lane = not decision.reasons
+        self._record(decision)
+        return decision
+
+    def stats(self) -> Dict[str, Any]:
+        """Get fast-lane and escalation counts, with escalations per failed check"""
+        with self._lock:
+            total = self._counters["fast_lane"] + self._counters["escalated"]
+            return {
+                **self._counters,
+                "fast_lane_rate": round(self._counters["fast_lane"] / total, 3) if total else None,
+                "escalation_reasons": dict(self._escalation_reasons)
+            }
+
+    def _extract(self, invoice_data: Dict[str, Any]) -> tuple:
+        fields = {**(invoice_data.get("extracted_data") or {}), **{
+            name: invoice_data[name] for name in (*REQUIRED_FIELDS, "line_items") if invoice_data.get(name) not in (None, "")
+        }}
+        source = invoice_data.get("file_path") or invoice_data.get("document_path")
+        if any(fields.get(name) in (None, "") for name in REQUIRED_FIELDS) and self.ocr_backend and (source or invoice_data.get("content")):
+            try:
+                extracted = self.ocr_backend.extract(InvoiceDocument(path=source, content=invoice_data.get("content")))
+            except Exception as e:
+                return fields, [f"extraction: {str(e)}"]
+            fields = {**extracted, **{name: value for name, value in fields.items() if value not in (None, "")}}
+        errors = validate_invoice(fields)
+        if not errors:
+            fields["amount"] = parse_amount(fields["amount"])
+        return fields, [f"extraction: {error}" for error in errors]
+
+    def _check_erp(self, invoice_data: Dict[str, Any], decision: TriageDecision) -> List[str]:
+        invoice = {**invoice_data, **decision.fields}
+        try:
+            decision.erp = self.erp_validator.validate([invoice])[0]
+        except Exception as e:
+            logger.warning(f"ERP validation unavailable during triage, escalating: {str(e)}")
+            return [f"erp: validation unavailable ({str(e)})"]
+        reasons = [f"erp: {check} failed" for check in ERP_CHECKS if not decision.erp.get(check)]
+        if decision.erp.get("duplicate_check"):
+            reasons.append(f"erp: duplicate of invoice {decision.erp.get('duplicate_of')}")
+        if decision.erp.get("possible_duplicates"):
+            reasons.append(f"erp: possible duplicate of {', '.join(decision.erp['possible_duplicates'])}")
+        return reasons
+
+    def _check_compliance(self, invoice_data: Dict[str, Any], decision: TriageDecision) -> List[str]:
+        fields = decision.fields
+        transaction = {
+            "description": f"Invoice {fields['invoice_number']} from {fields['vendor']}",
+            **invoice_data,
+            **fields,
+            "approver": invoice_data.get("approver") or FAST_LANE_APPROVER
+        }
+        evaluation = self.compliance_engine.evaluate([transaction], id_field="invoice_number")
+        decision.compliance = evaluation.results()[0]
+        if decision.compliance["status"] == "COMPLIANT":
+            return []
+        return [f"compliance: {issue}" for issue in decision.compliance["issues"]]
+
+    def _record(self, decision: TriageDecision) -> None:
+        with self._lock:
+            self._counters["fast_lane" if decision.fast_lane else "escalated"] += 1
+            for check in {reason.split(":", 1)[0] for reason in decision.reasons}:
+                self._escalation_reasons[check] = self._escalation_reasons.get(check, 0) + 1
+
+@lru_cache()
+def get_invoice_triage() -> InvoiceTriage:
+    """Get the process-wide invoice triage built from INVOICE_FAST_LANE_* settings"""
+    config = WorkflowConfig()
+    return InvoiceTriage(
+        get_erp_validator(),
+        get_compliance_engine(),
+        ocr_backend=OCRFactory.get_ocr_backend(config),
+        max_amount=config.get_invoice_fast_lane_config()["max_amount"]
+    )
@@ -0,0 +1,462 @@
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
+from datetime import date
+from functools import lru_cache
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import (
+    BigInteger, Column, Float, Integer, MetaData, String, Table, Text, UniqueConstraint, bindparam, create_engine, event, func, insert, select, update
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import StaticPool
+from src.common.logger import get_logger
+from src.common.resilience import CircuitOpenError
+from src.config.workflow_config import WorkflowConfig
+from src.core.factories.payment_factory import PaymentGatewayFactory
+from src.core.interfaces.payment_interface import BasePaymentGateway
+from src.services.duplicate_index import invoice_number_keys, invoice_vendor
+from src.services.result_store import _enable_sqlite_wal
+
+logger = get_logger(__name__)
+
+PAYMENT_STATUSES = ("queued", "submitted", "paid", "failed")
+RUN_STATUSES = ("pending", "submitted", "completed")
+
+# Keeps IN (...) lists under SQLite's bound-parameter limit
+_IN_CHUNK = 500
+
+def payment_idempotency_key(payment: Dict[str, Any]) -> str:
+    """
+    Idempotency key of a payment request
+
+    An explicit idempotency_key wins. Otherwise the key is derived from
+    the vendor invoice itself (vendor, invoice_number and amount) when the
+    invoice number is known, and from invoice_id only when it is not, so
+    the same vendor invoice resubmitted under a new invoice_id, or by a
+    retried workflow, asks for the same payment rather than a new one.
+    Vendor and invoice number are normalized as in the duplicate index, so
+    "ACME Supplies" and "Acme  Supplies" name the same vendor.
+
+    Raises:
+        ValueError: If the payment has no idempotency_key, invoice_id or invoice_number
+    """
+    if payment.get("idempotency_key"):
+        return str(payment["idempotency_key"])
+    number, _ = invoice_number_keys(payment.get("invoice_number"))
+    if number:
+        amount_cents = _amount_cents(payment.get("amount"))
+        digest = hashlib.blake2b(f"{invoice_vendor(payment)}|{number}|{amount_cents}".encode(), digest_size=12).hexdigest()
+        return f"vendor-invoice:{digest}"
+    if payment.get("invoice_id"):
+        return f"invoice:{payment['invoice_id']}"
+    raise ValueError("Payment needs an idempotency_key, invoice_id or invoice_number")
+
+def _amount_cents(amount: Any) -> int:
+    try:
+        return int(round(float(amount) * 100))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid payment amount: {amount}")
+
+class PaymentExecutor:
+    """
+    Idempotent, batched payment execution against a payment gateway.
+
+    request_payments() records each payment in a ledger under its
+    idempotency key and returns at once with status queued. Asking again
+    with the same key returns the recorded payment instead of paying
+    twice; only a failed payment is queued again. A vendor invoice
+    (vendor and invoice_number) can be recorded under one key only, so a
+    second key for it, such as an explicit one or a different amount, is
+    rejected. The ledger is a SQL table, so the guarantee holds across
+    retries, restarts and API workers sharing the database.
+
+    submit_runs() groups queued payments into runs of at most max_run_size
+    payments with the same vendor, currency and payment date, and submits
+    each run in one gateway request. Payments are claimed for a run before
+    the run is sent, and a run that was not accepted is resent under the
+    same run_id, which the gateway treats as idempotent. reconcile() polls
+    submitted runs and records each payment as paid or failed.
+
+    start() runs both on the event loop every interval_seconds; without
+    it, call run_once().
+    """
+
+    def __init__(
+        self,
+        gateway: BasePaymentGateway,
+        url: str = "sqlite:///payments.db",
+        max_run_size: int = 500,
+        interval_seconds: float = 5.0
+    ):
+        if max_run_size < 1:
+            raise ValueError("max_run_size must be at least 1")
+        self.gateway = gateway
+        self.max_run_size = max_run_size
+        self.interval_seconds = interval_seconds
+        self._counters = {"requested": 0, "idempotent_replays": 0, "requeued": 0, "runs_submitted": 0, "submit_errors": 0, "reconcile_errors": 0}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        if url in ("sqlite://", "sqlite:///:memory:"):
+            # One shared connection, or every thread would see its own empty database
+            self.engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        else:
+            connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+            self.engine = create_engine(url, connect_args=connect_args, pool_pre_ping=True)
+            if url.startswith("sqlite"):
+                event.listen(self.engine, "connect", _enable_sqlite_wal)
+        metadata = MetaData()
+        self.payments = Table(
+            "payments",
+            metadata,
+            Column("idempotency_key", String(128), primary_key=True),
+            Column("invoice_id", String(128)),
+            Column("invoice_number", String(128)),
+            Column("vendor", String(256), nullable=False),
+            # Normalized vendor identity, as in the duplicate index; vendor is what the gateway is sent
+            Column("vendor_key", String(256), nullable=False),
+            Column("currency", String(3), nullable=False),
+            Column("amount_cents", BigInteger, nullable=False),
+            Column("payment_date", String(10), nullable=False),
+            Column("status", String(16), nullable=False, index=True),
+            Column("run_id", String(64), index=True),
+            Column("transaction_id", String(128)),
+            Column("error_message", Text),
+            Column("attempts", Integer, nullable=False, default=0),
+            Column("created_at", Float, nullable=False),
+            Column("updated_at", Float, nullable=False),
+            # One key per vendor invoice; rows without an invoice number are not constrained
+            UniqueConstraint("vendor_key", "invoice_number", name="uq_payments_vendor_invoice"),
+        )
+        self.runs = Table(
+            "payment_runs",
+            metadata,
+            Column("run_id", String(64), primary_key=True),
+            Column("vendor", String(256), nullable=False),
+            Column("currency", String(3), nullable=False),
+            Column("payment_date", String(10), nullable=False),
+            Column("payment_count", Integer, nullable=False),
+            Column("amount_cents", BigInteger, nullable=False),
+            Column("status", String(16), nullable=False, index=True),
+            Column("gateway_run_id", String(128)),
+            Column("created_at", Float, nullable=False),
+            Column("updated_at", Float, nullable=False),
+        )
+        metadata.create_all(self.engine)
+
+    def request_payment(self, payment: Dict[str, Any]) -> Dict[str, Any]:
+        """Record one payment request; see request_payments()"""
+        return self.request_payments([payment])[0]
+
+    def request_payments(self, payments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Record payment requests in the ledger for the next payment run
+
+        Args:
+            payments: Dicts with vendor (name or ID), amount, currency, optional
+                payment_date (default today) and an idempotency_key, invoice_id
+                or invoice_number to derive the key from
+
+        Returns:
+            Ledger record per payment, in order
+
+        Raises:
+            ValueError: If a payment is malformed, its idempotency key is
+                already recorded for a different vendor, amount or currency, or
+                its vendor invoice is already recorded under another key
+        """
+        rows = [self._row(payment) for payment in payments]
+        for attempt in range(2):
+            try:
+                replays, requeued = self._record(rows)
+                break
+            except IntegrityError:
+                # Another process inserted one of the keys first; the retry finds it as existing
+                if attempt:
+                    raise
+        self._count(requested=len(rows), idempotent_replays=replays, requeued=requeued)
+        records = self._payments_by_key([row["idempotency_key"] for row in rows])
+        return [records[row["idempotency_key"]] for row in rows]
+
+    def get_payment(self, idempotency_key: str) -> Optional[Dict[str, Any]]:
+        """Ledger record of a payment, or None if it was never requested"""
+        return self._payments_by_key([idempotency_key]).get(idempotency_key)
+
+    def submit_runs(self) -> int:
+        """
+        Group queued payments into runs and submit every run not yet accepted
+
+        Returns:
+            Number of runs the gateway accepted
+        """
+        self._claim_runs()
+        with self.engine.connect() as conn:
+            pending = conn.execute(select(self.runs).where(self.runs.c.status == "pending").order_by(self.runs.c.created_at)).mappings().all()
+        accepted = 0
+        for run in pending:
+            with self.engine.connect() as conn:
+                members = conn.execute(
+                    select(self.payments.c.idempotency_key, self.payments.c.invoice_id, self.payments.c.amount_cents)
+                    .where(self.payments.c.run_id == run["run_id"])
+                ).all()
+            try:
+                response = self.gateway.submit_run({
+                    "run_id": run["run_id"],
+                    "vendor": run["vendor"],
+                    "currency": run["currency"],
+                    "payment_date": run["payment_date"],
+                    "payments": [
+                        {"idempotency_key": key, "invoice_id": invoice_id, "amount": amount_cents / 100}
+                        for key, invoice_id, amount_cents in members
+                    ]
+                })
+            except Exception as e:
+                self._count(submit_errors=1)
+                logger.warning(f"Payment run {run['run_id']} not accepted, will resend: {str(e)}")
+                if isinstance(e, CircuitOpenError):
+                    break
+                continue
+            with self.engine.begin() as conn:
+                conn.execute(
+                    update(self.runs).where(self.runs.c.run_id == run["run_id"])
+                    .values(status="submitted", gateway_run_id=response["gateway_run_id"], updated_at=time.time())
+                )
+            accepted += 1
+        self._count(runs_submitted=accepted)
+        if accepted:
+            logger.info(f"Submitted {accepted} payment runs")
+        return accepted
+
+    def reconcile(self) -> int:
+        """
+        Poll submitted runs and record the outcome of settled payments
+
+        Returns:
+            Number of payments newly recorded as paid or failed
+        """
+        with self.engine.connect() as conn:
+            runs = conn.execute(select(self.runs.c.run_id, self.runs.c.gateway_run_id).where(self.runs.c.status == "submitted")).all()
+        settled = 0
+        for run_id, gateway_run_id in runs:
+            try:
+                status = self.gateway.get_run_status(gateway_run_id)
+            except Exception as e:
+                self._count(reconcile_errors=1)
+                logger.warning(f"Cannot reconcile payment run {run_id}: {str(e)}")
+                if isinstance(e, CircuitOpenError):
+                    break
+                continue
+            now = time.time()
+            outcomes = [
+                {
+                    "key": payment["idempotency_key"],
+                    "new_status": payment["status"],
+                    "transaction_id": payment.get("transaction_id"),
+                    "error_message": payment.get("error"),
+                    "now": now
+                }
+                for payment in status["payments"] if payment["status"] in ("paid", "failed")
+            ]
+            with self.engine.begin() as conn:
+                if outcomes:
+                    # Only payments still in this run; a payment requeued after failing is left alone
+                    settled += conn.execute(
+                        update(self.payments)
+                        .where(self.payments.c.idempotency_key == bindparam("key"))
+                        .where(self.payments.c.run_id == run_id)
+                        .where(self.payments.c.status == "submitted")
+                        .values(
+                            status=bindparam("new_status"),
+                            transaction_id=bindparam("transaction_id"),
+                            error_message=bindparam("error_message"),
+                            updated_at=bindparam("now")
+                        ),
+                        outcomes
+                    ).rowcount
+                if status["status"] == "completed":
+                    conn.execute(update(self.runs).where(self.runs.c.run_id == run_id).values(status="completed", updated_at=now))
+        return settled
+
+    def run_once(self) -> Dict[str, int]:
+        """Submit queued payments, then reconcile submitted runs"""
+        return {"runs_submitted": self.submit_runs(), "payments_settled": self.reconcile()}
+
+    def start(self) -> None:
+        """Submit and reconcile every interval_seconds on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+            logger.info(f"Payment executor started, running every {self.interval_seconds}s")
+
+    async def stop(self) -> None:
+        """Stop the background loop, submitting payments still queued first"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        try:
+            await asyncio.to_thread(self.submit_runs)
+        except Exception as e:
+            logger.error(f"Final payment run submission failed: {str(e)}")
+        logger.info("Payment executor stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get payments and runs by status, and request and gateway counters"""
+        with self.engine.connect() as conn:
+            payments = dict(conn.execute(select(self.payments.c.status, func.count()).group_by(self.payments.c.status)).all())
+            runs = dict(conn.execute(select(self.runs.c.status, func.count()).group_by(self.runs.c.status)).all())
+            average_run_size = conn.execute(select(func.avg(self.runs.c.payment_count))).scalar()
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "payments": {status: payments.get(status, 0) for status in PAYMENT_STATUSES},
+            "runs": {status: runs.get(status, 0) for status in RUN_STATUSES},
+            "average_run_size": round(average_run_size, 1) if average_run_size else None,
+            **counters
+        }
+
+    def _count(self, **increments: int) -> None:
+        with self._lock:
+            for name, increment in increments.items():
+                self._counters[name] += increment
+
+    async def _run_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.error(f"Payment run cycle failed: {str(e)}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def _row(self, payment: Dict[str, Any]) -> Dict[str, Any]:
+        vendor = payment.get("vendor_id") or payment.get("vendor")
+        if not vendor:
+            raise ValueError("Payment needs a vendor or vendor_id")
+        amount_cents = _amount_cents(payment.get("amount"))
+        if amount_cents <= 0:
+            raise ValueError(f"Invalid payment amount: {payment['amount']}")
+        currency = str(payment.get("currency") or "USD").upper()
+        if len(currency) != 3 or not currency.isalpha():
+            raise ValueError(f"Invalid currency: {currency}")
+        payment_date = str(payment.get("payment_date") or date.today().isoformat())
+        date.fromisoformat(payment_date)
+        invoice_number, _ = invoice_number_keys(payment.get("invoice_number"))
+        return {
+            "idempotency_key": payment_idempotency_key(payment),
+            "invoice_id": str(payment["invoice_id"]) if payment.get("invoice_id") else None,
+            "invoice_number": invoice_number or None,
+            "vendor": str(vendor),
+            "vendor_key": invoice_vendor(payment),
+            "currency": currency,
+            "amount_cents": amount_cents,
+            "payment_date": payment_date
+        }
+
+    def _record(self, rows: List[Dict[str, Any]]) -> tuple:
+        now = time.time()
+        new_rows: Dict[str, Dict[str, Any]] = {}
+        replays = 0
+        requeue = []
+        with self.engine.begin() as conn:
+            existing = self._select_by_key(conn, [row["idempotency_key"] for row in rows])
+            invoice_keys = self._keys_by_invoice(conn, rows)
+            for row in rows:
+                key = row["idempotency_key"]
+                if row["invoice_number"]:
+                    invoice_key = invoice_keys.setdefault((row["vendor_key"], row["invoice_number"]), key)
+                    if invoice_key != key:
+                        raise ValueError(
+                            f"Invoice {row['invoice_number']} of vendor {row['vendor']} is already recorded "
+                            f"under idempotency key {invoice_key}"
+                        )
+                recorded = existing.get(key) or new_rows.get(key)
+                if recorded is None:
+                    new_rows[key] = {**row, "status": "queued", "attempts": 0, "created_at": now, "updated_at": now}
+                    continue
+                if any(recorded[name] != row[name] for name in ("vendor_key", "currency", "amount_cents")):
+                    raise ValueError(f"Idempotency key {key} is already used for a different payment")
+                replays += 1
+                if recorded["status"] == "failed" and key not in requeue:
+                    requeue.append(key)
+            if new_rows:
+                conn.execute(insert(self.payments), list(new_rows.values()))
+            for start in range(0, len(requeue), _IN_CHUNK):
+                conn.execute(
+                    update(self.payments)
+                    .where(self.payments.c.idempotency_key.in_(requeue[start:start + _IN_CHUNK]))
+                    .where(self.payments.c.status == "failed")
+                    .values(status="queued", run_id=None, error_message=None, updated_at=now)
+                )
+        return replays, len(requeue)
+
+    def _keys_by_invoice(self, conn, rows: List[Dict[str, Any]]) -> Dict[tuple, str]:
+        numbers = list(dict.fromkeys(row["invoice_number"] for row in rows if row["invoice_number"]))
+        keys = {}
+        for start in range(0, len(numbers), _IN_CHUNK):
+            query = (
+                select(self.payments.c.vendor_key, self.payments.c.invoice_number, self.payments.c.idempotency_key)
+                .where(self.payments.c.invoice_number.in_(numbers[start:start + _IN_CHUNK]))
+            )
+            keys.update({(vendor, number): key for vendor, number, key in conn.execute(query)})
+        return keys
+
+    def _claim_runs(self) -> None:
+        with self.engine.begin() as conn:
+            queued = conn.execute(
+                select(self.payments.c.idempotency_key, self.payments.c.vendor, self.payments.c.currency, self.payments.c.payment_date)
+                .where(self.payments.c.status == "queued")
+                .order_by(self.payments.c.vendor, self.payments.c.currency, self.payments.c.payment_date, self.payments.c.created_at)
+            ).all()
+            now = time.time()
+            for (vendor, currency, payment_date), group in groupby(queued, key=lambda row: row[1:]):
+                keys = [row[0] for row in group]
+                for start in range(0, len(keys), self.max_run_size):
+                    run_id = f"RUN-{uuid.uuid4().hex[:20]}"
+                    # Re-checking status makes a concurrent claimer in another process skip these payments
+                    conn.execute(
+                        update(self.payments)
+                        .where(self.payments.c.idempotency_key.in_(keys[start:start + self.max_run_size]))
+                        .where(self.payments.c.status == "queued")
+                        .values(status="submitted", run_id=run_id, attempts=self.payments.c.attempts + 1, updated_at=now)
+                    )
+                    count, amount_cents = conn.execute(
+                        select(func.count(), func.sum(self.payments.c.amount_cents)).where(self.payments.c.run_id == run_id)
+                    ).one()
+                    if count:
+                        conn.execute(insert(self.runs).values(
+                            run_id=run_id, vendor=vendor, currency=currency, payment_date=payment_date,
+                            payment_count=count, amount_cents=amount_cents, status="pending",
+                            created_at=now, updated_at=now
+                        ))
+
+    def _payments_by_key(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        with self.engine.connect() as conn:
+            rows = self._select_by_key(conn, list(dict.fromkeys(keys)))
+        return {key: _record(row) for key, row in rows.items()}
+
+    def _select_by_key(self, conn, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        rows = {}
+        for start in range(0, len(keys), _IN_CHUNK):
+            query = select(self.payments).where(self.payments.c.idempotency_key.in_(keys[start:start + _IN_CHUNK]))
+            rows.update({row["idempotency_key"]: dict(row) for row in conn.execute(query).mappings()})
+        return rows
+
+def _record(row: Dict[str, Any]) -> Dict[str, Any]:
+    record = {name: value for name, value in row.items() if name not in ("amount_cents", "vendor_key")}
+    record["amount"] = row["amount_cents"] / 100
+    return record
+
+@lru_cache()
+def get_payment_executor() -> PaymentExecutor:
+    """Get the process-wide payment executor built from PAYMENT_* settings"""
+    config = WorkflowConfig()
+    payment_config = config.get_payment_config()
+    return PaymentExecutor(
+        PaymentGatewayFactory.get_payment_gateway(config),
+        url=payment_config["ledger_url"],
+        max_run_size=payment_config["max_run_size"],
+        interval_seconds=payment_config["interval_seconds"]
+    )
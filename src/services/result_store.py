@@ -0,0 +1,218 @@
+import threading
+import time
+from typing import Dict, Iterable, Optional, Type
+from pydantic import BaseModel
+from sqlalchemy import Column, Float, MetaData, String, Table, Text, create_engine, delete, event, func, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from src.common.logger import get_logger
+from src.common.ttl_cache import TTLLRUCache
+from src.core.interfaces.store_interface import BaseResultStore
+from src.models.finance_models import FinanceWorkflowOutput
+
+logger = get_logger(__name__)
+
+class InMemoryResultStore(BaseResultStore):
+    """Process-local LRU result store with TTL expiry"""
+
+    def __init__(
+        self,
+        model_cls: Type[BaseModel] = FinanceWorkflowOutput,
+        max_entries: int = 10000,
+        ttl_seconds: Optional[float] = 86400
+    ):
+        self.model_cls = model_cls
+        self._cache = TTLLRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def get(self, key: str) -> Optional[BaseModel]:
+        return self._cache.get(key)
+
+    def put(self, key: str, value: BaseModel) -> None:
+        self._cache.set(key, value)
+
+    def delete(self, key: str) -> bool:
+        return self._cache.pop(key) is not None
+
+    def purge_expired(self) -> int:
+        return self._cache.purge_expired()
+
+class SQLResultStore(BaseResultStore):
+    """
+    SQLAlchemy-backed result store shared by every worker process.
+
+    Results are serialized as JSON and looked up by primary key, and
+    written with the dialect's atomic upsert (SQLite, PostgreSQL, MySQL),
+    so concurrent writers of one key never collide. Expired rows are
+    hidden on read and the table is trimmed back to max_entries
+    (oldest updates first) every maintenance_interval writes.
+    """
+
+    def __init__(
+        self,
+        url: str = "sqlite:///workflow_results.db",
+        model_cls: Type[BaseModel] = FinanceWorkflowOutput,
+        table_name: str = "workflow_results",
+        max_entries: int = 10000,
+        ttl_seconds: Optional[float] = 86400,
+        maintenance_interval: int = 100
+    ):
+        self.model_cls = model_cls
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.maintenance_interval = maintenance_interval
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+        self.engine = create_engine(url, connect_args=connect_args, pool_pre_ping=True)
+        if url.startswith("sqlite"):
+            event.listen(self.engine, "connect", _enable_sqlite_wal)
+
+        metadata = MetaData()
+        self.table = Table(
+            table_name,
+            metadata,
+            Column("key", String(128), primary_key=True),
+            Column("status", String(32)),
+            Column("payload", Text, nullable=False),
+            Column("updated_at", Float, nullable=False, index=True),
+            Column("expires_at", Float, index=True),
+        )
+        metadata.create_all(self.engine)
+        self._upsert = self._upsert_statement()
+
+    def get(self, key: str) -> Optional[BaseModel]:
+        query = select(self.table.c.payload, self.table.c.expires_at).where(self.table.c.key == key)
+        with self.engine.connect() as conn:
+            row = conn.execute(query).first()
+        if row is None:
+            return None
+        if row.expires_at is not None and row.expires_at <= time.time():
+            return None
+        return self.model_cls.model_validate_json(row.payload)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, BaseModel]:
+        keys = list(keys)
+        now = time.time()
+        results = {}
+        with self.engine.connect() as conn:
+            for start in range(0, len(keys), 500):
+                query = select(self.table.c.key, self.table.c.payload, self.table.c.expires_at).where(
+                    self.table.c.key.in_(keys[start:start + 500])
+                )
+                for row in conn.execute(query):
+                    if row.expires_at is None or row.expires_at > now:
+                        results[row.key] = self.model_cls.model_validate_json(row.payload)
+        return results
+
+    def put(self, key: str, value: BaseModel) -> None:
+        self.put_many({key: value})
+
+    def put_many(self, values: Dict[str, BaseModel]) -> None:
+        now = time.time()
+        rows = [{"key": key, **self._row(value, now)} for key, value in values.items()]
+        if rows:
+            with self.engine.begin() as conn:
+                conn.execute(self._upsert, rows)
+
+        with self._lock:
+            previous = self._writes
+            self._writes += len(values)
+            run_maintenance = self._writes // self.maintenance_interval > previous // self.maintenance_interval
+        if run_maintenance:
+            self._evict()
+
+    def delete(self, key: str) -> bool:
+        with self.engine.begin() as conn:
+            result = conn.execute(delete(self.table).where(self.table.c.key == key))
+        return result.rowcount > 0
+
+    def purge_expired(self) -> int:
+        with self.engine.begin() as conn:
+            result = conn.execute(delete(self.table).where(self.table.c.expires_at <= time.time()))
+        return result.rowcount
+
+    def _upsert_statement(self):
+        """
+        Insert that overwrites an existing row with the same key
+
+        Raises:
+            ValueError: If the database dialect has no upsert support here
+        """
+        columns = ("status", "payload", "updated_at", "expires_at")
+        dialect = self.engine.dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            statement = (sqlite if dialect == "sqlite" else postgresql).insert(self.table)
+            return statement.on_conflict_do_update(
+                index_elements=[self.table.c.key],
+                set_={name: statement.excluded[name] for name in columns}
+            )
+        if dialect in ("mysql", "mariadb"):
+            statement = mysql.insert(self.table)
+            return statement.on_duplicate_key_update({name: statement.inserted[name] for name in columns})
+        raise ValueError(f"Unsupported result store database: {dialect}")
+
+    def _row(self, value: BaseModel, now: float) -> dict:
+        status = getattr(value, "status", None)
+        return {
+            "status": getattr(status, "value", status),
+            "payload": value.model_dump_json(),
+            "updated_at": now,
+            "expires_at": now + self.ttl_seconds if self.ttl_seconds else None,
+        }
+
+    def _evict(self) -> None:
+        """Drop expired rows, then the oldest rows above max_entries"""
+        try:
+            purged = self.purge_expired()
+            with self.engine.begin() as conn:
+                count = conn.execute(select(func.count()).select_from(self.table)).scalar_one()
+                excess = count - self.max_entries
+                if excess > 0:
+                    oldest = select(self.table.c.key).order_by(self.table.c.updated_at).limit(excess)
+                    conn.execute(delete(self.table).where(self.table.c.key.in_(oldest.scalar_subquery())))
+            if purged or excess > 0:
+                logger.info(f"Result store eviction: {purged} expired, {max(excess, 0)} over capacity")
+        except Exception as e:
+            logger.error(f"Result store eviction failed: {str(e)}")
+
+class RedisResultStore(BaseResultStore):
+    """Redis-backed result store; Redis handles TTL and maxmemory eviction"""
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        model_cls: Type[BaseModel] = FinanceWorkflowOutput,
+        key_prefix: str = "workflow_results",
+        ttl_seconds: Optional[float] = 86400
+    ):
+        import redis
+
+        self.model_cls = model_cls
+        self.key_prefix = key_prefix
+        self.ttl_seconds = ttl_seconds
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[BaseModel]:
+        payload = self.client.get(self._key(key))
+        return None if payload is None else self.model_cls.model_validate_json(payload)
+
+    def put(self, key: str, value: BaseModel) -> None:
+        ttl = int(self.ttl_seconds) if self.ttl_seconds else None
+        self.client.set(self._key(key), value.model_dump_json(), ex=ttl)
+
+    def delete(self, key: str) -> bool:
+        return self.client.delete(self._key(key)) > 0
+
+    def purge_expired(self) -> int:
+        # Redis expires keys on its own
+        return 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}"
+
+def _enable_sqlite_wal(dbapi_connection, connection_record):
+    # WAL lets several uvicorn workers read while one writes
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
@@ -0,0 +1,56 @@
+import threading
+import time
+from typing import Any, Dict, List
+from src.common.logger import get_logger
+from src.core.interfaces.store_interface import BaseResultStore
+from src.models.finance_models import WorkflowStatus
+
+logger = get_logger(__name__)
+
+class PartialResultRecorder:
+    """
+    Event sink that appends streamed LLM tokens to a workflow's stored record.
+
+    Tokens are buffered per stage and written to the record's partial_results
+    at most every flush_interval seconds, and whenever a stage completes.
+    Once the record reaches a terminal status (e.g. the API timed the workflow
+    out) the recorder stops writing so it never overwrites the final result.
+    """
+
+    def __init__(self, store: BaseResultStore, workflow_id: str, flush_interval: float = 0.5):
+        self.store = store
+        self.workflow_id = workflow_id
+        self.flush_interval = flush_interval
+        self._parts: Dict[str, List[str]] = {}
+        self._last_flush = 0.0
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    def __call__(self, event: str, data: Dict[str, Any]) -> None:
+        if event == "token":
+            with self._lock:
+                self._parts.setdefault(data["stage"], []).append(data["text"])
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+        elif event == "stage" and data.get("state") == "completed" and data["stage"] in self._parts:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the text streamed so far to the workflow record"""
+        with self._lock:
+            if self._stopped:
+                return
+            self._last_flush = time.monotonic()
+            partial_results = {stage: "".join(parts) for stage, parts in self._parts.items()}
+
+            # Buffered text is cumulative, so a skipped or overwritten flush is repaired by the next one
+            current = self.store.get(self.workflow_id)
+            if current is None:
+                return
+            if current.status in (WorkflowStatus.SUCCESS, WorkflowStatus.FAILED):
+                self._stopped = True
+                return
+            try:
+                self.store.put(self.workflow_id, current.model_copy(update={"partial_results": partial_results}))
+            except Exception as e:
+                logger.warning(f"Could not record partial results for {self.workflow_id}: {str(e)}")
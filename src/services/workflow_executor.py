@@ -0,0 +1,335 @@
+import asyncio
+import math
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+from src.common.logger import get_logger
+from src.services.workflow_scheduler import PriorityScheduler, ScheduledJob
+
+logger = get_logger(__name__)
+
+class WorkflowQueueFullError(Exception):
+    """Raised when the workflow executor cannot accept more work"""
+    pass
+
+class WorkflowExecutor:
+    """
+    Bounded pool that runs blocking workflow calls off the event loop.
+
+    At most max_concurrency workflows run at once and at most queue_depth
+    more wait for a free worker; anything beyond that is rejected with
+    WorkflowQueueFullError so the API can answer 429 instead of piling up.
+    Waiting work is held in a PriorityScheduler rather than the pool's FIFO,
+    so urgent requests overtake queued bulk work. The async executor type
+    runs coroutines on the caller's event loop instead of a pool, so
+    max_concurrency can be set to hundreds.
+    """
+
+    _executor_types = {
+        'thread': ThreadPoolExecutor,
+        'process': ProcessPoolExecutor,
+        'async': None
+    }
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        queue_depth: int = 100,
+        timeout_seconds: Optional[float] = 300,
+        executor_type: str = "thread",
+        aging_seconds: float = 30.0,
+        org_weights: Optional[Dict[str, float]] = None,
+        initial_estimate_seconds: float = 30.0
+    ):
+        if executor_type not in self._executor_types:
+            raise ValueError(f"Unsupported executor type: {executor_type}")
+        self.max_concurrency = max_concurrency
+        self.queue_depth = queue_depth
+        self.timeout_seconds = timeout_seconds
+        self.executor_type = executor_type
+
+        self._pool: Optional[Executor] = None
+        if executor_type == 'thread':
+            self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="workflow")
+        elif executor_type == 'process':
+            self._pool = ProcessPoolExecutor(max_workers=max_concurrency)
+        self._slots = threading.BoundedSemaphore(max_concurrency + queue_depth)
+        self._pending = 0
+        self._running = 0
+        self._scheduler = PriorityScheduler(aging_seconds=aging_seconds, tenant_weights=org_weights)
+        self._avg_duration = initial_estimate_seconds
+        # Per submitted future, resolved when its job leaves the queue; wait() starts the timeout there
+        self._started: "weakref.WeakKeyDictionary[Any, Future]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: int = 1,
+        tenant: str = "default",
+        job_id: Optional[str] = None,
+        on_start: Optional[Callable[[], None]] = None
+    ) -> Future:
+        """
+        Schedule a blocking call on the pool
+
+        Args:
+            fn: Callable to run (must be picklable for the process executor)
+            *args: Arguments passed to fn
+            priority: 1 (normal) to 5 (most urgent)
+            tenant: Organization the work is billed to for fair sharing
+            job_id: Identifier for queue_info lookups
+            on_start: Called when the job leaves the queue for a worker
+
+        Returns:
+            Future for the call result; cancelling it while queued drops the job
+
+        Raises:
+            WorkflowQueueFullError: If running plus queued work is at capacity
+        """
+        if self._pool is None:
+            raise RuntimeError("The async executor only accepts coroutines, use submit_async")
+        self._acquire_slot()
+        result = Future()
+        started = Future()
+        self._started[result] = started
+        job = ScheduledJob(job_id=job_id or str(uuid.uuid4()), priority=priority, tenant=tenant, start=lambda: None)
+        job.start = lambda: self._start_pool_job(job, result, started, on_start, fn, args)
+
+        with self._lock:
+            self._pending += 1
+        result.add_done_callback(self._release_slot)
+        result.add_done_callback(lambda _: self._drop_if_cancelled(job, result))
+        self._enqueue(job)
+        return result
+
+    def submit_async(
+        self,
+        coro_fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+        priority: int = 1,
+        tenant: str = "default",
+        job_id: Optional[str] = None,
+        on_start: Optional[Callable[[], None]] = None
+    ) -> asyncio.Task:
+        """
+        Schedule a coroutine on the running event loop
+
+        Args:
+            coro_fn: Coroutine function to run
+            *args: Arguments passed to coro_fn
+            priority: 1 (normal) to 5 (most urgent)
+            tenant: Organization the work is billed to for fair sharing
+            job_id: Identifier for queue_info lookups
+            on_start: Called when the job leaves the queue
+
+        Returns:
+            Task for the coroutine result
+
+        Raises:
+            WorkflowQueueFullError: If running plus queued work is at capacity
+        """
+        self._acquire_slot()
+        loop = asyncio.get_running_loop()
+        gate = loop.create_future()
+        job = ScheduledJob(job_id=job_id or str(uuid.uuid4()), priority=priority, tenant=tenant, start=lambda: None)
+        job.start = lambda: loop.call_soon_threadsafe(_open_gate, gate)
+        started_signal = Future()
+
+        entered = False
+
+        async def run() -> Any:
+            nonlocal entered
+            await gate
+            entered = True
+            self._notify_start(job, started_signal, on_start)
+            started = time.monotonic()
+            try:
+                return await coro_fn(*args)
+            finally:
+                self._finish(started)
+
+        def settle(finished: asyncio.Task) -> None:
+            # A task cancelled before passing the gate (possibly before its first step) never reaches run's finally
+            if finished.cancelled() and not entered:
+                self._abandon(job)
+            self._release_slot(finished)
+
+        try:
+            task = loop.create_task(run())
+        except Exception:
+            self._slots.release()
+            raise
+
+        self._started[task] = started_signal
+        with self._lock:
+            self._pending += 1
+        task.add_done_callback(settle)
+        self._enqueue(job)
+        return task
+
+    def queue_info(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a queued job's position and estimated wait
+
+        Returns:
+            queue_position (1-based) and estimated_wait_seconds, or None if
+            the job is not waiting in this executor
+        """
+        with self._lock:
+            position = self._scheduler.position(job_id)
+            average = self._avg_duration
+        if position is None:
+            return None
+        # Each batch of max_concurrency jobs ahead costs about one average run
+        return {
+            "queue_position": position,
+            "estimated_wait_seconds": round(math.ceil(position / self.max_concurrency) * average, 1)
+        }
+
+    async def wait(self, future: Union[Future, asyncio.Future], timeout: Optional[float] = None) -> Any:
+        """
+        Await a submitted call without blocking the event loop
+
+        The timeout covers running only: time spent queued for a worker
+        does not count against it.
+
+        Args:
+            future: Future or task returned by submit/submit_async
+            timeout: Seconds to wait once the call starts, defaults to the executor timeout
+
+        Raises:
+            asyncio.TimeoutError: If the call does not finish in time
+        """
+        timeout = self.timeout_seconds if timeout is None else timeout
+        started = self._started.get(future)
+        if not isinstance(future, asyncio.Future):
+            future = asyncio.wrap_future(future)
+        if timeout and started is not None and not started.done():
+            # Ends when the job starts, or when it finishes or is cancelled without starting
+            await asyncio.wait({future, asyncio.wrap_future(started)}, return_when=asyncio.FIRST_COMPLETED)
+        return await asyncio.wait_for(future, timeout or None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get current executor load"""
+        with self._lock:
+            pending = self._pending
+            running = self._running
+            queued_by_priority = self._scheduler.counts_by_priority()
+            average = self._avg_duration
+        return {
+            "executor_type": self.executor_type,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.queue_depth,
+            "in_flight": pending,
+            "running": running,
+            "queued": pending - running,
+            "queued_by_priority": queued_by_priority,
+            "average_duration_seconds": round(average, 2),
+            "available_slots": self.max_concurrency + self.queue_depth - pending
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        logger.info("Shutting down workflow executor")
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _enqueue(self, job: ScheduledJob) -> None:
+        with self._lock:
+            self._scheduler.push(job)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        # Start queued jobs while workers are free; start callbacks run outside the lock
+        while True:
+            with self._lock:
+                if self._running >= self.max_concurrency:
+                    return
+                job = self._scheduler.pop()
+                if job is None:
+                    return
+                job.dispatched = True
+                self._running += 1
+            job.start()
+
+    def _start_pool_job(
+        self,
+        job: ScheduledJob,
+        result: Future,
+        started: Future,
+        on_start: Optional[Callable[[], None]],
+        fn: Callable[..., Any],
+        args: tuple
+    ) -> None:
+        if not result.set_running_or_notify_cancel():
+            self._finish(None)
+            return
+        self._notify_start(job, started, on_start)
+        started = time.monotonic()
+        try:
+            pool_future = self._pool.submit(fn, *args)
+        except Exception as e:
+            result.set_exception(e)
+            self._finish(None)
+            return
+        pool_future.add_done_callback(lambda done: self._complete_pool_job(done, result, started))
+
+    @staticmethod
+    def _notify_start(job: ScheduledJob, started: Future, on_start: Optional[Callable[[], None]]) -> None:
+        if not started.done():
+            started.set_result(None)
+        if on_start is None:
+            return
+        try:
+            on_start()
+        except Exception as e:
+            logger.warning(f"on_start hook failed for job {job.job_id}: {str(e)}")
+
+    def _complete_pool_job(self, done: Future, result: Future, started: float) -> None:
+        if done.cancelled():
+            result.set_exception(RuntimeError("Workflow was cancelled by executor shutdown"))
+        elif done.exception() is not None:
+            result.set_exception(done.exception())
+        else:
+            result.set_result(done.result())
+        self._finish(started)
+
+    def _finish(self, started: Optional[float]) -> None:
+        with self._lock:
+            self._running -= 1
+            if started is not None:
+                # Exponential moving average feeds the estimated wait
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * (time.monotonic() - started)
+        self._dispatch()
+
+    def _drop_if_cancelled(self, job: ScheduledJob, result: Future) -> None:
+        if result.cancelled() and not job.dispatched:
+            with self._lock:
+                self._scheduler.remove(job.job_id)
+
+    def _abandon(self, job: ScheduledJob) -> None:
+        with self._lock:
+            if not job.dispatched:
+                self._scheduler.remove(job.job_id)
+                return
+        # Dispatched but cancelled before the gate opened: free its worker
+        self._finish(None)
+
+    def _acquire_slot(self) -> None:
+        if not self._slots.acquire(blocking=False):
+            raise WorkflowQueueFullError(
+                f"Workflow queue is full ({self.max_concurrency} running, {self.queue_depth} queued)"
+            )
+
+    def _release_slot(self, _future: Any) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+def _open_gate(gate: asyncio.Future) -> None:
+    if not gate.done():
+        gate.set_result(None)
@@ -0,0 +1,145 @@
+import asyncio
+from contextlib import AbstractContextManager
+from typing import Optional
+from src.workflows.finance_workflow import FinanceWorkflow
+from src.config.workflow_config import WorkflowConfig
+from src.core.factories.store_factory import ResultStoreFactory
+from src.core.interfaces.store_interface import BaseResultStore
+from src.llm.rate_limiter import get_rate_limiter
+from src.llm.response_cache import get_response_cache
+from src.models.finance_models import FinanceWorkflowInput, FinanceWorkflowOutput
+from src.services.event_bus import workflow_event_scope
+from src.services.stream_recorder import PartialResultRecorder
+
+# One workflow and store per process; built lazily so process-pool workers create their own
+_finance_workflow: Optional[FinanceWorkflow] = None
+_workflow_store: Optional[BaseResultStore] = None
+
+def get_finance_workflow() -> FinanceWorkflow:
+    """Get the process-wide FinanceWorkflow instance"""
+    global _finance_workflow
+    if _finance_workflow is None:
+        workflow_config = WorkflowConfig()
+        _finance_workflow = FinanceWorkflow(
+            response_cache=get_response_cache(),
+            rate_limiter=get_rate_limiter(),
+            call_deadline_seconds=workflow_config.get_resilience_config()["llm_call_deadline_seconds"],
+            precompute_metrics=workflow_config.get_workflow_config()["precompute_metrics"]
+        )
+    return _finance_workflow
+
+def set_finance_workflow(finance_workflow: Optional[FinanceWorkflow]) -> None:
+    """Replace the process-wide FinanceWorkflow, e.g. with one built on FakeChatModel"""
+    global _finance_workflow
+    _finance_workflow = finance_workflow
+
+def get_workflow_store() -> BaseResultStore:
+    """Get the process-wide workflow result store"""
+    global _workflow_store
+    if _workflow_store is None:
+        _workflow_store = ResultStoreFactory.get_result_store(WorkflowConfig())
+    return _workflow_store
+
+def workflow_scope(
+    workflow_id: Optional[str],
+    input_data: FinanceWorkflowInput,
+    publish_events: bool = True
+) -> AbstractContextManager:
+    """
+    Build the event scope for a workflow run
+
+    In streaming mode (WORKFLOW_STREAMING_ENABLED, overridable per request
+    with metadata["stream"]) the LLM output is streamed and appended to the
+    stored record's partial_results as it arrives.
+    """
+    streaming_config = WorkflowConfig().get_streaming_config()
+    stream = bool((input_data.metadata or {}).get("stream", streaming_config["enabled"]))
+    sinks = []
+    if stream and workflow_id is not None:
+        sinks.append(PartialResultRecorder(
+            get_workflow_store(),
+            workflow_id,
+            flush_interval=streaming_config["flush_interval_seconds"]
+        ))
+    return workflow_event_scope(workflow_id, publish=publish_events, sinks=sinks, stream_tokens=stream)
+
+def run_finance_workflow(
+    workflow_type: str,
+    input_data: FinanceWorkflowInput,
+    workflow_id: Optional[str] = None,
+    publish_events: bool = True
+) -> FinanceWorkflowOutput:
+    """
+    Run a finance workflow synchronously
+
+    Args:
+        workflow_type: Workflow key (financial_analysis, budget_management, ...)
+        input_data: Finance workflow input data
+        workflow_id: Report progress and partial results for this workflow, if given
+        publish_events: Publish events to this process's event bus
+
+    Returns:
+        Workflow execution results
+
+    Raises:
+        ValueError: If workflow type is not supported
+    """
+    finance_workflow = get_finance_workflow()
+    with workflow_scope(workflow_id, input_data, publish_events):
+        if workflow_type == "financial_analysis":
+            return finance_workflow.execute_financial_analysis_workflow(input_data)
+        elif workflow_type == "budget_management":
+            return finance_workflow.execute_budget_management_workflow(input_data)
+        elif workflow_type == "investment_advisory":
+            return finance_workflow.execute_investment_advisory_workflow(input_data)
+        elif workflow_type == "comprehensive":
+            return finance_workflow.execute_comprehensive_workflow(input_data)
+    raise ValueError(f"Unknown workflow type: {workflow_type}")
+
+async def arun_finance_workflow(
+    workflow_type: str,
+    input_data: FinanceWorkflowInput,
+    workflow_id: Optional[str] = None,
+    publish_events: bool = True
+) -> FinanceWorkflowOutput:
+    """
+    Run a finance workflow on the event loop using the async LLM path
+
+    Args:
+        workflow_type: Workflow key (financial_analysis, budget_management, ...)
+        input_data: Finance workflow input data
+        workflow_id: Report progress and partial results for this workflow, if given
+        publish_events: Publish events to this process's event bus
+
+    Returns:
+        Workflow execution results
+
+    Raises:
+        ValueError: If workflow type is not supported
+    """
+    finance_workflow = get_finance_workflow()
+    with workflow_scope(workflow_id, input_data, publish_events):
+        if workflow_type == "financial_analysis":
+            return await finance_workflow.aexecute_financial_analysis_workflow(input_data)
+        elif workflow_type == "budget_management":
+            return await finance_workflow.aexecute_budget_management_workflow(input_data)
+        elif workflow_type == "investment_advisory":
+            return await finance_workflow.aexecute_investment_advisory_workflow(input_data)
+        elif workflow_type == "comprehensive":
+            return await finance_workflow.aexecute_comprehensive_workflow(input_data)
+    raise ValueError(f"Unknown workflow type: {workflow_type}")
+
+def run_invoice_workflow(input_data: FinanceWorkflowInput) -> FinanceWorkflowOutput:
+    """
+    Run invoice processing synchronously
+
+    Module-level so the process executor can pickle it; each worker process
+    builds its own FinanceService.
+    """
+    from src.core.dependencies import DependencyProvider
+
+    return DependencyProvider().get_finance_service().process_invoice(input_data)
+
+async def arun_invoice_workflow(input_data: FinanceWorkflowInput) -> FinanceWorkflowOutput:
+    """Run invoice processing on a worker thread, for the async executor"""
+    return await asyncio.to_thread(run_invoice_workflow, input_data)
@@ -0,0 +1,150 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterator, Optional, Tuple
+
+# FinanceWorkflowInput.priority runs from 1 (normal) to 5 (most urgent)
+MAX_PRIORITY = 5
+
+# How long computed queue positions are reused while the queue is unchanged
+POSITION_CACHE_SECONDS = 1.0
+
+@dataclass
+class ScheduledJob:
+    """A queued unit of work and the callback that starts it"""
+    job_id: str
+    priority: int
+    tenant: str
+    start: Callable[[], None]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    dispatched: bool = False
+
+class PriorityScheduler:
+    """
+    Admission queue ordering work by priority, tenant fairness and age.
+
+    Jobs wait in one FIFO per (priority, tenant). The next job comes from
+    the queue whose head has the highest effective priority, where waiting
+    aging_seconds raises a job's priority by one level (up to MAX_PRIORITY)
+    so bulk low-priority work cannot starve forever. Ties go to the tenant
+    that has received the least service relative to its weight, so one
+    organization's bulk upload shares workers with everyone else's requests.
+
+    Not thread-safe; callers hold their own lock.
+    """
+
+    def __init__(self, aging_seconds: float = 30.0, tenant_weights: Optional[Dict[str, float]] = None):
+        self.aging_seconds = aging_seconds
+        self.tenant_weights = tenant_weights or {}
+        self._queues: Dict[Tuple[int, str], Deque[ScheduledJob]] = {}
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._served: Dict[str, float] = {}
+        self._virtual_time = 0.0
+        # Bumped on every queue change; keys the cached dispatch order
+        self._version = 0
+        self._positions: Optional[Tuple[int, float, Dict[str, int]]] = None
+
+    def push(self, job: ScheduledJob) -> None:
+        """Queue a job behind others of the same priority and tenant"""
+        if not self._is_backlogged(job.tenant):
+            # Returning tenants start at the current virtual time instead of
+            # cashing in service they did not use while idle
+            self._served[job.tenant] = max(self._served.get(job.tenant, 0.0), self._virtual_time)
+        self._queues.setdefault((job.priority, job.tenant), deque()).append(job)
+        self._jobs[job.job_id] = job
+        self._version += 1
+
+    def pop(self) -> Optional[ScheduledJob]:
+        """Remove and return the job that should run next"""
+        key = self._select(self._queues, self._served, time.monotonic())
+        if key is None:
+            return None
+        job = self._take(self._queues, key)
+        del self._jobs[job.job_id]
+        self._version += 1
+        self._virtual_time = self._served[job.tenant]
+        self._served[job.tenant] += 1.0 / self._weight(job.tenant)
+        return job
+
+    def remove(self, job_id: str) -> bool:
+        """Drop a queued job, e.g. when its caller gave up waiting"""
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return False
+        key = (job.priority, job.tenant)
+        self._queues[key].remove(job)
+        if not self._queues[key]:
+            del self._queues[key]
+        self._version += 1
+        return True
+
+    def position(self, job_id: str) -> Optional[int]:
+        """
+        Get a queued job's 1-based place in dispatch order
+
+        Simulates the dispatch sequence on a copy of the queues, so the
+        answer accounts for priority, fairness and aging. A simulation costs
+        O(queued jobs x queues); its result answers every position lookup
+        until the queue changes or POSITION_CACHE_SECONDS pass, so status
+        polls from many clients cost one simulation between queue changes.
+        """
+        if job_id not in self._jobs:
+            return None
+        now = time.monotonic()
+        if self._positions is None or self._positions[0] != self._version or now - self._positions[1] >= POSITION_CACHE_SECONDS:
+            order = {job.job_id: index for index, job in enumerate(self._dispatch_order(now), start=1)}
+            self._positions = (self._version, now, order)
+        return self._positions[2].get(job_id)
+
+    def counts_by_priority(self) -> Dict[int, int]:
+        """Get the number of queued jobs per priority level"""
+        counts: Dict[int, int] = {}
+        for (priority, _tenant), queue in self._queues.items():
+            counts[priority] = counts.get(priority, 0) + len(queue)
+        return counts
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def _dispatch_order(self, now: float) -> Iterator[ScheduledJob]:
+        queues = {key: deque(queue) for key, queue in self._queues.items()}
+        served = dict(self._served)
+        while True:
+            key = self._select(queues, served, now)
+            if key is None:
+                return
+            job = self._take(queues, key)
+            served[job.tenant] += 1.0 / self._weight(job.tenant)
+            yield job
+
+    def _select(
+        self,
+        queues: Dict[Tuple[int, str], Deque[ScheduledJob]],
+        served: Dict[str, float],
+        now: float
+    ) -> Optional[Tuple[int, str]]:
+        best_key, best_rank = None, None
+        for key, queue in queues.items():
+            head = queue[0]
+            rank = (self._effective_priority(head, now), -served[head.tenant], -head.enqueued_at)
+            if best_rank is None or rank > best_rank:
+                best_key, best_rank = key, rank
+        return best_key
+
+    def _effective_priority(self, job: ScheduledJob, now: float) -> int:
+        if self.aging_seconds <= 0:
+            return job.priority
+        return min(MAX_PRIORITY, job.priority + int((now - job.enqueued_at) / self.aging_seconds))
+
+    @staticmethod
+    def _take(queues: Dict[Tuple[int, str], Deque[ScheduledJob]], key: Tuple[int, str]) -> ScheduledJob:
+        job = queues[key].popleft()
+        if not queues[key]:
+            del queues[key]
+        return job
+
+    def _is_backlogged(self, tenant: str) -> bool:
+        return any(key[1] == tenant for key in self._queues)
+
+    def _weight(self, tenant: str) -> float:
+        return max(self.tenant_weights.get(tenant, 1.0), 1e-6)
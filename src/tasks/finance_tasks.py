@@ -1,6 +1,7 @@
 from src.core.base_task import BaseFinanceTask
 from crewai import Task, Agent
-from typing import Any
+from functools import lru_cache
+from typing import Any, List, Optional
 
 class FinancialAnalysisTask(BaseFinanceTask):
     def get_description(self, data: Any) -> str:
@@ -99,17 +100,22 @@ class FinanceTasks:
             'compliance_check': ComplianceCheckTask()
         }
     
-    def financial_analysis_task(self, agent: Agent, data: Any) -> Task:
-        return self._tasks['financial_analysis'].create_task(agent, data)
+    def financial_analysis_task(self, agent: Agent, data: Any, async_execution: bool = False, context: Optional[List[Task]] = None) -> Task:
+        return self._tasks['financial_analysis'].create_task(agent, data, async_execution=async_execution, context=context)
     
-    def risk_assessment_task(self, agent: Agent, data: Any) -> Task:
-        return self._tasks['risk_assessment'].create_task(agent, data)
+    def risk_assessment_task(self, agent: Agent, data: Any, async_execution: bool = False, context: Optional[List[Task]] = None) -> Task:
+        return self._tasks['risk_assessment'].create_task(agent, data, async_execution=async_execution, context=context)
     
-    def budget_monitoring_task(self, agent: Agent, data: Any) -> Task:
-        return self._tasks['budget_monitoring'].create_task(agent, data)
+    def budget_monitoring_task(self, agent: Agent, data: Any, async_execution: bool = False, context: Optional[List[Task]] = None) -> Task:
+        return self._tasks['budget_monitoring'].create_task(agent, data, async_execution=async_execution, context=context)
     
-    def investment_analysis_task(self, agent: Agent, data: Any) -> Task:
-        return self._tasks['investment_analysis'].create_task(agent, data)
+    def investment_analysis_task(self, agent: Agent, data: Any, async_execution: bool = False, context: Optional[List[Task]] = None) -> Task:
+        return self._tasks['investment_analysis'].create_task(agent, data, async_execution=async_execution, context=context)
     
-    def compliance_check_task(self, agent: Agent, data: Any) -> Task:
-        return self._tasks['compliance_check'].create_task(agent, data)
\ No newline at end of file
+    def compliance_check_task(self, agent: Agent, data: Any, async_execution: bool = False, context: Optional[List[Task]] = None) -> Task:
+        return self._tasks['compliance_check'].create_task(agent, data, async_execution=async_execution, context=context)
+
+@lru_cache()
+def get_finance_tasks() -> FinanceTasks:
+    """Get the process-wide finance task factory"""
+    return FinanceTasks()
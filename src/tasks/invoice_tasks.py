@@ -1,6 +1,7 @@
 from crewai import Task
 from typing import Any, Dict
 from src.common.logger import get_logger
+from src.llm.prompt_compactor import compact_payload
 
 logger = get_logger(__name__)
 
@@ -16,7 +17,7 @@ class InvoiceTasks:
             3. Validate extracted data format
             4. Return structured data
             
-            Invoice data: {invoice_data}
+            Invoice data: {compact_payload(invoice_data, label='invoice_data')}
             """,
             agent=agent
         )
@@ -33,7 +34,7 @@ class InvoiceTasks:
             4. Check for duplicates
             5. Verify budget availability
             
-            Invoice data: {invoice_data}
+            Invoice data: {compact_payload(invoice_data, label='invoice_data')}
             """,
             agent=agent
         )
@@ -49,7 +50,7 @@ class InvoiceTasks:
             3. Track approval status
             4. Handle approval/rejection actions
             
-            Invoice data: {invoice_data}
+            Invoice data: {compact_payload(invoice_data, label='invoice_data')}
             """,
             agent=agent,
             requires_human_input=True  # Enable human approver interaction
@@ -61,12 +62,12 @@ class InvoiceTasks:
         return Task(
             description=f"""
             Execute payment for approved invoice:
-            1. Prepare payment data
-            2. Submit to payment gateway
-            3. Record transaction details
+            1. Prepare payment data: vendor, invoice_number, amount and currency as they appear on the invoice
+            2. Submit to payment gateway (payments are idempotent per vendor, invoice_number and amount, so never alter them)
+            3. Record the payment status and idempotency key
             4. Update payment status
             
-            Invoice data: {invoice_data}
+            Invoice data: {compact_payload(invoice_data, label='invoice_data')}
             """,
             agent=agent
         )
@@ -82,7 +83,7 @@ class InvoiceTasks:
             3. Check regulatory requirements
             4. Generate compliance report
             
-            Invoice data: {invoice_data}
+            Invoice data: {compact_payload(invoice_data, label='invoice_data')}
             """,
             agent=agent
         )
\ No newline at end of file
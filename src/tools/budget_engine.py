@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Sequence
+from pydantic import BaseModel
+from src.models.finance_models import BudgetData
+
+GROUP_COLUMNS = ("department", "category")
+
+def analyze_budget_rows(
+    rows: Sequence[Any],
+    trend_window: int = 3,
+    forecast_periods: int = 3,
+    top_n: int = 5
+) -> Dict[str, Any]:
+    """
+    Grouped budget variance analysis over many BudgetData rows in one pass
+
+    Rows are aggregated by department, category and period with pandas
+    group-bys. Per-period totals get a rolling average of actual spend and
+    a linear-trend forecast. Per-department trends are fitted for all
+    departments at once with a single least-squares solve.
+
+    Args:
+        rows: BudgetData models or dicts with department, category, period, budgeted_amount, actual_amount
+        trend_window: Periods in the rolling average of actual spend
+        forecast_periods: Future periods to project from the linear trend
+        top_n: Largest line-item overruns to report
+
+    Returns:
+        Compact totals, breakdowns, per-period trend and forecast, and top overruns
+
+    Raises:
+        ValueError: If no rows are given or a row is missing required fields
+    """
+    if not rows:
+        raise ValueError("No budget rows provided")
+    frame = pd.DataFrame([BudgetData(**row).model_dump() if not isinstance(row, BaseModel) else row.model_dump() for row in rows])
+    frame = frame.rename(columns={"budgeted_amount": "budgeted", "actual_amount": "actual"})
+    frame["variance"] = frame["actual"] - frame["budgeted"]
+
+    periods = _ordered_periods(frame["period"].unique().tolist())
+    frame["period"] = pd.Categorical(frame["period"], categories=periods, ordered=True)
+
+    by_period = _grouped(frame, "period")
+    actual = by_period["actual"].to_numpy()
+    by_period["rolling_actual"] = by_period["actual"].rolling(trend_window, min_periods=1).mean()
+    slope, intercept = _fit_trend(actual)
+
+    pivot = frame.pivot_table(index="department", columns="period", values="actual", aggfunc="sum", observed=False).fillna(0.0)
+    department_slopes = dict(zip(pivot.index, _fit_trend(pivot.to_numpy().T)[0].tolist())) if len(periods) > 1 else {}
+    by_department = _grouped(frame, "department")
+    by_department["trend_per_period"] = by_department.index.map(lambda name: department_slopes.get(name))
+
+    lines = frame.sort_values("variance", ascending=False)
+    overruns = lines[lines["variance"] > 0].head(top_n)
+    totals = _with_variance_pct(frame[["budgeted", "actual", "variance"]].sum().to_frame().T).iloc[0]
+
+    return {
+        "lines": len(frame),
+        "totals": _round_record(totals.to_dict()),
+        "by_department": _records(by_department),
+        "by_category": _records(_grouped(frame, "category")),
+        "by_period": _records(by_period),
+        "trend": {
+            "actual_per_period": _round(slope),
+            "rolling_window": trend_window
+        },
+        "forecast": {
+            label: _round(intercept + slope * (len(periods) - 1 + step))
+            for step, label in enumerate(_future_periods(periods, forecast_periods), start=1)
+        } if len(periods) > 1 else {},
+        "over_budget_groups": int((frame.groupby(list(GROUP_COLUMNS), observed=True)["variance"].sum() > 0).sum()),
+        "top_overruns": [
+            {
+                "department": row.department,
+                "category": row.category,
+                "period": str(row.period),
+                "variance": _round(row.variance),
+                "variance_percentage": _round(row.variance / row.budgeted * 100) if row.budgeted else None
+            }
+            for row in overruns.itertuples()
+        ]
+    }
+
+def _grouped(frame: pd.DataFrame, column: str) -> pd.DataFrame:
+    grouped = frame.groupby(column, observed=True)[["budgeted", "actual", "variance"]].sum()
+    return _with_variance_pct(grouped)
+
+def _with_variance_pct(frame: pd.DataFrame) -> pd.DataFrame:
+    budgeted = frame["budgeted"].to_numpy(dtype=float)
+    frame["variance_percentage"] = np.divide(
+        frame["variance"].to_numpy(dtype=float) * 100, budgeted,
+        out=np.zeros(len(frame)), where=budgeted != 0
+    )
+    return frame
+
+def _fit_trend(values: np.ndarray) -> tuple:
+    # Least-squares slope and intercept over the period index; a 2-D input fits one series per column
+    if len(values) < 2:
+        return 0.0, float(values[0]) if len(values) else 0.0
+    return tuple(np.polyfit(np.arange(len(values), dtype=float), values, 1))
+
+def _ordered_periods(periods: List[str]) -> List[str]:
+    # Calendar order when every label parses as a period (2026-01, 2026Q1, 2026), otherwise lexical
+    try:
+        parsed = {period: pd.Period(period) for period in periods}
+    except (ValueError, TypeError):
+        return sorted(periods)
+    if len({value.freqstr for value in parsed.values()}) != 1:
+        return sorted(periods)
+    return sorted(periods, key=parsed.get)
+
+def _future_periods(periods: List[str], count: int) -> List[str]:
+    try:
+        last = pd.Period(periods[-1])
+        return [str(last + step) for step in range(1, count + 1)]
+    except (ValueError, TypeError):
+        return [f"+{step}" for step in range(1, count + 1)]
+
+def _records(frame: pd.DataFrame) -> Dict[str, Dict[str, Optional[float]]]:
+    return {str(index): _round_record(values) for index, values in frame.to_dict(orient="index").items()}
+
+def _round_record(values: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    return {key: _round(value) for key, value in values.items()}
+
+def _round(value: Any) -> Optional[float]:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return round(float(value), 2)
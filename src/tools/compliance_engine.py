@@ -0,0 +1,220 @@
+import json
+import operator
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+from src.common.logger import get_logger
+from src.config.workflow_config import WorkflowConfig
+from src.models.finance_models import ComplianceCheck
+
+logger = get_logger(__name__)
+
+SEVERITIES = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+
+# Declarative rules: a transaction violates a rule when every "when" condition
+# holds and (if "require" is given) any required field is missing.
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    *(
+        {
+            "rule_id": f"REQUIRED_{name.upper()}",
+            "description": f"Missing required field: {name}",
+            "severity": "MEDIUM",
+            "penalty": 20,
+            "require": [name],
+            "remediation": ["Ensure all required fields are completed before submission"]
+        }
+        for name in ("amount", "date", "description", "approver")
+    ),
+    {
+        "rule_id": "SECONDARY_APPROVAL",
+        "description": "Transactions over $10,000 require secondary approval",
+        "severity": "HIGH",
+        "penalty": 15,
+        "when": [{"field": "amount", "op": ">", "value": 10000}],
+        "require": ["secondary_approver"],
+        "remediation": ["Obtain secondary approver signature for high-value transactions"]
+    },
+    {
+        "rule_id": "SUPPORTING_DOCUMENTS",
+        "description": "Transactions over $5,000 require supporting documentation",
+        "severity": "MEDIUM",
+        "penalty": 10,
+        "when": [{"field": "amount", "op": ">", "value": 5000}],
+        "require": ["supporting_documents"],
+        "remediation": ["Attach relevant supporting documents (receipts, invoices, contracts)"]
+    }
+]
+
+_NUMERIC_OPS: Dict[str, Callable[[Any, Any], Any]] = {
+    ">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le
+}
+
+@dataclass
+class ComplianceRule:
+    """One declarative compliance rule"""
+    rule_id: str
+    description: str
+    severity: str = "MEDIUM"
+    penalty: int = 10
+    when: List[Dict[str, Any]] = field(default_factory=list)
+    require: List[str] = field(default_factory=list)
+    remediation: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.severity = self.severity.upper()
+        if self.severity not in SEVERITIES:
+            raise ValueError(f"Rule {self.rule_id}: severity must be one of {', '.join(SEVERITIES)}")
+        if not self.when and not self.require:
+            raise ValueError(f"Rule {self.rule_id}: needs at least one 'when' condition or 'require' field")
+        for condition in self.when:
+            if condition.get("op") not in (*_NUMERIC_OPS, "==", "!=", "in", "not_in", "missing", "present"):
+                raise ValueError(f"Rule {self.rule_id}: unsupported operator {condition.get('op')!r}")
+
+    def violated(self, frame: pd.DataFrame) -> np.ndarray:
+        """Boolean mask of the rows violating this rule"""
+        mask = np.ones(len(frame), dtype=bool)
+        for condition in self.when:
+            mask &= _condition_mask(frame, condition)
+        if self.require:
+            mask &= np.logical_or.reduce([~_present(frame, name) for name in self.require])
+        return mask
+
+class ComplianceEvaluation:
+    """
+    Result of evaluating every rule over a batch of transactions.
+
+    Holds a (rules x transactions) violation matrix; per-transaction scores
+    and statuses are derived from it with array operations. ComplianceCheck
+    objects are only built on request, for violations.
+    """
+
+    def __init__(self, rules: Sequence[ComplianceRule], violations: np.ndarray, ids: Sequence[Any], pass_score: int):
+        self.rules = list(rules)
+        self.violations = violations
+        self.ids = list(ids)
+        self.pass_score = pass_score
+        penalties = np.array([rule.penalty for rule in self.rules])
+        critical = np.array([rule.severity == "CRITICAL" for rule in self.rules])
+        self.scores = np.maximum(0, 100 - penalties @ violations) if len(self.rules) else np.full(len(self.ids), 100)
+        blocking = (violations[critical].any(axis=0) if critical.any() else np.zeros(len(self.ids), dtype=bool))
+        self.compliant = (self.scores >= pass_score) & ~blocking
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def summary(self) -> Dict[str, Any]:
+        """Batch totals and violation counts per rule"""
+        counts = self.violations.sum(axis=1).tolist()
+        return {
+            "transactions_checked": len(self),
+            "non_compliant": int((~self.compliant).sum()),
+            "average_score": float(self.scores.mean()) if len(self) else 100.0,
+            "rule_violations": {rule.rule_id: count for rule, count in zip(self.rules, counts) if count}
+        }
+
+    def checks(self, index: int) -> List[ComplianceCheck]:
+        """ComplianceCheck for every rule one transaction violates"""
+        return [
+            ComplianceCheck(
+                rule_id=rule.rule_id,
+                rule_description=rule.description,
+                status="WARNING" if rule.severity == "LOW" else "NON_COMPLIANT",
+                severity=rule.severity,
+                details=f"Transaction {self.ids[index]}: {rule.description}",
+                remediation_steps=rule.remediation or None
+            )
+            for rule, violated in zip(self.rules, self.violations[:, index]) if violated
+        ]
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Per-transaction score, status, issues and recommendations"""
+        scores = self.scores.tolist()
+        compliant = self.compliant.tolist()
+        flagged = set(np.flatnonzero(self.violations.any(axis=0)).tolist())
+        results = []
+        for index in range(len(self)):
+            violated = [rule for rule, hit in zip(self.rules, self.violations[:, index]) if hit] if index in flagged else []
+            results.append({
+                "compliance_score": scores[index],
+                "status": "COMPLIANT" if compliant[index] else "NON_COMPLIANT",
+                "issues": [rule.description for rule in violated],
+                "recommendations": list(dict.fromkeys(step for rule in violated for step in rule.remediation))
+            })
+        return results
+
+class ComplianceRuleEngine:
+    """
+    Evaluate declarative compliance rules over batches of transactions.
+
+    Rules are validated once at construction. Each rule is evaluated as a
+    boolean column over the whole batch (a list of dicts or a DataFrame),
+    so screening cost grows with rules x columns rather than with Python
+    work per transaction.
+    """
+
+    def __init__(self, rules: Optional[Sequence[Union[ComplianceRule, Dict[str, Any]]]] = None, pass_score: int = 80):
+        self.rules = [rule if isinstance(rule, ComplianceRule) else ComplianceRule(**rule) for rule in (rules or DEFAULT_RULES)]
+        duplicates = {rule.rule_id for rule in self.rules if sum(r.rule_id == rule.rule_id for r in self.rules) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate compliance rule ids: {', '.join(sorted(duplicates))}")
+        self.pass_score = pass_score
+
+    def evaluate(self, transactions: Union[pd.DataFrame, Sequence[Dict[str, Any]]], id_field: str = "id") -> ComplianceEvaluation:
+        """
+        Evaluate every rule over a batch
+
+        Args:
+            transactions: DataFrame or list of transaction dicts
+            id_field: Column identifying transactions in ComplianceCheck details (row position if absent)
+
+        Returns:
+            Evaluation holding the violation matrix, scores and statuses
+        """
+        frame = transactions if isinstance(transactions, pd.DataFrame) else pd.DataFrame.from_records(list(transactions))
+        ids = frame[id_field].tolist() if id_field in frame.columns else list(range(len(frame)))
+        violations = np.vstack([rule.violated(frame) for rule in self.rules]) if self.rules else np.zeros((0, len(frame)), dtype=bool)
+        return ComplianceEvaluation(self.rules, violations, ids, self.pass_score)
+
+def load_rules(path: str) -> List[Dict[str, Any]]:
+    """Load rule definitions from a JSON file holding a list of rules or {"rules": [...]}"""
+    with open(path) as file:
+        data = json.load(file)
+    return data["rules"] if isinstance(data, dict) else data
+
+@lru_cache()
+def get_compliance_engine() -> ComplianceRuleEngine:
+    """Get the process-wide rule engine, built from COMPLIANCE_RULES_PATH or the default rules"""
+    compliance_config = WorkflowConfig().get_compliance_config()
+    rules = load_rules(compliance_config["rules_path"]) if compliance_config["rules_path"] else None
+    engine = ComplianceRuleEngine(rules, pass_score=compliance_config["pass_score"])
+    logger.info(f"Loaded {len(engine.rules)} compliance rules")
+    return engine
+
+def _present(frame: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in frame.columns:
+        return np.zeros(len(frame), dtype=bool)
+    return frame[name].notna().to_numpy()
+
+def _condition_mask(frame: pd.DataFrame, condition: Dict[str, Any]) -> np.ndarray:
+    name, op, value = condition["field"], condition["op"], condition.get("value")
+    if op == "present":
+        return _present(frame, name)
+    if op == "missing":
+        return ~_present(frame, name)
+    if name not in frame.columns:
+        # Absent fields never satisfy a comparison
+        return np.full(len(frame), op in ("!=", "not_in"))
+    column = frame[name]
+    if op in _NUMERIC_OPS:
+        numbers = pd.to_numeric(column, errors="coerce").to_numpy(dtype=float)
+        with np.errstate(invalid="ignore"):
+            return _NUMERIC_OPS[op](numbers, float(value))
+    if op == "==":
+        return (column == value).to_numpy()
+    if op == "!=":
+        return (column != value).to_numpy()
+    if op == "in":
+        return column.isin(value).to_numpy()
+    return ~column.isin(value).to_numpy()
@@ -0,0 +1,66 @@
+import time
+from typing import Any, Dict, List, Optional
+from src.common.resilience import call_with_retry
+from src.core.interfaces.erp_interface import BaseERPClient
+from src.llm.http_clients import get_http_client
+from src.tools.mock_erp import MockERPDataset
+
+class HttpERPClient(BaseERPClient):
+    """
+    ERP reached over HTTP (ERP_API_URL).
+
+    Requests share the process-wide keep-alive connection pool, and
+    invoices are validated batch_size at a time in one POST each. Calls go
+    through the erp circuit breaker and are retried on transient failures.
+    """
+
+    def __init__(self, url: str, timeout_seconds: float = 30.0, batch_size: int = 500):
+        if not url:
+            raise ValueError("ERP_API_URL is required for the http ERP client")
+        self.url = url.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+        self.batch_size = batch_size
+
+    def fetch_changes(self, cursor: Optional[str] = None) -> Dict[str, Any]:
+        params = {"since": cursor} if cursor else {}
+        return self._call(lambda: get_http_client().get(f"{self.url}/changes", params=params, timeout=self.timeout_seconds))
+
+    def validate_invoices(self, invoices: List[Dict[str, Any]]) -> List[Dict[str, bool]]:
+        results = []
+        for start in range(0, len(invoices), self.batch_size):
+            batch = invoices[start:start + self.batch_size]
+            body = self._call(lambda: get_http_client().post(
+                f"{self.url}/invoices/validate", json={"invoices": batch}, timeout=self.timeout_seconds
+            ))
+            if len(body["results"]) != len(batch):
+                raise ValueError(f"ERP returned {len(body['results'])} results for {len(batch)} invoices")
+            results.extend(body["results"])
+        return results
+
+    def _call(self, request) -> Dict[str, Any]:
+        def attempt():
+            response = request()
+            response.raise_for_status()
+            return response.json()
+        return call_with_retry("erp", attempt, deadline_seconds=2 * self.timeout_seconds)
+
+class MockERPClient(BaseERPClient):
+    """
+    In-process client over a MockERPDataset, for development without an ERP.
+
+    latency_seconds simulates the network round trip of each request.
+    """
+
+    def __init__(self, dataset: Optional[MockERPDataset] = None, latency_seconds: float = 0.0):
+        self.dataset = dataset or MockERPDataset.generate()
+        self.latency_seconds = latency_seconds
+
+    def fetch_changes(self, cursor: Optional[str] = None) -> Dict[str, Any]:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return self.dataset.changes(cursor)
+
+    def validate_invoices(self, invoices: List[Dict[str, Any]]) -> List[Dict[str, bool]]:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return self.dataset.validate(invoices)
@@ -0,0 +1,125 @@
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+OPEN_PO_STATUSES = ("open", "partially_received")
+
+def vendor_key(name: Any) -> str:
+    """Normalized vendor name used for lookups ("ACME  Supplies " -> "acme supplies")"""
+    return re.sub(r"\s+", " ", str(name or "")).strip().casefold()
+
+def match_invoice(
+    invoice: Dict[str, Any],
+    vendor: Optional[Dict[str, Any]],
+    purchase_order: Optional[Dict[str, Any]],
+    amount_tolerance: float = 0.0
+) -> Dict[str, bool]:
+    """
+    Validate one invoice against its vendor-master record and purchase order
+
+    Shared by the local index and the mock ERP so both give the same answers.
+
+    Args:
+        invoice: Invoice fields (vendor or vendor_id, po_number, amount, currency)
+        vendor: Vendor-master record, or None if unknown
+        purchase_order: Purchase order record, or None if unknown
+        amount_tolerance: Fraction an invoice may exceed the PO's remaining amount by
+
+    Returns:
+        po_match, vendor_valid and budget_available flags
+    """
+    vendor_valid = bool(vendor) and bool(vendor.get("active", True))
+    po_match = (
+        vendor_valid
+        and purchase_order is not None
+        and purchase_order.get("status", "open") in OPEN_PO_STATUSES
+        and purchase_order.get("vendor_id") == vendor.get("vendor_id")
+        and (not invoice.get("currency") or invoice.get("currency") == purchase_order.get("currency", invoice.get("currency")))
+    )
+    try:
+        amount = float(invoice.get("amount") or 0)
+    except (TypeError, ValueError):
+        amount = float("inf")
+    budget_available = po_match and amount <= float(purchase_order.get("amount_remaining", 0)) * (1 + amount_tolerance)
+    return {"po_match": po_match, "vendor_valid": vendor_valid, "budget_available": budget_available}
+
+class ERPIndex:
+    """
+    Local copy of the ERP vendor master and open purchase orders.
+
+    Holds every vendor by id and normalized name (inactive ones too, so
+    they are rejected locally) and open POs by PO number. apply_changes()
+    upserts records from the ERP change feed and drops POs that closed, so
+    a refresh costs as much as the changes since the last cursor rather
+    than a full reload. Safe to read from several threads while a refresh
+    runs.
+    """
+
+    def __init__(self):
+        self._vendors: Dict[str, Dict[str, Any]] = {}
+        self._vendor_ids_by_name: Dict[str, str] = {}
+        self._purchase_orders: Dict[str, Dict[str, Any]] = {}
+        self.cursor: Optional[str] = None
+        self.refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._vendors) + len(self._purchase_orders)
+
+    def apply_changes(self, vendors: Iterable[Dict[str, Any]], purchase_orders: Iterable[Dict[str, Any]], cursor: Optional[str]) -> int:
+        """
+        Apply one page of the ERP change feed
+
+        Returns:
+            Number of records applied
+        """
+        applied = 0
+        with self._lock:
+            for vendor in vendors:
+                vendor_id = str(vendor["vendor_id"])
+                previous = self._vendors.pop(vendor_id, None)
+                if previous is not None:
+                    self._vendor_ids_by_name.pop(vendor_key(previous.get("name")), None)
+                self._vendors[vendor_id] = vendor
+                self._vendor_ids_by_name[vendor_key(vendor.get("name"))] = vendor_id
+                applied += 1
+            for purchase_order in purchase_orders:
+                po_number = str(purchase_order["po_number"])
+                if purchase_order.get("status", "open") in OPEN_PO_STATUSES:
+                    self._purchase_orders[po_number] = purchase_order
+                else:
+                    self._purchase_orders.pop(po_number, None)
+                applied += 1
+            self.cursor = cursor
+            self.refreshed_at = time.monotonic()
+        return applied
+
+    def lookup(self, invoice: Dict[str, Any], amount_tolerance: float = 0.0) -> Optional[Dict[str, bool]]:
+        """
+        Validate an invoice from the index alone
+
+        Returns:
+            Validation flags, or None when the vendor or PO is not in the
+            index and the ERP has to decide
+        """
+        with self._lock:
+            vendor_id = invoice.get("vendor_id")
+            vendor = self._vendors.get(str(vendor_id)) if vendor_id is not None else None
+            if vendor is None:
+                vendor = self._vendors.get(self._vendor_ids_by_name.get(vendor_key(invoice.get("vendor")), ""))
+            po_number = invoice.get("po_number")
+            purchase_order = self._purchase_orders.get(str(po_number)) if po_number else None
+        if vendor is None or (po_number and purchase_order is None and vendor.get("active", True)):
+            return None
+        return match_invoice(invoice, vendor, purchase_order, amount_tolerance)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "vendors": len(self._vendors),
+                "active_vendors": sum(bool(vendor.get("active", True)) for vendor in self._vendors.values()),
+                "open_purchase_orders": len(self._purchase_orders),
+                "cursor": self.cursor,
+                "age_seconds": round(time.monotonic() - self.refreshed_at, 1) if self.refreshed_at else None
+            }
@@ -1,83 +1,83 @@
 from crewai.tools import tool
 import pandas as pd
-import yfinance as yf
 import numpy as np
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Optional
 import requests
+from src.config.workflow_config import WorkflowConfig
+from src.core.factories.market_data_factory import MarketDataFactory
+from src.core.interfaces.market_data_interface import BaseMarketDataProvider
+from src.tools.market_data import period_to_range, summarize_history
+from src.tools.budget_engine import analyze_budget_rows
+from src.tools.compliance_engine import get_compliance_engine
+from src.tools.metrics_engine import analyze_budget, portfolio_risk
+from src.tools.risk_engine import compute_risk_metrics
 
 @tool
 def financial_data_tool(symbol: str, period: str = "1y") -> Dict[str, Any]:
-    """Retrieves financial data from various sources including stock prices, company financials, and market data"""
+    """Retrieves financial data from various sources including stock prices, company financials, and market data. Pass several comma-separated symbols to fetch them in one batch."""
+    symbols = [s.strip().upper() for s in symbol.split(",") if s.strip()]
     try:
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period=period)
-        info = ticker.info
-        
-        return {
-            "symbol": symbol,
-            "current_price": hist['Close'].iloc[-1],
-            "price_change": hist['Close'].iloc[-1] - hist['Close'].iloc[-2],
-            "volume": hist['Volume'].iloc[-1],
-            "market_cap": info.get('marketCap', 'N/A'),
-            "pe_ratio": info.get('trailingPE', 'N/A'),
-            "dividend_yield": info.get('dividendYield', 'N/A'),
-            "historical_data": hist.to_dict()
-        }
+        provider = get_market_data_provider()
+        start, end = period_to_range(period)
+        history = provider.get_history(symbols, start, end)
+        info = provider.get_info(list(history))
+
+        summaries = {}
+        for name in symbols:
+            if name not in history:
+                summaries[name] = {"symbol": name, "error": f"No market data for {name}"}
+                continue
+            fundamentals = info.get(name, {})
+            summaries[name] = {
+                "symbol": name,
+                **summarize_history(history[name]),
+                "market_cap": fundamentals.get("market_cap", "N/A"),
+                "pe_ratio": fundamentals.get("pe_ratio", "N/A"),
+                "dividend_yield": fundamentals.get("dividend_yield", "N/A")
+            }
+        return summaries[symbols[0]] if len(symbols) == 1 else {"period": period, "symbols": summaries}
     except Exception as e:
         return {"error": f"Failed to retrieve data for {symbol}: {str(e)}"}
 
+@lru_cache()
+def get_market_data_provider() -> BaseMarketDataProvider:
+    """Get the process-wide market data provider"""
+    return MarketDataFactory.get_market_data_provider(WorkflowConfig())
+
 @tool
 def risk_calculator_tool(returns_data: List[float], confidence_level: float = 0.95) -> Dict[str, float]:
     """Calculates various risk metrics including VaR, volatility, and correlation analysis"""
     try:
-        returns = np.array(returns_data)
-        
-        # Calculate risk metrics
-        volatility = np.std(returns) * np.sqrt(252)  # Annualized volatility
-        var_95 = np.percentile(returns, (1 - confidence_level) * 100)
-        sharpe_ratio = np.mean(returns) / np.std(returns) * np.sqrt(252)
-        max_drawdown = _calculate_max_drawdown(returns)
-        
-        return {
-            "volatility": volatility,
-            "value_at_risk": var_95,
-            "sharpe_ratio": sharpe_ratio,
-            "max_drawdown": max_drawdown,
-            "mean_return": np.mean(returns),
-            "std_deviation": np.std(returns)
-        }
+        result = compute_risk_metrics([returns_data], confidence_level=confidence_level)
+        metrics = result["assets"]["asset_0"]
+        metrics.pop("beta")
+        return metrics
     except Exception as e:
         return {"error": f"Risk calculation failed: {str(e)}"}
 
-def _calculate_max_drawdown(returns: np.ndarray) -> float:
-    cumulative = np.cumprod(1 + returns)
-    running_max = np.maximum.accumulate(cumulative)
-    drawdown = (cumulative - running_max) / running_max
-    return np.min(drawdown)
+@tool
+def portfolio_risk_tool(
+    returns_data: Dict[str, List[float]],
+    weights: Optional[Dict[str, float]] = None,
+    benchmark_returns: Optional[List[float]] = None,
+    confidence_level: float = 0.95
+) -> Dict[str, Any]:
+    """Calculates volatility, VaR, CVaR, Sharpe, max drawdown, beta and the correlation matrix for several assets at once"""
+    try:
+        return portfolio_risk(returns_data, weights, benchmark_returns, confidence_level)
+    except Exception as e:
+        return {"error": f"Portfolio risk calculation failed: {str(e)}"}
 
 @tool
 def budget_analyzer_tool(budget_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Analyzes budget data and calculates variances, trends, and forecasts"""
+    """Analyzes budget data and calculates variances, trends, and forecasts. Pass {"rows": [...]} with department, category, period, budgeted_amount and actual_amount per row for grouped analysis."""
     try:
-        actual = budget_data.get('actual', [])
-        budgeted = budget_data.get('budgeted', [])
-        
-        if len(actual) != len(budgeted):
-            return {"error": "Actual and budgeted data must have same length"}
-        
-        variance = [a - b for a, b in zip(actual, budgeted)]
-        variance_pct = [(a - b) / b * 100 if b != 0 else 0 for a, b in zip(actual, budgeted)]
-        
-        return {
-            "total_actual": sum(actual),
-            "total_budgeted": sum(budgeted),
-            "total_variance": sum(variance),
-            "variance_percentage": sum(variance) / sum(budgeted) * 100 if sum(budgeted) != 0 else 0,
-            "monthly_variances": variance,
-            "monthly_variance_percentages": variance_pct,
-            "over_budget_months": len([v for v in variance if v > 0]),
-            "under_budget_months": len([v for v in variance if v < 0])
-        }
+        if budget_data.get('rows'):
+            return analyze_budget_rows(budget_data['rows'])
+        return analyze_budget(budget_data.get('actual', []), budget_data.get('budgeted', []))
+    except ValueError as e:
+        return {"error": str(e)}
     except Exception as e:
         return {"error": f"Budget analysis failed: {str(e)}"}
 
@@ -85,43 +85,7 @@ def budget_analyzer_tool(budget_data: Dict[str, Any]) -> Dict[str, Any]:
 def compliance_checker_tool(transaction_data: Dict[str, Any]) -> Dict[str, Any]:
     """Checks financial processes and transactions for regulatory compliance"""
     try:
-        compliance_score = 100
-        issues = []
-        
-        # Check for required fields
-        required_fields = ['amount', 'date', 'description', 'approver']
-        for field in required_fields:
-            if field not in transaction_data:
-                compliance_score -= 20
-                issues.append(f"Missing required field: {field}")
-        
-        # Check amount limits
-        amount = transaction_data.get('amount', 0)
-        if amount > 10000 and 'secondary_approver' not in transaction_data:
-            compliance_score -= 15
-            issues.append("Transactions over $10,000 require secondary approval")
-        
-        # Check documentation
-        if amount > 5000 and 'supporting_documents' not in transaction_data:
-            compliance_score -= 10
-            issues.append("Transactions over $5,000 require supporting documentation")
-        
-        return {
-            "compliance_score": max(0, compliance_score),
-            "status": "COMPLIANT" if compliance_score >= 80 else "NON_COMPLIANT",
-            "issues": issues,
-            "recommendations": _get_recommendations(issues)
-        }
+        evaluation = get_compliance_engine().evaluate([transaction_data])
+        return {**evaluation.results()[0], "checks": [check.model_dump() for check in evaluation.checks(0)]}
     except Exception as e:
         return {"error": f"Compliance check failed: {str(e)}"}
-
-def _get_recommendations(issues: List[str]) -> List[str]:
-    recommendations = []
-    for issue in issues:
-        if "Missing required field" in issue:
-            recommendations.append("Ensure all required fields are completed before submission")
-        elif "secondary approval" in issue:
-            recommendations.append("Obtain secondary approver signature for high-value transactions")
-        elif "supporting documentation" in issue:
-            recommendations.append("Attach relevant supporting documents (receipts, invoices, contracts)")
-    return recommendations
\ No newline at end of file
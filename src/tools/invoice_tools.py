@@ -1,73 +1,82 @@
-from langchain.tools import Tool
-from typing import Dict, Any
+import json
+from langchain_core.tools import Tool
+from functools import lru_cache
+from typing import Dict, Any, Union
+from src.config.workflow_config import WorkflowConfig
+from src.core.factories.ocr_factory import OCRFactory
+from src.core.interfaces.ocr_interface import BaseOCRBackend
+from src.models.finance_models import InvoiceDocument
+from src.services.erp_validation import get_erp_validator
+from src.services.payment_executor import get_payment_executor
+
+@lru_cache()
+def get_ocr_backend() -> BaseOCRBackend:
+    """Get the process-wide OCR backend selected by INVOICE_OCR_BACKEND"""
+    return OCRFactory.get_ocr_backend(WorkflowConfig())
+
+def _parse_input(data: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Tool input as a dict: single-input tools receive the agent's JSON string, direct callers pass a dict
+
+    Raises:
+        ValueError: If the input is not a JSON object
+    """
+    if isinstance(data, dict):
+        return data
+    try:
+        parsed = json.loads(data)
+    except (TypeError, ValueError):
+        raise ValueError(f"Expected a JSON object, got: {data!r}")
+    if not isinstance(parsed, dict):
+        raise ValueError(f"Expected a JSON object, got: {data!r}")
+    return parsed
 
 # OCR Tool for Invoice Data Extraction
 def extract_invoice_data(file_path: str) -> Dict[str, Any]:
     """
-    Extract data from invoice using OCR
+    Extract data from invoice using the configured OCR backend
     """
     try:
-        # Implement OCR logic here (Azure Computer Vision or AWS Textract)
-        # This is a placeholder implementation
         return {
             "status": "success",
-            "extracted_data": {
-                "invoice_number": "INV-001",
-                "date": "2025-10-29",
-                "vendor": "Sample Vendor",
-                "amount": 1000.00,
-                "currency": "USD",
-                "line_items": []
-            }
+            "extracted_data": get_ocr_backend().extract(InvoiceDocument(path=file_path))
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 # ERP Integration Tool
-def validate_with_erp(invoice_data: Dict[str, Any]) -> Dict[str, Any]:
+def validate_with_erp(invoice_data: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Validate invoice data against ERP system
+    Validate invoice data against the ERP, from the local vendor/PO index when possible
     """
     try:
-        # Implement ERP validation logic here
-        # This is a placeholder implementation
         return {
             "status": "success",
-            "validation_result": {
-                "po_match": True,
-                "vendor_valid": True,
-                "budget_available": True,
-                "duplicate_check": False
-            }
+            "validation_result": get_erp_validator().validate([_parse_input(invoice_data)])[0]
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 # Payment Gateway Tool
-def execute_payment(payment_data: Dict[str, Any]) -> Dict[str, Any]:
+def execute_payment(payment_data: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Execute payment through payment gateway
+    Queue a payment for the next payment run; asking again for the same invoice returns the recorded payment
     """
     try:
-        # Implement payment gateway integration here
-        # This is a placeholder implementation
         return {
             "status": "success",
-            "payment_result": {
-                "transaction_id": "TX123",
-                "status": "completed",
-                "timestamp": "2025-10-29T12:00:00Z"
-            }
+            "payment_result": get_payment_executor().request_payment(_parse_input(payment_data))
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 # Audit Logger Tool
-def log_audit_event(event_data: Dict[str, Any]) -> Dict[str, Any]:
+def log_audit_event(event_data: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
     """
     Log audit events for compliance
     """
     try:
+        event_data = _parse_input(event_data)
         # Implement audit logging logic here
         # This is a placeholder implementation
         return {
@@ -91,19 +100,19 @@ ocr_tool = Tool(
 
 erp_validation_tool = Tool(
     name="erp_validation",
-    description="Validate invoice data against ERP system",
+    description="Validate invoice data against ERP system; input is a JSON object with invoice_number, vendor or vendor_id, po_number, amount and currency",
     func=validate_with_erp
 )
 
 payment_gateway_tool = Tool(
     name="payment_gateway",
-    description="Execute payments through payment gateway",
+    description="Queue an invoice payment for the next payment run; input is a JSON object with vendor, amount, currency and invoice_number or invoice_id; idempotent per vendor invoice",
     func=execute_payment
 )
 
 audit_logger_tool = Tool(
     name="audit_logger",
-    description="Log audit events for compliance tracking",
+    description="Log audit events for compliance tracking; input is a JSON object with type and details",
     func=log_audit_event
 )
 
@@ -0,0 +1,331 @@
+import json
+import os
+import re
+import threading
+import zlib
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from src.common.logger import get_logger
+from src.common.resilience import call_with_retry
+from src.common.ttl_cache import TTLLRUCache
+from src.core.interfaces.market_data_interface import BaseMarketDataProvider
+
+logger = get_logger(__name__)
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+INFO_FIELDS = {"market_cap": "marketCap", "pe_ratio": "trailingPE", "dividend_yield": "dividendYield"}
+
+_PERIOD_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_PERIOD_DAYS = {"d": 1, "wk": 7, "mo": 31, "y": 366}
+
+def period_to_range(period: str, end: Optional[date] = None) -> Tuple[date, date]:
+    """
+    Convert a yfinance-style period ("5d", "6mo", "1y", "ytd", "max") to dates
+
+    Raises:
+        ValueError: If the period is not recognised
+    """
+    end = end or date.today()
+    if period == "ytd":
+        return date(end.year, 1, 1), end
+    if period == "max":
+        return end - timedelta(days=366 * 30), end
+    match = _PERIOD_PATTERN.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    count, unit = match.groups()
+    return end - timedelta(days=int(count) * _PERIOD_DAYS[unit]), end
+
+def _normalize_history(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame[[column for column in OHLCV_COLUMNS if column in frame.columns]].dropna(how="all")
+    index = pd.to_datetime(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame.index = index.normalize()
+    frame.index.name = "Date"
+    return frame[~frame.index.duplicated(keep="last")].sort_index()
+
+def _slice(frame: pd.DataFrame, start: date, end: date) -> pd.DataFrame:
+    return frame.loc[pd.Timestamp(start):pd.Timestamp(end)]
+
+class YFinanceMarketDataProvider(BaseMarketDataProvider):
+    """
+    Yahoo Finance provider that downloads every symbol in a single batch call.
+
+    Calls go through the market_data circuit breaker and are retried on
+    transient failures; each request gives up after timeout_seconds.
+    """
+
+    def __init__(self, threads: bool = True, timeout_seconds: float = 30.0):
+        import yfinance
+        self._yf = yfinance
+        self.threads = threads
+        self.timeout_seconds = timeout_seconds
+
+    def get_history(self, symbols: Sequence[str], start: date, end: date) -> Dict[str, pd.DataFrame]:
+        symbols = list(symbols)
+        if not symbols:
+            return {}
+        raw = call_with_retry("market_data", lambda: self._yf.download(
+            tickers=symbols,
+            start=start.isoformat(),
+            end=(end + timedelta(days=1)).isoformat(),  # yfinance treats end as exclusive
+            group_by="ticker",
+            auto_adjust=False,
+            threads=self.threads,
+            progress=False,
+            timeout=self.timeout_seconds
+        ), deadline_seconds=2 * self.timeout_seconds)
+        if raw is None or raw.empty:
+            return {}
+
+        history = {}
+        for symbol in symbols:
+            if isinstance(raw.columns, pd.MultiIndex):
+                if symbol not in raw.columns.get_level_values(0):
+                    continue
+                frame = raw[symbol]
+            else:
+                frame = raw
+            frame = _normalize_history(frame)
+            if not frame.empty:
+                history[symbol] = frame
+        return history
+
+    def get_info(self, symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        tickers = self._yf.Tickers(" ".join(symbols))
+        info = {}
+        for symbol in symbols:
+            try:
+                ticker = tickers.tickers[symbol.upper()]
+                raw = call_with_retry("market_data", lambda: ticker.info, deadline_seconds=2 * self.timeout_seconds)
+                info[symbol] = {field: raw.get(key, "N/A") for field, key in INFO_FIELDS.items()}
+            except Exception as e:
+                logger.warning(f"Fundamentals lookup failed for {symbol}: {str(e)}")
+        return info
+
+class FixtureMarketDataProvider(BaseMarketDataProvider):
+    """
+    Offline provider for tests and demos.
+
+    Reads <SYMBOL>.csv (Date,Open,High,Low,Close,Volume) and <SYMBOL>.json
+    fundamentals from fixture_dir when present, otherwise generates a
+    deterministic business-day random walk seeded by the symbol name.
+    """
+
+    def __init__(self, fixture_dir: Optional[str] = None):
+        self.fixture_dir = fixture_dir or None
+        self.history_calls = 0
+
+    def get_history(self, symbols: Sequence[str], start: date, end: date) -> Dict[str, pd.DataFrame]:
+        self.history_calls += 1
+        history = {}
+        for symbol in symbols:
+            frame = _slice(self._load_history(symbol), start, end)
+            if not frame.empty:
+                history[symbol] = frame
+        return history
+
+    def get_info(self, symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        info = {}
+        for symbol in symbols:
+            path = self._fixture_path(symbol, "json")
+            if path:
+                with open(path) as f:
+                    info[symbol] = json.load(f)
+            else:
+                rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+                info[symbol] = {
+                    "market_cap": int(rng.integers(1, 3000)) * 1_000_000_000,
+                    "pe_ratio": round(float(rng.uniform(8, 40)), 2),
+                    "dividend_yield": round(float(rng.uniform(0, 0.04)), 4)
+                }
+        return info
+
+    def _fixture_path(self, symbol: str, extension: str) -> Optional[str]:
+        if not self.fixture_dir:
+            return None
+        path = os.path.join(self.fixture_dir, f"{symbol.upper()}.{extension}")
+        return path if os.path.exists(path) else None
+
+    def _load_history(self, symbol: str) -> pd.DataFrame:
+        path = self._fixture_path(symbol, "csv")
+        if path:
+            return _normalize_history(pd.read_csv(path, index_col="Date", parse_dates=True))
+
+        # Anchor the walk at a fixed date so overlapping requests see the same prices
+        dates = pd.bdate_range("2000-01-03", date.today())
+        rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+        close = 100 * np.cumprod(1 + rng.normal(0.0003, 0.015, len(dates)))
+        spread = np.abs(rng.normal(0, 0.005, len(dates)))
+        return pd.DataFrame({
+            "Open": close * (1 - spread / 2),
+            "High": close * (1 + spread),
+            "Low": close * (1 - spread),
+            "Close": close,
+            "Volume": rng.integers(100_000, 10_000_000, len(dates)).astype(float)
+        }, index=pd.DatetimeIndex(dates, name="Date"))
+
+class CachedMarketDataProvider(BaseMarketDataProvider):
+    """
+    Read-through Parquet cache in front of another provider.
+
+    Each symbol is stored as <cache_dir>/<SYMBOL>.parquet next to a
+    coverage.json index of the date range already fetched. Requests only
+    download the missing head or tail of that range, batching symbols that
+    share the same gap into one upstream call, made without holding the
+    cache lock. A gap is marked as covered only once it returned data (or
+    holds no business day), and today's bar never is, so failed fetches
+    and intraday prices are retried. Fundamentals are kept in memory for
+    info_ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        provider: BaseMarketDataProvider,
+        cache_dir: str = ".market_data_cache",
+        info_ttl_seconds: Optional[float] = 86400,
+        max_memory_entries: int = 256
+    ):
+        self.provider = provider
+        self.cache_dir = cache_dir
+        self._coverage_path = os.path.join(cache_dir, "coverage.json")
+        self._frames = TTLLRUCache(max_entries=max_memory_entries)
+        self._info = TTLLRUCache(max_entries=max_memory_entries, ttl_seconds=info_ttl_seconds)
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._coverage = self._load_coverage()
+
+    def get_history(self, symbols: Sequence[str], start: date, end: date) -> Dict[str, pd.DataFrame]:
+        symbols = list(dict.fromkeys(symbols))
+        with self._lock:
+            gaps: Dict[Tuple[date, date], List[str]] = {}
+            for symbol in symbols:
+                for gap in self._missing_ranges(symbol, start, end):
+                    gaps.setdefault(gap, []).append(symbol)
+
+        # Upstream calls run unlocked; a gap fetched twice by concurrent requests merges idempotently
+        for (gap_start, gap_end), gap_symbols in gaps.items():
+            logger.info(f"Fetching {len(gap_symbols)} symbol(s) for {gap_start}..{gap_end}")
+            fetched = self.provider.get_history(gap_symbols, gap_start, gap_end)
+            with self._lock:
+                for symbol in gap_symbols:
+                    self._append(symbol, fetched.get(symbol), gap_start, gap_end)
+
+        with self._lock:
+            history = {}
+            for symbol in symbols:
+                frame = self._read(symbol)
+                if frame is not None:
+                    frame = _slice(frame, start, end)
+                    if not frame.empty:
+                        history[symbol] = frame
+            return history
+
+    def get_info(self, symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        info = {symbol: self._info.get(symbol) for symbol in symbols}
+        missing = [symbol for symbol, value in info.items() if value is None]
+        if missing:
+            for symbol, value in self.provider.get_info(missing).items():
+                self._info.set(symbol, value)
+                info[symbol] = value
+        return {symbol: value for symbol, value in info.items() if value is not None}
+
+    def _missing_ranges(self, symbol: str, start: date, end: date) -> List[Tuple[date, date]]:
+        covered = self._coverage.get(symbol)
+        if covered is None:
+            return [(start, end)]
+        covered_start, covered_end = (date.fromisoformat(value) for value in covered)
+        gaps = []
+        if start < covered_start:
+            gaps.append((start, covered_start - timedelta(days=1)))
+        if end > covered_end:
+            gaps.append((covered_end + timedelta(days=1), end))
+        return gaps
+
+    def _append(self, symbol: str, frame: Optional[pd.DataFrame], start: date, end: date) -> None:
+        has_data = frame is not None and not frame.empty
+        if has_data:
+            existing = self._read(symbol)
+            merged = frame if existing is None else pd.concat([existing, frame])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            merged.to_parquet(self._history_path(symbol))
+            self._frames.set(symbol, merged)
+        elif np.busday_count(start, end + timedelta(days=1)):
+            # Nothing came back for trading days (an upstream error or a lagging feed): fetch again next time
+            return
+
+        covered_end = min(end, date.today() - timedelta(days=1))
+        covered = self._coverage.get(symbol)
+        if covered is not None:
+            covered_start, previous_end = (date.fromisoformat(value) for value in covered)
+            # Another request may have moved coverage while this gap was fetched; only a touching range keeps it contiguous
+            if start > previous_end + timedelta(days=1) or covered_end < covered_start - timedelta(days=1):
+                return
+            start = min(start, covered_start)
+            covered_end = max(covered_end, previous_end)
+        if covered_end >= start:
+            self._coverage[symbol] = [start.isoformat(), covered_end.isoformat()]
+            self._save_coverage()
+
+    def _read(self, symbol: str) -> Optional[pd.DataFrame]:
+        frame = self._frames.get(symbol)
+        if frame is None and os.path.exists(self._history_path(symbol)):
+            frame = pd.read_parquet(self._history_path(symbol))
+            self._frames.set(symbol, frame)
+        return frame
+
+    def _history_path(self, symbol: str) -> str:
+        safe_symbol = re.sub(r"[^A-Za-z0-9_.=^-]", "_", symbol.upper())
+        return os.path.join(self.cache_dir, f"{safe_symbol}.parquet")
+
+    def _load_coverage(self) -> Dict[str, List[str]]:
+        if not os.path.exists(self._coverage_path):
+            return {}
+        try:
+            with open(self._coverage_path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable market data coverage index: {str(e)}")
+            return {}
+
+    def _save_coverage(self) -> None:
+        tmp_path = f"{self._coverage_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._coverage, f)
+        os.replace(tmp_path, self._coverage_path)
+
+def summarize_history(frame: pd.DataFrame, recent: int = 5) -> Dict[str, Any]:
+    """
+    Reduce a price history to the figures an agent needs
+
+    Args:
+        frame: OHLCV frame indexed by date
+        recent: Number of trailing closes to include
+
+    Returns:
+        Latest price and change, period return/high/low, average volume,
+        annualised volatility and the last few closes
+    """
+    close = frame["Close"]
+    returns = close.pct_change().dropna()
+    previous = close.iloc[-2] if len(close) > 1 else close.iloc[-1]
+    return {
+        "current_price": round(float(close.iloc[-1]), 4),
+        "price_change": round(float(close.iloc[-1] - previous), 4),
+        "price_change_pct": round(float(close.iloc[-1] / previous - 1), 6),
+        "volume": int(frame["Volume"].iloc[-1]),
+        "period_start": frame.index[0].date().isoformat(),
+        "period_end": frame.index[-1].date().isoformat(),
+        "observations": int(len(frame)),
+        "period_return": round(float(close.iloc[-1] / close.iloc[0] - 1), 6),
+        "period_high": round(float(frame["High"].max()), 4),
+        "period_low": round(float(frame["Low"].min()), 4),
+        "average_volume": int(frame["Volume"].mean()),
+        "annualized_volatility": round(float(returns.std() * np.sqrt(252)), 6) if len(returns) > 1 else None,
+        "recent_closes": {
+            timestamp.date().isoformat(): round(float(value), 4) for timestamp, value in close.tail(recent).items()
+        }
+    }
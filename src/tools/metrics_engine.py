@@ -0,0 +1,261 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from src.common.logger import get_logger
+from src.tools.budget_engine import analyze_budget_rows
+from src.tools.compliance_engine import get_compliance_engine
+from src.tools.risk_engine import align_return_series, compute_risk_metrics, to_risk_metrics
+
+logger = get_logger(__name__)
+
+FINANCIAL_RATIOS = "financial_ratios"
+BUDGET_VARIANCE = "budget_variance"
+RISK = "risk"
+COMPLIANCE = "compliance"
+
+# Metric sections each workflow pre-computes before its LLM call
+WORKFLOW_METRICS = {
+    "financial_analysis": (FINANCIAL_RATIOS, RISK),
+    "budget_management": (BUDGET_VARIANCE,),
+    "investment_advisory": (RISK,),
+    "comprehensive": (FINANCIAL_RATIOS, BUDGET_VARIANCE, RISK, COMPLIANCE)
+}
+
+def analyze_budget(
+    actual: Sequence[float],
+    budgeted: Sequence[float],
+    categories: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Compute budget vs actual variances
+
+    Args:
+        actual: Actual spend per period or category
+        budgeted: Budgeted amount per period or category
+        categories: Optional names for each line, adding a per-category breakdown
+
+    Returns:
+        Totals, variance per line and over/under budget counts
+
+    Raises:
+        ValueError: If actual and budgeted differ in length
+    """
+    if len(actual) != len(budgeted):
+        raise ValueError("Actual and budgeted data must have same length")
+
+    # One vectorized pass; results are converted back to Python numbers once
+    actual_values = np.asarray(actual)
+    budgeted_values = np.asarray(budgeted)
+    variance_values = actual_values - budgeted_values
+    pct_values = np.divide(
+        variance_values * 100, budgeted_values,
+        out=np.zeros(len(variance_values)), where=budgeted_values != 0
+    )
+    total_actual, total_budgeted, total_variance = (
+        values.sum().item() if len(values) else 0 for values in (actual_values, budgeted_values, variance_values)
+    )
+    variance, variance_pct = variance_values.tolist(), pct_values.tolist()
+
+    result = {
+        "total_actual": total_actual,
+        "total_budgeted": total_budgeted,
+        "total_variance": total_variance,
+        "variance_percentage": total_variance / total_budgeted * 100 if total_budgeted != 0 else 0,
+        "monthly_variances": variance,
+        "monthly_variance_percentages": variance_pct,
+        "over_budget_months": int((variance_values > 0).sum()),
+        "under_budget_months": int((variance_values < 0).sum())
+    }
+    if categories is not None:
+        result["by_category"] = {
+            name: {"budgeted": b, "actual": a, "variance": v, "variance_percentage": pct}
+            for name, a, b, v, pct in zip(categories, actual, budgeted, variance, variance_pct)
+        }
+        overruns = sorted((v, name) for name, v in zip(categories, variance) if v > 0)
+        result["largest_overruns"] = [name for _, name in reversed(overruns[-3:])]
+    return result
+
+def budget_lines(budget_data: Dict[str, Any]) -> Optional[Tuple[Optional[List[str]], List[float], List[float]]]:
+    """
+    Extract budget lines from either supported layout
+
+    Accepts {"actual": [...], "budgeted": [...]} or a per-category mapping
+    {"Marketing": {"budgeted": 50000, "actual": 45000}, ...}. Row-level
+    {"rows": [...]} data goes to budget_engine.analyze_budget_rows() instead.
+
+    Returns:
+        (categories or None, actual, budgeted), or None when the data holds no budget lines
+    """
+    if isinstance(budget_data.get("actual"), list) and isinstance(budget_data.get("budgeted"), list):
+        return None, budget_data["actual"], budget_data["budgeted"]
+    lines = {
+        name: value for name, value in budget_data.items()
+        if isinstance(value, dict) and _is_number(value.get("actual")) and _is_number(value.get("budgeted"))
+    }
+    if not lines:
+        return None
+    names = list(lines)
+    return names, [lines[name]["actual"] for name in names], [lines[name]["budgeted"] for name in names]
+
+def financial_ratios(financial_data: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Derive profitability, leverage and liquidity ratios from reported figures
+
+    Figures that are given directly (e.g. profit_margin) are kept; missing ones
+    are derived where their inputs exist. Ratios are returned as fractions.
+
+    Returns:
+        Ratios that could be computed, empty when no usable figures are present
+    """
+    revenue = _number(financial_data, "revenue", "total_revenue")
+    expenses = _number(financial_data, "expenses", "total_expenses")
+    assets = _number(financial_data, "assets", "total_assets")
+    liabilities = _number(financial_data, "liabilities", "total_liabilities")
+    current_assets = _number(financial_data, "current_assets")
+    current_liabilities = _number(financial_data, "current_liabilities")
+
+    net_income = _number(financial_data, "net_income", "profit")
+    if net_income is None and revenue is not None and expenses is not None:
+        net_income = revenue - expenses
+    equity = _number(financial_data, "equity", "total_equity")
+    if equity is None and assets is not None and liabilities is not None:
+        equity = assets - liabilities
+
+    ratios = {
+        "revenue": revenue,
+        "net_income": net_income,
+        "equity": equity,
+        "profit_margin": _first(_number(financial_data, "profit_margin"), _ratio(net_income, revenue)),
+        "return_on_assets": _ratio(net_income, assets),
+        "return_on_equity": _ratio(net_income, equity),
+        "roi": _number(financial_data, "roi"),
+        "debt_to_equity": _first(_number(financial_data, "debt_to_equity", "debt_equity_ratio"), _ratio(liabilities, equity)),
+        "debt_ratio": _ratio(liabilities, assets),
+        "current_ratio": _first(_number(financial_data, "current_ratio"), _ratio(current_assets, current_liabilities)),
+        "quick_ratio": _first(_number(financial_data, "quick_ratio"), _ratio(
+            None if current_assets is None else current_assets - (_number(financial_data, "inventory") or 0),
+            current_liabilities
+        )),
+        "cash_flow": _number(financial_data, "cash_flow", "operating_cash_flow"),
+        "ebitda": _number(financial_data, "ebitda")
+    }
+    return {name: value for name, value in ratios.items() if value is not None}
+
+def portfolio_risk(
+    returns_data: Dict[str, List[float]],
+    weights: Optional[Dict[str, float]] = None,
+    benchmark_returns: Optional[List[float]] = None,
+    confidence_level: float = 0.95
+) -> Dict[str, Any]:
+    """
+    Risk metrics per asset and for the weighted portfolio
+
+    Returns:
+        RiskMetrics dicts keyed by asset name plus "portfolio"
+    """
+    names, matrix = align_return_series(returns_data)
+    benchmark = benchmark_returns[-matrix.shape[1]:] if benchmark_returns else None
+    result = compute_risk_metrics(
+        matrix,
+        asset_names=names,
+        weights=[weights[name] for name in names] if weights else None,
+        benchmark_returns=benchmark,
+        confidence_level=confidence_level
+    )
+    return {name: metrics.model_dump() for name, metrics in to_risk_metrics(result).items()}
+
+def compute_workflow_metrics(
+    sections: Iterable[str],
+    financial_data: Optional[Dict[str, Any]] = None,
+    budget_data: Optional[Dict[str, Any]] = None,
+    investment_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Run the deterministic calculators a workflow needs on its input data
+
+    Sections whose inputs are absent are left out. A section whose inputs are
+    malformed reports {"error": ...} instead of failing the workflow, so the
+    LLM stage still runs on whatever could be computed.
+
+    Args:
+        sections: Metric sections to compute (see WORKFLOW_METRICS)
+        financial_data: Reported figures, optionally with "returns" and "transactions"
+        budget_data: Budget lines in either layout accepted by budget_lines()
+        investment_data: Portfolio data, optionally with "returns", "weights" and "benchmark_returns"
+
+    Returns:
+        Results keyed by section name
+    """
+    payloads = [data for data in (financial_data, budget_data, investment_data) if isinstance(data, dict)]
+    calculators = {
+        FINANCIAL_RATIOS: lambda: financial_ratios(financial_data) if isinstance(financial_data, dict) else None,
+        BUDGET_VARIANCE: lambda: _budget_variance(budget_data),
+        RISK: lambda: _risk(investment_data, financial_data),
+        COMPLIANCE: lambda: _compliance(payloads)
+    }
+    metrics = {}
+    for section in sections:
+        try:
+            result = calculators[section]()
+        except Exception as e:
+            logger.warning(f"[METRICS] {section} could not be computed: {str(e)}")
+            result = {"error": str(e)}
+        if result:
+            metrics[section] = result
+    return metrics
+
+def _budget_variance(budget_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if isinstance(budget_data, dict) and budget_data.get("rows"):
+        return analyze_budget_rows(budget_data["rows"])
+    lines = budget_lines(budget_data) if isinstance(budget_data, dict) else None
+    if lines is None:
+        return None
+    categories, actual, budgeted = lines
+    return analyze_budget(actual, budgeted, categories)
+
+def _risk(*payloads: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    # Investment returns take precedence; financial data may carry a single return series
+    for data in payloads:
+        if not isinstance(data, dict) or not data.get("returns"):
+            continue
+        returns = data["returns"]
+        returns_data = returns if isinstance(returns, dict) else {data.get("symbol") or "portfolio": returns}
+        return portfolio_risk(
+            returns_data,
+            weights=data.get("weights"),
+            benchmark_returns=data.get("benchmark_returns"),
+            confidence_level=data.get("confidence_level", 0.95)
+        )
+    return None
+
+def _compliance(payloads: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    transactions = [t for data in payloads for t in data.get("transactions") or [] if isinstance(t, dict)]
+    if not transactions:
+        return None
+    evaluation = get_compliance_engine().evaluate(transactions)
+    checks = evaluation.results()
+    findings = [
+        {"transaction": transaction_id, "compliance_score": check["compliance_score"], "issues": check["issues"]}
+        for transaction_id, check in zip(evaluation.ids, checks) if check["issues"]
+    ]
+    return {
+        **evaluation.summary(),
+        "findings": findings,
+        "recommendations": sorted({r for check in checks for r in check["recommendations"]})
+    }
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _number(data: Dict[str, Any], *keys: str) -> Optional[float]:
+    for key in keys:
+        if _is_number(data.get(key)):
+            return data[key]
+    return None
+
+def _first(*values: Optional[float]) -> Optional[float]:
+    return next((value for value in values if value is not None), None)
+
+def _ratio(numerator: Optional[float], denominator: Optional[float]) -> Optional[float]:
+    if numerator is None or not denominator:
+        return None
+    return numerator / denominator
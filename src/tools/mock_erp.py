@@ -0,0 +1,137 @@
+"""
+Mock ERP server for local development and integration tests.
+
+Serves a synthetic vendor master and purchase order book with the same
+API the HTTP ERP client expects:
+    GET  /changes?since=<cursor>&limit=<n>
+    POST /invoices/validate  {"invoices": [...]}
+
+Run from the project root:
+    python -m src.tools.mock_erp --port 8100
+"""
+
+import argparse
+import random
+import threading
+from typing import Any, Dict, List, Optional
+from fastapi import FastAPI
+from pydantic import BaseModel
+from src.tools.erp_index import match_invoice, vendor_key
+
+class MockERPDataset:
+    """
+    In-memory vendor master and purchase orders with a versioned change feed.
+
+    Every upsert bumps a global version; the change feed returns records
+    with a version above the caller's cursor, so clients can refresh
+    incrementally. Request counters show how often clients hit the ERP.
+    """
+
+    def __init__(self, vendors: Optional[List[Dict[str, Any]]] = None, purchase_orders: Optional[List[Dict[str, Any]]] = None):
+        self._vendors: Dict[str, Dict[str, Any]] = {}
+        self._purchase_orders: Dict[str, Dict[str, Any]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        self.requests = {"changes": 0, "validate": 0, "invoices_validated": 0}
+        for vendor in vendors or []:
+            self.upsert_vendor(vendor)
+        for purchase_order in purchase_orders or []:
+            self.upsert_purchase_order(purchase_order)
+
+    @classmethod
+    def generate(cls, vendors: int = 500, purchase_orders: int = 5000, seed: int = 7) -> "MockERPDataset":
+        """Deterministic synthetic dataset: V-00001... vendors (5% inactive) and PO-000001... orders"""
+        rng = random.Random(seed)
+        vendor_records = [
+            {"vendor_id": f"V-{i:05d}", "name": f"Vendor {i:05d}", "active": rng.random() >= 0.05}
+            for i in range(1, vendors + 1)
+        ]
+        po_records = [
+            {
+                "po_number": f"PO-{i:06d}",
+                "vendor_id": f"V-{rng.randint(1, vendors):05d}",
+                "currency": "USD",
+                "amount_remaining": round(rng.uniform(500, 50000), 2),
+                "status": "open" if rng.random() >= 0.1 else "closed"
+            }
+            for i in range(1, purchase_orders + 1)
+        ]
+        return cls(vendor_records, po_records)
+
+    def upsert_vendor(self, vendor: Dict[str, Any]) -> None:
+        with self._lock:
+            self._version += 1
+            self._vendors[str(vendor["vendor_id"])] = {**vendor, "version": self._version}
+
+    def upsert_purchase_order(self, purchase_order: Dict[str, Any]) -> None:
+        with self._lock:
+            self._version += 1
+            self._purchase_orders[str(purchase_order["po_number"])] = {**purchase_order, "version": self._version}
+
+    def changes(self, cursor: Optional[str] = None, limit: int = 10000) -> Dict[str, Any]:
+        """Records changed after cursor, oldest first, at most limit per page"""
+        since = int(cursor or 0)
+        with self._lock:
+            self.requests["changes"] += 1
+            changed = sorted(
+                [("vendors", record) for record in self._vendors.values() if record["version"] > since]
+                + [("purchase_orders", record) for record in self._purchase_orders.values() if record["version"] > since],
+                key=lambda item: item[1]["version"]
+            )
+            page, has_more = changed[:limit], len(changed) > limit
+            latest = page[-1][1]["version"] if page else since
+        return {
+            "vendors": [record for kind, record in page if kind == "vendors"],
+            "purchase_orders": [record for kind, record in page if kind == "purchase_orders"],
+            "cursor": str(latest),
+            "has_more": has_more
+        }
+
+    def validate(self, invoices: List[Dict[str, Any]], amount_tolerance: float = 0.0) -> List[Dict[str, bool]]:
+        """Validate invoices against the full dataset, inactive vendors and closed POs included"""
+        with self._lock:
+            self.requests["validate"] += 1
+            self.requests["invoices_validated"] += len(invoices)
+            by_name = {vendor_key(vendor["name"]): vendor for vendor in self._vendors.values()}
+            results = []
+            for invoice in invoices:
+                vendor = self._vendors.get(str(invoice.get("vendor_id"))) or by_name.get(vendor_key(invoice.get("vendor")))
+                purchase_order = self._purchase_orders.get(str(invoice.get("po_number")))
+                results.append({**match_invoice(invoice, vendor, purchase_order, amount_tolerance), "duplicate_check": False})
+        return results
+
+class _ValidateRequest(BaseModel):
+    invoices: List[Dict[str, Any]]
+
+def create_mock_erp_app(dataset: Optional[MockERPDataset] = None) -> FastAPI:
+    """FastAPI app serving a mock ERP over the given (or a generated) dataset"""
+    dataset = dataset or MockERPDataset.generate()
+    app = FastAPI(title="Mock ERP")
+    app.state.dataset = dataset
+
+    @app.get("/changes")
+    def changes(since: Optional[str] = None, limit: int = 10000):
+        return dataset.changes(since, limit)
+
+    @app.post("/invoices/validate")
+    def validate(request: _ValidateRequest):
+        return {"results": dataset.validate(request.invoices)}
+
+    @app.get("/stats")
+    def stats():
+        return dataset.requests
+
+    return app
+
+def main():
+    import uvicorn
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--vendors", type=int, default=500)
+    parser.add_argument("--purchase-orders", type=int, default=5000)
+    args = parser.parse_args()
+    uvicorn.run(create_mock_erp_app(MockERPDataset.generate(args.vendors, args.purchase_orders)), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Payment gateway simulator for local development and integration tests.
+
+Accepts batched payment runs and settles them asynchronously, with the
+same API the HTTP payment gateway client expects:
+    POST /payment-runs               {"run_id", "vendor", "currency", "payment_date", "payments": [...]}
+    GET  /payment-runs/<gateway_run_id>
+
+Run from the project root:
+    python -m src.tools.mock_payment_gateway --port 8200 --settle-seconds 2
+"""
+
+import argparse
+import hashlib
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+class PaymentGatewaySimulator:
+    """
+    In-memory payment gateway that settles runs after a delay.
+
+    A run is processing for settle_seconds after submission, then every
+    payment in it is paid or failed. Outcomes are deterministic:
+    failure_rate of payments, chosen by a hash of their idempotency key
+    and attempt number, fail with an error. Resubmitting a run_id returns
+    the accepted run, and a payment whose idempotency key was already paid
+    in another run fails as a duplicate, as real gateways do. Request
+    counters show how often clients call the gateway.
+    """
+
+    def __init__(self, settle_seconds: float = 0.0, failure_rate: float = 0.0):
+        self.settle_seconds = settle_seconds
+        self.failure_rate = failure_rate
+        self._runs: Dict[str, Dict[str, Any]] = {}
+        self._runs_by_client_id: Dict[str, str] = {}
+        self._paid_keys: Dict[str, str] = {}
+        self._attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.requests = {"submit_run": 0, "get_run_status": 0, "payments_submitted": 0, "duplicates_rejected": 0}
+
+    def submit_run(self, run: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.requests["submit_run"] += 1
+            gateway_run_id = self._runs_by_client_id.get(run["run_id"])
+            if gateway_run_id is None:
+                gateway_run_id = f"GR-{len(self._runs) + 1:08d}"
+                self._runs_by_client_id[run["run_id"]] = gateway_run_id
+                self._runs[gateway_run_id] = {
+                    "run": run,
+                    "submitted_at": time.monotonic(),
+                    "results": None
+                }
+                self.requests["payments_submitted"] += len(run["payments"])
+        return {"gateway_run_id": gateway_run_id, "status": "accepted"}
+
+    def get_run_status(self, gateway_run_id: str) -> Dict[str, Any]:
+        with self._lock:
+            self.requests["get_run_status"] += 1
+            record = self._runs.get(gateway_run_id)
+            if record is None:
+                raise KeyError(f"Unknown payment run: {gateway_run_id}")
+            if record["results"] is None:
+                if time.monotonic() - record["submitted_at"] < self.settle_seconds:
+                    return {
+                        "status": "processing",
+                        "payments": [{"idempotency_key": payment["idempotency_key"], "status": "pending"} for payment in record["run"]["payments"]]
+                    }
+                record["results"] = self._settle(gateway_run_id, record["run"]["payments"])
+            return {"status": "completed", "payments": record["results"]}
+
+    def _settle(self, gateway_run_id: str, payments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results = []
+        for position, payment in enumerate(payments):
+            key = payment["idempotency_key"]
+            self._attempts[key] = self._attempts.get(key, 0) + 1
+            digest = hashlib.blake2b(f"{key}:{self._attempts[key]}".encode(), digest_size=8).digest()
+            if key in self._paid_keys:
+                self.requests["duplicates_rejected"] += 1
+                results.append({"idempotency_key": key, "status": "failed", "error": f"Duplicate payment, already paid as {self._paid_keys[key]}"})
+            elif int.from_bytes(digest, "big") / 2 ** 64 < self.failure_rate:
+                results.append({"idempotency_key": key, "status": "failed", "error": "Declined by beneficiary bank"})
+            else:
+                transaction_id = f"TX-{gateway_run_id[3:]}-{position + 1:05d}"
+                self._paid_keys[key] = transaction_id
+                results.append({"idempotency_key": key, "status": "paid", "transaction_id": transaction_id})
+        return results
+
+class _PaymentRunRequest(BaseModel):
+    run_id: str
+    vendor: str
+    currency: str
+    payment_date: str
+    payments: List[Dict[str, Any]]
+
+def create_mock_payment_app(simulator: Optional[PaymentGatewaySimulator] = None) -> FastAPI:
+    """FastAPI app serving the given (or a new) payment gateway simulator"""
+    simulator = simulator or PaymentGatewaySimulator()
+    app = FastAPI(title="Mock Payment Gateway")
+    app.state.simulator = simulator
+
+    @app.post("/payment-runs")
+    def submit_run(request: _PaymentRunRequest):
+        return simulator.submit_run(request.model_dump())
+
+    @app.get("/payment-runs/{gateway_run_id}")
+    def get_run_status(gateway_run_id: str):
+        try:
+            return simulator.get_run_status(gateway_run_id)
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    @app.get("/stats")
+    def stats():
+        return simulator.requests
+
+    return app
+
+def main():
+    import uvicorn
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8200)
+    parser.add_argument("--settle-seconds", type=float, default=2.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(create_mock_payment_app(PaymentGatewaySimulator(args.settle_seconds, args.failure_rate)), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
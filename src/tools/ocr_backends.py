@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+from src.common.logger import get_logger
+from src.common.resilience import acall_with_retry, call_with_retry
+from src.core.interfaces.ocr_interface import BaseOCRBackend
+from src.llm.http_clients import get_async_http_client, get_http_client
+from src.models.finance_models import InvoiceDocument
+
+logger = get_logger(__name__)
+
+INVOICE_FIELDS = ("invoice_number", "date", "vendor", "amount", "currency", "line_items")
+
+_FIELD_PATTERNS = {
+    "invoice_number": re.compile(r"invoice\s*(?:number|no\.?|#)\s*[:#]?\s*([A-Z0-9][\w\-/]*)", re.IGNORECASE),
+    "date": re.compile(r"date\s*:?\s*(\d{4}-\d{2}-\d{2})", re.IGNORECASE),
+    "vendor": re.compile(r"(?:vendor|supplier)\s*:\s*(.+)", re.IGNORECASE),
+    "amount": re.compile(r"(?:total|amount(?:\s+due)?)\s*:?\s*(?:[A-Z]{3}\s*)?\$?\s*([\d,]+(?:\.\d+)?)", re.IGNORECASE),
+    "currency": re.compile(r"currency\s*:?\s*([A-Z]{3})\b", re.IGNORECASE)
+}
+_SYNTHETIC_VENDORS = ("Acme Supplies", "Globex Logistics", "Initech Services", "Umbrella Facilities", "Stark Components")
+
+def read_document(document: InvoiceDocument) -> Tuple[bytes, str]:
+    """
+    Raw bytes and display name of a document
+
+    Raises:
+        ValueError: If the document has neither a path nor content
+    """
+    if document.content is not None:
+        return document.content.encode(), document.path or document.document_id
+    if document.path:
+        with open(document.path, "rb") as file:
+            return file.read(), document.path
+    raise ValueError(f"Document {document.document_id} has neither a path nor content")
+
+def normalize_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the standard invoice fields, with amounts as floats and missing fields as None"""
+    data = {name: fields.get(name) for name in INVOICE_FIELDS}
+    if isinstance(data["amount"], str):
+        try:
+            data["amount"] = float(data["amount"].replace(",", ""))
+        except ValueError:
+            data["amount"] = None
+    data["line_items"] = data["line_items"] or []
+    return data
+
+class LocalOCRBackend(BaseOCRBackend):
+    """
+    Deterministic stand-in for an OCR service.
+
+    JSON documents are read field by field and plain text is parsed with
+    regular expressions. Anything else (scans, PDFs) gets fields derived
+    from its SHA-256 digest, so the same bytes always yield the same
+    invoice. latency_seconds simulates the service's per-document cost.
+    """
+
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+
+    def extract(self, document: InvoiceDocument) -> Dict[str, Any]:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return self._parse(*read_document(document))
+
+    async def aextract(self, document: InvoiceDocument) -> Dict[str, Any]:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        if document.content is not None:
+            return self._parse(*read_document(document))
+        return self._parse(*await asyncio.to_thread(read_document, document))
+
+    def _parse(self, raw: bytes, name: str) -> Dict[str, Any]:
+        try:
+            text = raw.decode()
+        except UnicodeDecodeError:
+            return self._synthetic(raw)
+        stripped = text.lstrip()
+        if name.lower().endswith(".json") or stripped.startswith("{"):
+            try:
+                fields = json.loads(text)
+            except ValueError:
+                fields = None
+            if isinstance(fields, dict):
+                return normalize_fields(fields.get("extracted_data", fields))
+        fields = {}
+        for field_name, pattern in _FIELD_PATTERNS.items():
+            match = pattern.search(text)
+            if match:
+                fields[field_name] = match.group(1).strip()
+        if not fields:
+            return self._synthetic(raw)
+        if fields.get("amount") is not None:
+            fields.setdefault("currency", "USD")
+        if fields.get("currency"):
+            fields["currency"] = fields["currency"].upper()
+        return normalize_fields(fields)
+
+    @staticmethod
+    def _synthetic(raw: bytes) -> Dict[str, Any]:
+        digest = hashlib.sha256(raw).hexdigest()
+        return normalize_fields({
+            "invoice_number": f"INV-{digest[:8].upper()}",
+            "date": (date(2026, 1, 1) + timedelta(days=int(digest[8:10], 16))).isoformat(),
+            "vendor": _SYNTHETIC_VENDORS[int(digest[10:12], 16) % len(_SYNTHETIC_VENDORS)],
+            "amount": int(digest[12:20], 16) % 2_000_000 / 100,
+            "currency": "USD"
+        })
+
+class HttpOCRBackend(BaseOCRBackend):
+    """
+    OCR service reached over HTTP (OCR_SERVICE_URL).
+
+    Each document is posted as a multipart file; the service answers with
+    the invoice fields, optionally wrapped in "extracted_data". Calls go
+    through the ocr circuit breaker and are retried on transient failures.
+    """
+
+    def __init__(self, url: str, timeout_seconds: float = 30.0):
+        if not url:
+            raise ValueError("OCR_SERVICE_URL is required for the http OCR backend")
+        self.url = url
+        self.timeout_seconds = timeout_seconds
+
+    def extract(self, document: InvoiceDocument) -> Dict[str, Any]:
+        raw, name = read_document(document)
+        response = call_with_retry(
+            "ocr",
+            lambda: self._checked(get_http_client().post(self.url, files={"file": (os.path.basename(name), raw)}, timeout=self.timeout_seconds)),
+            deadline_seconds=2 * self.timeout_seconds
+        )
+        return self._fields(response.json())
+
+    async def aextract(self, document: InvoiceDocument) -> Dict[str, Any]:
+        raw, name = read_document(document) if document.content is not None else await asyncio.to_thread(read_document, document)
+
+        async def post():
+            client = get_async_http_client()
+            return self._checked(await client.post(self.url, files={"file": (os.path.basename(name), raw)}, timeout=self.timeout_seconds))
+
+        response = await acall_with_retry("ocr", post, deadline_seconds=2 * self.timeout_seconds)
+        return self._fields(response.json())
+
+    @staticmethod
+    def _checked(response):
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _fields(body: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        body = body or {}
+        return normalize_fields(body.get("extracted_data", body))
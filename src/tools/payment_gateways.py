@@ -0,0 +1,57 @@
+import time
+from typing import Any, Dict, Optional
+from src.common.resilience import call_with_retry
+from src.core.interfaces.payment_interface import BasePaymentGateway
+from src.llm.http_clients import get_http_client
+from src.tools.mock_payment_gateway import PaymentGatewaySimulator
+
+class HttpPaymentGateway(BasePaymentGateway):
+    """
+    Payment gateway reached over HTTP (PAYMENT_GATEWAY_URL).
+
+    Requests share the process-wide keep-alive connection pool and go
+    through the payment_gateway circuit breaker. Retrying a run submission
+    is safe: the run_id is sent as its Idempotency-Key.
+    """
+
+    def __init__(self, url: str, timeout_seconds: float = 30.0):
+        if not url:
+            raise ValueError("PAYMENT_GATEWAY_URL is required for the http payment gateway")
+        self.url = url.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+
+    def submit_run(self, run: Dict[str, Any]) -> Dict[str, Any]:
+        return self._call(lambda: get_http_client().post(
+            f"{self.url}/payment-runs", json=run, headers={"Idempotency-Key": run["run_id"]}, timeout=self.timeout_seconds
+        ))
+
+    def get_run_status(self, gateway_run_id: str) -> Dict[str, Any]:
+        return self._call(lambda: get_http_client().get(f"{self.url}/payment-runs/{gateway_run_id}", timeout=self.timeout_seconds))
+
+    def _call(self, request) -> Dict[str, Any]:
+        def attempt():
+            response = request()
+            response.raise_for_status()
+            return response.json()
+        return call_with_retry("payment_gateway", attempt, deadline_seconds=2 * self.timeout_seconds)
+
+class MockPaymentGateway(BasePaymentGateway):
+    """
+    In-process client over a PaymentGatewaySimulator, for development without a gateway.
+
+    latency_seconds simulates the network round trip of each request.
+    """
+
+    def __init__(self, simulator: Optional[PaymentGatewaySimulator] = None, latency_seconds: float = 0.0):
+        self.simulator = simulator or PaymentGatewaySimulator()
+        self.latency_seconds = latency_seconds
+
+    def submit_run(self, run: Dict[str, Any]) -> Dict[str, Any]:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return self.simulator.submit_run(run)
+
+    def get_run_status(self, gateway_run_id: str) -> Dict[str, Any]:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return self.simulator.get_run_status(gateway_run_id)
@@ -0,0 +1,120 @@
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence
+from src.models.finance_models import RiskMetrics
+
+TRADING_DAYS = 252
+
+def compute_risk_metrics(
+    returns: Any,
+    asset_names: Optional[Sequence[str]] = None,
+    weights: Optional[Sequence[float]] = None,
+    benchmark_returns: Optional[Sequence[float]] = None,
+    confidence_level: float = 0.95,
+    risk_free_rate: float = 0.0,
+    include_correlation: bool = True
+) -> Dict[str, Any]:
+    """
+    Compute risk metrics for every asset in one vectorized pass
+
+    Args:
+        returns: 2-D array-like of periodic returns shaped (assets, periods)
+        asset_names: Names for each row, defaults to asset_0..asset_n
+        weights: Portfolio weights, defaults to equal weight
+        benchmark_returns: Market returns used for beta, defaults to the portfolio
+        confidence_level: VaR/CVaR confidence level
+        risk_free_rate: Annual risk-free rate used in the Sharpe ratio
+        include_correlation: Build the nested correlation matrix (O(assets^2))
+
+    Returns:
+        Dict with per-asset metrics, portfolio metrics and the correlation matrix
+    """
+    matrix = np.atleast_2d(np.asarray(returns, dtype=float))
+    n_assets, n_periods = matrix.shape
+    if n_periods < 2:
+        raise ValueError("At least two return periods are required")
+    names = list(asset_names) if asset_names is not None else [f"asset_{i}" for i in range(n_assets)]
+    if len(names) != n_assets:
+        raise ValueError("asset_names must match the number of return series")
+
+    w = np.full(n_assets, 1.0 / n_assets) if weights is None else np.asarray(weights, dtype=float)
+    if w.shape != (n_assets,):
+        raise ValueError("weights must match the number of return series")
+
+    # The portfolio is computed as one more row so every metric stays a single pass
+    portfolio = w @ matrix
+    series = np.vstack([matrix, portfolio])
+
+    mean = series.mean(axis=1)
+    std = series.std(axis=1)
+    volatility = std * np.sqrt(TRADING_DAYS)
+    excess = mean - risk_free_rate / TRADING_DAYS
+    sharpe = np.divide(excess, std, out=np.zeros_like(excess), where=std > 0) * np.sqrt(TRADING_DAYS)
+
+    var = np.percentile(series, (1 - confidence_level) * 100, axis=1)
+    tail = series <= var[:, None]
+    expected_shortfall = (series * tail).sum(axis=1) / np.maximum(tail.sum(axis=1), 1)
+
+    cumulative = np.cumprod(1 + series, axis=1)
+    running_max = np.maximum.accumulate(cumulative, axis=1)
+    max_drawdown = ((cumulative - running_max) / running_max).min(axis=1)
+
+    market = portfolio if benchmark_returns is None else np.asarray(benchmark_returns, dtype=float)
+    if market.shape != (n_periods,):
+        raise ValueError("benchmark_returns must have one value per period")
+    market_dev = market - market.mean()
+    market_var = market_dev @ market_dev / n_periods
+    beta = (series - mean[:, None]) @ market_dev / n_periods / market_var if market_var > 0 else np.zeros(len(series))
+
+    correlation_matrix = None
+    if include_correlation:
+        correlation = np.corrcoef(matrix) if n_assets > 1 else np.ones((1, 1))
+        correlation = np.nan_to_num(correlation).tolist()
+        correlation_matrix = {
+            row_name: dict(zip(names, row)) for row_name, row in zip(names, correlation)
+        }
+
+    # Convert columns to Python floats once instead of per cell
+    columns = {
+        "volatility": volatility,
+        "value_at_risk": var,
+        "expected_shortfall": expected_shortfall,
+        "sharpe_ratio": sharpe,
+        "max_drawdown": max_drawdown,
+        "beta": beta,
+        "mean_return": mean,
+        "std_deviation": std
+    }
+    rows = [dict(zip(columns, values)) for values in zip(*(np.asarray(c).tolist() for c in columns.values()))]
+
+    return {
+        "assets": dict(zip(names, rows[:n_assets])),
+        "portfolio": rows[n_assets],
+        "weights": dict(zip(names, map(float, w))),
+        "correlation_matrix": correlation_matrix,
+        "confidence_level": confidence_level,
+        "periods": n_periods
+    }
+
+def to_risk_metrics(result: Dict[str, Any]) -> Dict[str, RiskMetrics]:
+    """
+    Convert compute_risk_metrics output to RiskMetrics models
+
+    Returns:
+        RiskMetrics per asset plus a "portfolio" entry carrying the correlation matrix
+    """
+    metrics = {name: RiskMetrics(**values) for name, values in result["assets"].items()}
+    metrics["portfolio"] = RiskMetrics(**result["portfolio"], correlation_matrix=result.get("correlation_matrix"))
+    return metrics
+
+def align_return_series(returns_data: Dict[str, List[float]]) -> tuple:
+    """
+    Stack named return series into an (assets, periods) matrix
+
+    Series of different lengths are aligned on their most recent periods.
+    """
+    if not returns_data:
+        raise ValueError("No return series provided")
+    names = list(returns_data)
+    periods = min(len(series) for series in returns_data.values())
+    matrix = np.array([returns_data[name][-periods:] for name in names], dtype=float)
+    return names, matrix
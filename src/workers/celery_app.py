@@ -0,0 +1,67 @@
+"""
+Celery application for distributed workflow execution
+
+Start a worker with:
+    celery -A src.workers.celery_app worker --loglevel=info -Q workflows
+"""
+
+from urllib.parse import urlparse
+from celery import Celery
+from src.config.workflow_config import WorkflowConfig
+
+# FinanceWorkflowInput.priority runs from 1 (normal) to 5 (most urgent)
+MIN_PRIORITY = 1
+MAX_PRIORITY = 5
+
+def celery_priority(priority: int, broker_url: str) -> int:
+    """
+    Map a workflow priority onto the broker's priority scale
+
+    The Redis transport consumes lower numbers first, AMQP higher numbers.
+
+    Args:
+        priority: FinanceWorkflowInput.priority (1-5, 5 most urgent)
+        broker_url: Celery broker URL
+
+    Returns:
+        Celery message priority
+    """
+    priority = min(max(priority, MIN_PRIORITY), MAX_PRIORITY)
+    if urlparse(broker_url).scheme in ("amqp", "amqps", "pyamqp"):
+        return priority
+    return MAX_PRIORITY - priority
+
+def create_celery_app(config: WorkflowConfig) -> Celery:
+    """
+    Build the Celery app from workflow configuration
+
+    A memory:// broker is kombu's in-process transport: tasks are queued,
+    not run on the caller, and a worker thread in the same process (as in
+    celery.contrib.testing.worker.start_worker) consumes them, so tests
+    and local runs need no Redis or worker processes.
+    """
+    celery_config = config.get_celery_config()
+    broker_url = celery_config["broker_url"]
+    app = Celery("eafaw", broker=broker_url, include=["src.workers.tasks"])
+    app.conf.update(
+        task_default_queue=celery_config["queue"],
+        task_serializer="json",
+        accept_content=["json"],
+        # Results live in the shared workflow result store, not the Celery backend
+        task_ignore_result=True,
+        task_acks_late=True,
+        # Prefetching would let low-priority work jump ahead of urgent messages
+        worker_prefetch_multiplier=1,
+        task_soft_time_limit=celery_config["timeout_seconds"],
+        task_time_limit=celery_config["timeout_seconds"] + 30,
+        task_queue_max_priority=MAX_PRIORITY,
+        task_default_priority=celery_priority(MIN_PRIORITY, broker_url),
+        broker_transport_options={
+            "priority_steps": list(range(MAX_PRIORITY + 1)),
+            "sep": ":",
+            "queue_order_strategy": "priority"
+        }
+    )
+    return app
+
+celery_app = create_celery_app(WorkflowConfig())
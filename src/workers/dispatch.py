@@ -0,0 +1,106 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+from src.config.workflow_config import WorkflowConfig
+from src.core.interfaces.store_interface import BaseResultStore
+from src.models.finance_models import FinanceWorkflowInput, FinanceWorkflowOutput, WorkflowStatus
+from src.workers.celery_app import celery_app, celery_priority
+from src.workers.tasks import process_invoice_task, run_finance_workflow_task
+from src.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+class CeleryWorkflowDispatcher:
+    """
+    Enqueue workflows to Celery workers instead of running them in the API.
+
+    Workers write results to the shared result store. The task returned by
+    submit() resolves once that record turns terminal, so callers can await
+    it exactly like an executor future. A record still not terminal after
+    timeout_seconds (CELERY_RESULT_TIMEOUT_SECONDS by default) is marked
+    FAILED, and workers leave terminal records alone.
+    """
+
+    def __init__(
+        self,
+        store: BaseResultStore,
+        poll_interval: float = 0.5,
+        max_poll_interval: float = 2.0,
+        timeout_seconds: Optional[float] = None
+    ):
+        self.store = store
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        if timeout_seconds is None:
+            timeout_seconds = WorkflowConfig().get_celery_config()["result_timeout_seconds"]
+        self.timeout_seconds = timeout_seconds
+        self.broker_url = celery_app.conf.broker_url
+        self._in_flight = 0
+
+    def submit(self, workflow_type: str, input_data: FinanceWorkflowInput, workflow_id: str) -> asyncio.Task:
+        """
+        Enqueue a finance workflow
+
+        Args:
+            workflow_type: Workflow key (financial_analysis, budget_management, ...)
+            input_data: Finance workflow input data
+            workflow_id: Record the worker updates
+
+        Returns:
+            Task resolving to the stored FinanceWorkflowOutput
+        """
+        return self._enqueue(run_finance_workflow_task, (workflow_type, input_data.model_dump_json(), workflow_id), input_data, workflow_id)
+
+    def submit_invoice(self, input_data: FinanceWorkflowInput, workflow_id: str) -> asyncio.Task:
+        """Enqueue invoice processing; see submit()"""
+        return self._enqueue(process_invoice_task, (input_data.model_dump_json(), workflow_id), input_data, workflow_id)
+
+    async def wait_for_result(self, workflow_id: str) -> FinanceWorkflowOutput:
+        """
+        Poll the shared store until the worker records a final status
+
+        Store reads run in a thread, as the SQL and Redis stores block. Past
+        timeout_seconds the record is marked FAILED and returned.
+        """
+        deadline = time.monotonic() + self.timeout_seconds
+        delay = self.poll_interval
+        while True:
+            record = await asyncio.to_thread(self.store.get, workflow_id)
+            if record is not None and record.status in (WorkflowStatus.SUCCESS, WorkflowStatus.FAILED):
+                return record
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return await asyncio.to_thread(self._mark_timed_out, workflow_id, record)
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 1.5, self.max_poll_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get dispatcher load as seen from this API process"""
+        return {
+            "executor_type": "celery",
+            "broker": celery_app.conf.broker_url.split("@")[-1],
+            "queue": celery_app.conf.task_default_queue,
+            "in_flight": self._in_flight
+        }
+
+    def _enqueue(self, task: Any, args: tuple, input_data: FinanceWorkflowInput, workflow_id: str) -> asyncio.Task:
+        task.apply_async(args=args, task_id=workflow_id, priority=celery_priority(input_data.priority, self.broker_url))
+        logger.info(f"Enqueued workflow {workflow_id} with priority {input_data.priority}")
+
+        self._in_flight += 1
+        waiter = asyncio.get_running_loop().create_task(self.wait_for_result(workflow_id))
+        waiter.add_done_callback(self._release)
+        return waiter
+
+    def _mark_timed_out(self, workflow_id: str, record: Optional[FinanceWorkflowOutput]) -> FinanceWorkflowOutput:
+        error_message = f"No result from a worker within {self.timeout_seconds} seconds"
+        if record is None:
+            # Evicted from the store: leave recording the failure to the caller
+            raise asyncio.TimeoutError(error_message)
+        failed = record.model_copy(update={"status": WorkflowStatus.FAILED, "error_message": error_message})
+        self.store.put(workflow_id, failed)
+        logger.error(f"Workflow {workflow_id} timed out waiting for a worker")
+        return failed
+
+    def _release(self, _task: asyncio.Task) -> None:
+        self._in_flight -= 1
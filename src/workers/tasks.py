@@ -0,0 +1,85 @@
+import asyncio
+from celery.signals import worker_process_shutdown
+from src.workers.celery_app import celery_app
+from src.llm.client_registry import close_llm_clients
+from src.models.finance_models import FinanceWorkflowInput, FinanceWorkflowOutput, WorkflowStatus
+from src.services.workflow_runner import get_workflow_store, run_finance_workflow, run_invoice_workflow
+from src.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+@celery_app.task(name="workflows.run_finance_workflow")
+def run_finance_workflow_task(workflow_type: str, input_json: str, workflow_id: str) -> str:
+    """
+    Run a finance workflow on a worker and store its result
+
+    Args:
+        workflow_type: Workflow key (financial_analysis, budget_management, ...)
+        input_json: Serialized FinanceWorkflowInput
+        workflow_id: Record to update in the shared result store
+
+    Returns:
+        Final workflow status
+    """
+    input_data = FinanceWorkflowInput.model_validate_json(input_json)
+    if not _mark_running(workflow_id):
+        return WorkflowStatus.FAILED.value
+    try:
+        # The API's event bus is in another process; partial results still reach the store
+        result = run_finance_workflow(workflow_type, input_data, workflow_id, publish_events=False)
+    except Exception as e:
+        logger.error(f"Workflow {workflow_id} failed on worker: {str(e)}")
+        result = FinanceWorkflowOutput(status=WorkflowStatus.FAILED, workflow_type=input_data.workflow_type, error_message=str(e))
+    return _store_result(workflow_id, result)
+
+@celery_app.task(name="workflows.process_invoice")
+def process_invoice_task(input_json: str, workflow_id: str) -> str:
+    """
+    Run invoice processing on a worker and store its result
+
+    Args:
+        input_json: Serialized FinanceWorkflowInput
+        workflow_id: Record to update in the shared result store
+
+    Returns:
+        Final workflow status
+    """
+    input_data = FinanceWorkflowInput.model_validate_json(input_json)
+    if not _mark_running(workflow_id):
+        return WorkflowStatus.FAILED.value
+    try:
+        result = run_invoice_workflow(input_data)
+    except Exception as e:
+        logger.error(f"Invoice workflow {workflow_id} failed on worker: {str(e)}")
+        result = FinanceWorkflowOutput(status=WorkflowStatus.FAILED, workflow_type=input_data.workflow_type, error_message=str(e))
+    return _store_result(workflow_id, result)
+
+@worker_process_shutdown.connect
+def close_worker_llm_clients(**_kwargs) -> None:
+    """Release pooled LLM connections when a worker process exits"""
+    asyncio.run(close_llm_clients())
+
+def _mark_running(workflow_id: str) -> bool:
+    """Mark a queued workflow RUNNING; False if it is already terminal and must not run"""
+    store = get_workflow_store()
+    record = store.get(workflow_id)
+    if _is_terminal(record):
+        logger.warning(f"Skipping workflow {workflow_id}: already {record.status.value}")
+        return False
+    if record is not None and record.status == WorkflowStatus.PENDING:
+        store.put(workflow_id, record.model_copy(update={"status": WorkflowStatus.RUNNING}))
+    return True
+
+def _store_result(workflow_id: str, result: FinanceWorkflowOutput) -> str:
+    result.workflow_id = workflow_id
+    store = get_workflow_store()
+    current = store.get(workflow_id)
+    # The API marks a record FAILED when it gives up waiting; the caller has seen that answer
+    if _is_terminal(current):
+        logger.warning(f"Discarding result of workflow {workflow_id}: already {current.status.value}")
+        return current.status.value
+    store.put(workflow_id, result)
+    return result.status.value
+
+def _is_terminal(record) -> bool:
+    return record is not None and record.status in (WorkflowStatus.SUCCESS, WorkflowStatus.FAILED)
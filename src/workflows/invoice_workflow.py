@@ -1,21 +1,44 @@
 from src.core.base_workflow import BaseWorkflow
-from src.crews.invoice_crew import InvoiceCrew
-from typing import Dict, Any
+from src.crews.invoice_crew import InvoiceCrew, get_invoice_crew
+from functools import lru_cache
+from typing import Dict, Any, Optional
 from src.common.logger import get_logger
+from src.config.workflow_config import WorkflowConfig
+from src.services.duplicate_index import DuplicateInvoiceIndex, get_duplicate_index, invoice_index_id
+from src.services.invoice_triage import FAST_LANE_APPROVER, InvoiceTriage, TriageDecision, get_invoice_triage
+from src.tools.invoice_tools import execute_payment, log_audit_event
 
 logger = get_logger(__name__)
 
+# Workflow payment status for each payment ledger status
+PAYMENT_STATUS_LABELS = {"queued": "Scheduled", "submitted": "Scheduled", "paid": "Completed", "failed": "Failed"}
+
 class InvoiceWorkflow(BaseWorkflow):
     """Workflow for Invoice-to-Pay process"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        invoice_crew: Optional[InvoiceCrew] = None,
+        triage: Optional[InvoiceTriage] = None,
+        duplicate_index: Optional[DuplicateInvoiceIndex] = None
+    ):
         super().__init__()
-        self.invoice_crew = InvoiceCrew()
+        self.invoice_crew = invoice_crew if invoice_crew is not None else get_invoice_crew()
+        self.triage = triage if triage is not None else get_invoice_triage()
+        # An empty index is falsy (it has a length), so test for None
+        self.duplicate_index = duplicate_index if duplicate_index is not None else get_duplicate_index()
+        self.fast_lane_enabled = WorkflowConfig().get_invoice_fast_lane_config()["enabled"]
     
     def process_invoice(self, invoice_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute the full Invoice-to-Pay workflow
         
+        Invoices that pass deterministic triage (extraction, ERP match,
+        compliance, amount limit) are approved and paid without the crew;
+        exact duplicates of an indexed invoice are rejected, and the rest go
+        to the crew together with the triage findings. Every invoice is
+        added to the duplicate index before it can be paid.
+        
         Args:
             invoice_data: Dictionary containing invoice information and document path
             
@@ -25,6 +48,20 @@ class InvoiceWorkflow(BaseWorkflow):
         try:
             logger.info(f"Starting invoice processing workflow for invoice: {invoice_data.get('invoice_id', 'Unknown')}")
             
+            triage = self.triage.triage(invoice_data) if self.fast_lane_enabled else None
+            duplicate_of = (triage.erp or {}).get("duplicate_of") if triage is not None else None
+            if triage is not None and triage.fast_lane:
+                # A concurrent submission of the same invoice may have been indexed after triage
+                duplicate_of = self._claim(invoice_data, triage.fields)
+                if duplicate_of is None:
+                    return self._process_fast_lane(invoice_data, triage)
+            if duplicate_of is not None:
+                return self._reject_duplicate(invoice_data, triage, duplicate_of)
+            self._index(invoice_data, triage.fields if triage is not None else {})
+            if triage is not None:
+                logger.info(f"Escalating invoice {invoice_data.get('invoice_id', 'Unknown')} to the crew: {'; '.join(triage.reasons)}")
+                invoice_data = {**invoice_data, "triage": triage.to_dict()}
+            
             # Create and execute the invoice processing crew
             crew = self.invoice_crew.invoice_processing_crew(invoice_data)
             result = crew.kickoff()
@@ -33,6 +70,7 @@ class InvoiceWorkflow(BaseWorkflow):
             workflow_result = {
                 "status": "SUCCESS",
                 "invoice_id": invoice_data.get("invoice_id"),
+                "lane": "crew",
                 "workflow_results": result,
                 "payment_status": "Completed",
                 "audit_trail": {
@@ -53,4 +91,77 @@ class InvoiceWorkflow(BaseWorkflow):
                 "status": "FAILED",
                 "invoice_id": invoice_data.get("invoice_id"),
                 "error": error_msg
-            }
\ No newline at end of file
+            }
+    
+    def _claim(self, invoice_data: Dict[str, Any], fields: Dict[str, Any]) -> Optional[str]:
+        """Index the invoice unless an exact duplicate is indexed; returns the duplicate's ID"""
+        invoice = {**invoice_data, **fields}
+        return self.duplicate_index.claim(invoice, invoice_index_id(invoice))
+
+    def _index(self, invoice_data: Dict[str, Any], fields: Dict[str, Any]) -> None:
+        """Index an invoice going to the crew, so later submissions see it as a duplicate"""
+        invoice = {**invoice_data, **invoice_data.get("extracted_data", {}), **fields}
+        if invoice.get("invoice_number"):
+            self.duplicate_index.add(invoice, invoice_index_id(invoice))
+
+    def _process_fast_lane(self, invoice_data: Dict[str, Any], triage: TriageDecision) -> Dict[str, Any]:
+        """Approve an invoice that passed triage and its duplicate claim, and queue its payment, without LLM calls"""
+        invoice_id = invoice_data.get("invoice_id")
+        fields = triage.fields
+        payment = execute_payment({
+            "invoice_id": invoice_id,
+            "invoice_number": fields["invoice_number"],
+            "vendor": fields["vendor"],
+            "amount": fields["amount"],
+            "currency": fields["currency"]
+        })
+        if payment["status"] != "success":
+            raise RuntimeError(f"Payment failed: {payment.get('message')}")
+        audit = log_audit_event({
+            "type": "invoice_fast_lane",
+            "details": {"invoice_id": invoice_id, "approver": FAST_LANE_APPROVER, "erp": triage.erp, "compliance": triage.compliance}
+        })
+        logger.info(f"Processed invoice {invoice_id or 'Unknown'} in the fast lane")
+        return {
+            "status": "SUCCESS",
+            "invoice_id": invoice_id,
+            "lane": "fast_lane",
+            "workflow_results": {"extracted_data": fields, "triage": triage.to_dict(), "payment": payment["payment_result"]},
+            "payment_status": PAYMENT_STATUS_LABELS[payment["payment_result"]["status"]],
+            "audit_trail": {
+                "extraction_status": "Completed",
+                "validation_status": "Completed",
+                "approval_status": "Auto-approved",
+                "payment_status": "Submitted",
+                "audit_log": audit.get("audit_log")
+            }
+        }
+
+    def _reject_duplicate(self, invoice_data: Dict[str, Any], triage: TriageDecision, duplicate_of: str) -> Dict[str, Any]:
+        """Reject an exact duplicate of an indexed invoice, without LLM calls or a payment"""
+        invoice_id = invoice_data.get("invoice_id")
+        audit = log_audit_event({
+            "type": "invoice_duplicate_rejected",
+            "details": {"invoice_id": invoice_id, "duplicate_of": duplicate_of}
+        })
+        logger.warning(f"Rejected invoice {invoice_id or 'Unknown'} as a duplicate of invoice {duplicate_of}")
+        return {
+            "status": "SUCCESS",
+            "invoice_id": invoice_id,
+            "lane": "rejected",
+            "duplicate_of": duplicate_of,
+            "workflow_results": {"extracted_data": triage.fields, "triage": triage.to_dict()},
+            "payment_status": "Not paid",
+            "audit_trail": {
+                "extraction_status": "Completed",
+                "validation_status": "Completed",
+                "approval_status": "Rejected",
+                "payment_status": "Not paid",
+                "audit_log": audit.get("audit_log")
+            }
+        }
+
+@lru_cache()
+def get_invoice_workflow() -> InvoiceWorkflow:
+    """Get the process-wide invoice workflow, shared by the invoice endpoint, FinanceService and workers"""
+    return InvoiceWorkflow()
@@ -0,0 +1,10 @@
+import os
+
+# Settings are read when modules are imported; tests need no API keys, broker or database
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("CREW_API_KEY", "test")
+os.environ.setdefault("CELERY_BROKER_URL", "memory://")
+os.environ.setdefault("RESULT_STORE_BACKEND", "memory")
+os.environ.setdefault("WORKFLOW_DISPATCH", "local")
+os.environ.setdefault("DUPLICATE_INDEX_URL", "")
+os.environ.setdefault("PAYMENT_LEDGER_URL", "sqlite://")
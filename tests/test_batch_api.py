@@ -0,0 +1,67 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from src.api import finance_api
+from src.llm.fake_llm import FakeChatModel
+from src.services.workflow_runner import set_finance_workflow
+from src.workflows.finance_workflow import FinanceWorkflow
+
+def item(workflow_type, **fields):
+    return {"workflow_type": workflow_type, "user_id": "u1", "organization_id": "o1", **fields}
+
+ITEMS = [
+    item("FINANCIAL_ANALYSIS", financial_data={"revenue": [100.0, 120.0]}),
+    item("BUDGET_MANAGEMENT", budget_data={"actual": [90.0], "budgeted": [100.0]}, priority=3),
+    item("INVESTMENT_ADVISORY", investment_data={"holdings": {"AAA": 0.6, "BBB": 0.4}})
+]
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(finance_api, "workflow_dispatcher", None)
+    set_finance_workflow(FinanceWorkflow(llm=FakeChatModel(responder=lambda prompt: "batch report")))
+    yield TestClient(finance_api.app)
+    set_finance_workflow(None)
+
+def results(client, batch_id):
+    response = client.get(f"/api/v1/workflows/batch/{batch_id}/results")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def check_batch(client, response, total):
+    assert response.status_code == 200
+    batch = response.json()
+    assert batch["total"] == total and len(batch["workflow_ids"]) == total
+
+    # The TestClient runs background tasks before returning, so the batch is finished
+    status = client.get(f"/api/v1/workflows/batch/{batch['batch_id']}/status").json()
+    assert status["status"] == "SUCCESS"
+    assert (status["succeeded"], status["failed"], status["pending"], status["running"]) == (total, 0, 0, 0)
+
+    lines = results(client, batch["batch_id"])
+    assert sorted(line["workflow_id"] for line in lines) == sorted(batch["workflow_ids"])
+    assert all(line["status"] == "SUCCESS" and line["results"] == "batch report" for line in lines)
+    return lines
+
+def test_json_list_body(client):
+    lines = check_batch(client, client.post("/api/v1/workflows/batch", json=ITEMS), 3)
+    assert {line["workflow_type"] for line in lines} == {"FINANCIAL_ANALYSIS", "BUDGET_MANAGEMENT", "INVESTMENT_ADVISORY"}
+
+def test_items_object_body(client):
+    check_batch(client, client.post("/api/v1/workflows/batch", json={"items": ITEMS[:2]}), 2)
+
+def test_ndjson_body(client):
+    body = "\n".join(json.dumps(entry) for entry in ITEMS) + "\n\n"
+    response = client.post("/api/v1/workflows/batch", content=body, headers={"content-type": "application/x-ndjson"})
+    check_batch(client, response, 3)
+
+def test_ndjson_body_without_trailing_newline(client):
+    body = "\n".join(json.dumps(entry) for entry in ITEMS[:2])
+    response = client.post("/api/v1/workflows/batch", content=body, headers={"content-type": "application/x-ndjson"})
+    check_batch(client, response, 2)
+
+def test_invalid_and_empty_batches_are_rejected(client):
+    assert client.post("/api/v1/workflows/batch", json=[]).status_code == 422
+    assert client.post("/api/v1/workflows/batch", json=[{"workflow_type": "FINANCIAL_ANALYSIS"}]).status_code == 422
+    response = client.post("/api/v1/workflows/batch", content="not json\n", headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 422
+    assert client.get("/api/v1/workflows/batch/missing/results").status_code == 404
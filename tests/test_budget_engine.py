@@ -0,0 +1,48 @@
+import pytest
+from src.models.finance_models import BudgetData
+from src.tools import finance_tools
+from src.tools.budget_engine import analyze_budget_rows
+
+def row(department, category, period, budgeted, actual):
+    return {"department": department, "category": category, "period": period, "budgeted_amount": budgeted, "actual_amount": actual}
+
+ROWS = [
+    row("Sales", "Travel", "2026-01", 100.0, 110.0),
+    row("Sales", "Travel", "2026-02", 100.0, 130.0),
+    row("Sales", "Software", "2026-03", 200.0, 150.0),
+    row("Ops", "Rent", "2026-10", 500.0, 500.0),
+    row("Ops", "Rent", "2026-02", 500.0, 520.0),
+    BudgetData(department="Ops", category="Rent", period="2026-03", budgeted_amount=500.0, actual_amount=540.0)
+]
+
+def test_rows_are_grouped_by_department_category_and_period():
+    result = analyze_budget_rows(ROWS, top_n=2)
+    assert result["lines"] == 6
+    assert result["totals"] == {"budgeted": 1900.0, "actual": 1950.0, "variance": 50.0, "variance_percentage": 2.63}
+    assert result["by_department"]["Sales"]["variance"] == -10.0
+    assert result["by_category"]["Rent"]["actual"] == 1560.0
+    assert result["over_budget_groups"] == 2
+    assert [(line["category"], line["period"]) for line in result["top_overruns"]] == [("Rent", "2026-03"), ("Travel", "2026-02")]
+
+def test_periods_follow_the_calendar_with_trend_and_forecast():
+    result = analyze_budget_rows(ROWS, trend_window=2, forecast_periods=2)
+    # "2026-10" sorts after "2026-03" on the calendar, not lexically between 01 and 02
+    assert list(result["by_period"]) == ["2026-01", "2026-02", "2026-03", "2026-10"]
+    assert result["by_period"]["2026-03"]["rolling_actual"] == pytest.approx((650.0 + 690.0) / 2)
+    assert list(result["forecast"]) == ["2026-11", "2026-12"]
+    assert result["trend"]["rolling_window"] == 2
+    assert result["by_department"]["Ops"]["trend_per_period"] > 0
+
+def test_single_period_and_invalid_rows():
+    result = analyze_budget_rows([row("Sales", "Travel", "FY26", 100.0, 90.0)])
+    assert result["forecast"] == {} and result["top_overruns"] == []
+    assert result["by_department"]["Sales"]["trend_per_period"] is None
+    with pytest.raises(ValueError):
+        analyze_budget_rows([])
+    with pytest.raises(ValueError):
+        analyze_budget_rows([{"department": "Sales"}])
+
+def test_budget_analyzer_tool_accepts_rows():
+    result = finance_tools.budget_analyzer_tool.run(budget_data={"rows": ROWS[:3]})
+    assert result["totals"]["variance"] == -10.0
+    assert "error" in finance_tools.budget_analyzer_tool.run(budget_data={"actual": [1.0], "budgeted": [1.0, 2.0]})
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import pytest
+
+pytest.importorskip("celery")
+
+from celery.contrib.testing.worker import start_worker
+from celery.signals import task_postrun
+from src.llm.fake_llm import FakeChatModel
+from src.models.finance_models import FinanceWorkflowInput, FinanceWorkflowOutput, WorkflowStatus
+from src.services.workflow_runner import get_workflow_store, set_finance_workflow
+from src.workflows.finance_workflow import FinanceWorkflow
+from src.workers import tasks
+from src.workers.celery_app import celery_app
+from src.workers.dispatch import CeleryWorkflowDispatcher
+
+@pytest.fixture(scope="module")
+def worker():
+    with start_worker(celery_app, pool="solo", perform_ping_check=False, loglevel="WARNING"):
+        yield
+
+@pytest.fixture
+def release(monkeypatch):
+    """Invoice workflow stub that runs on the worker once the test sets the returned event"""
+    event = threading.Event()
+
+    def run_invoice_workflow(input_data):
+        event.wait(5)
+        return FinanceWorkflowOutput(status=WorkflowStatus.SUCCESS, workflow_type=input_data.workflow_type, results={"paid": True})
+
+    monkeypatch.setattr(tasks, "run_invoice_workflow", run_invoice_workflow)
+    return event
+
+def enqueue(dispatcher, workflow_id):
+    input_data = FinanceWorkflowInput(workflow_type="INVOICE_PROCESSING", user_id="u1", organization_id="o1")
+    get_workflow_store().put(workflow_id, FinanceWorkflowOutput(workflow_id=workflow_id, status=WorkflowStatus.PENDING, workflow_type=input_data.workflow_type))
+    return dispatcher.submit_invoice(input_data, workflow_id)
+
+def test_memory_broker_queues_to_worker_thread(worker, release):
+    async def scenario():
+        dispatcher = CeleryWorkflowDispatcher(get_workflow_store(), poll_interval=0.05, timeout_seconds=10)
+        waiter = enqueue(dispatcher, "wf-celery-1")
+        # Enqueueing returned without running the task on the event loop
+        await asyncio.sleep(0.2)
+        assert not waiter.done()
+        release.set()
+        return await waiter
+
+    result = asyncio.run(scenario())
+    assert result.status == WorkflowStatus.SUCCESS
+    assert result.results == {"paid": True}
+
+def test_timed_out_workflow_is_not_overwritten_by_worker(worker, release):
+    finished = threading.Event()
+
+    def on_postrun(task_id=None, **_kwargs):
+        if task_id == "wf-celery-2":
+            finished.set()
+
+    task_postrun.connect(on_postrun, weak=False)
+
+    async def scenario():
+        dispatcher = CeleryWorkflowDispatcher(get_workflow_store(), poll_interval=0.05, timeout_seconds=0.3)
+        return await enqueue(dispatcher, "wf-celery-2")
+
+    result = asyncio.run(scenario())
+    assert result.status == WorkflowStatus.FAILED
+    release.set()
+    # Whether the worker picked the task up before or after the timeout, it leaves the record alone
+    assert finished.wait(5)
+    task_postrun.disconnect(on_postrun)
+    stored = get_workflow_store().get("wf-celery-2")
+    assert stored.status == WorkflowStatus.FAILED
+    assert "No result from a worker" in stored.error_message
+
+def test_worker_runs_finance_workflow_on_fake_llm(worker):
+    llm = FakeChatModel(responder=lambda prompt: "worker report")
+    set_finance_workflow(FinanceWorkflow(llm=llm))
+    input_data = FinanceWorkflowInput(workflow_type="FINANCIAL_ANALYSIS", financial_data={"revenue": [100.0, 120.0]}, user_id="u1", organization_id="o1")
+    get_workflow_store().put("wf-celery-3", FinanceWorkflowOutput(workflow_id="wf-celery-3", status=WorkflowStatus.PENDING, workflow_type=input_data.workflow_type))
+
+    async def scenario():
+        dispatcher = CeleryWorkflowDispatcher(get_workflow_store(), poll_interval=0.05, timeout_seconds=10)
+        return await dispatcher.submit("financial_analysis", input_data, "wf-celery-3")
+
+    try:
+        result = asyncio.run(scenario())
+    finally:
+        set_finance_workflow(None)
+    assert result.status == WorkflowStatus.SUCCESS
+    assert result.workflow_id == "wf-celery-3"
+    assert result.results == "worker report"
+    assert result.token_usage.llm_calls == 1
+    assert llm.calls == 1
@@ -0,0 +1,62 @@
+import json
+import pandas as pd
+import pytest
+from src.tools import finance_tools
+from src.tools.compliance_engine import ComplianceRuleEngine, load_rules
+
+COMPLETE = {"amount": 100.0, "date": "2026-01-01", "description": "Office supplies", "approver": "kim"}
+
+def test_default_rules_score_a_batch():
+    engine = ComplianceRuleEngine()
+    evaluation = engine.evaluate([
+        {**COMPLETE, "id": "T1"},
+        {**COMPLETE, "id": "T2", "amount": 7500.0},
+        {"id": "T3", "amount": 25000.0, "date": "2026-01-03"}
+    ])
+    scores = [result["compliance_score"] for result in evaluation.results()]
+    statuses = [result["status"] for result in evaluation.results()]
+    assert scores == [100, 90, 35]
+    assert statuses == ["COMPLIANT", "COMPLIANT", "NON_COMPLIANT"]
+    assert evaluation.summary()["rule_violations"] == {
+        "REQUIRED_DESCRIPTION": 1, "REQUIRED_APPROVER": 1, "SECONDARY_APPROVAL": 1, "SUPPORTING_DOCUMENTS": 2
+    }
+    checks = evaluation.checks(2)
+    assert [check.rule_id for check in checks] == ["REQUIRED_DESCRIPTION", "REQUIRED_APPROVER", "SECONDARY_APPROVAL", "SUPPORTING_DOCUMENTS"]
+    assert checks[0].details == "Transaction T3: Missing required field: description"
+
+def test_custom_rules_with_operators_and_critical_severity(tmp_path):
+    rules = [
+        {"rule_id": "SANCTIONED", "description": "Sanctioned country", "severity": "critical", "penalty": 5,
+         "when": [{"field": "country", "op": "in", "value": ["XX", "YY"]}]},
+        {"rule_id": "CASH_REVIEW", "description": "Large cash payment", "severity": "LOW", "penalty": 30,
+         "when": [{"field": "method", "op": "==", "value": "cash"}, {"field": "amount", "op": ">=", "value": 1000}]}
+    ]
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"rules": rules}))
+    engine = ComplianceRuleEngine(load_rules(str(path)), pass_score=80)
+    frame = pd.DataFrame([
+        {"country": "XX", "method": "wire", "amount": 10.0},
+        {"country": "US", "method": "cash", "amount": "1500"},
+        {"country": "US", "method": "cash", "amount": 999.0}
+    ])
+    results = engine.evaluate(frame).results()
+    # A critical rule fails the transaction whatever its score
+    assert (results[0]["compliance_score"], results[0]["status"]) == (95, "NON_COMPLIANT")
+    assert (results[1]["compliance_score"], results[1]["status"]) == (70, "NON_COMPLIANT")
+    assert results[2]["issues"] == []
+    assert engine.evaluate(frame).checks(1)[0].status == "WARNING"
+
+def test_invalid_rules_are_rejected_up_front():
+    with pytest.raises(ValueError, match="severity"):
+        ComplianceRuleEngine([{"rule_id": "R", "description": "d", "severity": "URGENT", "require": ["x"]}])
+    with pytest.raises(ValueError, match="operator"):
+        ComplianceRuleEngine([{"rule_id": "R", "description": "d", "when": [{"field": "x", "op": "~"}]}])
+    with pytest.raises(ValueError, match="needs at least one"):
+        ComplianceRuleEngine([{"rule_id": "R", "description": "d"}])
+    with pytest.raises(ValueError, match="Duplicate"):
+        ComplianceRuleEngine([{"rule_id": "R", "description": "d", "require": ["x"]}] * 2)
+
+def test_compliance_checker_tool_checks_one_transaction():
+    result = finance_tools.compliance_checker_tool.run(transaction_data={**COMPLETE, "amount": 12000.0, "supporting_documents": ["po.pdf"]})
+    assert result["status"] == "COMPLIANT" and result["compliance_score"] == 85
+    assert [check["rule_id"] for check in result["checks"]] == ["SECONDARY_APPROVAL"]
@@ -0,0 +1,61 @@
+from src.services.duplicate_index import DuplicateInvoiceIndex, invoice_index_id
+
+LINE_ITEMS = [
+    {"description": "Steel brackets 40mm", "amount": 120.0},
+    {"description": "Hex bolts M8 box", "amount": 45.5},
+    {"description": "Anchor plates galvanized", "amount": 310.0},
+    {"description": "Delivery and handling", "amount": 25.0},
+    {"description": "Safety inspection", "amount": 80.0}
+]
+
+def invoice(number="INV-00123", vendor="Acme Supplies", amount=580.5, day="2026-01-15", line_items=None):
+    return {"invoice_number": number, "vendor": vendor, "amount": amount, "date": day, "line_items": line_items}
+
+def test_exact_and_loose_number_matches():
+    index = DuplicateInvoiceIndex(url=None)
+    index.add(invoice(), "X1")
+    assert index.check(invoice())["duplicate_of"] == "X1"
+    assert index.check(invoice(), exclude_id="X1")["duplicate_of"] is None
+    loose = index.check(invoice(number="inv 123", amount=99.0, day="2026-02-01"))
+    assert loose["duplicate_of"] is None
+    assert [(match["invoice_id"], match["reason"]) for match in loose["possible_duplicates"]] == [("X1", "same_number")]
+    assert index.check(invoice(vendor="Other Vendor"))["duplicate_of"] is None
+
+def test_line_item_near_duplicates_via_lsh():
+    index = DuplicateInvoiceIndex(url=None)
+    index.add(invoice(line_items=LINE_ITEMS), "X1")
+    # Renumbered, re-dated and re-totalled, with the same line items
+    resubmitted = index.check(invoice(number="B-77", amount=581.0, day="2026-03-02", line_items=list(reversed(LINE_ITEMS))))
+    assert resubmitted["duplicate_of"] is None
+    [match] = resubmitted["possible_duplicates"]
+    assert match["invoice_id"] == "X1" and match["reason"] == "line_items" and match["similarity"] >= 0.8
+
+    different = [{"description": f"Consulting hours week {week}", "amount": 900.0} for week in range(5)]
+    assert index.check(invoice(number="B-78", amount=4500.0, line_items=different))["possible_duplicates"] == []
+    # Buckets are per vendor, so the same items from another vendor are not matched
+    assert index.check(invoice(number="B-79", vendor="Other Vendor", amount=1.0, line_items=LINE_ITEMS))["possible_duplicates"] == []
+
+def test_workers_share_invoices_through_the_table(tmp_path):
+    url = f"sqlite:///{tmp_path / 'index.db'}"
+    first = DuplicateInvoiceIndex(url=url)
+    second = DuplicateInvoiceIndex(url=url, refresh_seconds=3600)
+    first.add_many({"X1": invoice()})
+    # Lookups answer from memory until the next refresh
+    assert second.check(invoice())["duplicate_of"] is None
+    assert second.refresh() == 1
+    assert second.check(invoice())["duplicate_of"] == "X1"
+
+def test_claim_races_between_workers_settle_on_the_table(tmp_path):
+    url = f"sqlite:///{tmp_path / 'index.db'}"
+    first = DuplicateInvoiceIndex(url=url, refresh_seconds=3600)
+    second = DuplicateInvoiceIndex(url=url, refresh_seconds=3600)
+    assert first.claim(invoice(), "X1") is None
+    assert second.claim(invoice(), "X2") == "X1"
+    assert second.check(invoice())["duplicate_of"] == "X1"
+
+def test_claim_admits_one_id_per_invoice():
+    index = DuplicateInvoiceIndex(url=None)
+    assert index.claim(invoice(), "X1") is None
+    assert index.claim(invoice(), "X1") is None
+    assert index.claim(invoice(), "X2") == "X1"
+    assert invoice_index_id(invoice()) == invoice_index_id({**invoice(), "invoice_number": "INV00123"})
@@ -0,0 +1,59 @@
+import pytest
+from src.services.duplicate_index import DuplicateInvoiceIndex
+from src.services.erp_validation import BulkERPValidator
+from src.tools.erp_clients import MockERPClient
+from src.tools.mock_erp import MockERPDataset
+
+@pytest.fixture
+def dataset():
+    return MockERPDataset(
+        vendors=[
+            {"vendor_id": "V-1", "name": "Acme Supplies", "active": True},
+            {"vendor_id": "V-2", "name": "Dormant Ltd", "active": False}
+        ],
+        purchase_orders=[
+            {"po_number": "PO-1", "vendor_id": "V-1", "currency": "USD", "amount_remaining": 1000.0, "status": "open"},
+            {"po_number": "PO-2", "vendor_id": "V-1", "currency": "USD", "amount_remaining": 1000.0, "status": "closed"}
+        ]
+    )
+
+def invoice(po_number, vendor="Acme Supplies", amount=500.0, number="INV-1"):
+    return {"invoice_number": number, "date": "2026-01-15", "vendor": vendor, "po_number": po_number, "amount": amount, "currency": "USD"}
+
+def test_index_hits_stay_local_and_misses_share_one_erp_request(dataset):
+    validator = BulkERPValidator(MockERPClient(dataset))
+    results = validator.validate([
+        invoice("PO-1"),
+        invoice("PO-2"),
+        invoice("PO-9"),
+        invoice("PO-1", vendor="Dormant Ltd"),
+        invoice("PO-1", amount=5000.0)
+    ])
+    assert [result["source"] for result in results] == ["index", "erp", "erp", "index", "index"]
+    assert results[0]["po_match"] and results[0]["budget_available"]
+    assert not results[1]["po_match"]
+    assert not results[2]["po_match"]
+    assert not results[3]["vendor_valid"]
+    assert results[4]["po_match"] and not results[4]["budget_available"]
+    assert dataset.requests["validate"] == 1
+    assert dataset.requests["invoices_validated"] == 2
+    stats = validator.stats()
+    assert (stats["index_hits"], stats["erp_lookups"], stats["erp_requests"]) == (3, 2, 1)
+
+def test_refresh_applies_only_new_changes(dataset):
+    validator = BulkERPValidator(MockERPClient(dataset))
+    validator.refresh()
+    dataset.upsert_purchase_order({"po_number": "PO-3", "vendor_id": "V-1", "currency": "USD", "amount_remaining": 200.0, "status": "open"})
+    assert validator.refresh() == 1
+    result = validator.validate([invoice("PO-3", amount=150.0)])[0]
+    assert result["source"] == "index" and result["budget_available"]
+    assert dataset.requests["validate"] == 0
+
+def test_duplicate_check_comes_from_duplicate_index(dataset):
+    index = DuplicateInvoiceIndex(url=None)
+    index.add(invoice("PO-1"), "X1")
+    validator = BulkERPValidator(MockERPClient(dataset), duplicate_index=index)
+    duplicate, other, itself = validator.validate([invoice("PO-1"), invoice("PO-1", number="INV-2", amount=20.0), {**invoice("PO-1"), "invoice_id": "X1"}])
+    assert duplicate["duplicate_check"] and duplicate["duplicate_of"] == "X1"
+    assert not other["duplicate_check"]
+    assert not itself["duplicate_check"]
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from src.api import finance_api
+from src.llm.fake_llm import FakeChatModel
+from src.services.event_bus import WorkflowEventBus, emit_workflow_event, token_streaming_enabled, workflow_event_scope
+from src.services.workflow_runner import set_finance_workflow
+from src.workflows.finance_workflow import FinanceWorkflow
+
+def test_subscribers_get_history_then_live_events_from_other_threads():
+    bus = WorkflowEventBus()
+    bus.publish("wf-1", "status", {"status": "RUNNING"})
+
+    async def scenario():
+        received = []
+        subscription = bus.subscribe("wf-1")
+        received.append(await subscription.__anext__())
+        # Executor workers publish from their own threads
+        worker = threading.Thread(target=lambda: [
+            bus.publish("wf-1", "stage", {"stage": "financial_analysis", "state": "completed"}),
+            bus.publish("wf-1", "status", {"status": "SUCCESS"})
+        ])
+        worker.start()
+        async for event in subscription:
+            received.append(event)
+        worker.join()
+        return received
+
+    events = asyncio.run(scenario())
+    assert [(event.seq, event.event) for event in events] == [(1, "status"), (2, "stage"), (3, "status")]
+    assert bus.stats() == {"channels": 1, "subscribers": 0}
+
+def test_resuming_after_a_sequence_number_skips_seen_events():
+    bus = WorkflowEventBus()
+    for status in ("PENDING", "RUNNING", "SUCCESS"):
+        bus.publish("wf-2", "status", {"status": status})
+
+    async def replay(after_seq):
+        return [event.data["status"] async for event in bus.subscribe("wf-2", after_seq)]
+
+    assert asyncio.run(replay(0)) == ["PENDING", "RUNNING", "SUCCESS"]
+    assert asyncio.run(replay(2)) == ["SUCCESS"]
+
+def test_closed_channels_are_forgotten_after_retention():
+    bus = WorkflowEventBus(retention_seconds=0)
+    bus.publish("wf-3", "status", {"status": "FAILED"})
+    time.sleep(0.01)
+    bus.publish("wf-4", "status", {"status": "RUNNING"})
+    assert bus.stats()["channels"] == 1
+
+def test_event_scope_routes_emits_to_sinks():
+    received = []
+    emit_workflow_event("stage", stage="ignored")
+    with workflow_event_scope(None, sinks=[lambda event, data: received.append((event, data))], stream_tokens=False):
+        emit_workflow_event("stage", stage="financial_analysis", state="started")
+        assert not token_streaming_enabled()
+    assert received == [("stage", {"stage": "financial_analysis", "state": "started"})]
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(finance_api, "workflow_dispatcher", None)
+    set_finance_workflow(FinanceWorkflow(llm=FakeChatModel(responder=lambda prompt: "streamed analysis report")))
+    yield TestClient(finance_api.app)
+    set_finance_workflow(None)
+
+def read_sse(response):
+    events = []
+    for frame in response.text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+def test_sse_endpoint_streams_status_stages_and_tokens(client):
+    response = client.post("/api/v1/workflows/financial-analysis", json={
+        "workflow_type": "FINANCIAL_ANALYSIS",
+        "financial_data": {"revenue": [100.0, 120.0]},
+        "user_id": "u1",
+        "organization_id": "o1",
+        "metadata": {"stream": True}
+    })
+    workflow_id = response.json()["workflow_id"]
+
+    # The workflow already finished, so the stream replays history and closes
+    stream = client.get(f"/api/v1/workflows/{workflow_id}/events")
+    assert stream.headers["content-type"].startswith("text/event-stream")
+    events = read_sse(stream)
+    kinds = [event for _id, event, _data in events]
+    assert kinds[0] == "status" and kinds[-1] == "status"
+    assert events[-1][2]["data"]["status"] == "SUCCESS"
+    assert {"stage", "token"} <= set(kinds)
+    tokens = "".join(data["data"]["text"] for _id, event, data in events if event == "token")
+    assert tokens == "streamed analysis report"
+
+    # Last-Event-ID resumes after the events a client already saw
+    resumed = read_sse(client.get(f"/api/v1/workflows/{workflow_id}/events", headers={"Last-Event-ID": events[-2][0]}))
+    assert [event for _id, event, _data in resumed] == ["status"]
+    assert client.get("/api/v1/workflows/missing/events").status_code == 404
+
+    # The streamed text was also recorded as the workflow's final result
+    assert client.get(f"/api/v1/workflows/{workflow_id}/status").json()["results"] == "streamed analysis report"
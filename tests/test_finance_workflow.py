@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+from src.llm.fake_llm import FakeChatModel
+from src.llm.response_cache import CachedResponse, LLMResponseCache
+from src.models.finance_models import FinanceWorkflowInput, WorkflowStatus
+from src.services.result_store import InMemoryResultStore
+from src.services.workflow_runner import arun_finance_workflow, run_finance_workflow, set_finance_workflow
+from src.workflows.finance_workflow import FinanceWorkflow
+
+FINANCIAL_DATA = {"revenue": [100.0, 120.0, 150.0], "expenses": [80.0, 90.0, 100.0], "assets": 500.0, "liabilities": 200.0}
+
+def request(**metadata):
+    return FinanceWorkflowInput(
+        workflow_type="FINANCIAL_ANALYSIS",
+        financial_data=FINANCIAL_DATA,
+        user_id="u1",
+        organization_id="o1",
+        metadata=metadata or None
+    )
+
+def use_workflow(llm, response_cache=None):
+    workflow = FinanceWorkflow(llm=llm, response_cache=response_cache)
+    set_finance_workflow(workflow)
+    return workflow
+
+@pytest.fixture(autouse=True)
+def reset_workflow():
+    yield
+    set_finance_workflow(None)
+
+def test_sync_and_async_paths_run_on_the_fake_llm():
+    llm = FakeChatModel(responder=lambda prompt: "1. Revenue is growing")
+    use_workflow(llm)
+
+    result = run_finance_workflow("financial_analysis", request())
+    async_result = asyncio.run(arun_finance_workflow("financial_analysis", request()))
+
+    for output in (result, async_result):
+        assert output.status == WorkflowStatus.SUCCESS
+        assert output.results == "1. Revenue is growing"
+        assert output.token_usage.llm_calls == 1
+        assert output.token_usage.by_stage["financial_analysis"] > 0
+    assert llm.calls == 2
+
+def test_comprehensive_workflow_fans_out_and_joins_compliance():
+    prompts = []
+
+    def responder(prompt):
+        prompts.append(prompt)
+        return f"report {len(prompts)}"
+
+    use_workflow(FakeChatModel(responder=responder))
+    result = asyncio.run(arun_finance_workflow("comprehensive", request()))
+
+    assert result.status == WorkflowStatus.SUCCESS
+    assert set(result.results) == {"financial_analysis", "risk_assessment", "budget_monitoring", "investment_analysis", "compliance_check"}
+    assert result.token_usage.llm_calls == 5
+    # Compliance runs last and sees every upstream report
+    assert all(report in prompts[-1] for report in ("report 1", "report 2", "report 3", "report 4"))
+
+def test_repeated_prompts_are_answered_from_the_cache():
+    llm = FakeChatModel()
+    cache = LLMResponseCache()
+    use_workflow(llm, cache)
+
+    first = run_finance_workflow("financial_analysis", request())
+    second = asyncio.run(arun_finance_workflow("financial_analysis", request()))
+    run_finance_workflow("financial_analysis", request(cache_bypass=True))
+
+    assert first.results == second.results
+    assert llm.calls == 2
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["shared_hits"], stats["misses"], stats["writes"]) == (1, 0, 1, 2)
+    assert stats["hit_rate"] == 0.5
+
+def test_shared_tier_hits_are_promoted_to_memory():
+    shared_tier = InMemoryResultStore(model_cls=CachedResponse)
+    use_workflow(FakeChatModel(responder=lambda prompt: "shared report"), LLMResponseCache(shared_tier=shared_tier))
+    run_finance_workflow("financial_analysis", request())
+
+    # A second process: empty memory tier, same shared tier, an LLM that must not be called
+    llm = FakeChatModel(responder=lambda prompt: pytest.fail("cache miss reached the LLM"))
+    cache = LLMResponseCache(shared_tier=shared_tier)
+    use_workflow(llm, cache)
+    first = asyncio.run(arun_finance_workflow("financial_analysis", request()))
+    second = run_finance_workflow("financial_analysis", request())
+
+    assert first.results == second.results == "shared report"
+    assert llm.calls == 0
+    stats = cache.stats()
+    assert (stats["shared_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+    assert stats["memory_entries"] == 1
+
+def test_sampled_completions_are_not_cached():
+    llm = FakeChatModel(temperature=0.7)
+    cache = LLMResponseCache()
+    use_workflow(llm, cache)
+    run_finance_workflow("financial_analysis", request())
+    run_finance_workflow("financial_analysis", request())
+    assert llm.calls == 2
+    assert cache.stats()["writes"] == 0
@@ -0,0 +1,22 @@
+import asyncio
+import httpx
+from src.llm.http_clients import LoopBoundAsyncClient
+
+def test_each_event_loop_gets_its_own_pool():
+    loops = []
+    client = LoopBoundAsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"path": request.url.path})))
+
+    async def call():
+        response = await client.get("http://ocr.test/extract")
+        loops.append(client.for_running_loop())
+        assert client.for_running_loop() is loops[-1]
+        return response.json()
+
+    assert asyncio.run(call()) == {"path": "/extract"}
+    assert asyncio.run(call()) == {"path": "/extract"}
+    assert loops[0] is not loops[1]
+    # Pools of finished loops are not kept around
+    assert len(client._loop_clients) <= 1
+
+    asyncio.run(client.aclose())
+    assert client.is_closed and len(client._loop_clients) == 0
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import os
+from src.models.finance_models import InvoiceDocument, InvoiceIngestionResult
+from src.services.duplicate_index import DuplicateInvoiceIndex
+from src.services.erp_validation import BulkERPValidator
+from src.services.invoice_pipeline import InvoiceIngestionPipeline, parse_amount, validate_invoice
+from src.services.invoice_triage import InvoiceTriage
+from src.services.result_store import InMemoryResultStore
+from src.tools.compliance_engine import ComplianceRuleEngine
+from src.tools.erp_clients import MockERPClient
+from src.tools.mock_erp import MockERPDataset
+from src.tools.ocr_backends import LocalOCRBackend
+from src.workflows.invoice_workflow import InvoiceWorkflow
+from tests.test_invoice_workflow import RecordingCrew
+
+INVOICE = {"invoice_number": "INV-100", "date": "2026-01-15", "vendor": "Acme Supplies", "amount": 120.0, "currency": "USD"}
+
+def write(path, fields):
+    with open(path, "w") as f:
+        json.dump(fields, f)
+
+async def ingest_inbox(inbox, store, index):
+    pipeline = InvoiceIngestionPipeline(LocalOCRBackend(), store, ocr_concurrency=2, duplicate_index=index)
+    pipeline.start(inbox_dir=str(inbox), poll_seconds=0.05)
+    for _ in range(100):
+        await asyncio.sleep(0.05)
+        if not any(entry.is_file() and entry.name.endswith(".json") for entry in os.scandir(inbox)):
+            break
+    await pipeline.stop()
+    return pipeline.stats()
+
+def test_inbox_files_are_archived_and_not_reingested(tmp_path):
+    write(tmp_path / "a.json", INVOICE)
+    write(tmp_path / "b.json", {**INVOICE, "amount": 75.5, "invoice_number": "INV-101"})
+    write(tmp_path / "c.json", INVOICE)
+    write(tmp_path / "d.json.part", INVOICE)
+    store = InMemoryResultStore(model_cls=InvoiceIngestionResult)
+    index = DuplicateInvoiceIndex(url=None)
+
+    stats = asyncio.run(ingest_inbox(tmp_path, store, index))
+    assert sorted(os.listdir(tmp_path / "processed")) == ["a.json", "b.json", "c.json"]
+    assert sorted(os.listdir(tmp_path)) == ["d.json.part", "processed"]
+    assert stats["routes"]["auto_approve"] == 2
+    assert stats["routes"]["rejected"] == 1
+
+    # A restarted pipeline finds nothing left to ingest
+    stats = asyncio.run(ingest_inbox(tmp_path, store, index))
+    assert stats["stages"]["ocr"]["processed"] == 0
+
+def test_amounts_accept_numeric_strings_but_not_booleans():
+    assert validate_invoice({**INVOICE, "amount": "1,200.50"}) == []
+    assert parse_amount("1,200.50") == 1200.5
+    assert validate_invoice({**INVOICE, "amount": True}) == ["Invalid amount: True"]
+    assert validate_invoice({**INVOICE, "amount": "n/a"}) == ["Invalid amount: n/a"]
+    assert validate_invoice({**INVOICE, "amount": -5}) == ["Invalid amount: -5"]
+
+def test_routed_invoices_are_dispatched_and_not_their_own_duplicates(tmp_path):
+    index = DuplicateInvoiceIndex(url=None)
+    dataset = MockERPDataset(
+        vendors=[{"vendor_id": "V-1", "name": "Acme Supplies", "active": True}],
+        purchase_orders=[{"po_number": "PO-1", "vendor_id": "V-1", "currency": "USD", "amount_remaining": 20000.0, "status": "open"}]
+    )
+    triage = InvoiceTriage(BulkERPValidator(MockERPClient(dataset), duplicate_index=index), ComplianceRuleEngine())
+    crew = RecordingCrew()
+    workflow = InvoiceWorkflow(invoice_crew=crew, triage=triage, duplicate_index=index)
+    processed = {}
+
+    def dispatch(result):
+        processed[result.document_id] = workflow.process_invoice({**result.extracted_data, "document_id": result.document_id})
+        return f"wf-{result.document_id}"
+
+    async def ingest():
+        pipeline = InvoiceIngestionPipeline(LocalOCRBackend(), store, duplicate_index=index, dispatcher=dispatch)
+        pipeline.start()
+        await pipeline.submit(InvoiceDocument(document_id="a", content=json.dumps({**INVOICE, "amount": "120.00"})))
+        await pipeline.submit(InvoiceDocument(document_id="b", content=json.dumps(INVOICE)))
+        await pipeline.submit(InvoiceDocument(document_id="c", content=json.dumps({**INVOICE, "amount": "oops"})))
+        await pipeline.join()
+        await pipeline.stop()
+        return pipeline.stats()
+
+    store = InMemoryResultStore(model_cls=InvoiceIngestionResult)
+    stats = asyncio.run(ingest())
+    assert store.get("a").route == "auto_approve" and store.get("a").workflow_id == "wf-a"
+    assert store.get("b").route == "rejected" and store.get("b").workflow_id is None
+    assert store.get("c").route == "rejected"
+    assert stats["dispatched"] == 1
+    # OCR output carries no PO, so the invoice escalates; the workflow must not
+    # reject it as a duplicate of the entry the pipeline indexed for it
+    assert processed["a"]["lane"] == "crew" and "duplicate_of" not in processed["a"]
+    assert crew.invoices[0]["amount"] == 120.0
@@ -0,0 +1,28 @@
+import json
+import pytest
+
+pytest.importorskip("langchain")
+
+from src.services.payment_executor import PaymentExecutor
+from src.tools import invoice_tools
+from src.tools.payment_gateways import MockPaymentGateway
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = PaymentExecutor(MockPaymentGateway(), url="sqlite://")
+    monkeypatch.setattr(invoice_tools, "get_payment_executor", lambda: executor)
+    return executor
+
+def test_payment_tool_accepts_agent_json_string(executor):
+    payment = {"vendor": "V-00001", "amount": 120.5, "currency": "USD", "invoice_number": "INV-9"}
+    result = invoice_tools.payment_gateway_tool.run(json.dumps(payment))
+    assert result["status"] == "success"
+    assert result["payment_result"]["status"] == "queued"
+    replay = invoice_tools.payment_gateway_tool.run(json.dumps({**payment, "invoice_id": "X2"}))
+    assert replay["payment_result"]["idempotency_key"] == result["payment_result"]["idempotency_key"]
+    assert executor.stats()["payments"]["queued"] == 1
+
+def test_payment_tool_reports_non_json_input(executor):
+    result = invoice_tools.payment_gateway_tool.run("pay vendor V-00001")
+    assert result["status"] == "error"
+    assert "JSON object" in result["message"]
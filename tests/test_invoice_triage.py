@@ -0,0 +1,43 @@
+import pytest
+from src.services.duplicate_index import DuplicateInvoiceIndex
+from src.services.erp_validation import BulkERPValidator
+from src.services.invoice_triage import InvoiceTriage
+from src.tools.compliance_engine import ComplianceRuleEngine
+from src.tools.erp_clients import MockERPClient
+from src.tools.mock_erp import MockERPDataset
+
+@pytest.fixture
+def duplicate_index():
+    return DuplicateInvoiceIndex(url=None)
+
+@pytest.fixture
+def triage(duplicate_index):
+    dataset = MockERPDataset(
+        vendors=[{"vendor_id": "V-1", "name": "Acme Supplies", "active": True}],
+        purchase_orders=[{"po_number": "PO-1", "vendor_id": "V-1", "currency": "USD", "amount_remaining": 20000.0, "status": "open"}]
+    )
+    validator = BulkERPValidator(MockERPClient(dataset), duplicate_index=duplicate_index)
+    return InvoiceTriage(validator, ComplianceRuleEngine(), max_amount=5000)
+
+def invoice(**overrides):
+    return {"invoice_number": "INV-1", "date": "2026-01-15", "vendor": "Acme Supplies", "po_number": "PO-1", "amount": 800.0, "currency": "USD", **overrides}
+
+def test_clean_invoice_takes_fast_lane(triage):
+    decision = triage.triage(invoice())
+    assert decision.fast_lane and decision.reasons == []
+
+@pytest.mark.parametrize("overrides, reason", [
+    ({"amount": 7500.0}, "amount:"),
+    ({"po_number": "PO-404"}, "erp:"),
+    ({"currency": None}, "extraction:")
+])
+def test_escalation_reasons(triage, overrides, reason):
+    decision = triage.triage(invoice(**overrides))
+    assert not decision.fast_lane
+    assert any(text.startswith(reason) for text in decision.reasons)
+
+def test_known_invoice_is_escalated_as_duplicate(triage, duplicate_index):
+    duplicate_index.add(invoice(), "X1")
+    decision = triage.triage(invoice())
+    assert not decision.fast_lane
+    assert any(text.startswith("erp:") and "duplicate" in text for text in decision.reasons)
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+import pytest
+from src.models.finance_models import FinanceWorkflowInput
+from src.services import finance_service
+from src.services.duplicate_index import DuplicateInvoiceIndex
+from src.services.erp_validation import BulkERPValidator
+from src.services.finance_service import FinanceService
+from src.services.invoice_triage import InvoiceTriage
+from src.services.payment_executor import get_payment_executor
+from src.tools.compliance_engine import ComplianceRuleEngine
+from src.tools.erp_clients import MockERPClient
+from src.tools.mock_erp import MockERPDataset
+from src.workflows.invoice_workflow import InvoiceWorkflow
+
+class RecordingCrew:
+    """Stands in for InvoiceCrew, recording the invoices escalated to it"""
+
+    def __init__(self):
+        self.invoices = []
+
+    def invoice_processing_crew(self, invoice_data):
+        self.invoices.append(invoice_data)
+        return SimpleNamespace(kickoff=lambda: "crew result")
+
+@pytest.fixture
+def crew():
+    return RecordingCrew()
+
+@pytest.fixture
+def duplicate_index():
+    return DuplicateInvoiceIndex(url=None)
+
+def build_workflow(crew, duplicate_index, validator_index):
+    dataset = MockERPDataset(
+        vendors=[{"vendor_id": "V-1", "name": "Acme Supplies", "active": True}],
+        purchase_orders=[{"po_number": "PO-1", "vendor_id": "V-1", "currency": "USD", "amount_remaining": 20000.0, "status": "open"}]
+    )
+    triage = InvoiceTriage(BulkERPValidator(MockERPClient(dataset), duplicate_index=validator_index), ComplianceRuleEngine(), max_amount=5000)
+    return InvoiceWorkflow(invoice_crew=crew, triage=triage, duplicate_index=duplicate_index)
+
+@pytest.fixture
+def workflow(crew, duplicate_index):
+    return build_workflow(crew, duplicate_index, duplicate_index)
+
+def invoice(number, **overrides):
+    return {"invoice_number": number, "date": "2026-01-15", "vendor": "Acme Supplies", "po_number": "PO-1", "amount": 800.0, "currency": "USD", **overrides}
+
+def test_fast_lane_pays_without_the_crew(workflow, crew, duplicate_index):
+    result = workflow.process_invoice(invoice("WF-1", invoice_id="X1"))
+    assert result["status"] == "SUCCESS" and result["lane"] == "fast_lane"
+    assert result["audit_trail"]["approval_status"] == "Auto-approved"
+    payment = result["workflow_results"]["payment"]
+    assert payment["status"] == "queued" and payment["invoice_id"] == "X1"
+    assert get_payment_executor().get_payment(payment["idempotency_key"]) is not None
+    assert crew.invoices == []
+    assert duplicate_index.check(invoice("WF-1"))["duplicate_of"] == "X1"
+
+def test_failed_check_escalates_to_the_crew(workflow, crew, duplicate_index):
+    result = workflow.process_invoice(invoice("WF-2", invoice_id="X2", amount=7500.0))
+    assert result["status"] == "SUCCESS" and result["lane"] == "crew"
+    assert result["workflow_results"] == "crew result"
+    [escalated] = crew.invoices
+    assert not escalated["triage"]["fast_lane"]
+    assert escalated["triage"]["reasons"][0].startswith("amount:")
+    # Indexed on the way to the crew, so a resubmission is caught
+    assert duplicate_index.check(invoice("WF-2", amount=7500.0))["duplicate_of"] == "X2"
+
+def test_exact_duplicate_is_rejected_without_payment(workflow, crew):
+    first = workflow.process_invoice(invoice("WF-3", invoice_id="X3"))
+    second = workflow.process_invoice(invoice("WF-3", invoice_id="X4"))
+    assert second["status"] == "SUCCESS" and second["lane"] == "rejected"
+    assert second["duplicate_of"] == "X3" and second["payment_status"] == "Not paid"
+    assert crew.invoices == []
+    assert first["lane"] == "fast_lane"
+
+def test_claim_rejects_a_duplicate_triage_did_not_see(crew, duplicate_index):
+    # Triage without the duplicate index, as when another submission is indexed between triage and claim
+    workflow = build_workflow(crew, duplicate_index, None)
+    duplicate_index.claim(invoice("WF-4"), "X5")
+    result = workflow.process_invoice(invoice("WF-4", invoice_id="X6"))
+    assert result["lane"] == "rejected" and result["duplicate_of"] == "X5"
+    assert crew.invoices == []
+
+def test_finance_service_runs_the_shared_workflow(workflow, monkeypatch):
+    monkeypatch.setattr(finance_service, "get_invoice_workflow", lambda: workflow)
+    service = FinanceService()
+    request = {"workflow_type": "INVOICE_PROCESSING", "user_id": "u1", "organization_id": "org1"}
+    output = service.process_invoice(FinanceWorkflowInput(**request, invoice_data=invoice("WF-5", invoice_id="X7")))
+    assert output.status == "SUCCESS" and output.results["lane"] == "fast_lane"
+    missing = service.process_invoice(FinanceWorkflowInput(**request))
+    assert missing.status == "FAILED" and "invoice_data" in missing.error_message
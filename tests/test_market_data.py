@@ -0,0 +1,48 @@
+from datetime import date
+import pytest
+from src.tools import finance_tools
+from src.tools.market_data import CachedMarketDataProvider, FixtureMarketDataProvider
+
+START, END = date(2024, 3, 1), date(2024, 3, 28)
+
+@pytest.fixture
+def fixture_provider():
+    return FixtureMarketDataProvider()
+
+@pytest.fixture
+def provider(fixture_provider, tmp_path):
+    return CachedMarketDataProvider(fixture_provider, cache_dir=str(tmp_path))
+
+def test_symbols_sharing_a_gap_are_fetched_in_one_call(provider, fixture_provider):
+    history = provider.get_history(["AAA", "BBB", "AAA"], START, END)
+    assert sorted(history) == ["AAA", "BBB"]
+    assert fixture_provider.history_calls == 1
+    assert history["AAA"].index[0].date() >= START and history["AAA"].index[-1].date() <= END
+
+    # Covered ranges are answered from the cache
+    again = provider.get_history(["AAA", "BBB"], date(2024, 3, 4), date(2024, 3, 15))
+    assert fixture_provider.history_calls == 1
+    assert again["BBB"]["Close"].equals(history["BBB"].loc["2024-03-04":"2024-03-15", "Close"])
+
+def test_only_missing_ranges_are_fetched(provider, fixture_provider, tmp_path):
+    provider.get_history(["AAA"], START, END)
+    provider.get_history(["AAA", "BBB"], date(2024, 2, 1), END)
+    # AAA needs only February, BBB the whole range: two batched calls
+    assert fixture_provider.history_calls == 3
+
+    # A new provider on the same directory reads the Parquet files and coverage index
+    reloaded = CachedMarketDataProvider(fixture_provider, cache_dir=str(tmp_path))
+    history = reloaded.get_history(["AAA", "BBB"], date(2024, 2, 1), END)
+    assert fixture_provider.history_calls == 3
+    assert history["AAA"].index[0].date() >= date(2024, 2, 1)
+
+def test_financial_data_tool_batches_comma_separated_symbols(provider, fixture_provider, monkeypatch):
+    monkeypatch.setattr(finance_tools, "get_market_data_provider", lambda: provider)
+    result = finance_tools.financial_data_tool.run(symbol="aaa, bbb", period="1mo")
+
+    assert result["period"] == "1mo"
+    assert set(result["symbols"]) == {"AAA", "BBB"}
+    summary = result["symbols"]["AAA"]
+    assert summary["observations"] > 15 and summary["current_price"] > 0
+    assert summary["market_cap"] != "N/A"
+    assert fixture_provider.history_calls == 1
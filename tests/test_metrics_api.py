@@ -0,0 +1,67 @@
+import pytest
+from fastapi.testclient import TestClient
+from src.api import finance_api
+from src.llm.fake_llm import FakeChatModel
+from src.services.workflow_runner import set_finance_workflow
+from src.workflows.finance_workflow import FinanceWorkflow
+
+RETURNS = {"AAA": [0.01, -0.02, 0.015, 0.005, -0.01], "BBB": [0.02, 0.01, -0.005, 0.0, 0.01]}
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(finance_api, "workflow_dispatcher", None)
+    llm = FakeChatModel()
+    set_finance_workflow(FinanceWorkflow(llm=llm))
+    client = TestClient(finance_api.app)
+    client.llm = llm
+    yield client
+    set_finance_workflow(None)
+
+def test_risk_endpoint_computes_assets_and_portfolio(client):
+    response = client.post("/api/v1/metrics/risk", json={"returns": RETURNS, "weights": {"AAA": 0.5, "BBB": 0.5}})
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body["assets"]) == {"AAA", "BBB"} and body["periods"] == 5
+    assert body["weights"] == {"AAA": 0.5, "BBB": 0.5}
+    assert body["portfolio"]["volatility"] < max(asset["volatility"] for asset in body["assets"].values())
+    correlation = body["portfolio"]["correlation_matrix"]
+    assert correlation["AAA"]["BBB"] == pytest.approx(correlation["BBB"]["AAA"]) and correlation["AAA"]["BBB"] < 0
+
+    assert client.post("/api/v1/metrics/risk", json={"returns": RETURNS, "weights": {"AAA": 1.0}}).status_code == 422
+
+def test_budget_endpoints(client):
+    body = client.post("/api/v1/metrics/budget", json={"actual": [110.0, 90.0], "budgeted": [100.0, 100.0], "categories": ["Ads", "Rent"]}).json()
+    assert body["total_variance"] == 0.0 and body["over_budget_months"] == 1
+    assert client.post("/api/v1/metrics/budget", json={"actual": [1.0], "budgeted": [1.0], "categories": ["a", "b"]}).status_code == 422
+
+    rows = [
+        {"department": "Sales", "category": "Travel", "period": "2026-01", "budgeted_amount": 100.0, "actual_amount": 120.0},
+        {"department": "Sales", "category": "Travel", "period": "2026-02", "budgeted_amount": 100.0, "actual_amount": 140.0}
+    ]
+    breakdown = client.post("/api/v1/metrics/budget/breakdown", json={"rows": rows, "forecast_periods": 1}).json()
+    assert breakdown["forecast"] == {"2026-03": 160.0}
+
+def test_compliance_endpoint_reports_checks_per_violation(client):
+    body = client.post("/api/v1/metrics/compliance", json={"transactions": [
+        {"amount": 100.0, "date": "2026-01-01", "description": "Office supplies", "approver": "kim"},
+        {"amount": 20000.0, "date": "2026-01-02", "description": "Server purchase"}
+    ]}).json()
+    assert (body["transactions_checked"], body["non_compliant"]) == (2, 1)
+    assert body["results"][0]["checks"] == []
+    assert {"REQUIRED_APPROVER", "SECONDARY_APPROVAL", "SUPPORTING_DOCUMENTS"} <= set(body["rule_violations"])
+    assert len(body["results"][1]["checks"]) == 3
+
+def test_metrics_only_workflow_skips_the_llm(client):
+    response = client.post("/api/v1/workflows/investment-advisory", json={
+        "workflow_type": "INVESTMENT_ADVISORY",
+        "investment_data": {"returns": RETURNS},
+        "user_id": "u1",
+        "organization_id": "o1",
+        "metadata": {"metrics_only": True}
+    })
+    workflow_id = response.json()["workflow_id"]
+    result = client.get(f"/api/v1/workflows/{workflow_id}/status").json()
+    assert result["status"] == "SUCCESS"
+    assert set(result["results"]["risk"]) == {"AAA", "BBB", "portfolio"}
+    assert result["token_usage"]["llm_calls"] == 0
+    assert client.llm.calls == 0
@@ -0,0 +1,63 @@
+import pytest
+from src.llm.fake_llm import FakeChatModel
+from src.models.finance_models import FinanceWorkflowInput, WorkflowStatus
+from src.tools.metrics_engine import WORKFLOW_METRICS, analyze_budget, compute_workflow_metrics, financial_ratios
+from src.workflows.finance_workflow import FinanceWorkflow
+
+FINANCIAL_DATA = {
+    "revenue": 1000.0, "expenses": 800.0, "assets": 2000.0, "liabilities": 1500.0,
+    "current_assets": 600.0, "current_liabilities": 300.0, "inventory": 150.0,
+    "returns": [0.01, -0.02, 0.015, 0.005, -0.01, 0.02]
+}
+
+def test_financial_ratios_derive_missing_figures():
+    ratios = financial_ratios({**FINANCIAL_DATA, "profit_margin": 0.25})
+    assert ratios["net_income"] == 200.0 and ratios["equity"] == 500.0
+    # Reported figures win over derived ones
+    assert ratios["profit_margin"] == 0.25
+    assert ratios["return_on_equity"] == pytest.approx(0.4)
+    assert ratios["debt_to_equity"] == pytest.approx(3.0)
+    assert ratios["current_ratio"] == pytest.approx(2.0) and ratios["quick_ratio"] == pytest.approx(1.5)
+    assert financial_ratios({"revenue": "n/a"}) == {}
+
+def test_budget_variances_by_line_and_category():
+    result = analyze_budget([120.0, 80.0, 100.0], [100.0, 100.0, 100.0], ["Travel", "Software", "Payroll"])
+    assert result["total_variance"] == 0.0
+    assert result["monthly_variance_percentages"] == [20.0, -20.0, 0.0]
+    assert (result["over_budget_months"], result["under_budget_months"]) == (1, 1)
+    assert result["by_category"]["Travel"]["variance"] == 20.0
+    assert result["largest_overruns"] == ["Travel"]
+    with pytest.raises(ValueError):
+        analyze_budget([1.0], [1.0, 2.0])
+
+def test_workflow_sections_skip_absent_inputs_and_isolate_errors():
+    metrics = compute_workflow_metrics(
+        WORKFLOW_METRICS["comprehensive"],
+        financial_data=FINANCIAL_DATA,
+        budget_data={"Marketing": {"budgeted": 100.0, "actual": 130.0}},
+        investment_data={"returns": {"AAA": [0.01, 0.02], "BBB": [0.01]}, "weights": {"AAA": 1.0}}
+    )
+    assert metrics["financial_ratios"]["debt_ratio"] == pytest.approx(0.75)
+    assert metrics["budget_variance"]["by_category"]["Marketing"]["variance"] == 30.0
+    # Malformed weights fail the risk section only
+    assert "error" in metrics["risk"]
+    assert "compliance" not in metrics
+    assert compute_workflow_metrics(WORKFLOW_METRICS["budget_management"]) == {}
+
+def test_precomputed_metrics_reach_the_prompt_and_the_output():
+    prompts = []
+    workflow = FinanceWorkflow(llm=FakeChatModel(responder=lambda prompt: prompts.append(prompt) or "analysis"))
+    result = workflow.execute_financial_analysis_workflow(FinanceWorkflowInput(
+        workflow_type="FINANCIAL_ANALYSIS", financial_data=FINANCIAL_DATA, user_id="u1", organization_id="o1"
+    ))
+
+    assert result.status == WorkflowStatus.SUCCESS
+    assert set(result.metrics) == {"financial_ratios", "risk"}
+    assert result.metrics["risk"]["portfolio"]["volatility"] > 0
+    assert "Pre-computed metrics (exact; use these figures instead of recalculating them)" in prompts[0]
+    assert '"net_income":200.0' in prompts[0]
+
+    without = FinanceWorkflow(llm=FakeChatModel(), precompute_metrics=False).execute_financial_analysis_workflow(FinanceWorkflowInput(
+        workflow_type="FINANCIAL_ANALYSIS", financial_data=FINANCIAL_DATA, user_id="u1", organization_id="o1"
+    ))
+    assert without.metrics is None
@@ -0,0 +1,73 @@
+import pytest
+from src.services.payment_executor import PaymentExecutor, payment_idempotency_key
+from src.tools.mock_payment_gateway import PaymentGatewaySimulator
+from src.tools.payment_gateways import MockPaymentGateway
+
+@pytest.fixture
+def executor():
+    return PaymentExecutor(MockPaymentGateway(), url="sqlite://")
+
+def payment(**overrides):
+    return {"vendor": "V-00001", "amount": 120.5, "currency": "USD", "payment_date": "2026-01-15", **overrides}
+
+def test_vendor_invoice_key_ignores_invoice_id():
+    first = payment_idempotency_key(payment(invoice_id="X1", invoice_number="INV-9"))
+    second = payment_idempotency_key(payment(invoice_id="X2", invoice_number="inv 9"))
+    assert first == second
+    assert first != payment_idempotency_key(payment(invoice_id="X1", invoice_number="INV-10"))
+
+def test_invoice_id_key_without_invoice_number():
+    assert payment_idempotency_key(payment(invoice_id="X1")) == "invoice:X1"
+    with pytest.raises(ValueError):
+        payment_idempotency_key(payment())
+
+def test_same_vendor_invoice_under_new_invoice_id_is_paid_once(executor):
+    first = executor.request_payment(payment(invoice_id="X1", invoice_number="INV-9"))
+    second = executor.request_payment(payment(invoice_id="X2", invoice_number="INV-9"))
+    assert second["idempotency_key"] == first["idempotency_key"]
+    assert executor.stats()["payments"]["queued"] == 1
+    assert executor.stats()["idempotent_replays"] == 1
+
+def test_second_key_for_recorded_vendor_invoice_is_rejected(executor):
+    executor.request_payment(payment(invoice_number="INV-9"))
+    with pytest.raises(ValueError, match="already recorded"):
+        executor.request_payment(payment(invoice_number="INV-9", idempotency_key="explicit-key"))
+    with pytest.raises(ValueError, match="already recorded"):
+        executor.request_payment(payment(invoice_number="INV-9", amount=99))
+    with pytest.raises(ValueError, match="already recorded"):
+        executor.request_payments([payment(invoice_number="INV-10"), payment(invoice_number="INV-10", amount=1)])
+    assert executor.stats()["payments"]["queued"] == 1
+
+def test_replay_returns_recorded_payment_without_paying_again(executor):
+    first = executor.request_payment(payment(invoice_number="INV-9"))
+    executor.run_once()
+    replay = executor.request_payment(payment(invoice_number="INV-9"))
+    assert replay["idempotency_key"] == first["idempotency_key"]
+    assert replay["status"] == "paid" and replay["transaction_id"]
+    executor.run_once()
+    stats = executor.stats()
+    assert stats["payments"]["paid"] == 1 and stats["idempotent_replays"] == 1
+    assert executor.gateway.simulator.requests["payments_submitted"] == 1
+
+def test_failed_payment_is_requeued_on_replay():
+    simulator = PaymentGatewaySimulator(failure_rate=1.0)
+    executor = PaymentExecutor(MockPaymentGateway(simulator), url="sqlite://")
+    key = executor.request_payment(payment(invoice_number="INV-9"))["idempotency_key"]
+    executor.run_once()
+    failed = executor.get_payment(key)
+    assert failed["status"] == "failed" and failed["error_message"]
+
+    simulator.failure_rate = 0.0
+    assert executor.request_payment(payment(invoice_number="INV-9"))["status"] == "queued"
+    executor.run_once()
+    assert executor.get_payment(key)["status"] == "paid"
+    stats = executor.stats()
+    assert stats["requeued"] == 1 and stats["payments"]["failed"] == 0
+    assert simulator.requests["submit_run"] == 2
+
+def test_vendor_name_is_normalized_in_the_key(executor):
+    first = executor.request_payment(payment(vendor="ACME Supplies", invoice_number="INV-9"))
+    second = executor.request_payment(payment(vendor="  acme   supplies", invoice_number="inv 9"))
+    assert second["idempotency_key"] == first["idempotency_key"]
+    assert second["vendor"] == "ACME Supplies"
+    assert executor.stats()["payments"]["queued"] == 1
@@ -0,0 +1,49 @@
+import json
+import numpy as np
+import pandas as pd
+from src.llm.fake_llm import FakeChatModel
+from src.llm.prompt_compactor import PromptCompactor, compact_payload
+from src.models.finance_models import FinanceWorkflowInput
+from src.workflows.finance_workflow import FinanceWorkflow
+
+def test_equal_payloads_render_identically_and_keep_cents():
+    compactor = PromptCompactor()
+    first = compactor.compact({"b": 1234567.891, "a": [0.1 + 0.2, np.float64(2.5)]})
+    second = compactor.compact({"a": [0.30000000000000004, 2.5], "b": 1234567.891})
+    assert first.text == second.text == '{"a":[0.3,2.5],"b":1234567.891}'
+    assert first.truncated == []
+
+def test_long_series_collapse_to_summaries():
+    compactor = PromptCompactor(series_threshold=10, recent_points=3)
+    closes = pd.Series(np.linspace(100, 200, 250), index=pd.bdate_range("2024-01-01", periods=250))
+    daily = {f"2024-03-{day:02d}": float(day) for day in range(1, 31)}
+    payload = json.loads(compactor.compact({"closes": closes, "daily": daily, "short": [1.0, 2.0]}).text)
+
+    summary = payload["closes"]
+    assert summary["series_points"] == 250
+    assert (summary["first"], summary["last"], summary["change_pct"]) == (100.0, 200.0, 1.0)
+    assert summary["start"] == "2024-01-01" and len(summary["recent"]) == 3
+    assert payload["daily"]["series_points"] == 30 and payload["daily"]["end"] == "2024-03-30"
+    assert payload["short"] == [1.0, 2.0]
+
+def test_payloads_over_budget_are_trimmed_and_flagged():
+    compactor = PromptCompactor(token_budget=200)
+    payload = {"transactions": [{"id": index, "memo": "x" * 500} for index in range(100)]}
+    compacted = compactor.compact(payload)
+
+    assert compacted.compacted_tokens <= 200 + 40
+    assert compacted.original_tokens > 10 * compacted.compacted_tokens
+    assert any(path.startswith("$.transactions") for path in compacted.truncated)
+    assert "(Note: truncated to fit the prompt budget" in compacted.text
+
+def test_workflow_prompts_embed_compact_payloads():
+    prompts = []
+    workflow = FinanceWorkflow(llm=FakeChatModel(responder=lambda prompt: prompts.append(prompt) or "ok"), precompute_metrics=False)
+    financial_data = {"revenue": list(range(1, 500)), "currency": "USD"}
+    workflow.execute_financial_analysis_workflow(FinanceWorkflowInput(
+        workflow_type="FINANCIAL_ANALYSIS", financial_data=financial_data, user_id="u1", organization_id="o1"
+    ))
+
+    assert compact_payload(financial_data, model="fake-llm") in prompts[0]
+    assert '"series_points":499' in prompts[0]
+    assert str(financial_data) not in prompts[0]
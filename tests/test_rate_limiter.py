@@ -0,0 +1,81 @@
+import uuid
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from src.api import finance_api
+from src.llm.fake_llm import FakeChatModel
+from src.llm.rate_limiter import LLMRateLimitExceeded, LLMRateLimiter, RateLimitCallbackHandler, organization_scope
+from src.models.finance_models import FinanceWorkflowInput, WorkflowStatus
+from src.workflows.finance_workflow import FinanceWorkflow
+
+def test_requests_per_minute_queue_callers_behind_each_other():
+    limiter = LLMRateLimiter(requests_per_minute=60, tokens_per_minute=0)
+    assert [limiter.reserve("org-a", 10) for _ in range(60)] == [0.0] * 60
+    # One request per second refills; each caller waits behind the one before
+    assert limiter.reserve("org-a", 10) == pytest.approx(1.0, abs=0.05)
+    assert limiter.reserve("org-b", 10) == pytest.approx(2.0, abs=0.05)
+    assert limiter.stats()["throttled"] == 2
+
+def test_tokens_per_minute_and_settling_actual_usage():
+    limiter = LLMRateLimiter(requests_per_minute=0, tokens_per_minute=600, completion_token_estimate=100)
+    assert limiter.reserve("org-a", 500) == 0.0
+    # 100 tokens left, refilling at 10 per second
+    assert limiter.reserve("org-a", 400) == pytest.approx(30.0, abs=0.1)
+    limiter.settle("org-a", 400, 100)
+    limiter.settle("org-a", 500, 100)
+    assert limiter.retry_after("org-a") == 0.0
+
+def test_calls_past_max_wait_are_rejected():
+    limiter = LLMRateLimiter(requests_per_minute=1, tokens_per_minute=0, max_wait_seconds=10)
+    limiter.reserve("org-a", 1)
+    with pytest.raises(LLMRateLimitExceeded) as rejected:
+        limiter.reserve("org-a", 1)
+    assert rejected.value.retry_after == pytest.approx(60.0, abs=0.1)
+    assert limiter.stats()["rejected"] == 1 and limiter.stats()["calls"] == 1
+
+def test_organization_limits_do_not_throttle_other_organizations():
+    limiter = LLMRateLimiter(requests_per_minute=0, tokens_per_minute=0, org_requests_per_minute=2, org_tokens_per_minute=1000)
+    assert limiter.reserve("org-a", 100) == limiter.reserve("org-a", 100) == 0.0
+    assert limiter.reserve("org-a", 100) == pytest.approx(30.0, abs=0.1)
+    assert limiter.reserve("org-b", 900) == 0.0
+    assert limiter.retry_after("org-b") > 0 and limiter.stats()["tracked_organizations"] == 2
+
+def test_idle_organizations_are_pruned_at_capacity():
+    limiter = LLMRateLimiter(org_requests_per_minute=10, max_organizations=2)
+    limiter.reserve("org-a", 1)
+    limiter.retry_after("org-b")
+    limiter.retry_after("org-c")
+    # org-b was idle (full buckets) and made room; org-a still owes capacity
+    assert limiter.stats()["tracked_organizations"] == 2
+    assert limiter.retry_after("org-a") == 0.0
+
+def test_workflow_settles_reported_usage():
+    limiter = LLMRateLimiter(requests_per_minute=10, tokens_per_minute=100000, completion_token_estimate=512)
+    workflow = FinanceWorkflow(llm=FakeChatModel(), rate_limiter=limiter)
+    input_data = FinanceWorkflowInput(workflow_type="FINANCIAL_ANALYSIS", financial_data={"revenue": [1.0]}, user_id="u1", organization_id="org-a")
+
+    result = workflow.execute_financial_analysis_workflow(input_data)
+    assert result.status == WorkflowStatus.SUCCESS
+    assert limiter.stats()["calls"] == 1
+    # The completion estimate was given back once the fake model reported its usage
+    assert limiter._global[1].level == pytest.approx(100000 - result.token_usage.total_tokens, abs=5)
+
+def test_callback_handler_bills_the_scoped_organization():
+    limiter = LLMRateLimiter(requests_per_minute=0, tokens_per_minute=0, org_requests_per_minute=0, org_tokens_per_minute=10000)
+    handler = RateLimitCallbackHandler(limiter)
+    run_id = uuid.uuid4()
+    with organization_scope("org-a"):
+        handler.on_chat_model_start({}, [[SimpleNamespace(content="x" * 400)]], run_id=run_id)
+    response = SimpleNamespace(generations=[[SimpleNamespace(message=None)]], llm_output={"token_usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}})
+    handler.on_llm_end(response, run_id=run_id)
+    assert limiter._orgs["org-a"][1].level == pytest.approx(10000 - 150, abs=1)
+
+def test_api_answers_429_with_retry_after_for_a_throttled_organization(monkeypatch):
+    limiter = LLMRateLimiter(requests_per_minute=0, tokens_per_minute=0, org_requests_per_minute=1, max_wait_seconds=5)
+    limiter.reserve("org-busy", 1)
+    monkeypatch.setattr(finance_api, "rate_limiter", limiter)
+    response = TestClient(finance_api.app).post("/api/v1/workflows/financial-analysis", json={
+        "workflow_type": "FINANCIAL_ANALYSIS", "financial_data": {"revenue": [1.0]}, "user_id": "u1", "organization_id": "org-busy"
+    })
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) == 55
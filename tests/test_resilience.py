@@ -0,0 +1,27 @@
+import asyncio
+import pytest
+from src.common import resilience
+from src.common.resilience import CircuitBreaker, RetryPolicy, acall_with_retry
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker("test_upstream", failure_threshold=1, reset_timeout=0.0)
+    monkeypatch.setitem(resilience._breakers, "test_upstream", breaker)
+    return breaker
+
+def test_cancelled_probe_reopens_breaker(breaker):
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    async def scenario():
+        probe = asyncio.create_task(acall_with_retry("test_upstream", lambda: asyncio.sleep(10), policy=RetryPolicy(max_retries=0)))
+        await asyncio.sleep(0.05)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(scenario())
+    assert not breaker._probing
+    # The cancelled probe counted as failed; with reset_timeout 0 the next call may probe again
+    assert breaker.stats()["opened"] == 2
+    breaker.acquire()
@@ -0,0 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+from src.models.finance_models import FinanceWorkflowOutput, WorkflowStatus
+from src.services.result_store import SQLResultStore
+
+def output(status, message=None):
+    return FinanceWorkflowOutput(status=status, workflow_type="INVOICE_PROCESSING", error_message=message)
+
+def test_put_overwrites_existing_key(tmp_path):
+    store = SQLResultStore(url=f"sqlite:///{tmp_path / 'results.db'}")
+    store.put("wf-1", output(WorkflowStatus.PENDING))
+    store.put_many({"wf-1": output(WorkflowStatus.FAILED, "boom"), "wf-2": output(WorkflowStatus.SUCCESS)})
+    assert store.get("wf-1").status == WorkflowStatus.FAILED
+    assert store.get("wf-1").error_message == "boom"
+    assert set(store.get_many(["wf-1", "wf-2", "wf-3"])) == {"wf-1", "wf-2"}
+
+def test_concurrent_writers_of_one_key_do_not_collide(tmp_path):
+    store = SQLResultStore(url=f"sqlite:///{tmp_path / 'results.db'}")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: store.put("wf-1", output(WorkflowStatus.RUNNING, str(i))), range(64)))
+    assert store.get("wf-1").status == WorkflowStatus.RUNNING
@@ -0,0 +1,45 @@
+import asyncio
+from src.llm.fake_llm import FakeChatModel
+from src.models.finance_models import FinanceWorkflowInput, FinanceWorkflowOutput, WorkflowStatus
+from src.services.result_store import InMemoryResultStore
+from src.services.event_bus import workflow_event_scope
+from src.services.stream_recorder import PartialResultRecorder
+from src.workflows.finance_workflow import FinanceWorkflow
+
+def pending(store, workflow_id, status=WorkflowStatus.RUNNING):
+    store.put(workflow_id, FinanceWorkflowOutput(workflow_id=workflow_id, status=status, workflow_type="FINANCIAL_ANALYSIS"))
+
+def test_tokens_are_buffered_and_flushed_on_stage_completion():
+    store = InMemoryResultStore()
+    pending(store, "wf-1")
+    recorder = PartialResultRecorder(store, "wf-1", flush_interval=60)
+    recorder("token", {"stage": "risk", "text": "Low "})
+    recorder.flush()
+    assert store.get("wf-1").partial_results == {"risk": "Low "}
+    # Within the flush interval tokens wait for the stage to complete
+    recorder("token", {"stage": "risk", "text": "exposure."})
+    assert store.get("wf-1").partial_results == {"risk": "Low "}
+    recorder("stage", {"stage": "risk", "state": "completed"})
+    assert store.get("wf-1").partial_results == {"risk": "Low exposure."}
+
+def test_terminal_records_are_never_overwritten():
+    store = InMemoryResultStore()
+    pending(store, "wf-2", status=WorkflowStatus.FAILED)
+    recorder = PartialResultRecorder(store, "wf-2", flush_interval=0)
+    recorder("token", {"stage": "risk", "text": "late"})
+    recorder.flush()
+    assert store.get("wf-2").partial_results is None and store.get("wf-2").status == WorkflowStatus.FAILED
+
+def test_streamed_workflow_records_partial_results():
+    store = InMemoryResultStore()
+    pending(store, "wf-3")
+    recorder = PartialResultRecorder(store, "wf-3", flush_interval=0)
+    workflow = FinanceWorkflow(llm=FakeChatModel(responder=lambda prompt: "Revenue grew twenty percent."))
+    input_data = FinanceWorkflowInput(workflow_type="FINANCIAL_ANALYSIS", financial_data={"revenue": [100.0, 120.0]}, user_id="u1", organization_id="o1")
+
+    with workflow_event_scope("wf-3", publish=False, sinks=[recorder]):
+        result = asyncio.run(workflow.aexecute_financial_analysis_workflow(input_data))
+
+    assert result.results == "Revenue grew twenty percent."
+    assert store.get("wf-3").partial_results == {"financial_analysis": "Revenue grew twenty percent."}
+    assert result.token_usage.llm_calls == 1
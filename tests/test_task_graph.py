@@ -0,0 +1,120 @@
+import asyncio
+import contextvars
+import threading
+import pytest
+from src.core.task_graph import TaskGraph
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+BRANCHES = ["a", "b", "c", "d"]
+
+def test_independent_stages_run_concurrently_and_join():
+    # Every branch waits for all four to arrive, so a serial run would time out
+    barrier = threading.Barrier(len(BRANCHES), timeout=5)
+
+    def branch(name):
+        def run(upstream):
+            assert upstream == {}
+            barrier.wait()
+            return name.upper()
+        return run
+
+    graph = TaskGraph()
+    for name in BRANCHES:
+        graph.add_stage(name, branch(name))
+    graph.add_stage("join", lambda upstream: "".join(upstream[name] for name in BRANCHES), depends_on=BRANCHES)
+    graph.add_stage("report", lambda upstream: upstream["join"].lower(), depends_on=["join"])
+
+    run = graph.run()
+    assert run.results["join"] == "ABCD" and run.results["report"] == "abcd"
+    assert set(run.stage_timings) == set(BRANCHES) | {"join", "report"}
+
+def test_async_stages_fan_out_on_the_loop():
+    async def scenario():
+        arrived = []
+        all_arrived = asyncio.Event()
+
+        def branch(name):
+            async def run(upstream):
+                arrived.append(name)
+                if len(arrived) == len(BRANCHES):
+                    all_arrived.set()
+                await asyncio.wait_for(all_arrived.wait(), 5)
+                return name
+            return run
+
+        async def join(upstream):
+            return sorted(upstream.values())
+
+        graph = TaskGraph()
+        for name in BRANCHES:
+            graph.add_stage(name, branch(name))
+        graph.add_stage("join", join, depends_on=BRANCHES)
+        return await graph.arun()
+
+    run = asyncio.run(scenario())
+    assert run.results["join"] == BRANCHES
+
+def test_context_variables_reach_every_stage():
+    seen = {}
+
+    def record(name):
+        def run(upstream):
+            seen[name] = request_id.get()
+        return run
+
+    async def arecord(upstream):
+        seen["async"] = request_id.get()
+
+    token = request_id.set("req-1")
+    try:
+        graph = TaskGraph().add_stage("a", record("a")).add_stage("b", record("b"), depends_on=["a"])
+        graph.run()
+        asyncio.run(TaskGraph().add_stage("async", arecord).arun())
+    finally:
+        request_id.reset(token)
+    assert seen == {"a": "req-1", "b": "req-1", "async": "req-1"}
+
+def test_stage_failure_is_raised_and_dependents_never_run():
+    ran = []
+
+    def fail(upstream):
+        raise RuntimeError("provider down")
+
+    graph = TaskGraph()
+    graph.add_stage("ok", lambda upstream: ran.append("ok"))
+    graph.add_stage("broken", fail)
+    graph.add_stage("join", lambda upstream: ran.append("join"), depends_on=["ok", "broken"])
+    with pytest.raises(RuntimeError, match="provider down"):
+        graph.run()
+    assert "join" not in ran
+
+def test_async_stage_failure_cancels_the_rest():
+    async def scenario():
+        slow_cancelled = asyncio.Event()
+
+        async def broken(upstream):
+            raise RuntimeError("provider down")
+
+        async def slow(upstream):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                slow_cancelled.set()
+                raise
+
+        graph = TaskGraph().add_stage("broken", broken).add_stage("slow", slow)
+        with pytest.raises(RuntimeError, match="provider down"):
+            await graph.arun()
+        await asyncio.sleep(0)
+        return slow_cancelled.is_set()
+
+    assert asyncio.run(scenario())
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="Duplicate stage"):
+        TaskGraph().add_stage("a", dict).add_stage("a", dict)
+    with pytest.raises(ValueError, match="unknown stage"):
+        TaskGraph().add_stage("a", dict, depends_on=["missing"]).run()
+    with pytest.raises(ValueError, match="Cycle"):
+        TaskGraph().add_stage("a", dict, depends_on=["b"]).add_stage("b", dict, depends_on=["a"]).run()
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from src.api import finance_api
+from src.services.workflow_executor import WorkflowExecutor, WorkflowQueueFullError
+
+@pytest.fixture
+def executor():
+    executor = WorkflowExecutor(max_concurrency=1, queue_depth=2, timeout_seconds=0.5, aging_seconds=0)
+    yield executor
+    executor.shutdown(wait=False)
+
+def test_queued_jobs_start_by_priority(executor):
+    release = threading.Event()
+    started = []
+    blocker = executor.submit(release.wait, 5, job_id="blocker")
+    low = executor.submit(started.append, "low", job_id="low")
+    high = executor.submit(started.append, "high", priority=5, job_id="high")
+
+    assert executor.queue_info("high")["queue_position"] == 1
+    assert executor.queue_info("low")["queue_position"] == 2
+    assert executor.queue_info("blocker") is None
+    release.set()
+    for future in (blocker, low, high):
+        future.result(5)
+    assert started == ["high", "low"]
+
+def test_full_queue_rejects_new_work(executor):
+    release = threading.Event()
+    futures = [executor.submit(release.wait, 5) for _ in range(3)]
+    with pytest.raises(WorkflowQueueFullError):
+        executor.submit(release.wait, 5)
+    assert executor.stats()["available_slots"] == 0
+    release.set()
+    for future in futures:
+        future.result(5)
+    assert executor.stats()["available_slots"] == 3
+
+def test_timeout_counts_from_job_start(executor):
+    async def scenario():
+        blocker = executor.submit(time.sleep, 0.4)
+        queued = executor.submit(time.sleep, 0.3)
+        slow = executor.submit(time.sleep, 1.0)
+        # Queued 0.4s plus running 0.3s: longer than the timeout, but only running counts
+        await executor.wait(queued)
+        await executor.wait(blocker)
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.wait(slow)
+
+    asyncio.run(scenario())
+
+def test_cancelled_queued_job_leaves_the_queue(executor):
+    release = threading.Event()
+    blocker = executor.submit(release.wait, 5)
+    queued = executor.submit(pytest.fail, "cancelled job ran", job_id="queued")
+    assert queued.cancel()
+    assert executor.queue_info("queued") is None
+    release.set()
+    blocker.result(5)
+    assert executor.stats()["in_flight"] == 0
+
+def test_api_answers_429_when_the_executor_is_full(monkeypatch):
+    executor = WorkflowExecutor(max_concurrency=1, queue_depth=0)
+    monkeypatch.setattr(finance_api, "workflow_executor", executor)
+    monkeypatch.setattr(finance_api, "workflow_dispatcher", None)
+    release = threading.Event()
+    blocker = executor.submit(release.wait, 5)
+    try:
+        response = TestClient(finance_api.app).post("/api/v1/workflows/financial-analysis", json={
+            "workflow_type": "FINANCIAL_ANALYSIS",
+            "financial_data": {"revenue": [100.0]},
+            "user_id": "u1",
+            "organization_id": "o1"
+        })
+    finally:
+        release.set()
+        blocker.result(5)
+        executor.shutdown(wait=False)
+    assert response.status_code == 429
+    assert "Workflow queue is full" in response.json()["detail"]
@@ -0,0 +1,85 @@
+import time
+from src.services import workflow_scheduler
+from src.services.workflow_scheduler import PriorityScheduler, ScheduledJob
+
+def job(job_id, priority=1, tenant="org-a", age=0.0):
+    return ScheduledJob(job_id=job_id, priority=priority, tenant=tenant, start=lambda: None, enqueued_at=time.monotonic() - age)
+
+def drain(scheduler):
+    order = []
+    while (next_job := scheduler.pop()) is not None:
+        order.append(next_job.job_id)
+    return order
+
+def test_higher_priority_overtakes_queued_work():
+    scheduler = PriorityScheduler(aging_seconds=0)
+    for index in range(3):
+        scheduler.push(job(f"bulk-{index}"))
+    scheduler.push(job("urgent", priority=5))
+    assert drain(scheduler) == ["urgent", "bulk-0", "bulk-1", "bulk-2"]
+
+def test_waiting_jobs_age_into_higher_priority():
+    scheduler = PriorityScheduler(aging_seconds=10)
+    scheduler.push(job("fresh", priority=3))
+    # Waited three aging periods: priority 1 counts as 4
+    scheduler.push(job("old", priority=1, age=35))
+    scheduler.push(job("recent", priority=1, age=5))
+    assert drain(scheduler) == ["old", "fresh", "recent"]
+
+def test_tenants_take_turns_within_a_priority():
+    scheduler = PriorityScheduler(aging_seconds=0)
+    for index in range(4):
+        scheduler.push(job(f"a{index}", tenant="org-a"))
+    scheduler.push(job("b0", tenant="org-b"))
+    scheduler.push(job("b1", tenant="org-b"))
+    assert drain(scheduler) == ["a0", "b0", "a1", "b1", "a2", "a3"]
+
+def test_tenant_weights_scale_their_share():
+    scheduler = PriorityScheduler(aging_seconds=0, tenant_weights={"org-a": 2.0})
+    for index in range(4):
+        scheduler.push(job(f"a{index}", tenant="org-a"))
+        scheduler.push(job(f"b{index}", tenant="org-b"))
+    assert drain(scheduler)[:6] == ["a0", "b0", "a1", "b1", "a2", "a3"]
+
+def test_idle_tenant_does_not_bank_unused_service():
+    scheduler = PriorityScheduler(aging_seconds=0)
+    for index in range(3):
+        scheduler.push(job(f"a{index}", tenant="org-a"))
+    assert [scheduler.pop().job_id for _ in range(2)] == ["a0", "a1"]
+    scheduler.push(job("b0", tenant="org-b"))
+    scheduler.push(job("b1", tenant="org-b"))
+    # org-b joins at org-a's current service level instead of from zero
+    assert drain(scheduler) == ["b0", "a2", "b1"]
+
+def test_position_follows_dispatch_order_and_removals():
+    scheduler = PriorityScheduler(aging_seconds=0)
+    scheduler.push(job("a0", tenant="org-a"))
+    scheduler.push(job("a1", tenant="org-a"))
+    scheduler.push(job("b0", tenant="org-b"))
+    assert [scheduler.position(job_id) for job_id in ("a0", "b0", "a1")] == [1, 2, 3]
+
+    assert scheduler.remove("a0")
+    assert scheduler.position("a0") is None
+    assert scheduler.position("a1") == 1 and scheduler.position("b0") == 2
+    scheduler.push(job("urgent", priority=5, tenant="org-c"))
+    assert scheduler.position("urgent") == 1 and scheduler.position("b0") == 3
+    assert scheduler.counts_by_priority() == {1: 2, 5: 1} and len(scheduler) == 3
+
+def test_position_lookups_share_one_simulation(monkeypatch):
+    scheduler = PriorityScheduler(aging_seconds=0)
+    for index in range(200):
+        scheduler.push(job(f"job-{index}", tenant=f"org-{index % 20}"))
+    simulations = []
+    dispatch_order = scheduler._dispatch_order
+    monkeypatch.setattr(scheduler, "_dispatch_order", lambda now: simulations.append(now) or dispatch_order(now))
+
+    positions = [scheduler.position(f"job-{index}") for index in range(200)]
+    assert sorted(positions) == list(range(1, 201))
+    assert len(simulations) == 1
+
+    # A queue change, or the cache expiring, forces a fresh simulation
+    scheduler.pop()
+    assert scheduler.position("job-199") == 199
+    monkeypatch.setattr(workflow_scheduler, "POSITION_CACHE_SECONDS", 0)
+    scheduler.position("job-199")
+    assert len(simulations) == 3